@@ -1,7 +1,9 @@
-import shutil
 import os
+import zipfile
 from datetime import datetime
 
+from core.journal_rotation import JOURNAUX_ROTATIFS, GestionnaireRotation, dossier_archives
+
 # Liste des fichiers à archiver (ajuste selon tes besoins)
 fichiers = [
     "journal_gain_simule.csv",
@@ -19,11 +21,43 @@ nom_archive = f"archive_simulation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zi
 def fichiers_existants(flist):
     return [f for f in flist if os.path.exists(f)]
 
+# Segments déjà compressés par core.journal_rotation : stockés tels quels dans le zip
+EXTENSIONS_COMPRESSEES = (".zst", ".gz")
+
+
+def dossiers_segments(journaux=JOURNAUX_ROTATIFS):
+    """Dossiers ``archives_journaux/<nom>/`` (segments + manifeste) existants."""
+    return [str(d) for d in (dossier_archives(j) for j in journaux) if d.is_dir()]
+
+
+def _ajouter(archive, chemin):
+    stocke = chemin.endswith(EXTENSIONS_COMPRESSEES)
+    archive.write(chemin, compress_type=zipfile.ZIP_STORED if stocke else zipfile.ZIP_DEFLATED)
+
+
+def creer_archive(chemins, nom):
+    """Zippe uniquement les fichiers/dossiers listés (et non tout le répertoire)."""
+    with zipfile.ZipFile(nom, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for chemin in chemins:
+            if os.path.isdir(chemin):
+                for racine, _, noms in os.walk(chemin):
+                    for n in noms:
+                        _ajouter(archive, os.path.join(racine, n))
+            else:
+                _ajouter(archive, chemin)
+
+
 def main():
-    to_archive = fichiers_existants(fichiers)
+    # Journaux JSONL : segments compressés + manifeste (core.journal_rotation)
+    segments = GestionnaireRotation().faire_tourner_journaux(forcer=True)
+    for journal, segment in segments.items():
+        print(f"Journal archivé : {journal} → {segment.fichier}")
+
+    # Les segments et manifestes rejoignent l'archive avec les autres fichiers
+    to_archive = fichiers_existants(fichiers) + dossiers_segments()
     if to_archive:
         print(f"Fichiers à archiver : {to_archive}")
-        shutil.make_archive(nom_archive.replace('.zip', ''), 'zip', root_dir='.', base_dir='.')
+        creer_archive(to_archive, nom_archive)
         print(f"Archive créée : {nom_archive}")
     else:
         print("Aucun fichier à archiver.")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# backtest.py – V6.1.0
+"""Backtest DeFiPilot : rejoue des snapshots de pools et des signaux enregistrés
+à travers le pipeline de décision (contexte/policy, mode global, scoring,
+rééquilibrage), sur horloge virtuelle et sans écriture de journaux.
+
+Exemple :
+    python backtest.py --snapshots data/logs/pool_snapshots.jsonl --capital 10000 --frais-bps 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+from core.backtest import Backtest, charger_signaux, charger_snapshots
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="DeFiPilot – Backtest par rejeu historique")
+    parser.add_argument("--snapshots", required=True, help="Snapshots de pools (JSONL ou JSON)")
+    parser.add_argument("--signaux", default="data/logs/journal_signaux.jsonl", help="Journal des signaux marché")
+    parser.add_argument("--ai", default="data/logs/ai_evaluation.jsonl", help="Journal des évaluations IA")
+    parser.add_argument("--cfg", default=None, help="Configuration stratégie JSON (optionnelle)")
+    parser.add_argument("--capital", type=float, default=10_000.0, help="Capital initial en USD")
+    parser.add_argument("--profil", default="modere", help="Profil (prudent/modere/risque)")
+    parser.add_argument("--frais-bps", type=float, default=0.0, dest="frais_bps", help="Coût par USD déplacé (bps)")
+    parser.add_argument("--sortie", default=None, help="Écrit le rapport complet en JSON")
+    args = parser.parse_args(argv)
+
+    snapshots_path = Path(args.snapshots)
+    if not snapshots_path.exists():
+        print(f"[ERROR] Fichier de snapshots introuvable : {snapshots_path}")
+        return 1
+
+    cfg: Dict[str, Any] = {}
+    if args.cfg:
+        try:
+            with open(args.cfg, "r", encoding="utf-8") as f:
+                cfg = json.load(f)
+        except (OSError, json.JSONDecodeError) as exc:
+            print(f"[WARN] Configuration ignorée ({args.cfg}) : {exc}")
+
+    snapshots = charger_snapshots(snapshots_path)
+    if not snapshots:
+        print("[ERROR] Aucun snapshot exploitable.")
+        return 1
+
+    rapport = Backtest(
+        snapshots,
+        charger_signaux(args.signaux, args.ai),
+        cfg,
+        capital_usd=args.capital,
+        profil=args.profil,
+        frais_bps=args.frais_bps,
+    ).executer()
+
+    print(f"[INFO] {rapport['nb_etapes']} étapes, {rapport['nb_signaux']} signaux, "
+          f"{rapport['duree_simulee_jours']:.1f} jours rejoués en {rapport['duree_reelle_s']:.2f}s")
+    print(f"       période   = {rapport['debut']} → {rapport['fin']}")
+    print(f"       PnL       = {rapport['pnl_usd']:+.2f} USD ({rapport['rendement_pct']:+.2f}%)")
+    print(f"       turnover  = {rapport['turnover_usd']:.2f} USD (x{rapport['turnover_ratio']:.2f}), "
+          f"{rapport['nb_reequilibrages']} rééquilibrage(s), frais {rapport['frais_usd']:.2f} USD")
+    print(f"       drawdown  = {rapport['drawdown_max_pct']:.2f}%")
+    print(f"       contextes = {rapport['contextes']}  modes = {rapport['modes']}")
+
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(rapport, f, ensure_ascii=False, indent=2)
+        print(f"[OK] Rapport écrit dans {args.sortie}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -34,6 +34,9 @@ try:  # pragma: no cover - eth-account optionnel
 except Exception:  # pragma: no cover
     Account = None  # type: ignore
 
+from core.gas_estimator import activer_oracle_reseau
+from core.gas_limit_cache import cache_partage, cle_depuis_fonction
+from core.gas_oracle import MODES_FRAIS, obtenir_oracle
 from core.journal_farming import enregistrer_farming
 
 VERSION = "V3.9.11"
@@ -127,7 +130,7 @@ def _to_checksum(addr: str, w3: Optional[Any]) -> str:  # V3.9.11
     return addr
 
 
-def _connect_web3(rpc_url: Optional[str]) -> Optional[Any]:  # V3.9.11
+def _connect_web3(rpc_url: Optional[str], chain: str = DEFAULT_CHAIN) -> Optional[Any]:  # V3.9.11
     if Web3 is None or not rpc_url:
         return None
     try:
@@ -144,6 +147,7 @@ def _connect_web3(rpc_url: Optional[str]) -> Optional[Any]:  # V3.9.11
             is_connected = bool(w3.isConnected())
         if not is_connected:
             return None
+        activer_oracle_reseau(w3, str(chain).lower())
         return w3
     except Exception:  # pragma: no cover
         return None
@@ -159,6 +163,13 @@ def _format_wei_to_native(value: int) -> float:  # V3.9.11
     return float(Decimal(value) / Decimal(10 ** 18))
 
 
+def _tx_fee_fields(w3: Any, args: argparse.Namespace) -> Dict[str, int]:
+    """Champs de frais : ``--gas-price`` explicite (legacy) ou oracle de gas partagé."""
+    if getattr(args, "gas_price", None):
+        return {"gasPrice": int(args.gas_price)}
+    return obtenir_oracle(w3).frais_transaction(getattr(args, "gas_mode", None) or "normal")
+
+
 def _apply_gas_buffer(gas_estimate: int) -> int:  # V3.9.11
     if gas_estimate <= 0:
         return 0
@@ -300,7 +311,7 @@ def _handle_harvest(args: argparse.Namespace, opts: GlobalOptions) -> int:  # V3
         enregistrer_farming(**payload)
         return 0
 
-    w3 = _connect_web3(rpc_url)
+    w3 = _connect_web3(rpc_url, opts.chain)
     if w3 is None:
         print("❌ Impossible de se connecter au RPC. Bascule en simulation.")
         payload = _build_log_payload(
@@ -325,15 +336,19 @@ def _handle_harvest(args: argparse.Namespace, opts: GlobalOptions) -> int:  # V3
         minichef_checksum = _to_checksum(minichef, w3)
         contract = _get_minichef_contract(w3, minichef_checksum)
         function = contract.functions.harvest(pid, wallet_checksum)
-        gas_price = int(args.gas_price or w3.eth.gas_price)
-        gas_estimate = function.estimate_gas({"from": wallet_checksum})
-        gas_limit = _apply_gas_buffer(gas_estimate)
+        fee_fields = _tx_fee_fields(w3, args)
+        gas_key = cle_depuis_fonction(function)
+        gas_limit = cache_partage().estimer(
+            gas_key,
+            lambda: function.estimate_gas({"from": wallet_checksum}),
+            _apply_gas_buffer,
+        )
         nonce = w3.eth.get_transaction_count(wallet_checksum)
         tx_data = function.build_transaction(
             {
                 "from": wallet_checksum,
                 "gas": gas_limit,
-                "gasPrice": gas_price,
+                **fee_fields,
                 "nonce": nonce,
                 "chainId": opts.chain_id,
             }
@@ -344,9 +359,12 @@ def _handle_harvest(args: argparse.Namespace, opts: GlobalOptions) -> int:  # V3
         tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
         print(f"⏳ Transaction envoyée : {tx_hash.hex()}")
         receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        cache_partage().observer_recu(gas_key, receipt, gas_limit)
         status = receipt.status
         gas_used = receipt.gasUsed
-        effective_gas_price = getattr(receipt, "effectiveGasPrice", gas_price)
+        effective_gas_price = getattr(
+            receipt, "effectiveGasPrice", fee_fields.get("gasPrice", fee_fields.get("maxFeePerGas"))
+        )
         tx_cost_native = _format_wei_to_native(gas_used * effective_gas_price)
         if status == 1:
             print("✅ Récolte confirmée.")
@@ -473,7 +491,7 @@ def _handle_unstake(args: argparse.Namespace, opts: GlobalOptions) -> int:  # V3
         enregistrer_farming(**payload)
         return 0
 
-    w3 = _connect_web3(rpc_url)
+    w3 = _connect_web3(rpc_url, opts.chain)
     if w3 is None:
         print("❌ Impossible de se connecter au RPC. Bascule en simulation.")
         payload = _build_log_payload(
@@ -498,15 +516,19 @@ def _handle_unstake(args: argparse.Namespace, opts: GlobalOptions) -> int:  # V3
         minichef_checksum = _to_checksum(minichef, w3)
         contract = _get_minichef_contract(w3, minichef_checksum)
         function = contract.functions.withdraw(pid, amount_wei, wallet_checksum)
-        gas_price = int(args.gas_price or w3.eth.gas_price)
-        gas_estimate = function.estimate_gas({"from": wallet_checksum})
-        gas_limit = _apply_gas_buffer(gas_estimate)
+        fee_fields = _tx_fee_fields(w3, args)
+        gas_key = cle_depuis_fonction(function)
+        gas_limit = cache_partage().estimer(
+            gas_key,
+            lambda: function.estimate_gas({"from": wallet_checksum}),
+            _apply_gas_buffer,
+        )
         nonce = w3.eth.get_transaction_count(wallet_checksum)
         tx_data = function.build_transaction(
             {
                 "from": wallet_checksum,
                 "gas": gas_limit,
-                "gasPrice": gas_price,
+                **fee_fields,
                 "nonce": nonce,
                 "chainId": opts.chain_id,
             }
@@ -517,9 +539,12 @@ def _handle_unstake(args: argparse.Namespace, opts: GlobalOptions) -> int:  # V3
         tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
         print(f"⏳ Transaction envoyée : {tx_hash.hex()}")
         receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        cache_partage().observer_recu(gas_key, receipt, gas_limit)
         status = receipt.status
         gas_used = receipt.gasUsed
-        effective_gas_price = getattr(receipt, "effectiveGasPrice", gas_price)
+        effective_gas_price = getattr(
+            receipt, "effectiveGasPrice", fee_fields.get("gasPrice", fee_fields.get("maxFeePerGas"))
+        )
         tx_cost_native = _format_wei_to_native(gas_used * effective_gas_price)
         if status == 1:
             print("✅ Retrait confirmé.")
@@ -674,6 +699,13 @@ def build_parser() -> argparse.ArgumentParser:  # V3.9.11
         dest="gas_price",
         help="Gas price en wei (optionnel)",
     )
+    harvest_parser.add_argument(
+        "--gas-mode",
+        choices=sorted(MODES_FRAIS),
+        default="normal",
+        dest="gas_mode",
+        help="Mode de frais EIP-1559 de l'oracle (ignoré si --gas-price)",
+    )
 
     unstake_parser = subparsers.add_parser("unstake", help="Retirer des LP du pool")
     unstake_parser.add_argument("--pid", type=int, required=True, help="Identifiant du pool")
@@ -695,6 +727,13 @@ def build_parser() -> argparse.ArgumentParser:  # V3.9.11
         dest="gas_price",
         help="Gas price en wei (optionnel)",
     )
+    unstake_parser.add_argument(
+        "--gas-mode",
+        choices=sorted(MODES_FRAIS),
+        default="normal",
+        dest="gas_mode",
+        help="Mode de frais EIP-1559 de l'oracle (ignoré si --gas-price)",
+    )
 
     stake_parser = subparsers.add_parser("stake", help="Déposer des LP (simulation)")
     stake_parser.add_argument("--pid", type=int, required=True, help="Identifiant du pool")
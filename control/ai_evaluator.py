@@ -308,10 +308,16 @@ def evaluate(
 # ------------------ CLI ------------------
 
 def _append_jsonl(path: Path, obj: Dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False))
-        f.write("\n")
+    # Import local : le module reste utilisable seul (stdlib) hors du dépôt.
+    try:
+        from core.signal_bus import ajouter_jsonl
+    except ImportError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(obj, ensure_ascii=False))
+            f.write("\n")
+        return
+    ajouter_jsonl(path, obj)
 
 
 def _cli(argv: List[str] | None = None) -> int:
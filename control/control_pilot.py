@@ -13,16 +13,16 @@ Module d'observation produisant des synthèses sur les journaux DeFiPilot.
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Hashable, Iterable, Optional
 import argparse
-import json
 import logging
 import time
 
 from .aggregator import AggregatedSnapshot, aggregate_from_config
 from .anomaly_detector import Anomaly, detect_anomalies, summarize_anomalies
 from core.exchange_format import build_payload, write_exchange_payload
-from core.sync_guard import safe_read_jsonl, acquire_lock, release_lock
+from core.signal_bus import ajouter_jsonl
+from core.sync_guard import safe_read_jsonl
 
 logger = logging.getLogger(__name__)
 
@@ -123,22 +123,15 @@ def charger_evenements(journal_path: Path, max_events: int) -> list[dict[str, An
 
 
 def ecrire_resume(resume: ResumeGlobal, output_path: Path) -> None:
-    """Écrit le résumé global dans un fichier JSONL en section critique protégée."""
-    try:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-    except OSError:
-        return
+    """Écrit le résumé global dans un fichier JSONL en section critique protégée.
 
-    locked = acquire_lock(output_path, timeout_s=2.0, poll_s=0.05, stale_s=300)
+    Avec un bus actif, le résumé est publié sur le sujet du fichier et écrit
+    par le puits du bus.
+    """
     try:
-        with output_path.open("a", encoding="utf-8") as flux:
-            flux.write(json.dumps(resume.to_dict(), ensure_ascii=False))
-            flux.write("\n")
+        ajouter_jsonl(output_path, resume.to_dict(), verrouiller=True)
     except OSError:
         pass
-    finally:
-        if locked:
-            release_lock(output_path)
 
 
 def _charger_jsonl_brut(path: Path, max_lines: int | None = None) -> list[dict[str, Any]]:
@@ -397,16 +390,33 @@ def lire_signaux_consolides(limit: int = 50, include_ai: bool = True) -> list[Si
     signaux_bruts = _charger_jsonl_brut(chemin_signaux, max_lines=max_lines)
     signaux_ai = _charger_jsonl_brut(chemin_ai, max_lines=max_lines) if include_ai else []
 
-    signaux: list[SignalConsolide] = []
+    signaux_tries = consolider_signaux(signaux_bruts + signaux_ai, limit=limit)
+    logger.info("%d signaux consolidés chargés (limit=%s)", len(signaux_tries), limit)
+    return signaux_tries
 
-    for brut in signaux_bruts:
-        signaux.append(_build_signal_from_obj(brut))
 
-    for brut_ai in signaux_ai:
-        signaux.append(_build_signal_from_obj(brut_ai))
+def consolider_signaux(bruts: list[dict[str, Any]], limit: int = 50) -> list[SignalConsolide]:
+    """Construit les signaux consolidés à partir d'événements bruts déjà chargés.
 
-    def _score_tri(signal: SignalConsolide) -> float:
-        ts = _parse_timestamp(signal.timestamp)
+    Même résultat que ``lire_signaux_consolides`` sans relire les journaux :
+    utilisé par le superviseur, qui reçoit les événements via le bus.
+    """
+    return [signal for _, signal in consolider_signaux_indexes(enumerate(bruts), limit=limit)]
+
+
+def consolider_signaux_indexes(
+    entrees: Iterable[tuple[Hashable, dict[str, Any]]],
+    limit: int = 50,
+) -> list[tuple[Hashable, SignalConsolide]]:
+    """Variante de ``consolider_signaux`` conservant la clé (offset) de chaque événement.
+
+    Le superviseur s'en sert pour ne normaliser que les signaux nouveaux
+    (``core.signals_normalizer.NormaliseurSignaux``).
+    """
+    signaux = [(cle, _build_signal_from_obj(brut)) for cle, brut in entrees if isinstance(brut, dict)]
+
+    def _score_tri(entree: tuple[Hashable, SignalConsolide]) -> float:
+        ts = _parse_timestamp(entree[1].timestamp)
         if ts is not None:
             return ts.timestamp()
         return 0.0
@@ -414,8 +424,6 @@ def lire_signaux_consolides(limit: int = 50, include_ai: bool = True) -> list[Si
     signaux_tries = sorted(signaux, key=_score_tri, reverse=True)
     if limit > 0:
         signaux_tries = signaux_tries[:limit]
-
-    logger.info("%d signaux consolidés chargés (limit=%s)", len(signaux_tries), limit)
     return signaux_tries
 
 
@@ -445,7 +453,11 @@ class ControlPilot:
         resume: ResumeGlobal,
         bus_path: Path = Path("exchange_bus.jsonl"),
     ) -> None:
-        """Construit et publie un payload inter-bots minimal dans exchange_bus.jsonl.
+        """Construit et publie un payload inter-bots minimal dans exchange_bus.jsonl."""
+        write_exchange_payload(bus_path, self.construire_exchange(events, resume))
+
+    def construire_exchange(self, events: list[dict[str, Any]], resume: ResumeGlobal) -> dict[str, Any]:
+        """Construit le payload inter-bots minimal (sans l'écrire).
 
         - context: pris depuis le dernier événement qui possède 'context'
         - ai_context/confidence: pris depuis la dernière ligne AI (tag ou ligne contenant AI_context)
@@ -479,7 +491,7 @@ class ControlPilot:
             if context_val and metrics_val and (ai_ctx is not None) and (ai_conf is not None):
                 break
 
-        payload = build_payload(
+        return build_payload(
             source="ControlPilot",
             version="V5.1",
             context=context_val or getattr(resume, "context", None),
@@ -487,15 +499,19 @@ class ControlPilot:
             ai_confidence=ai_conf,
             metrics=metrics_val,
         )
-        write_exchange_payload(bus_path, payload)
+
+    def analyser(self, evenements: list[dict[str, Any]]) -> Optional[ResumeGlobal]:
+        """Résumé des ``max_events`` derniers événements fournis, sans I/O."""
+        if self.max_events > 0:
+            evenements = evenements[-self.max_events:]
+        if not evenements:
+            return None
+        return calculer_resume(evenements)
 
     def run_once(self) -> bool:
         """Effectue une analyse unique en produisant éventuellement un résumé."""
         evenements = charger_evenements(self.input_path, self.max_events)
-        if not evenements:
-            return False
-
-        resume = calculer_resume(evenements)
+        resume = self.analyser(evenements)
         if resume is None:
             return False
 
@@ -4,7 +4,9 @@ from __future__ import annotations
 """Ce module calcule des signaux de risque simples à partir des indicateurs agrégés
 issus de ``extraire_indicateurs_de_base``."""
 
-from typing import Any, Iterable
+from typing import Any, Iterable, Mapping
+
+from core.monte_carlo import seuils_monte_carlo
 
 _NIVEAUX_ORDONNES = ("OK", "A_SURVEILLER", "RISQUE")
 _ORDRE_NIVEAUX = {niveau: index for index, niveau in enumerate(_NIVEAUX_ORDONNES)}
@@ -19,8 +21,44 @@ def _niveau_max(n1: str, n2: str) -> str:
     return n2
 
 
-def calculer_signaux_risque(indicateurs: dict[str, Any]) -> list[dict[str, Any]]:
-    """Calcule les signaux de risque globaux à partir des indicateurs fournis."""
+def _evaluer_monte_carlo(monte_carlo: dict[str, Any], seuils: Mapping[str, float]) -> tuple[str, list[str]]:
+    """Niveau et motifs issus des percentiles de pertes simulées."""
+    niveau = "OK"
+    motifs: list[str] = []
+
+    def _mesure(cle: str) -> float | None:
+        valeur = monte_carlo.get(cle)
+        if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+            return float(valeur)
+        return None
+
+    var_95 = _mesure("var_95_pct")
+    if var_95 is not None and var_95 > seuils["var_max_pct"]:
+        niveau = _niveau_max(niveau, "A_SURVEILLER")
+        motifs.append("VAR_ELEVEE")
+
+    cvar_99 = _mesure("cvar_99_pct")
+    if cvar_99 is not None and cvar_99 > seuils["cvar_max_pct"]:
+        niveau = _niveau_max(niveau, "RISQUE")
+        motifs.append("CVAR_EXTREME")
+
+    drawdown_p95 = _mesure("drawdown_p95_pct")
+    if drawdown_p95 is not None and drawdown_p95 > seuils["drawdown_max_pct"]:
+        niveau = _niveau_max(niveau, "RISQUE")
+        motifs.append("DRAWDOWN_SEVERE")
+
+    return niveau, motifs
+
+
+def calculer_signaux_risque(
+    indicateurs: dict[str, Any],
+    cfg: Mapping[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """Calcule les signaux de risque globaux à partir des indicateurs fournis.
+
+    Le rapport ``monte_carlo`` éventuel est comparé aux seuils
+    ``safety.monte_carlo`` de ``cfg`` (défauts ``core.monte_carlo.SEUILS_DEFAUT``).
+    """
     nb_evenements = indicateurs.get("nb_evenements", 0)
     if nb_evenements == 0:
         signal = {
@@ -70,6 +108,12 @@ def calculer_signaux_risque(indicateurs: dict[str, Any]) -> list[dict[str, Any]]
             niveau = _niveau_max(niveau, "RISQUE")
             motifs.append("VOLATILITE_ELEVEE")
 
+    monte_carlo = indicateurs.get("monte_carlo")
+    if isinstance(monte_carlo, dict):
+        niveau_mc, motifs_mc = _evaluer_monte_carlo(monte_carlo, seuils_monte_carlo(cfg))
+        niveau = _niveau_max(niveau, niveau_mc)
+        motifs.extend(motifs_mc)
+
     motifs_uniques: list[str] = []
     motifs_vus = set()
     for motif in motifs:
@@ -91,6 +135,8 @@ def calculer_signaux_risque(indicateurs: dict[str, Any]) -> list[dict[str, Any]]
             "metrics_locales_moyennes": metrics or {},
         },
     }
+    if isinstance(monte_carlo, dict):
+        signal["details"]["monte_carlo"] = monte_carlo
     return [signal]
 
 
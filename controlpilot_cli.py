@@ -16,6 +16,7 @@ from control.data_collector import (
     extraire_indicateurs_de_base,
 )
 from control.risk_signals import calculer_signaux_risque, resumer_niveau_risque
+from core.state_manager import get_state
 
 
 def main(argv: Iterable[str] | None = None) -> int:
@@ -45,7 +46,13 @@ def main(argv: Iterable[str] | None = None) -> int:
 
     evenements = charger_evenements_signaux(chemin_signaux)
     indicateurs = extraire_indicateurs_de_base(evenements)
-    signaux = list(calculer_signaux_risque(indicateurs))
+    # Dernière passe Monte Carlo du daemon (état partagé), avec ses seuils de config.
+    monte_carlo = (get_state() or {}).get("monte_carlo")
+    cfg_risque = None
+    if isinstance(monte_carlo, dict):
+        indicateurs["monte_carlo"] = monte_carlo
+        cfg_risque = {"safety": {"monte_carlo": monte_carlo.get("seuils") or {}}}
+    signaux = list(calculer_signaux_risque(indicateurs, cfg_risque))
     resume = resumer_niveau_risque(signaux)
 
     def _ecrire_signaux_dans_journal(
@@ -0,0 +1,362 @@
+# core/allocation_optimizer.py – V6.1.0
+"""
+Optimiseur d'allocation sous contraintes pour ``StrategyEngine``.
+
+Remplace les parts uniformes (puis plafonnées / renormalisées) par la
+solution d'un petit programme quadratique concave, résolu en NumPy :
+
+    max  h · (rᵀw − λ/2 · wᵀΣw) · capital − Σ gas_i        (pools retenues)
+    s.c. lb_i ≤ w_i ≤ ub_i,  Σ w_i ≤ budget
+
+- ``r``  : APR annuel des candidats (``apr`` en %), ``h`` = horizon / 365 ;
+- ``Σ``  : covariance structurelle (volatilité par pool, facteurs de
+  corrélation marché / plateforme / jetons partagés) ;
+- ``gas``: coût d'entrée par pool (swap + add_liquidity) via
+  ``core.gas_estimator`` (oracle de gas si enregistré, sinon config) ;
+- bornes : ``min_pct`` / ``max_pct``, plafond de risque du profil et facteur
+  d'exposition du contexte, comme l'heuristique historique.
+
+Le QP est résolu par gradient projeté accéléré (FISTA) ; la projection sur
+{boîte ∩ budget} est exacte (Newton par morceaux sécurisé par dichotomie).
+Sans aversion au risque le problème est un LP résolu exactement par
+remplissage glouton. Le gas étant un coût fixe par pool, les pools dont le
+rendement attendu ne couvre pas le gas sont retirées et le problème est
+résolu à nouveau sur les pools restantes.
+
+Les allocations peuvent donc totaliser moins que le budget d'exposition : la
+part des pools écartées (rendement < gas) et celle que l'aversion au risque
+ne juge pas rentable restent non investies, sans redistribution. Le capital
+qui fixe l'échelle rendement / gas est celui du portefeuille
+(``capital_portefeuille`` sur les soldes du snapshot), pas une constante.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS_ENTREE = ("swap", "add_liquidity")
+# jetons valorisés 1 USD sans prix fourni
+STABLES_USD = frozenset({"USDC", "USDC.E", "USDT", "DAI"})
+
+
+@dataclass(frozen=True)
+class ParametresOptimiseur:
+    """Paramètres du modèle (section ``optimizer`` de la config de stratégie).
+
+    ``capital_usd`` à None : capital du portefeuille, à fournir par l'appelant
+    (``dataclasses.replace``) avant l'optimisation.
+    """
+
+    capital_usd: Optional[float] = None
+    horizon_jours: float = 30.0
+    aversion_risque: float = 2.0
+    volatilite_defaut: float = 0.25
+    correlation_base: float = 0.1
+    correlation_plateforme: float = 0.3
+    correlation_jeton: float = 0.2
+    tolerance: float = 1e-10
+    iterations_max: int = 2_000
+
+    @classmethod
+    def depuis_config(cls, cfg: Optional[Mapping[str, Any]]) -> "ParametresOptimiseur":
+        section = cfg.get("optimizer") if isinstance(cfg, Mapping) else None
+        if not isinstance(section, Mapping):
+            return cls()
+        valeurs = {k: v for k, v in section.items() if k in cls.__dataclass_fields__}
+        return cls(**valeurs)
+
+
+@dataclass(frozen=True)
+class ResultatAllocation:
+    """Poids optimaux (fraction du capital, 0 pour les pools écartées) et bilan en USD."""
+
+    poids: np.ndarray
+    rendement_usd: float
+    penalite_risque_usd: float
+    gas_usd: float
+    iterations: int
+
+    @property
+    def objectif_usd(self) -> float:
+        return self.rendement_usd - self.penalite_risque_usd - self.gas_usd
+
+
+# ---------------------------------------------------------------------------
+# Modèle
+# ---------------------------------------------------------------------------
+
+def capital_portefeuille(soldes: Mapping[str, Any], prix_usd: Optional[Mapping[str, Any]] = None) -> float:
+    """Valeur USD des soldes (quantités par jeton) ; stablecoins à 1 USD par défaut.
+
+    Un jeton sans prix connu n'est pas compté (message de debug).
+    """
+    prix = {str(k).upper(): v for k, v in (prix_usd or {}).items()}
+    total = 0.0
+    for jeton, quantite in soldes.items():
+        cle = str(jeton).upper()
+        valeur = prix.get(cle, 1.0 if cle in STABLES_USD else None)
+        if not isinstance(valeur, (int, float)) or not isinstance(quantite, (int, float)):
+            logger.debug("Solde %s non valorisé (prix inconnu)", jeton)
+            continue
+        total += float(quantite) * float(valeur)
+    return total
+
+
+def _echelle(params: ParametresOptimiseur) -> float:
+    """Capital × horizon / 365 : passage des rendements annuels aux USD de l'horizon."""
+    if params.capital_usd is None:
+        raise ValueError("capital_usd requis : capital du portefeuille non fourni")
+    return float(params.capital_usd) * params.horizon_jours / 365.0
+
+
+def _jetons(symboles: Any) -> frozenset:
+    texte = str(symboles or "").upper().replace("/", "-").replace("_", "-")
+    return frozenset(j.strip() for j in texte.split("-") if j.strip())
+
+
+def matrice_covariance(candidats: Sequence[Any], params: ParametresOptimiseur) -> np.ndarray:
+    """Covariance annuelle structurelle des candidats (``PoolCandidate``).
+
+    La volatilité vient de ``metadata["volatility"]`` si fournie. La
+    corrélation est un modèle à facteurs (marché commun, plateforme, jetons),
+    semi-définie positive par construction : deux pools d'une même
+    plateforme ajoutent ``correlation_plateforme`` à ``correlation_base``, le
+    partage de jetons ajoute jusqu'à ``correlation_jeton``.
+    """
+    n = len(candidats)
+    volatilites = np.full(n, params.volatilite_defaut)
+    for i, candidat in enumerate(candidats):
+        meta = getattr(candidat, "metadata", None) or {}
+        vol = meta.get("volatility") if isinstance(meta, Mapping) else None
+        if isinstance(vol, (int, float)) and not isinstance(vol, bool) and vol >= 0:
+            volatilites[i] = float(vol)
+
+    correlation = np.full((n, n), params.correlation_base)
+    plateformes: Dict[str, int] = {}
+    jetons: Dict[str, int] = {}
+    lignes, colonnes = [], []
+    for i, candidat in enumerate(candidats):
+        for jeton in _jetons(getattr(candidat, "symbols", "")):
+            lignes.append(i)
+            colonnes.append(jetons.setdefault(jeton, len(jetons)))
+    if jetons and params.correlation_jeton:
+        # Facteur jeton : incidence pools × jetons normalisée par ligne (cosinus)
+        incidence = np.zeros((n, len(jetons)))
+        incidence[lignes, colonnes] = 1.0
+        incidence /= np.maximum(np.linalg.norm(incidence, axis=1), 1.0)[:, None]
+        correlation += params.correlation_jeton * (incidence @ incidence.T)
+    if params.correlation_plateforme:
+        codes = np.array([plateformes.setdefault(str(getattr(c, "platform", "")), len(plateformes)) for c in candidats])
+        correlation += params.correlation_plateforme * (codes[:, None] == codes[None, :])
+    # Part idiosyncratique : complète la diagonale à 1
+    correlation[np.diag_indices(n)] = np.maximum(np.diag(correlation), 1.0)
+    return correlation * np.outer(volatilites, volatilites)
+
+
+def couts_gas_entree(
+    candidats: Sequence[Any],
+    estimateur: Optional[Callable[[str, str], float]] = None,
+) -> np.ndarray:
+    """Coût USD d'entrée (swap + add_liquidity) par candidat, une estimation par chaîne.
+
+    Une chaîne sans estimation disponible (config absente, réseau inconnu)
+    compte pour 0 : le gas ne doit pas empêcher l'allocation.
+    """
+    if estimateur is None:
+        from core.gas_estimator import estimer_cout_gas as estimateur
+
+    par_chaine: Dict[str, float] = {}
+    couts = np.zeros(len(candidats))
+    for i, candidat in enumerate(candidats):
+        chaine = str(getattr(candidat, "chain", "") or "").lower()
+        if chaine not in par_chaine:
+            try:
+                par_chaine[chaine] = float(sum(estimateur(op, chaine) for op in OPERATIONS_ENTREE))
+            except Exception as exc:
+                logger.debug("Gas indisponible pour %r : %s", chaine, exc)
+                par_chaine[chaine] = 0.0
+        couts[i] = par_chaine[chaine]
+    return couts
+
+
+# ---------------------------------------------------------------------------
+# Solveur
+# ---------------------------------------------------------------------------
+
+def projeter_boite_budget(v: np.ndarray, lb: np.ndarray, ub: np.ndarray, budget: float, tol: float = 1e-12) -> np.ndarray:
+    """Projection euclidienne de ``v`` sur {lb ≤ w ≤ ub, Σw ≤ budget} (suppose Σlb ≤ budget)."""
+    w = np.clip(v, lb, ub)
+    exces = w.sum() - budget
+    if exces <= tol:
+        return w
+    # w(τ) = clip(v − τ, lb, ub) ; Σw(τ) décroît, linéaire par morceaux en τ ≥ 0.
+    bas, haut, tau = 0.0, float(np.max(v - lb)), 0.0
+    for _ in range(200):
+        if exces > 0:
+            bas = tau
+        else:
+            haut = tau
+        libres = np.count_nonzero((v - tau > lb) & (v - tau < ub))
+        suivant = tau + exces / libres if libres else (bas + haut) / 2
+        tau = suivant if bas < suivant < haut else (bas + haut) / 2
+        w = np.clip(v - tau, lb, ub)
+        exces = w.sum() - budget
+        if abs(exces) <= tol or haut - bas <= tol:
+            break
+    return w
+
+
+def _lp_glouton(r: np.ndarray, lb: np.ndarray, ub: np.ndarray, budget: float) -> np.ndarray:
+    """Solution exacte sans terme de risque : bornes basses puis meilleurs rendements."""
+    w = lb.copy()
+    reste = budget - w.sum()
+    for i in np.argsort(-r, kind="stable"):
+        if reste <= 0 or r[i] <= 0:
+            break
+        ajout = min(ub[i] - w[i], reste)
+        w[i] += ajout
+        reste -= ajout
+    return w
+
+
+def resoudre_qp(
+    r: np.ndarray,
+    covariance: np.ndarray,
+    lb: np.ndarray,
+    ub: np.ndarray,
+    budget: float,
+    aversion: float,
+    tol: float = 1e-10,
+    iterations_max: int = 2_000,
+    depart: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, int]:
+    """max rᵀw − aversion/2 · wᵀΣw sur {lb ≤ w ≤ ub, Σw ≤ budget} ; retourne (w, itérations).
+
+    ``depart`` (optionnel) sert de point initial (démarrage à chaud).
+    """
+    if aversion <= 0 or not covariance.any():
+        return _lp_glouton(r, lb, ub, budget), 0
+
+    q = aversion * covariance
+    # Constante de Lipschitz du gradient : borne de Gershgorin de la plus grande valeur propre.
+    lipschitz = float(np.abs(q).sum(axis=1).max())
+    pas = 1.0 / lipschitz
+    if depart is None:
+        depart = r / np.maximum(np.diag(q), 1e-12)
+    w = projeter_boite_budget(depart, lb, ub, budget)
+    y, t = w, 1.0
+    for iteration in range(1, iterations_max + 1):
+        suivant = projeter_boite_budget(y + pas * (r - q @ y), lb, ub, budget)
+        if np.max(np.abs(suivant - w)) <= tol:
+            return suivant, iteration
+        # Redémarrage adaptatif (O'Donoghue & Candès, critère du gradient
+        # projeté) : évite les oscillations sans produit matrice-vecteur de plus
+        if np.dot(y - suivant, suivant - w) > 0:
+            y, t = suivant, 1.0
+        else:
+            t_suivant = (1.0 + np.sqrt(1.0 + 4.0 * t * t)) / 2.0
+            y = suivant + ((t - 1.0) / t_suivant) * (suivant - w)
+            t = t_suivant
+        w = suivant
+    return w, iterations_max
+
+
+def evaluer_allocation(
+    poids: np.ndarray,
+    r: np.ndarray,
+    covariance: np.ndarray,
+    gas: np.ndarray,
+    params: ParametresOptimiseur,
+) -> Tuple[float, float, float]:
+    """(rendement, pénalité de risque, gas) en USD sur l'horizon pour des poids donnés."""
+    echelle = _echelle(params)
+    rendement = echelle * float(r @ poids)
+    penalite = echelle * params.aversion_risque / 2.0 * float(poids @ covariance @ poids)
+    return rendement, penalite, float(gas[poids > 0].sum())
+
+
+def bornes_allocation(
+    n: int,
+    min_pct: float,
+    max_pct: float,
+    plafond_risque: Optional[float] = None,
+    facteur_exposition: float = 1.0,
+    budget: float = 1.0,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Bornes par pool : ``[min_pct, min(max_pct, plafond)]`` mises à l'échelle de l'exposition.
+
+    Un plafond de risque sous ``min_pct`` l'emporte (comme l'heuristique) et
+    les bornes basses sont réduites si elles dépassent ensemble le budget.
+    """
+    haut = max_pct if plafond_risque is None else min(max_pct, plafond_risque)
+    haut = max(0.0, haut * facteur_exposition)
+    bas = min(max(0.0, min_pct * facteur_exposition), haut, budget / n if n else 0.0)
+    return np.full(n, bas), np.full(n, haut)
+
+
+def optimiser_allocations(
+    candidats: Sequence[Any],
+    lb: np.ndarray,
+    ub: np.ndarray,
+    budget: float = 1.0,
+    params: Optional[ParametresOptimiseur] = None,
+    gas: Optional[np.ndarray] = None,
+    covariance: Optional[np.ndarray] = None,
+) -> ResultatAllocation:
+    """Allocation optimale des candidats ; les pools ne couvrant pas leur gas reçoivent 0.
+
+    La somme des poids peut rester sous ``budget`` (pools écartées, part non
+    rentable après pénalité de risque) : le reste n'est pas investi.
+    ``params.capital_usd`` doit être renseigné.
+    """
+    params = params or ParametresOptimiseur()
+    n = len(candidats)
+    r = np.array([float(getattr(c, "apr", 0.0) or 0.0) / 100.0 for c in candidats])
+    covariance = matrice_covariance(candidats, params) if covariance is None else covariance
+    gas = couts_gas_entree(candidats) if gas is None else np.asarray(gas, dtype=float)
+    echelle = _echelle(params)
+
+    actifs = np.ones(n, dtype=bool)
+    poids = np.zeros(n)
+    iterations = 0
+    while actifs.any():
+        idx = np.flatnonzero(actifs)
+        bas = np.minimum(lb[idx], budget / len(idx))
+        w, nb = resoudre_qp(
+            r[idx], covariance[np.ix_(idx, idx)], bas, ub[idx], budget,
+            params.aversion_risque, params.tolerance, params.iterations_max,
+            depart=poids[idx] if iterations else None,
+        )
+        iterations += nb
+        # Contribution nette de chaque pool : rendement attendu moins son gas d'entrée
+        net = echelle * r[idx] * w - gas[idx]
+        perdantes = (net < 0) | (w <= params.tolerance)
+        poids[idx] = w
+        if not perdantes.any():
+            break
+        actifs[idx[perdantes]] = False
+        poids[idx[perdantes]] = 0.0
+
+    rendement, penalite, cout_gas = evaluer_allocation(poids, r, covariance, gas, params)
+    return ResultatAllocation(poids, rendement, penalite, cout_gas, iterations)
+
+
+__all__ = [
+    "ParametresOptimiseur",
+    "ResultatAllocation",
+    "STABLES_USD",
+    "bornes_allocation",
+    "capital_portefeuille",
+    "couts_gas_entree",
+    "evaluer_allocation",
+    "matrice_covariance",
+    "optimiser_allocations",
+    "projeter_boite_budget",
+    "resoudre_qp",
+]
@@ -0,0 +1,404 @@
+# core/backtest.py – V6.1.0
+"""Rejeu historique du pipeline de décision, sur horloge virtuelle.
+
+Le backtest alimente le code de décision *inchangé* avec des données
+enregistrées, sans ``sleep`` ni écriture de journaux sur disque :
+
+1. signaux (``journal_signaux.jsonl``, ``ai_evaluation.jsonl``) visibles à
+   l'instant virtuel, normalisés via ``core.signals_normalizer`` (50 plus
+   récents, comme ``lire_signaux_consolides``) ;
+2. contexte + policy via ``core.market_signals_adapter.calculer_contexte_et_policy``
+   sur le snapshot de pools courant ;
+3. mode global via ``determiner_mode_global_v5_5`` lorsqu'il est importable
+   (sinon ``NORMAL``, comme le repli du moteur) ;
+4. scoring via ``core.scoring.calculer_scores_et_gains`` avec un historique
+   de pools tenu en mémoire ;
+5. plan via ``core.rebalancing.generer_plan_reequilibrage_contexte``, dont
+   les actions sont appliquées à l'allocation par catégorie.
+
+Entre deux snapshots, chaque catégorie (Prudent/Modere/Risque) rapporte
+l'APR moyen (en %, convention de ``core.scoring``) de ses pools au prorata
+du temps virtuel écoulé, sur la part investie donnée par la table
+d'exposition de ``core.strategy_engine`` (profil × contexte, surchargeable
+via ``exposure_table`` dans la config, plafonnée à 1 comme le budget de
+``StrategyEngine.compute_allocations``). Le rapport contient PnL, turnover, frais, drawdown
+et la répartition des contextes et modes.
+
+Formats d'entrée :
+- snapshots : JSONL ``{"timestamp": ..., "pools": [...]}`` ou JSON (liste de
+  tels objets) ; chaque pool peut porter ``categorie``, ``apr``, ``tvl``/
+  ``tvl_usd``, ``volume_24h``, ``plateforme`` et ``nom`` ;
+- signaux : JSONL tels qu'écrits par ``journaliser_signaux`` / l'évaluateur IA.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from core.historique import HistoriqueCompact, maj_historique
+from core.market_signals_adapter import calculer_contexte_et_policy
+from core.rebalancing import CATEGORIES, generer_plan_reequilibrage_contexte
+from core.scoring import calculer_scores_et_gains, charger_ponderations
+from core.signals_normalizer import SignalNormalise, normaliser_signaux
+from core.strategy_engine import exposure_factor
+
+try:  # le module de mode global n'est pas toujours importable
+    from core.mode_engine_v5_5 import determiner_mode_global_v5_5
+except ImportError:  # pragma: no cover - dépend de l'arbre
+    determiner_mode_global_v5_5 = None
+
+logger = logging.getLogger(__name__)
+
+SECONDES_PAR_AN = 365 * 24 * 3600
+LIMITE_SIGNAUX = 50
+ALLOCATION_INITIALE = {"Prudent": 1 / 3, "Modere": 1 / 3, "Risque": 1 / 3}
+
+
+def _parse_ts(valeur: Any) -> Optional[float]:
+    """Horodatage (ISO 8601, ``Z`` accepté, ou epoch) → secondes epoch UTC."""
+    if isinstance(valeur, (int, float)):
+        return float(valeur)
+    if not isinstance(valeur, str) or not valeur.strip():
+        return None
+    texte = valeur.strip()
+    if texte.endswith("Z"):
+        texte = texte[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(texte)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+def _lire_jsonl(chemin: Path) -> List[Dict[str, Any]]:
+    if not chemin.exists():
+        return []
+    lignes: List[Dict[str, Any]] = []
+    with chemin.open("r", encoding="utf-8") as f:
+        for ligne in f:
+            ligne = ligne.strip()
+            if not ligne:
+                continue
+            try:
+                obj = json.loads(ligne)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(obj, dict):
+                lignes.append(obj)
+    return lignes
+
+
+def charger_snapshots(chemin: str | Path) -> List[Tuple[float, List[Dict[str, Any]]]]:
+    """Snapshots de pools triés par horodatage (JSONL ou JSON)."""
+    chemin = Path(chemin)
+    if chemin.suffix == ".jsonl":
+        bruts: Iterable[Any] = _lire_jsonl(chemin)
+    else:
+        with chemin.open("r", encoding="utf-8") as f:
+            bruts = json.load(f)
+    snapshots = []
+    for brut in bruts:
+        if not isinstance(brut, Mapping):
+            continue
+        ts = _parse_ts(brut.get("timestamp") or brut.get("ts"))
+        pools = brut.get("pools")
+        if ts is None or not isinstance(pools, list):
+            continue
+        snapshots.append((ts, [dict(p) for p in pools if isinstance(p, Mapping)]))
+    snapshots.sort(key=lambda s: s[0])
+    return snapshots
+
+
+def charger_signaux(*chemins: str | Path) -> List[Dict[str, Any]]:
+    """Concatène les journaux de signaux (les fichiers absents sont ignorés)."""
+    signaux: List[Dict[str, Any]] = []
+    for chemin in chemins:
+        signaux.extend(_lire_jsonl(Path(chemin)))
+    return signaux
+
+
+class HorlogeVirtuelle:
+    """Horloge du rejeu : le temps n'avance que lorsqu'on le demande."""
+
+    def __init__(self, debut: float = 0.0) -> None:
+        self._t = float(debut)
+
+    def maintenant(self) -> float:
+        return self._t
+
+    def avancer_jusqu_a(self, t: float) -> float:
+        """Avance l'horloge (jamais en arrière) et retourne la durée écoulée."""
+        ecoule = max(0.0, float(t) - self._t)
+        self._t += ecoule
+        return ecoule
+
+
+class FenetreSignaux:
+    """Signaux normalisés une seule fois, servis par fenêtre temporelle."""
+
+    def __init__(self, signaux_bruts: Sequence[Mapping[str, Any]], limite: int = LIMITE_SIGNAUX) -> None:
+        horodates: List[Tuple[float, SignalNormalise]] = []
+        for brut in signaux_bruts:
+            ts = _parse_ts(brut.get("timestamp") or brut.get("ts"))
+            normalises = normaliser_signaux([dict(brut)])
+            if ts is not None and normalises:
+                horodates.append((ts, normalises[0]))
+        horodates.sort(key=lambda s: s[0])
+        self._ts = [ts for ts, _ in horodates]
+        self._signaux = [s for _, s in horodates]
+        self.limite = limite
+
+    def __len__(self) -> int:
+        return len(self._signaux)
+
+    def visibles(self, t: float) -> List[SignalNormalise]:
+        """``limite`` signaux les plus récents à l'instant ``t``, du plus récent au plus ancien."""
+        fin = bisect.bisect_right(self._ts, t)
+        debut = max(0, fin - self.limite) if self.limite > 0 else 0
+        return self._signaux[debut:fin][::-1]
+
+
+@dataclass
+class JournalMemoire:
+    """Journaux du rejeu, conservés en mémoire au lieu des fichiers JSONL."""
+
+    decisions: List[Dict[str, Any]] = field(default_factory=list)
+    plans: List[Dict[str, Any]] = field(default_factory=list)
+    snapshots: List[Dict[str, Any]] = field(default_factory=list)
+
+
+def _rendement_annuel_par_categorie(pools: Sequence[Mapping[str, Any]]) -> Dict[str, float]:
+    """APR moyen (fraction annuelle) par catégorie ; repli sur la moyenne globale."""
+    par_cat: Dict[str, List[float]] = {cat: [] for cat in CATEGORIES}
+    tous: List[float] = []
+    for pool in pools:
+        try:
+            apr = float(pool.get("apr", 0.0)) / 100.0
+        except (TypeError, ValueError):
+            continue
+        tous.append(apr)
+        cat = pool.get("categorie")
+        if cat in par_cat:
+            par_cat[cat].append(apr)
+    moyenne = sum(tous) / len(tous) if tous else 0.0
+    return {cat: (sum(v) / len(v) if v else moyenne) for cat, v in par_cat.items()}
+
+
+def _appliquer_actions(allocation: Dict[str, float], actions: Sequence[Mapping[str, Any]]) -> float:
+    """Applique les actions du plan ; retourne le volume déplacé (USD)."""
+    volume = 0.0
+    for action in actions:
+        cat = action.get("categorie")
+        if cat not in allocation:
+            continue
+        try:
+            montant = float(action.get("montant_usd", 0.0))
+        except (TypeError, ValueError):
+            continue
+        if action.get("action") == "augmenter":
+            allocation[cat] += montant
+        elif action.get("action") in ("reduire", "diminuer"):
+            montant = min(montant, allocation[cat])
+            allocation[cat] -= montant
+        else:
+            continue
+        volume += montant
+    return volume
+
+
+class Backtest:
+    """Rejoue snapshots de pools + signaux à travers le pipeline de décision.
+
+    :param snapshots: séquence ``(epoch_s, pools)`` triée (liste, ou vue
+        projetée en mémoire de ``core.param_sweep``, parcourue sans copie).
+    :param signaux: signaux bruts (journal marché + évaluations IA).
+    :param cfg: configuration stratégie (``market_params``, ``ALLOCATION_POLICIES``,
+        paramètres de rééquilibrage sous ``rebalancing``).
+    :param capital_usd: capital initial réparti selon ``allocation_initiale``.
+    :param profil: profil de rééquilibrage et de scoring.
+    :param frais_bps: coût d'un déplacement de capital, en points de base.
+    """
+
+    def __init__(
+        self,
+        snapshots: Sequence[Tuple[float, List[Dict[str, Any]]]],
+        signaux: Sequence[Mapping[str, Any]] = (),
+        cfg: Optional[Mapping[str, Any]] = None,
+        *,
+        capital_usd: float = 10_000.0,
+        profil: str = "modere",
+        allocation_initiale: Optional[Mapping[str, float]] = None,
+        frais_bps: float = 0.0,
+    ) -> None:
+        self.snapshots = snapshots if isinstance(snapshots, Sequence) else list(snapshots)
+        self.fenetre = FenetreSignaux(signaux)
+        self.cfg: Dict[str, Any] = dict(cfg or {})
+        self.capital_usd = float(capital_usd)
+        self.profil = profil
+        repartition = dict(allocation_initiale or ALLOCATION_INITIALE)
+        total_rep = sum(repartition.values()) or 1.0
+        self.allocation = {cat: self.capital_usd * repartition.get(cat, 0.0) / total_rep for cat in CATEGORIES}
+        self.frais_bps = float(frais_bps)
+        self.horloge = HorlogeVirtuelle(self.snapshots[0][0] if self.snapshots else 0.0)
+        self.journal = JournalMemoire()
+        self.historique_pools = HistoriqueCompact()
+
+    def _profil_scoring(self) -> Dict[str, Any]:
+        base = charger_ponderations(self.profil)
+        return {
+            "nom": self.profil,
+            "ponderations": {"apr": float(base.get("apr", 0.0)), "tvl": float(base.get("tvl", 0.0))},
+            "historique_max_bonus": float(base.get("historique_max_bonus", 0.0)),
+            "historique_max_malus": float(base.get("historique_max_malus", 0.0)),
+        }
+
+    def executer(self) -> Dict[str, Any]:
+        debut_reel = time.perf_counter()
+        profil_scoring = self._profil_scoring()
+        params_reeq = self.cfg.get("rebalancing") if isinstance(self.cfg.get("rebalancing"), Mapping) else None
+        pnl = frais = turnover = 0.0
+        courbe: List[Tuple[str, float]] = []
+        sommet = self.capital_usd
+        drawdown_max = 0.0
+        contextes: Counter = Counter()
+        modes: Counter = Counter()
+        nb_reequilibrages = 0
+        dernier_contexte: Optional[str] = None
+        rendements: Dict[str, float] = {cat: 0.0 for cat in CATEGORIES}
+        table_exposition = self.cfg.get("exposure_table") if isinstance(self.cfg.get("exposure_table"), Mapping) else None
+        exposition = 1.0
+        exposition_cumulee = 0.0
+
+        for t, pools in self.snapshots:
+            # 1) Rendement de la période écoulée avec l'allocation en place
+            ecoule = self.horloge.avancer_jusqu_a(t)
+            if ecoule:
+                gain = exposition * sum(self.allocation[c] * rendements[c] * ecoule / SECONDES_PAR_AN for c in CATEGORIES)
+                total = sum(self.allocation.values())
+                if total > 0:
+                    for c in CATEGORIES:
+                        self.allocation[c] += gain * self.allocation[c] / total
+                pnl += gain
+            rendements = _rendement_annuel_par_categorie(pools)
+            run_id = _iso(t)
+
+            # 2) Contexte + policy (journal marché neutralisé)
+            signaux = self.fenetre.visibles(t)
+            decision, policy = calculer_contexte_et_policy(
+                pools, self.cfg, last_context=dernier_contexte, run_id=run_id, journal_path=os.devnull
+            )
+            dernier_contexte = decision.context
+            contextes[decision.context] += 1
+            exposition = min(1.0, exposure_factor(self.profil, decision.context, table_exposition))
+            exposition_cumulee += exposition
+            signaux_dicts = [dict(s) for s in signaux]
+
+            # 3) Mode global
+            mode = "NORMAL"
+            if determiner_mode_global_v5_5 is not None:
+                try:
+                    mode, _ = determiner_mode_global_v5_5(
+                        cfg=self.cfg, contexte=decision.context, signaux_normalises=signaux_dicts, etat={}
+                    )
+                except Exception as exc:  # même repli que le moteur temps réel
+                    logger.debug("mode global indisponible : %s", exc)
+            modes[mode] += 1
+
+            # 4) Scoring, historique des pools en mémoire
+            total = sum(self.allocation.values())
+            top3, gain_jour = calculer_scores_et_gains(
+                pools=[dict(p) for p in pools],
+                profil=profil_scoring,
+                solde=total,
+                historique_pools=self.historique_pools,
+            )
+            for nom, _apr, gain_pool in top3:
+                maj_historique(self.historique_pools, nom, gain_pool)
+
+            # 5) Plan de rééquilibrage (aucun journal disque)
+            plan = generer_plan_reequilibrage_contexte(
+                context_label=decision.context,
+                profil_actif=self.profil,
+                allocation_actuelle_usd=dict(self.allocation),
+                total_usd=total,
+                signaux_normalises=signaux_dicts,
+                params=dict(params_reeq) if params_reeq else None,
+                run_id=run_id,
+                journal_path=None,
+            )
+            volume = _appliquer_actions(self.allocation, plan.get("actions") or [])
+            if volume:
+                nb_reequilibrages += 1
+                cout = volume * self.frais_bps / 10_000
+                total_apres = sum(self.allocation.values())
+                if total_apres > 0:
+                    for c in CATEGORIES:
+                        self.allocation[c] -= cout * self.allocation[c] / total_apres
+                frais += cout
+                turnover += volume
+
+            valeur = sum(self.allocation.values())
+            sommet = max(sommet, valeur)
+            if sommet > 0:
+                drawdown_max = max(drawdown_max, (sommet - valeur) / sommet)
+            courbe.append((run_id, valeur))
+            self.journal.decisions.append(
+                {"run_id": run_id, "context": decision.context, "score": decision.score, "policy": dict(policy), "mode": mode,
+                 "exposition": exposition}
+            )
+            self.journal.plans.append(plan)
+            self.journal.snapshots.append(
+                {"run_id": run_id, "allocation_usd": dict(self.allocation), "top3": top3, "gain_jour_usd": gain_jour}
+            )
+
+        valeur_finale = sum(self.allocation.values())
+        duree_simulee = (self.snapshots[-1][0] - self.snapshots[0][0]) if self.snapshots else 0.0
+        capital_moyen = (self.capital_usd + valeur_finale) / 2 or 1.0
+        return {
+            "nb_etapes": len(self.snapshots),
+            "nb_signaux": len(self.fenetre),
+            "debut": _iso(self.snapshots[0][0]) if self.snapshots else None,
+            "fin": _iso(self.snapshots[-1][0]) if self.snapshots else None,
+            "duree_simulee_jours": duree_simulee / 86_400,
+            "duree_reelle_s": time.perf_counter() - debut_reel,
+            "capital_initial_usd": self.capital_usd,
+            "valeur_finale_usd": valeur_finale,
+            "pnl_usd": valeur_finale - self.capital_usd,
+            "rendement_pct": (valeur_finale / self.capital_usd - 1) * 100 if self.capital_usd else 0.0,
+            "rendement_brut_usd": pnl,
+            "frais_usd": frais,
+            "turnover_usd": turnover,
+            "turnover_ratio": turnover / capital_moyen,
+            "nb_reequilibrages": nb_reequilibrages,
+            "drawdown_max_pct": drawdown_max * 100,
+            "exposition_moyenne": exposition_cumulee / len(self.snapshots) if self.snapshots else 1.0,
+            "contextes": dict(contextes),
+            "modes": dict(modes),
+            "allocation_finale_usd": dict(self.allocation),
+            "courbe": courbe,
+        }
+
+
+__all__ = [
+    "Backtest",
+    "FenetreSignaux",
+    "HorlogeVirtuelle",
+    "JournalMemoire",
+    "charger_signaux",
+    "charger_snapshots",
+]
@@ -0,0 +1,141 @@
+# core/classement.py – V6.1.0
+"""
+Index de classement des pools (top-k incrémental).
+
+``StrategyEngine.select_candidates`` et ``core.scoring.calculer_scores_et_gains``
+triaient toute la liste de pools pour n'en garder que quelques-unes. Ce
+module fournit :
+
+- ``ClassementPools`` : tas binaire (max) indexé par clé de pool. La mise à
+  jour d'une pool est en O(log n) (l'ancienne entrée est invalidée
+  paresseusement, le tas est compacté quand les entrées périmées dominent) ;
+  ``top(k)`` explore le tas sans le modifier, en O(k log k) hors entrées
+  périmées, sans re-scorer les pools inchangées.
+- ``indices_top_k`` : même sélection sur une colonne NumPy (``PoolTable``),
+  par ``argpartition`` puis tri stable des seuls candidats.
+
+Dans les deux cas l'ordre est celui de ``sorted(..., reverse=True)`` : à clé
+égale, la pool de plus petit ``ordre`` (position d'origine) passe devant.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Entrée du tas : (clé de tri négée, ordre, séquence unique, clé, valeur)
+_Entree = Tuple[Tuple[float, ...], int, int, Hashable, Any]
+
+
+class ClassementPools:
+    """Classement décroissant de pools par clé de tri (tuple de flottants)."""
+
+    __slots__ = ("_tas", "_entrees", "_ordres", "_sequence", "_prochain_ordre")
+
+    def __init__(self) -> None:
+        self._tas: List[_Entree] = []
+        self._entrees: Dict[Hashable, _Entree] = {}
+        self._ordres: Dict[Hashable, int] = {}
+        self._sequence = itertools.count()
+        self._prochain_ordre = 0
+
+    @classmethod
+    def construire(cls, elements: Iterable[Tuple[Hashable, Sequence[float], Any]]) -> "ClassementPools":
+        """Construit l'index en O(n) (heapify) depuis des triplets (clé, clé de tri, valeur)."""
+        classement = cls()
+        for cle, cle_tri, valeur in elements:
+            classement._entrees[cle] = classement._entree(cle, cle_tri, valeur, None)
+        classement._tas = list(classement._entrees.values())
+        heapq.heapify(classement._tas)
+        return classement
+
+    def __len__(self) -> int:
+        return len(self._entrees)
+
+    def __contains__(self, cle: Hashable) -> bool:
+        return cle in self._entrees
+
+    def _entree(self, cle: Hashable, cle_tri: Sequence[float], valeur: Any, ordre: Optional[int]) -> _Entree:
+        if ordre is None:
+            ordre = self._ordres.get(cle)
+            if ordre is None:
+                ordre = self._prochain_ordre
+        self._ordres[cle] = ordre
+        self._prochain_ordre = max(self._prochain_ordre, ordre + 1)
+        return (tuple(-v for v in cle_tri), ordre, next(self._sequence), cle, valeur)
+
+    def mettre_a_jour(
+        self,
+        cle: Hashable,
+        cle_tri: Sequence[float],
+        valeur: Any = None,
+        ordre: Optional[int] = None,
+    ) -> None:
+        """Insère ou re-classe une pool ; ``ordre`` départage les égalités (défaut : ordre d'insertion)."""
+        entree = self._entree(cle, cle_tri, valeur, ordre)
+        self._entrees[cle] = entree
+        heapq.heappush(self._tas, entree)
+        if len(self._tas) > 2 * len(self._entrees) + 64:
+            self._compacter()
+
+    def retirer(self, cle: Hashable) -> None:
+        """Retire une pool du classement (sans effet si absente)."""
+        if self._entrees.pop(cle, None) is not None:
+            del self._ordres[cle]
+            if len(self._tas) > 2 * len(self._entrees) + 64:
+                self._compacter()
+
+    def _compacter(self) -> None:
+        self._tas = list(self._entrees.values())
+        heapq.heapify(self._tas)
+
+    def _top_entrees(self, k: int) -> List[_Entree]:
+        tas, entrees = self._tas, self._entrees
+        resultat: List[_Entree] = []
+        if k <= 0 or not tas:
+            return resultat
+        # Parcours du tas par niveau de priorité : seuls les enfants des
+        # entrées déjà extraites sont candidats.
+        frontiere: List[Tuple[_Entree, int]] = [(tas[0], 0)]
+        taille = len(tas)
+        while frontiere and len(resultat) < k:
+            entree, i = heapq.heappop(frontiere)
+            if entrees.get(entree[3]) is entree:
+                resultat.append(entree)
+            for j in (2 * i + 1, 2 * i + 2):
+                if j < taille:
+                    heapq.heappush(frontiere, (tas[j], j))
+        return resultat
+
+    def top(self, k: int) -> List[Any]:
+        """Valeurs des ``k`` meilleures pools, de la meilleure à la moins bonne."""
+        return [entree[4] for entree in self._top_entrees(k)]
+
+    def top_cles(self, k: int) -> List[Hashable]:
+        """Clés des ``k`` meilleures pools."""
+        return [entree[3] for entree in self._top_entrees(k)]
+
+
+def indices_top_k(valeurs: np.ndarray, k: int) -> np.ndarray:
+    """Indices des ``k`` plus grandes valeurs, ordre de ``argsort(-valeurs, kind="stable")[:k]``.
+
+    Seuls les éléments au moins égaux au k-ième sont triés ; une colonne
+    contenant des NaN dans le top-k retombe sur le tri complet.
+    """
+    valeurs = np.asarray(valeurs, dtype=float)
+    n = valeurs.size
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k >= n:
+        return np.argsort(-valeurs, kind="stable")
+    seuil = -np.partition(-valeurs, k - 1)[k - 1]
+    if np.isnan(seuil):
+        return np.argsort(-valeurs, kind="stable")[:k]
+    candidats = np.flatnonzero(valeurs >= seuil)
+    return candidats[np.argsort(-valeurs[candidats], kind="stable")[:k]]
+
+
+__all__ = ["ClassementPools", "indices_top_k"]
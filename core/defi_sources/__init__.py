@@ -1 +1,2 @@
 from . import defillama
+from . import flux_pools
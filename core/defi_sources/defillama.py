@@ -1,11 +1,36 @@
 # core/defi_sources/defillama.py
-# 🧩 Version : V3.2 – Alias get_pools_defillama + TVL fictif
+# 🧩 Version : V6.1.0 – Univers réel en flux (snapshot local ou HTTP)
 
-def recuperer_pools():
+import os
+
+# Snapshot local (.json) ou URL du payload « yields » DefiLlama
+ENV_SOURCE = "DEFIPILOT_POOLS_SOURCE"
+
+# Une ingestion par source : le snapshot précédent est gardé d'un appel à l'autre
+_INGESTIONS = {}
+
+
+def recuperer_pools(source=None, en_table=False):
     """
-    Simule la récupération de pools DeFi depuis DefiLlama.
-    Injecte une valeur fictive pour 'tvl_usd' afin de permettre la simulation.
+    Récupère les pools DeFi depuis DefiLlama.
+
+    Avec ``source`` (ou la variable DEFIPILOT_POOLS_SOURCE), le payload est lu
+    en flux par ``core.defi_sources.flux_pools`` (fichier local ou URL) et
+    comparé au snapshot de l'appel précédent sur la même source (diff journalisé).
+    Sinon, pools simulées avec une TVL fictive pour permettre la simulation.
+
+    Avec ``en_table=True``, renvoie une ``core.pool_table.PoolTable`` (colonnes
+    reprises de l'ingestion sans copie) au lieu d'une liste de dicts.
     """
+    source = source or os.environ.get(ENV_SOURCE)
+    if source:
+        table = ingerer_source(source).table
+        if en_table:
+            from core.pool_table import PoolTable
+
+            return PoolTable.depuis_table_flux(table)
+        return table.lignes()
+
     pools = [
         {
             "nom": "USDC-ETH",
@@ -34,8 +59,23 @@ def recuperer_pools():
     for pool in pools:
         pool["tvl_usd"] = 10000.0
 
+    if en_table:
+        from core.pool_table import PoolTable
+
+        return PoolTable.depuis_dicts(pools)
     return pools
 
 
+def ingerer_source(source):
+    """Ingère ``source`` avec l'``IngestionPools`` qui lui est associée (créée au premier appel)."""
+    from core.defi_sources.flux_pools import IngestionPools
+
+    cle = os.fspath(source)
+    ingestion = _INGESTIONS.get(cle)
+    if ingestion is None:
+        ingestion = _INGESTIONS[cle] = IngestionPools()
+    return ingestion.ingerer(source)
+
+
 # ✅ Alias attendu par main.py
 get_pools_defillama = recuperer_pools
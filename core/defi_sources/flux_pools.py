@@ -0,0 +1,478 @@
+# core/defi_sources/flux_pools.py – V6.1.0
+"""Ingestion en flux de l'univers de pools (payload « yields » DefiLlama).
+
+``defillama.recuperer_pools`` renvoyait trois pools fictives et l'ancienne
+version (v2.1) chargeait tout le payload avec ``response.json()`` avant de
+construire un dict par pool. Pour un univers de 15 000+ pools :
+
+- ``iterer_pools`` lit le JSON en flux (``ijson`` s'il est installé, sinon
+  un décodeur incrémental stdlib objet par objet) depuis un fichier local ou
+  une URL HTTP, sans charger le document entier ;
+- ``lire_table_pools`` ne garde que les champs utiles, rangés en colonnes
+  (``TablePools`` : listes d'identifiants + tableaux NumPy) ;
+- ``comparer_tables`` calcule les pools ajoutées, retirées et modifiées par
+  rapport au snapshot précédent ;
+- ``IngestionPools`` enchaîne le tout et ne repasse au scoring et aux
+  agrégats de signaux que les lignes ajoutées ou modifiées ; le scoring
+  lit directement les colonnes (``core.pool_table.PoolTable``).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import math
+import os
+import re
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:  # parseur en flux optionnel
+    import ijson
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    ijson = None
+
+logger = logging.getLogger(__name__)
+
+Source = Union[str, "os.PathLike[str]", BinaryIO]
+
+TAILLE_BLOC = 1 << 18
+TOLERANCE_RELATIVE = 1e-6
+# champ DefiLlama → colonne numérique
+COLONNES_NUMERIQUES: Dict[str, str] = {
+    "apy": "apr",
+    "apyBase": "apr_base",
+    "apyReward": "apr_reward",
+    "tvlUsd": "tvl_usd",
+    "volumeUsd1d": "volume_24h",
+}
+# champ DefiLlama → colonne texte
+COLONNES_TEXTE: Dict[str, str] = {
+    "project": "plateforme",
+    "symbol": "nom",
+    "chain": "chaine",
+}
+_DEBUT_DATA = re.compile(r'"data"\s*:\s*\[')
+
+
+# ---------------------------------------------------------------------------
+# Lecture en flux
+# ---------------------------------------------------------------------------
+def _ouvrir(source: Source, timeout: float) -> Tuple[BinaryIO, bool]:
+    """Flux binaire de la source ; le booléen indique s'il faut le fermer."""
+    if hasattr(source, "read"):
+        return source, False  # type: ignore[return-value]
+    texte = os.fspath(source)
+    if texte.startswith(("http://", "https://")):
+        return urllib.request.urlopen(texte, timeout=timeout), True
+    return open(texte, "rb"), True
+
+
+def _iterer_stdlib(flux: BinaryIO, taille_bloc: int) -> Iterator[Dict[str, Any]]:
+    """Objets du tableau ``data`` (ou du tableau racine) décodés un par un."""
+    lecteur = io.TextIOWrapper(flux, encoding="utf-8")
+    decodeur = json.JSONDecoder()
+    tampon = ""
+    pos = -1
+    fin_flux = False
+
+    def remplir() -> bool:
+        nonlocal tampon, fin_flux
+        morceau = lecteur.read(taille_bloc)
+        if not morceau:
+            fin_flux = True
+            return False
+        tampon += morceau
+        return True
+
+    # 1) début du tableau : clé "data" ou tableau racine
+    while pos < 0:
+        debut = tampon.lstrip()
+        if debut.startswith("["):
+            pos = len(tampon) - len(debut) + 1
+            break
+        trouve = _DEBUT_DATA.search(tampon)
+        if trouve:
+            pos = trouve.end()
+            break
+        if not remplir():
+            return
+
+    # 2) objets successifs
+    try:
+        while True:
+            while pos < len(tampon) and tampon[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(tampon):
+                if not remplir():
+                    raise ValueError("Tableau JSON de pools non terminé")
+                continue
+            if tampon[pos] == "]":
+                return
+            try:
+                obj, fin = decodeur.raw_decode(tampon, pos)
+            except json.JSONDecodeError:
+                if fin_flux or not remplir():
+                    raise
+                continue
+            pos = fin
+            if isinstance(obj, dict):
+                yield obj
+            if pos > taille_bloc:
+                tampon, pos = tampon[pos:], 0
+    finally:
+        lecteur.detach()
+
+
+def iterer_pools(
+    source: Source,
+    *,
+    taille_bloc: int = TAILLE_BLOC,
+    timeout: float = 30.0,
+    utiliser_ijson: Optional[bool] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Itère les pools brutes d'un payload ``{"data": [...]}`` ou d'un tableau JSON.
+
+    :param source: chemin local, URL ``http(s)://`` ou flux binaire ouvert.
+    :param utiliser_ijson: force (ou interdit) ``ijson`` ; par défaut il est
+        utilisé s'il est installé.
+    """
+    flux, fermer = _ouvrir(source, timeout)
+    try:
+        if ijson is not None and utiliser_ijson is not False:
+            debut = flux.peek(64)[:64].lstrip() if hasattr(flux, "peek") else b""
+            prefixe = "item" if debut.startswith(b"[") else "data.item"
+            yield from ijson.items(flux, prefixe, use_float=True)
+        else:
+            yield from _iterer_stdlib(flux, taille_bloc)
+    finally:
+        if fermer:
+            flux.close()
+
+
+# ---------------------------------------------------------------------------
+# Table en colonnes
+# ---------------------------------------------------------------------------
+def est_source_yields(source: Source, taille: int = 4096) -> bool:
+    """Vrai pour une URL ou un fichier dont le début est un payload ``{"data": [...]}``.
+
+    Les fichiers au format interne (liste de dicts ou clé ``pools``) n'ont pas
+    d'identifiant DefiLlama et ne passent pas par ``IngestionPools``.
+    """
+    texte = os.fspath(source)
+    if texte.startswith(("http://", "https://")):
+        return True
+    try:
+        with open(texte, "rb") as flux:
+            debut = flux.read(taille).decode("utf-8", errors="ignore")
+    except OSError:
+        return False
+    trouve = _DEBUT_DATA.search(debut)
+    if not debut.lstrip().startswith("{") or trouve is None:
+        return False
+    pools = re.search(r'"pools"\s*:', debut)
+    return pools is None or trouve.start() < pools.start()
+
+
+def _nombre(valeur: Any) -> float:
+    if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+        return float(valeur)
+    return math.nan
+
+
+@dataclass
+class TablePools:
+    """Univers de pools en colonnes (une ligne par pool)."""
+
+    ids: List[str]
+    textes: Dict[str, List[str]]
+    nombres: Dict[str, np.ndarray]
+    index: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        if not self.index:
+            self.index = {pool_id: i for i, pool_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def ligne(self, i: int) -> Dict[str, Any]:
+        """Ligne ``i`` au format pool du reste du code (``apr`` en %, ``tvl_usd``)."""
+        pool: Dict[str, Any] = {"id": self.ids[i]}
+        for nom, colonne in self.textes.items():
+            pool[nom] = colonne[i]
+        for nom, colonne in self.nombres.items():
+            valeur = float(colonne[i])
+            pool[nom] = 0.0 if math.isnan(valeur) else valeur
+        # clés attendues par core.market_signals et les simulateurs de farming
+        pool["tvl"] = pool.get("tvl_usd", 0.0)
+        pool["farming_apr"] = pool.get("apr_reward", 0.0)
+        pool["lp"] = "-" in pool.get("nom", "")
+        return pool
+
+    def lignes(self, ids: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        if ids is None:
+            return [self.ligne(i) for i in range(len(self))]
+        return [self.ligne(self.index[pool_id]) for pool_id in ids if pool_id in self.index]
+
+    def sauvegarder(self, chemin: str) -> None:
+        """Snapshot compressé ``.npz`` (sans pickle)."""
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        tableaux = {"ids": np.array(self.ids, dtype=str)}
+        tableaux.update({f"t_{nom}": np.array(col, dtype=str) for nom, col in self.textes.items()})
+        tableaux.update({f"n_{nom}": col for nom, col in self.nombres.items()})
+        temporaire = chemin + ".tmp.npz"
+        np.savez_compressed(temporaire, **tableaux)
+        os.replace(temporaire, chemin)
+
+    @classmethod
+    def charger(cls, chemin: str) -> Optional["TablePools"]:
+        try:
+            with np.load(chemin, allow_pickle=False) as donnees:
+                ids = donnees["ids"].tolist()
+                textes = {k[2:]: donnees[k].tolist() for k in donnees.files if k.startswith("t_")}
+                nombres = {k[2:]: donnees[k] for k in donnees.files if k.startswith("n_")}
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning("Snapshot de pools illisible %s : %s", chemin, exc)
+            return None
+        return cls(ids=ids, textes=textes, nombres=nombres)
+
+
+def _identifiant(brut: Mapping[str, Any]) -> Optional[str]:
+    pool_id = brut.get("pool")
+    if pool_id:
+        return str(pool_id)
+    projet, symbole = brut.get("project"), brut.get("symbol")
+    if projet or symbole:
+        return f"{projet or ''}-{symbole or ''}-{brut.get('chain') or ''}"
+    return None
+
+
+def lire_table_pools(source: Source, **options: Any) -> TablePools:
+    """Construit la ``TablePools`` d'une source en ne projetant que les champs utiles."""
+    ids: List[str] = []
+    textes: Dict[str, List[str]] = {nom: [] for nom in COLONNES_TEXTE.values()}
+    nombres: Dict[str, List[float]] = {nom: [] for nom in COLONNES_NUMERIQUES.values()}
+    vus: Dict[str, int] = {}
+    for brut in iterer_pools(source, **options):
+        pool_id = _identifiant(brut)
+        if pool_id is None:
+            continue
+        if pool_id in vus:  # doublon : la dernière occurrence l'emporte
+            i = vus[pool_id]
+            for cle, nom in COLONNES_TEXTE.items():
+                textes[nom][i] = str(brut.get(cle) or "")
+            for cle, nom in COLONNES_NUMERIQUES.items():
+                nombres[nom][i] = _nombre(brut.get(cle))
+            continue
+        vus[pool_id] = len(ids)
+        ids.append(pool_id)
+        for cle, nom in COLONNES_TEXTE.items():
+            textes[nom].append(str(brut.get(cle) or ""))
+        for cle, nom in COLONNES_NUMERIQUES.items():
+            nombres[nom].append(_nombre(brut.get(cle)))
+    return TablePools(
+        ids=ids,
+        textes=textes,
+        nombres={nom: np.asarray(valeurs, dtype=np.float64) for nom, valeurs in nombres.items()},
+        index=vus,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Diff entre snapshots
+# ---------------------------------------------------------------------------
+@dataclass
+class DiffPools:
+    ajoutes: List[str]
+    retires: List[str]
+    modifies: List[str]
+
+    @property
+    def a_traiter(self) -> List[str]:
+        """Pools à repasser au scoring / aux signaux (ajoutées puis modifiées)."""
+        return self.ajoutes + self.modifies
+
+    def __bool__(self) -> bool:
+        return bool(self.ajoutes or self.retires or self.modifies)
+
+    def resume(self) -> Dict[str, int]:
+        return {"ajoutes": len(self.ajoutes), "retires": len(self.retires), "modifies": len(self.modifies)}
+
+
+def comparer_tables(
+    ancienne: Optional[TablePools],
+    nouvelle: TablePools,
+    tolerance: float = TOLERANCE_RELATIVE,
+) -> DiffPools:
+    """Pools ajoutées, retirées et modifiées (écart relatif > ``tolerance``)."""
+    if ancienne is None or not len(ancienne):
+        return DiffPools(ajoutes=list(nouvelle.ids), retires=[], modifies=[])
+    ajoutes = [pool_id for pool_id in nouvelle.ids if pool_id not in ancienne.index]
+    retires = [pool_id for pool_id in ancienne.ids if pool_id not in nouvelle.index]
+
+    communs_nouveaux = np.fromiter(
+        (i for i, pool_id in enumerate(nouvelle.ids) if pool_id in ancienne.index), dtype=np.int64
+    )
+    communs_anciens = np.fromiter(
+        (ancienne.index[nouvelle.ids[i]] for i in communs_nouveaux), dtype=np.int64, count=len(communs_nouveaux)
+    )
+    change = np.zeros(len(communs_nouveaux), dtype=bool)
+    for nom, colonne in nouvelle.nombres.items():
+        avant = ancienne.nombres.get(nom)
+        if avant is None:
+            continue
+        a, b = avant[communs_anciens], colonne[communs_nouveaux]
+        egal = np.isclose(a, b, rtol=tolerance, atol=0.0) | (np.isnan(a) & np.isnan(b))
+        change |= ~egal
+    for nom, colonne in nouvelle.textes.items():
+        avant = ancienne.textes.get(nom)
+        if avant is None:
+            continue
+        change |= np.fromiter(
+            (avant[j] != colonne[i] for i, j in zip(communs_nouveaux, communs_anciens)),
+            dtype=bool,
+            count=len(communs_nouveaux),
+        )
+    modifies = [nouvelle.ids[i] for i in communs_nouveaux[change]]
+    return DiffPools(ajoutes=ajoutes, retires=retires, modifies=modifies)
+
+
+# ---------------------------------------------------------------------------
+# Agrégats de signaux maintenus par différence
+# ---------------------------------------------------------------------------
+class AgregatsMarche:
+    """Sommes des métriques de ``core.market_signals.detect_market_context``.
+
+    Mises à jour ligne par ligne (retrait de l'ancienne valeur, ajout de la
+    nouvelle) : seules les pools modifiées sont parcourues.
+    """
+
+    def __init__(self) -> None:
+        self.nb_apr = 0
+        self.somme_apr = 0.0
+        self.somme_carres_apr = 0.0
+        self.tvl_sum = 0.0
+        self.volume_sum = 0.0
+
+    def _appliquer(self, pool: Mapping[str, Any], signe: int) -> None:
+        apr = pool.get("apr", 0.0)
+        if apr > 0:
+            self.nb_apr += signe
+            self.somme_apr += signe * apr
+            self.somme_carres_apr += signe * apr * apr
+        if pool.get("tvl", 0.0) > 0:
+            self.tvl_sum += signe * pool["tvl"]
+        if pool.get("volume_24h", 0.0) > 0:
+            self.volume_sum += signe * pool["volume_24h"]
+
+    def ajouter(self, pool: Mapping[str, Any]) -> None:
+        self._appliquer(pool, 1)
+
+    def retirer(self, pool: Mapping[str, Any]) -> None:
+        self._appliquer(pool, -1)
+
+    def metriques(self) -> Dict[str, float]:
+        """``apr_mean``, ``volume_sum``, ``tvl_sum`` et ``volatility_cv`` (mêmes définitions)."""
+        n = self.nb_apr
+        moyenne = self.somme_apr / n if n else 0.0
+        cv = 0.0
+        if n >= 2 and moyenne > 0:
+            variance = max(self.somme_carres_apr - n * moyenne * moyenne, 0.0) / (n - 1)
+            cv = math.sqrt(variance) / moyenne
+        return {"apr_mean": moyenne, "volume_sum": self.volume_sum, "tvl_sum": self.tvl_sum, "volatility_cv": cv}
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+@dataclass
+class ResultatIngestion:
+    table: TablePools
+    diff: DiffPools
+    pools_traitees: List[Dict[str, Any]]
+    metriques: Dict[str, float]
+
+
+class IngestionPools:
+    """Ingestion répétée de l'univers de pools, traitée par différence.
+
+    :param chemin_snapshot: ``.npz`` du snapshot précédent (relu au démarrage,
+        réécrit après chaque ingestion) ; None pour rester en mémoire.
+    :param profil: profil de scoring (``core.scoring.charger_profil_utilisateur``) ;
+        None pour ne pas scorer.
+    """
+
+    def __init__(
+        self,
+        chemin_snapshot: Optional[str] = None,
+        profil: Optional[Mapping[str, Any]] = None,
+        historique_pools: Any = None,
+        tolerance: float = TOLERANCE_RELATIVE,
+    ) -> None:
+        self.chemin_snapshot = chemin_snapshot
+        self.profil = profil
+        self.historique_pools = historique_pools
+        self.tolerance = tolerance
+        self.table: Optional[TablePools] = TablePools.charger(chemin_snapshot) if chemin_snapshot and os.path.exists(chemin_snapshot) else None
+        self.scores: Dict[str, float] = {}
+        self.agregats = AgregatsMarche()
+        if self.table is not None:
+            for pool in self.table.lignes():
+                self.agregats.ajouter(pool)
+            if self.profil is not None:
+                self._scorer(self.table, self.table.ids)
+
+    def _scorer(self, table: TablePools, ids: Sequence[str]) -> None:
+        from core.pool_table import PoolTable
+        from core.scoring import calculer_scores
+
+        if not ids:
+            return
+        lignes = PoolTable.depuis_table_flux(table).extraire([table.index[pool_id] for pool_id in ids])
+        calculer_scores(lignes, self.profil["ponderations"], self.historique_pools, self.profil)
+        self.scores.update(zip(lignes.colonne("pool_id"), lignes.colonne("score").tolist()))
+
+    def ingerer(self, source: Source, **options: Any) -> ResultatIngestion:
+        """Lit la source, calcule le diff et ne retraite que les lignes changées."""
+        nouvelle = lire_table_pools(source, **options)
+        ancienne = self.table
+        diff = comparer_tables(ancienne, nouvelle, self.tolerance)
+
+        if ancienne is not None:
+            for pool in ancienne.lignes(diff.retires + diff.modifies):
+                self.agregats.retirer(pool)
+        pools = nouvelle.lignes(diff.a_traiter)
+        for pool in pools:
+            self.agregats.ajouter(pool)
+        for pool_id in diff.retires:
+            self.scores.pop(pool_id, None)
+        if self.profil is not None:
+            self._scorer(nouvelle, diff.a_traiter)
+            for pool in pools:
+                pool["score"] = self.scores[pool["id"]]
+
+        self.table = nouvelle
+        if self.chemin_snapshot:
+            nouvelle.sauvegarder(self.chemin_snapshot)
+        logger.info("Univers de pools : %d pools, diff %s", len(nouvelle), diff.resume())
+        return ResultatIngestion(table=nouvelle, diff=diff, pools_traitees=pools, metriques=self.agregats.metriques())
+
+
+__all__ = [
+    "AgregatsMarche",
+    "DiffPools",
+    "IngestionPools",
+    "ResultatIngestion",
+    "TablePools",
+    "comparer_tables",
+    "est_source_yields",
+    "iterer_pools",
+    "lire_table_pools",
+]
@@ -0,0 +1,492 @@
+# core/defi_sources/multi_sources.py – V6.1.0
+"""Collecte concurrente des pools depuis plusieurs sources.
+
+``StrategyEngine`` définit le protocole ``PoolSource`` mais seule une source
+vide l'implémentait, et ``core.defi_sources`` ne connaissait qu'une source
+synchrone. ``CollecteurPools`` implémente ``PoolSource`` au-dessus de
+plusieurs sources interrogées en parallèle (``asyncio.gather``) :
+
+- ``SourceRest`` : API REST type DefiLlama (payload lu en flux par
+  ``flux_pools``) ;
+- ``SourceGraphQL`` : subgraph type Uniswap (requête POST GraphQL) ;
+- ``SourceReserves`` : réserves on-chain des paires (``getReserves`` groupés
+  dans un seul batch JSON-RPC).
+
+Chaque source a son worker, son cache TTL, ses requêtes conditionnelles (``ETag`` /
+``If-Modified-Since`` → 304 sans corps), son timeout et son disjoncteur : après
+``seuil_echecs`` échecs consécutifs elle n'est plus interrogée pendant
+``delai_reouverture_s`` et sert son dernier résultat connu. Les candidats sont
+fusionnés et dédupliqués (même chaîne, plateforme et paire de symboles).
+Le temps d'un rafraîchissement est celui de la source la plus lente.
+
+Un appel bloqué au-delà du timeout ne peut pas être interrompu : il garde le
+worker de sa source, jamais celui d'une autre, et tant qu'il n'est pas terminé
+la source n'est pas réinterrogée (échec compté, dernier résultat servi).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from threading import Lock
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from core.strategy_engine import PoolCandidate
+
+logger = logging.getLogger(__name__)
+
+TTL_DEFAUT_S = 300.0
+TIMEOUT_DEFAUT_S = 10.0
+SELECTEUR_GET_RESERVES = "0x0902f1ac"
+_SEPARATEURS_SYMBOLES = re.compile(r"[-/_ ]+")
+
+
+# ---------------------------------------------------------------------------
+# Disjoncteur
+# ---------------------------------------------------------------------------
+class Disjoncteur:
+    """Coupe une source après ``seuil_echecs`` échecs consécutifs.
+
+    Ouvert, il refuse les appels pendant ``delai_reouverture_s`` puis laisse
+    passer un essai (semi-ouvert) : un succès le referme, un échec le rouvre.
+    """
+
+    def __init__(self, seuil_echecs: int = 3, delai_reouverture_s: float = 30.0) -> None:
+        self.seuil_echecs = max(int(seuil_echecs), 1)
+        self.delai_reouverture_s = float(delai_reouverture_s)
+        self.echecs = 0
+        self._ouvert_depuis: Optional[float] = None
+        self._lock = Lock()
+
+    @property
+    def etat(self) -> str:
+        with self._lock:
+            if self._ouvert_depuis is None:
+                return "ferme"
+            if time.monotonic() - self._ouvert_depuis >= self.delai_reouverture_s:
+                return "semi-ouvert"
+            return "ouvert"
+
+    def autorise(self) -> bool:
+        return self.etat != "ouvert"
+
+    def succes(self) -> None:
+        with self._lock:
+            self.echecs = 0
+            self._ouvert_depuis = None
+
+    def echec(self) -> None:
+        with self._lock:
+            self.echecs += 1
+            if self.echecs >= self.seuil_echecs:
+                self._ouvert_depuis = time.monotonic()
+
+
+# ---------------------------------------------------------------------------
+# HTTP
+# ---------------------------------------------------------------------------
+@dataclass
+class ReponseHttp:
+    statut: int
+    entetes: Dict[str, str]
+    corps: bytes
+
+
+def requete_http(
+    url: str,
+    *,
+    corps: Optional[bytes] = None,
+    entetes: Optional[Mapping[str, str]] = None,
+    timeout: float = TIMEOUT_DEFAUT_S,
+) -> ReponseHttp:
+    """GET (ou POST si ``corps``) ; un 304 est retourné comme réponse, pas comme erreur."""
+    requete = urllib.request.Request(url, data=corps, headers=dict(entetes or {}))
+    try:
+        with urllib.request.urlopen(requete, timeout=timeout) as reponse:
+            return ReponseHttp(reponse.status, dict(reponse.headers.items()), reponse.read())
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304:
+            return ReponseHttp(304, dict(exc.headers.items()), b"")
+        raise
+
+
+# ---------------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------------
+@dataclass
+class EtatSource:
+    """Dernier résultat d'une source et validateurs HTTP associés."""
+
+    candidats: List[PoolCandidate] = field(default_factory=list)
+    expire_a: float = 0.0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    dernier_statut: str = "jamais"
+    duree_s: float = 0.0
+
+
+class SourcePools:
+    """Source de pools avec cache TTL, timeout et disjoncteur.
+
+    Les sous-classes implémentent ``_recuperer(etat)`` (appel bloquant,
+    exécuté sur le worker dédié de la source) qui retourne
+    ``(candidats, etag, last_modified)`` ou ``None`` si la ressource n'a pas
+    changé (HTTP 304). Le timeout court à partir du démarrage effectif de l'appel.
+    """
+
+    def __init__(
+        self,
+        nom: str,
+        *,
+        ttl_s: float = TTL_DEFAUT_S,
+        timeout_s: float = TIMEOUT_DEFAUT_S,
+        disjoncteur: Optional[Disjoncteur] = None,
+    ) -> None:
+        self.nom = nom
+        self.ttl_s = float(ttl_s)
+        self.timeout_s = float(timeout_s)
+        self.disjoncteur = disjoncteur or Disjoncteur()
+        self.etat = EtatSource()
+        self.nb_appels = 0
+        self._executeur: Optional[ThreadPoolExecutor] = None
+        self._en_cours: Optional[Future] = None
+
+    def _recuperer(self, etat: EtatSource) -> Optional[Tuple[List[PoolCandidate], Optional[str], Optional[str]]]:
+        raise NotImplementedError
+
+    def _entetes_conditionnels(self) -> Dict[str, str]:
+        entetes = {"Accept": "application/json"}
+        if self.etat.etag:
+            entetes["If-None-Match"] = self.etat.etag
+        if self.etat.last_modified:
+            entetes["If-Modified-Since"] = self.etat.last_modified
+        return entetes
+
+    async def _appeler(self) -> Any:
+        """``_recuperer`` sur le worker de la source, borné par ``timeout_s`` une fois démarré."""
+        if self._executeur is None:
+            self._executeur = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"pool-source-{self.nom}")
+        boucle = asyncio.get_running_loop()
+        demarre = asyncio.Event()
+
+        def appel():
+            try:
+                boucle.call_soon_threadsafe(demarre.set)
+            except RuntimeError:  # collecte annulée, boucle fermée
+                pass
+            return self._recuperer(self.etat)
+
+        self._en_cours = self._executeur.submit(appel)
+        await demarre.wait()
+        return await asyncio.wait_for(asyncio.wrap_future(self._en_cours), self.timeout_s)
+
+    async def collecter(self, forcer: bool = False) -> List[PoolCandidate]:
+        """Candidats de la source (cache si frais, dernier résultat connu en cas d'échec)."""
+        maintenant = time.monotonic()
+        if not forcer and maintenant < self.etat.expire_a:
+            self.etat.dernier_statut = "cache"
+            return self.etat.candidats
+        if not self.disjoncteur.autorise():
+            self.etat.dernier_statut = "disjoncte"
+            return self.etat.candidats
+
+        self.nb_appels += 1
+        if self._en_cours is not None and not self._en_cours.done():
+            # appel précédent toujours bloqué : pas de second appel sur le worker
+            self.disjoncteur.echec()
+            self.etat.dernier_statut = "en_cours"
+            logger.warning("Source %s toujours bloquée sur l'appel précédent", self.nom)
+            return self.etat.candidats
+
+        debut = time.perf_counter()
+        try:
+            resultat = await self._appeler()
+        except Exception as exc:  # timeout, réseau, format : la source est ignorée
+            self.disjoncteur.echec()
+            self.etat.dernier_statut = "timeout" if isinstance(exc, asyncio.TimeoutError) else "erreur"
+            self.etat.duree_s = time.perf_counter() - debut
+            logger.warning("Source %s en échec (%s) : %s", self.nom, self.etat.dernier_statut, exc)
+            return self.etat.candidats
+
+        self.disjoncteur.succes()
+        self.etat.duree_s = time.perf_counter() - debut
+        self.etat.expire_a = time.monotonic() + self.ttl_s
+        if resultat is None:
+            self.etat.dernier_statut = "inchange"
+        else:
+            self.etat.candidats, etag, last_modified = resultat
+            self.etat.etag = etag or None
+            self.etat.last_modified = last_modified or None
+            self.etat.dernier_statut = "ok"
+        return self.etat.candidats
+
+    def fermer(self) -> None:
+        """Libère le worker (un appel bloqué se termine en arrière-plan)."""
+        if self._executeur is not None:
+            self._executeur.shutdown(wait=False)
+            self._executeur = None
+
+
+class SourceRest(SourcePools):
+    """API REST renvoyant un payload ``{"data": [...]}`` type DefiLlama yields."""
+
+    def __init__(self, nom: str, url: str, **options: Any) -> None:
+        super().__init__(nom, **options)
+        self.url = url
+
+    def _recuperer(self, etat: EtatSource):
+        from core.defi_sources.flux_pools import lire_table_pools
+
+        requete = urllib.request.Request(self.url, headers=self._entetes_conditionnels())
+        try:
+            with urllib.request.urlopen(requete, timeout=self.timeout_s) as reponse:
+                entetes = dict(reponse.headers.items())
+                table = lire_table_pools(reponse)  # corps lu en flux, sans copie intégrale
+        except urllib.error.HTTPError as exc:
+            if exc.code == 304:
+                return None
+            raise
+        candidats = []
+        for pool in table.lignes():
+            candidats.append(
+                PoolCandidate(
+                    pool_id=pool["id"],
+                    platform=pool["plateforme"],
+                    chain=pool["chaine"],
+                    symbols=pool["nom"],
+                    tvl=pool["tvl_usd"],
+                    apr=pool["apr"],
+                    metadata={"source": self.nom, "volume_24h": pool["volume_24h"]},
+                )
+            )
+        return candidats, entetes.get("ETag"), entetes.get("Last-Modified")
+
+
+def _candidat_graphql(brut: Mapping[str, Any], source: str, plateforme: str, chaine: str) -> Optional[PoolCandidate]:
+    """Pool de subgraph type Uniswap → candidat (APR estimé des frais sur 24 h si absent)."""
+    pool_id = brut.get("id")
+    if not pool_id:
+        return None
+    symboles = brut.get("symbol")
+    if not symboles and isinstance(brut.get("token0"), Mapping) and isinstance(brut.get("token1"), Mapping):
+        symboles = f"{brut['token0'].get('symbol', '')}-{brut['token1'].get('symbol', '')}"
+    tvl = float(brut.get("totalValueLockedUSD") or brut.get("tvlUsd") or 0.0)
+    apr = brut.get("apr")
+    if apr is None:
+        frais_24h = float(brut.get("feesUSD") or 0.0)
+        if not frais_24h and brut.get("volumeUSD") is not None and brut.get("feeTier") is not None:
+            frais_24h = float(brut["volumeUSD"]) * float(brut["feeTier"]) / 1e6
+        apr = frais_24h * 365 / tvl * 100 if tvl > 0 else 0.0
+    return PoolCandidate(
+        pool_id=str(pool_id),
+        platform=str(brut.get("dex") or plateforme),
+        chain=str(brut.get("chain") or chaine),
+        symbols=str(symboles or ""),
+        tvl=tvl,
+        apr=float(apr),
+        metadata={"source": source},
+    )
+
+
+class SourceGraphQL(SourcePools):
+    """Subgraph GraphQL : les pools sont lues dans ``data.<champ>``."""
+
+    def __init__(
+        self,
+        nom: str,
+        url: str,
+        requete: str,
+        *,
+        champ: str = "pools",
+        plateforme: str = "",
+        chaine: str = "",
+        variables: Optional[Mapping[str, Any]] = None,
+        **options: Any,
+    ) -> None:
+        super().__init__(nom, **options)
+        self.url = url
+        self.requete = requete
+        self.champ = champ
+        self.plateforme = plateforme
+        self.chaine = chaine
+        self.variables = dict(variables or {})
+
+    def _recuperer(self, etat: EtatSource):
+        corps = json.dumps({"query": self.requete, "variables": self.variables}).encode("utf-8")
+        entetes = self._entetes_conditionnels()
+        entetes["Content-Type"] = "application/json"
+        reponse = requete_http(self.url, corps=corps, entetes=entetes, timeout=self.timeout_s)
+        if reponse.statut == 304:
+            return None
+        donnees = json.loads(reponse.corps)
+        if donnees.get("errors"):
+            raise ValueError(f"Erreur GraphQL : {donnees['errors']}")
+        bruts = (donnees.get("data") or {}).get(self.champ) or []
+        candidats = [c for c in (_candidat_graphql(b, self.nom, self.plateforme, self.chaine) for b in bruts) if c]
+        return candidats, reponse.entetes.get("ETag"), reponse.entetes.get("Last-Modified")
+
+
+class SourceReserves(SourcePools):
+    """Réserves on-chain de paires UniswapV2 via un batch JSON-RPC ``eth_call``.
+
+    Chaque paire : ``adresse``, ``plateforme``, ``chaine``, ``symboles``,
+    ``prix0_usd``, ``prix1_usd`` et optionnellement ``decimales0/1`` et ``apr``.
+    """
+
+    def __init__(self, nom: str, rpc_url: str, paires: Sequence[Mapping[str, Any]], **options: Any) -> None:
+        super().__init__(nom, **options)
+        self.rpc_url = rpc_url
+        self.paires = [dict(p) for p in paires]
+
+    def _recuperer(self, etat: EtatSource):
+        lot = [
+            {
+                "jsonrpc": "2.0",
+                "id": i,
+                "method": "eth_call",
+                "params": [{"to": paire["adresse"], "data": SELECTEUR_GET_RESERVES}, "latest"],
+            }
+            for i, paire in enumerate(self.paires)
+        ]
+        reponse = requete_http(
+            self.rpc_url,
+            corps=json.dumps(lot).encode("utf-8"),
+            entetes={"Content-Type": "application/json"},
+            timeout=self.timeout_s,
+        )
+        resultats = {r.get("id"): r for r in json.loads(reponse.corps)}
+        candidats = []
+        for i, paire in enumerate(self.paires):
+            brut = (resultats.get(i) or {}).get("result")
+            if not isinstance(brut, str) or len(brut) < 2 + 128:
+                logger.warning("Réserves illisibles pour %s", paire.get("adresse"))
+                continue
+            r0, r1 = int(brut[2:66], 16), int(brut[66:130], 16)
+            tvl = (
+                r0 / 10 ** int(paire.get("decimales0", 18)) * float(paire.get("prix0_usd", 0.0))
+                + r1 / 10 ** int(paire.get("decimales1", 18)) * float(paire.get("prix1_usd", 0.0))
+            )
+            candidats.append(
+                PoolCandidate(
+                    pool_id=str(paire["adresse"]).lower(),
+                    platform=str(paire.get("plateforme", "")),
+                    chain=str(paire.get("chaine", "")),
+                    symbols=str(paire.get("symboles", "")),
+                    tvl=tvl,
+                    apr=float(paire.get("apr", 0.0)),
+                    metadata={"source": self.nom, "reserves": [r0, r1]},
+                )
+            )
+        return candidats, None, None
+
+
+# ---------------------------------------------------------------------------
+# Fusion
+# ---------------------------------------------------------------------------
+def cle_candidat(candidat: PoolCandidate) -> Tuple[str, str, Tuple[str, ...]]:
+    """Clé de déduplication : chaîne, plateforme et symboles (ordre indifférent)."""
+    symboles = tuple(sorted(s for s in _SEPARATEURS_SYMBOLES.split(candidat.symbols.upper()) if s))
+    return candidat.chain.strip().lower(), candidat.platform.strip().lower(), symboles
+
+
+def fusionner_candidats(listes: Sequence[Sequence[PoolCandidate]]) -> List[PoolCandidate]:
+    """Fusionne les listes par ordre de priorité des sources.
+
+    Le premier candidat rencontré pour une clé est conservé ; une TVL ou un
+    APR nul est complété par une source suivante et ``metadata["sources"]``
+    liste toutes les sources qui ont vu la pool.
+    """
+    fusion: Dict[Tuple[str, str, Tuple[str, ...]], PoolCandidate] = {}
+    for candidats in listes:
+        for candidat in candidats:
+            cle = cle_candidat(candidat)
+            source = (candidat.metadata or {}).get("source")
+            existant = fusion.get(cle)
+            if existant is None:
+                metadata = dict(candidat.metadata or {})
+                metadata["sources"] = [source] if source else []
+                fusion[cle] = replace(candidat, metadata=metadata)
+                continue
+            if not existant.tvl and candidat.tvl:
+                existant.tvl = candidat.tvl
+            if not existant.apr and candidat.apr:
+                existant.apr = candidat.apr
+            if source and source not in existant.metadata["sources"]:
+                existant.metadata["sources"].append(source)
+    return list(fusion.values())
+
+
+class CollecteurPools:
+    """``PoolSource`` multi-sources : collecte concurrente puis fusion dédupliquée.
+
+    :param sources: sources par ordre de priorité (la première gagne en cas de doublon).
+    """
+
+    def __init__(self, sources: Sequence[SourcePools]) -> None:
+        self.sources = list(sources)
+        self.derniere_duree_s = 0.0
+
+    async def collecter(self, forcer: bool = False) -> List[PoolCandidate]:
+        debut = time.perf_counter()
+        listes = await asyncio.gather(*(s.collecter(forcer) for s in self.sources))
+        self.derniere_duree_s = time.perf_counter() - debut
+        return fusionner_candidats(listes)
+
+    def list_pools(self) -> List[PoolCandidate]:
+        """Interface ``PoolSource`` (synchrone) ; à ne pas appeler depuis une boucle asyncio active."""
+        return asyncio.run(self.collecter())
+
+    def rapport(self) -> Dict[str, Dict[str, Any]]:
+        """Statut, durée, nombre de candidats et état du disjoncteur par source."""
+        return {
+            s.nom: {
+                "statut": s.etat.dernier_statut,
+                "duree_s": round(s.etat.duree_s, 4),
+                "nb": len(s.etat.candidats),
+                "disjoncteur": s.disjoncteur.etat,
+            }
+            for s in self.sources
+        }
+
+    def fermer(self) -> None:
+        for source in self.sources:
+            source.fermer()
+
+    @classmethod
+    def depuis_config(cls, cfg: Mapping[str, Any]) -> "CollecteurPools":
+        """Construit les sources de la section ``pool_sources`` (liste de dicts avec ``type``)."""
+        fabriques: Dict[str, Callable[..., SourcePools]] = {
+            "rest": SourceRest,
+            "graphql": SourceGraphQL,
+            "reserves": SourceReserves,
+        }
+        sources: List[SourcePools] = []
+        for i, entree in enumerate(cfg.get("pool_sources") or []):
+            options = dict(entree)
+            type_source = options.pop("type", None)
+            if type_source not in fabriques:
+                raise ValueError(f"pool_sources[{i}] : type inconnu {type_source!r}")
+            seuil = options.pop("seuil_echecs", 3)
+            delai = options.pop("delai_reouverture_s", 30.0)
+            options.setdefault("nom", f"{type_source}-{i}")
+            sources.append(fabriques[type_source](disjoncteur=Disjoncteur(seuil, delai), **options))
+        return cls(sources)
+
+
+__all__ = [
+    "CollecteurPools",
+    "Disjoncteur",
+    "SourceGraphQL",
+    "SourcePools",
+    "SourceReserves",
+    "SourceRest",
+    "cle_candidat",
+    "fusionner_candidats",
+]
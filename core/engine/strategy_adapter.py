@@ -16,8 +16,8 @@ from core.market_signals import (
     detect_market_context,
     get_allocation_policy_for_context,
     journaliser_signaux,
-    load_params_from_config,
 )
+from core.policy_tables import TablesPolitique, tables_pour_config
 
 
 __all__ = ["calculer_contexte_et_policy"]
@@ -239,18 +239,13 @@ def calculer_contexte_et_policy(
     pools_valides = _ensure_list_of_dicts(pools_stats)
     cfg_valide = _ensure_dict(cfg)
 
-    params: MarketParams | Mapping[str, Any] | None = None
+    params: MarketParams | None = None
+    tables: TablesPolitique | None = None
     strategy_cfg = _ensure_dict(cfg_valide.get("strategy"))
     try:
-        params = load_params_from_config(strategy_cfg)
-    except TypeError:
-        try:
-            params = load_params_from_config(strategy_cfg, cfg_valide)
-        except TypeError:
-            try:
-                params = load_params_from_config(cfg_valide)
-            except Exception:
-                params = None
+        # Compilé une fois par version de la section ``strategy`` (core.policy_tables)
+        tables = tables_pour_config(strategy_cfg)
+        params = tables.params
     except Exception:
         params = None
 
@@ -302,23 +297,10 @@ def calculer_contexte_et_policy(
 
     context, score, metrics = _normalize_decision(raw_decision)
 
-    def _obtenir_policy() -> Mapping[str, Any] | Iterable[tuple[str, Any]]:
-        try:
-            return get_allocation_policy_for_context(context, params)
-        except TypeError:
-            pass
-        try:
-            return get_allocation_policy_for_context(context=context, params=params)
-        except TypeError:
-            pass
-        try:
-            return get_allocation_policy_for_context(context)
-        except TypeError:
-            pass
-        return get_allocation_policy_for_context(context=context)
-
     try:
-        policy_initiale = _obtenir_policy()
+        policy_initiale = (
+            tables.policy(context) if tables is not None else get_allocation_policy_for_context(context)
+        )
     except Exception:
         policy_initiale = {}
 
@@ -7,7 +7,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Tuple, Optional
 
-from .sync_guard import acquire_lock, release_lock, safe_read_jsonl
+from .signal_bus import ajouter_jsonl, dernier_jsonl
+from .sync_guard import safe_read_jsonl
 
 def now_iso_z() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
@@ -59,28 +60,30 @@ def validate_exchange_payload(obj: Any) -> Tuple[bool, List[str]]:
         errors.append("metrics must be dict")
     return (len(errors) == 0), errors
 
-def write_exchange_payload(path: str | Path, payload: Dict[str, Any]) -> None:
-    out = Path(path)
-    try:
-        out.parent.mkdir(parents=True, exist_ok=True)
-    except OSError:
-        pass
+def sign_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Ajoute (si absente) la signature d'intégrité au payload et le retourne."""
     integrity = payload.get("integrity")
     if not isinstance(integrity, dict):
         integrity = {}
     if "signature" not in integrity:
         integrity["signature"] = compute_signature(payload)
     payload["integrity"] = integrity
-    locked = acquire_lock(out, timeout_s=2.0, poll_s=0.05, stale_s=300)
+    return payload
+
+def write_exchange_payload(path: str | Path, payload: Dict[str, Any]) -> None:
+    out = Path(path)
     try:
-        with out.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False))
-            f.write("\n")
-    finally:
-        if locked:
-            release_lock(out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        pass
+    sign_payload(payload)
+    # Bus actif (superviseur) : publication en mémoire, écriture par son puits.
+    ajouter_jsonl(out, payload, verrouiller=True)
 
 def read_last_exchange(path: str | Path):
+    dernier = dernier_jsonl(path)
+    if dernier is not None:
+        return dernier
     parsed = safe_read_jsonl(Path(path), max_lines=1, wait_if_locked=True, timeout_s=2.0, parse=True)
     if not parsed:
         return None
@@ -0,0 +1,665 @@
+# core/execution/batch_executor.py – V6.1.0
+"""Exécuteur de rééquilibrage par lots : plan d'actions → DAG de transactions.
+
+``StrategyEngine.build_actions`` produit, pour chaque allocation, un triplet
+swap → add_liquidity → stake. Ces étapes sont dépendantes au sein d'une même
+pool, mais les triplets de pools différentes sont indépendants. Ce module :
+
+- construit le graphe de dépendances (DAG) à partir du plan,
+- pré-approuve en bloc les allowances nécessaires (une approbation par couple
+  token/spender, quelle que soit la quantité d'étapes qui l'utilisent),
+- diffuse les étapes indépendantes en parallèle, les nonces étant attribués
+  localement par :class:`NonceManager`,
+- lance chaque étape dépendante dès que ses prérequis sont confirmés.
+
+Le mode dry-run s'appuie sur :class:`StubChain`, une chaîne locale sans réseau
+avec un temps de bloc fixe, pour mesurer la latence de bout en bout d'un
+rééquilibrage (mode ``dag`` comparé au mode ``sequentiel``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Protocol, Tuple
+
+from core.execution.nonce_manager import NonceManager
+from core.gas_estimator import activer_oracle_reseau
+from core.gas_limit_cache import cache_partage, cle_depuis_fonction
+from core.gas_oracle import obtenir_oracle
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "Leg",
+    "LegResult",
+    "ChainBackend",
+    "StubChain",
+    "Web3Backend",
+    "BatchRebalanceExecutor",
+    "MINICHEF_DEPOSIT_ABI",
+    "construire_dag",
+    "planifier_approbations",
+]
+
+MODES_EXECUTION = ("dag", "sequentiel")
+_ABIS_DIR = Path(__file__).resolve().parent.parent / "abis"
+
+
+# ---------------------------------------------------------------------------
+# Structures
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Leg:
+    """Étape unitaire du plan (une transaction on-chain)."""
+
+    leg_id: str
+    kind: str
+    params: Dict[str, Any]
+    groupe: str
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class LegResult:
+    """Résultat d'exécution d'une étape."""
+
+    leg_id: str
+    kind: str
+    groupe: str
+    status: str = "pending"
+    tx_hash: Optional[str] = None
+    nonce: Optional[int] = None
+    envoye_a_s: Optional[float] = None
+    confirme_a_s: Optional[float] = None
+    receipt: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class ChainBackend(Protocol):
+    """Interface minimale d'une chaîne cible (réelle ou simulée)."""
+
+    adresse: str
+
+    def nonce_pending(self) -> int:
+        """Compteur de transactions ``pending`` du wallet."""
+        ...
+
+    def allowance(self, token: str, spender: str) -> int:
+        """Allowance courante du wallet pour ``spender`` sur ``token``."""
+        ...
+
+    def envoyer(self, leg: Leg, nonce: int) -> str:
+        """Signe et diffuse la transaction de l'étape, retourne son hash."""
+        ...
+
+    def attendre_recu(self, tx_hash: str) -> Dict[str, Any]:
+        """Bloque jusqu'à la confirmation et retourne le reçu (status, gasUsed…)."""
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Construction du DAG
+# ---------------------------------------------------------------------------
+
+def _kind_et_params(action: Any) -> Tuple[str, Dict[str, Any]]:
+    """Accepte un ``Action`` du StrategyEngine ou un dict ``{"kind"|"type", "params"}``."""
+    if isinstance(action, Mapping):
+        kind = action.get("kind") or action.get("type") or ""
+        params = action.get("params")
+    else:
+        kind = getattr(action, "kind", "") or ""
+        params = getattr(action, "params", None)
+    return str(kind), dict(params) if isinstance(params, Mapping) else {}
+
+
+def _groupe_action(params: Mapping[str, Any], index: int) -> str:
+    """Identifie la pool visée par une action (sert de clé de dépendance)."""
+    pool_id = params.get("pool_id")
+    if pool_id:
+        return str(pool_id)
+    token_b = params.get("tokenB")
+    if isinstance(token_b, str) and token_b.startswith("LP-"):
+        return token_b[3:]
+    return f"action-{index}"
+
+
+def construire_dag(actions: Iterable[Any]) -> List[Leg]:
+    """Transforme une liste d'actions en étapes reliées par leurs dépendances.
+
+    Au sein d'une même pool, chaque étape dépend de la précédente
+    (swap → add_liquidity → stake). Des dépendances explicites peuvent être
+    ajoutées via ``params["depends_on"]`` (liste de ``leg_id``).
+    """
+    legs: List[Leg] = []
+    dernier_par_groupe: Dict[str, str] = {}
+    for index, action in enumerate(actions):
+        kind, params = _kind_et_params(action)
+        if not kind:
+            raise ValueError(f"Action #{index} sans type")
+        groupe = _groupe_action(params, index)
+        leg_id = f"{groupe}:{kind}:{index}"
+
+        deps: List[str] = []
+        precedent = dernier_par_groupe.get(groupe)
+        if precedent is not None:
+            deps.append(precedent)
+        explicites = params.pop("depends_on", None)
+        if isinstance(explicites, (list, tuple)):
+            deps.extend(str(d) for d in explicites if str(d) not in deps)
+
+        legs.append(Leg(leg_id=leg_id, kind=kind, params=params, groupe=groupe, depends_on=tuple(deps)))
+        dernier_par_groupe[groupe] = leg_id
+    return legs
+
+
+def _montant_entier(valeur: Any) -> int:
+    try:
+        return max(int(valeur), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _besoins_approbation(
+    leg: Leg,
+    spenders: Mapping[str, str],
+) -> List[Tuple[str, str, int]]:
+    """Liste des (token, spender, montant) requis par une étape."""
+    p = leg.params
+    router = p.get("router") or p.get("router_address") or spenders.get("router", "router")
+    if leg.kind == "swap":
+        token = p.get("token_in") or p.get("tokenA")
+        montant = p.get("amount_in_wei", p.get("amountA"))
+        return [(str(token), str(router), _montant_entier(montant))] if token else []
+    if leg.kind == "add_liquidity":
+        besoins = []
+        for cle_token, cle_montant in (("tokenA", "amountA"), ("tokenB", "amountB")):
+            token = p.get(f"{cle_token}_address") or p.get(cle_token)
+            if token:
+                montant = p.get(f"{cle_montant}_wei", p.get(cle_montant))
+                besoins.append((str(token), str(router), _montant_entier(montant)))
+        return besoins
+    if leg.kind == "stake":
+        token = p.get("lp_token") or f"LP-{leg.groupe}"
+        minichef = p.get("minichef") or spenders.get("minichef", "minichef")
+        montant = p.get("amount_lp_wei", p.get("amount_lp"))
+        return [(str(token), str(minichef), _montant_entier(montant))]
+    return []
+
+
+def planifier_approbations(
+    legs: List[Leg],
+    spenders: Optional[Mapping[str, str]] = None,
+) -> Tuple[List[Leg], List[Leg]]:
+    """Regroupe les allowances nécessaires en une approbation par couple token/spender.
+
+    Retourne ``(approbations, legs)`` où chaque étape consommatrice dépend
+    désormais de l'approbation correspondante. Les montants requis par
+    plusieurs étapes sont cumulés.
+    """
+    spenders = spenders or {}
+    cumul: Dict[Tuple[str, str], int] = {}
+    consommateurs: Dict[str, List[Tuple[str, str]]] = {}
+    for leg in legs:
+        for token, spender, montant in _besoins_approbation(leg, spenders):
+            cle = (token, spender)
+            cumul[cle] = cumul.get(cle, 0) + montant
+            consommateurs.setdefault(leg.leg_id, []).append(cle)
+
+    approbations: Dict[Tuple[str, str], Leg] = {}
+    for (token, spender), montant in cumul.items():
+        leg_id = f"approve:{token}:{spender}"
+        approbations[(token, spender)] = Leg(
+            leg_id=leg_id,
+            kind="approve",
+            params={"token": token, "spender": spender, "amount": montant},
+            groupe=f"approve:{token}",
+        )
+
+    legs_relies: List[Leg] = []
+    for leg in legs:
+        deps = list(leg.depends_on)
+        for cle in consommateurs.get(leg.leg_id, []):
+            dep = approbations[cle].leg_id
+            if dep not in deps:
+                deps.append(dep)
+        legs_relies.append(Leg(leg.leg_id, leg.kind, leg.params, leg.groupe, tuple(deps)))
+    return list(approbations.values()), legs_relies
+
+
+# ---------------------------------------------------------------------------
+# Chaîne locale (dry-run)
+# ---------------------------------------------------------------------------
+
+class StubChain:
+    """Chaîne locale déterministe pour le dry-run (aucun appel réseau).
+
+    Chaque transaction est incluse dans le bloc suivant sa diffusion ; un bloc
+    est produit toutes les ``block_time_s`` secondes. Les nonces sont vérifiés
+    comme sur une vraie chaîne (un nonce déjà utilisé est rejeté) et les
+    approbations mettent réellement à jour les allowances.
+    """
+
+    def __init__(
+        self,
+        block_time_s: float = 0.05,
+        adresse: str = "0x" + "57" * 20,
+        echecs: Iterable[str] = (),
+        gas_par_type: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        self.adresse = adresse
+        self.block_time_s = max(float(block_time_s), 0.0)
+        self._echecs = set(echecs)
+        self._gas = dict(gas_par_type or {"approve": 46_000, "swap": 130_000, "add_liquidity": 180_000, "stake": 110_000})
+        self._lock = Lock()
+        self._t0 = time.monotonic()
+        self._nonces_utilises: set[int] = set()
+        self._txs: Dict[str, Tuple[Leg, int, int]] = {}
+        self._allowances: Dict[Tuple[str, str], int] = {}
+        self.appels: Dict[str, int] = {}
+
+    def _compter(self, methode: str) -> None:
+        with self._lock:
+            self.appels[methode] = self.appels.get(methode, 0) + 1
+
+    def _bloc_courant(self) -> int:
+        if self.block_time_s <= 0:
+            return 0
+        return int((time.monotonic() - self._t0) / self.block_time_s)
+
+    def nonce_pending(self) -> int:
+        self._compter("eth_getTransactionCount")
+        with self._lock:
+            return max(self._nonces_utilises) + 1 if self._nonces_utilises else 0
+
+    def allowance(self, token: str, spender: str) -> int:
+        self._compter("eth_call")
+        with self._lock:
+            return self._allowances.get((token, spender), 0)
+
+    def envoyer(self, leg: Leg, nonce: int) -> str:
+        self._compter("eth_sendRawTransaction")
+        with self._lock:
+            if nonce in self._nonces_utilises:
+                raise ValueError(f"nonce too low: {nonce}")
+            self._nonces_utilises.add(nonce)
+            tx_hash = "0x" + hashlib.sha256(f"{self.adresse}:{nonce}:{leg.leg_id}".encode()).hexdigest()
+            self._txs[tx_hash] = (leg, nonce, self._bloc_courant() + 1)
+            if leg.kind == "approve" and leg.leg_id not in self._echecs:
+                cle = (str(leg.params.get("token")), str(leg.params.get("spender")))
+                self._allowances[cle] = _montant_entier(leg.params.get("amount"))
+        return tx_hash
+
+    def attendre_recu(self, tx_hash: str) -> Dict[str, Any]:
+        self._compter("eth_getTransactionReceipt")
+        with self._lock:
+            leg, nonce, bloc = self._txs[tx_hash]
+        if self.block_time_s > 0:
+            reste = self._t0 + bloc * self.block_time_s - time.monotonic()
+            if reste > 0:
+                time.sleep(reste)
+        statut = 0 if (leg.leg_id in self._echecs or leg.kind in self._echecs) else 1
+        return {
+            "status": statut,
+            "blockNumber": bloc,
+            "gasUsed": self._gas.get(leg.kind, 100_000),
+            "nonce": nonce,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Chaîne réelle (Web3)
+# ---------------------------------------------------------------------------
+
+MINICHEF_DEPOSIT_ABI: List[Dict[str, Any]] = [
+    {
+        "inputs": [
+            {"internalType": "uint256", "name": "pid", "type": "uint256"},
+            {"internalType": "uint256", "name": "amount", "type": "uint256"},
+            {"internalType": "address", "name": "to", "type": "address"},
+        ],
+        "name": "deposit",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+]
+
+
+def _charger_abi(nom: str) -> List[Dict[str, Any]]:
+    with (_ABIS_DIR / nom).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data["abi"] if isinstance(data, dict) else data
+
+
+def _exiger(params: Mapping[str, Any], *cles: str) -> List[Any]:
+    manquantes = [c for c in cles if params.get(c) in (None, "")]
+    if manquantes:
+        raise ValueError(f"paramètres manquants pour l'exécution réelle: {', '.join(manquantes)}")
+    return [params[c] for c in cles]
+
+
+class Web3Backend:
+    """Backend réel : signe et diffuse les transactions via Web3.
+
+    Les étapes réelles doivent porter des paramètres on-chain complets
+    (adresses, montants en wei). Des constructeurs spécifiques peuvent être
+    fournis via ``builders`` : ``{kind: fn(w3, backend, params) -> ContractFunction}``.
+    """
+
+    def __init__(
+        self,
+        w3: Any,
+        private_key: str,
+        adresse: Optional[str] = None,
+        builders: Optional[Mapping[str, Callable[[Any, "Web3Backend", Dict[str, Any]], Any]]] = None,
+        gas_multiplier: float = 1.15,
+        gas_mode: str = "normal",
+        timeout_s: float = 180.0,
+        reseau: str = "polygon",
+    ) -> None:
+        from web3 import Web3  # import local : web3 reste optionnel pour le dry-run
+
+        self._Web3 = Web3
+        self.w3 = w3
+        self._private_key = private_key
+        if adresse is None:
+            adresse = w3.eth.account.from_key(private_key).address
+        self.adresse = Web3.to_checksum_address(adresse)
+        self.gas_multiplier = float(gas_multiplier)
+        self.gas_mode = gas_mode
+        self.timeout_s = float(timeout_s)
+        self.reseau = reseau
+        activer_oracle_reseau(w3, reseau, mode=gas_mode)
+        self._chain_id: Optional[int] = None
+        self._gas_envoyes: Dict[str, Tuple[Any, int]] = {}
+        self._gas_lock = Lock()
+        self._builders: Dict[str, Callable[[Any, "Web3Backend", Dict[str, Any]], Any]] = {
+            "approve": Web3Backend._build_approve,
+            "swap": Web3Backend._build_swap,
+            "add_liquidity": Web3Backend._build_add_liquidity,
+            "stake": Web3Backend._build_stake,
+        }
+        if builders:
+            self._builders.update(builders)
+
+    def checksum(self, adresse: str) -> str:
+        return self._Web3.to_checksum_address(adresse)
+
+    def contrat(self, adresse: str, abi: List[Dict[str, Any]]) -> Any:
+        return self.w3.eth.contract(address=self.checksum(adresse), abi=abi)
+
+    @staticmethod
+    def _build_approve(w3: Any, backend: "Web3Backend", p: Dict[str, Any]) -> Any:
+        from core.swap_reel import ERC20_ABI
+
+        token, spender, montant = _exiger(p, "token", "spender", "amount")
+        return backend.contrat(token, ERC20_ABI).functions.approve(backend.checksum(spender), int(montant))
+
+    @staticmethod
+    def _build_swap(w3: Any, backend: "Web3Backend", p: Dict[str, Any]) -> Any:
+        from core.swap_reel import ROUTER_V2_ABI
+
+        router, amount_in, amount_out_min, path = _exiger(p, "router", "amount_in_wei", "amount_out_min_wei", "path")
+        deadline = int(p.get("deadline") or time.time() + 15 * 60)
+        recipient = backend.checksum(p.get("recipient") or backend.adresse)
+        return backend.contrat(router, ROUTER_V2_ABI).functions.swapExactTokensForTokens(
+            int(amount_in), int(amount_out_min), [backend.checksum(a) for a in path], recipient, deadline
+        )
+
+    @staticmethod
+    def _build_add_liquidity(w3: Any, backend: "Web3Backend", p: Dict[str, Any]) -> Any:
+        router, token_a, token_b, a_wei, b_wei = _exiger(
+            p, "router", "tokenA_address", "tokenB_address", "amountA_wei", "amountB_wei"
+        )
+        deadline = int(p.get("deadline") or time.time() + 20 * 60)
+        return backend.contrat(router, _charger_abi("uniswap_v2_router.json")).functions.addLiquidity(
+            backend.checksum(token_a),
+            backend.checksum(token_b),
+            int(a_wei),
+            int(b_wei),
+            int(p.get("amountA_min_wei", 0)),
+            int(p.get("amountB_min_wei", 0)),
+            backend.adresse,
+            deadline,
+        )
+
+    @staticmethod
+    def _build_stake(w3: Any, backend: "Web3Backend", p: Dict[str, Any]) -> Any:
+        minichef, pid, montant = _exiger(p, "minichef", "pid", "amount_lp_wei")
+        return backend.contrat(minichef, MINICHEF_DEPOSIT_ABI).functions.deposit(
+            int(pid), int(montant), backend.adresse
+        )
+
+    def nonce_pending(self) -> int:
+        return int(self.w3.eth.get_transaction_count(self.adresse, "pending"))
+
+    def allowance(self, token: str, spender: str) -> int:
+        from core.swap_reel import ERC20_ABI
+
+        if not self._Web3.is_address(token) or not self._Web3.is_address(spender):
+            return 0
+        contrat = self.contrat(token, ERC20_ABI)
+        return int(contrat.functions.allowance(self.adresse, self.checksum(spender)).call())
+
+    def envoyer(self, leg: Leg, nonce: int) -> str:
+        builder = self._builders.get(leg.kind)
+        if builder is None:
+            raise ValueError(f"type d'étape non supporté: {leg.kind}")
+        if self._chain_id is None:
+            self._chain_id = int(self.w3.eth.chain_id)
+        fonction = builder(self.w3, self, leg.params)
+        if leg.params.get("gas_price_wei"):
+            frais = {"gasPrice": int(leg.params["gas_price_wei"])}
+        else:
+            frais = obtenir_oracle(self.w3).frais_transaction(self.gas_mode)
+        tx_params = {"from": self.adresse, "nonce": nonce, "chainId": self._chain_id, **frais}
+        cle = cle_depuis_fonction(fonction, len(leg.params.get("path") or ()))
+        gas_appris = cache_partage().limite(cle)
+        if gas_appris is not None:
+            tx = fonction.build_transaction({**tx_params, "gas": gas_appris})
+        else:
+            tx = fonction.build_transaction(tx_params)
+            tx["gas"] = math.floor(self.w3.eth.estimate_gas(tx) * self.gas_multiplier)
+        signed = self.w3.eth.account.sign_transaction(tx, self._private_key)
+        tx_hash = self.w3.eth.send_raw_transaction(signed.rawTransaction).hex()
+        with self._gas_lock:
+            self._gas_envoyes[tx_hash] = (cle, int(tx["gas"]))
+        return tx_hash
+
+    def attendre_recu(self, tx_hash: str) -> Dict[str, Any]:
+        recu = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=self.timeout_s)
+        with self._gas_lock:
+            envoi = self._gas_envoyes.pop(tx_hash, None)
+        if envoi is not None:
+            cache_partage().observer_recu(envoi[0], recu, envoi[1])
+        return {
+            "status": int(recu.status),
+            "blockNumber": int(recu.blockNumber),
+            "gasUsed": int(recu.gasUsed),
+            "effectiveGasPrice": int(getattr(recu, "effectiveGasPrice", 0) or 0),
+        }
+
+
+# ---------------------------------------------------------------------------
+# Exécuteur
+# ---------------------------------------------------------------------------
+
+class BatchRebalanceExecutor:
+    """Exécuteur compatible ``StrategyEngine.executor`` (méthode ``execute``).
+
+    ``mode="dag"`` diffuse toutes les étapes prêtes en parallèle ;
+    ``mode="sequentiel"`` reproduit l'exécution une-à-une (référence de latence).
+    Sans ``backend``, une :class:`StubChain` locale est utilisée (dry-run).
+    """
+
+    def __init__(
+        self,
+        backend: Optional[ChainBackend] = None,
+        *,
+        mode: str = "dag",
+        max_workers: int = 8,
+        spenders: Optional[Mapping[str, str]] = None,
+        approve_amount: Optional[int] = None,
+    ) -> None:
+        if mode not in MODES_EXECUTION:
+            raise ValueError(f"mode doit être l'un de {MODES_EXECUTION}")
+        self.dry_run = backend is None or isinstance(backend, StubChain)
+        self.backend: ChainBackend = backend if backend is not None else StubChain()
+        self.mode = mode
+        self.max_workers = max(1, int(max_workers))
+        self.spenders = dict(spenders or {})
+        self.approve_amount = approve_amount
+        self.nonces = NonceManager(self.backend.nonce_pending)
+
+    def _approbations_necessaires(self, approbations: List[Leg]) -> Tuple[List[Leg], List[str]]:
+        """Écarte les approbations déjà couvertes par l'allowance on-chain."""
+        a_envoyer: List[Leg] = []
+        couvertes: List[str] = []
+        for leg in approbations:
+            requis = _montant_entier(leg.params.get("amount"))
+            actuel = self.backend.allowance(str(leg.params["token"]), str(leg.params["spender"]))
+            if actuel > 0 and actuel >= requis:
+                couvertes.append(leg.leg_id)
+                continue
+            if self.approve_amount is not None:
+                leg.params["amount"] = max(int(self.approve_amount), requis)
+            a_envoyer.append(leg)
+        return a_envoyer, couvertes
+
+    def _envoyer(self, leg: Leg, t0: float) -> LegResult:
+        resultat = LegResult(leg_id=leg.leg_id, kind=leg.kind, groupe=leg.groupe)
+        nonce = self.nonces.prochain()
+        try:
+            resultat.tx_hash = self.backend.envoyer(leg, nonce)
+        except Exception as exc:
+            self.nonces.liberer(nonce)
+            resultat.status = "send_error"
+            resultat.error = str(exc)
+            logger.error("Envoi %s impossible: %s", leg.leg_id, exc)
+            return resultat
+        resultat.nonce = nonce
+        resultat.status = "sent"
+        resultat.envoye_a_s = time.monotonic() - t0
+        return resultat
+
+    def execute(self, actions: List[Any]) -> Dict[str, Any]:
+        """Exécute le plan et retourne un rapport détaillé (statuts, latences)."""
+        t0 = time.monotonic()
+        legs = construire_dag(actions)
+        approbations, legs = planifier_approbations(legs, self.spenders)
+        approbations, couvertes = self._approbations_necessaires(approbations)
+
+        resultats: Dict[str, LegResult] = {}
+        for leg_id in couvertes:
+            resultats[leg_id] = LegResult(leg_id=leg_id, kind="approve", groupe=leg_id, status="confirmed")
+
+        graphe = approbations + legs
+        connus = {leg.leg_id for leg in graphe} | set(couvertes)
+        restants: Dict[str, Leg] = {leg.leg_id: leg for leg in graphe}
+        en_vol: Dict[Future, Tuple[Leg, LegResult]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-exec") as pool:
+            while restants or en_vol:
+                for leg in list(restants.values()):
+                    bloquee = any(
+                        d not in connus or (d in resultats and resultats[d].status != "confirmed")
+                        for d in leg.depends_on
+                    )
+                    if bloquee:
+                        resultats[leg.leg_id] = LegResult(
+                            leg_id=leg.leg_id,
+                            kind=leg.kind,
+                            groupe=leg.groupe,
+                            status="skipped",
+                            error="prerequis_en_echec",
+                        )
+                        del restants[leg.leg_id]
+
+                prets = [
+                    leg
+                    for leg in restants.values()
+                    if all(d in resultats and resultats[d].status == "confirmed" for d in leg.depends_on)
+                ]
+                for leg in prets:
+                    if self.mode == "sequentiel" and en_vol:
+                        break
+                    del restants[leg.leg_id]
+                    resultat = self._envoyer(leg, t0)
+                    if resultat.status != "sent":
+                        resultats[leg.leg_id] = resultat
+                        continue
+                    futur = pool.submit(self.backend.attendre_recu, resultat.tx_hash)
+                    en_vol[futur] = (leg, resultat)
+                    if self.mode == "sequentiel":
+                        break
+
+                if not en_vol:
+                    if restants and not prets:
+                        # Dépendances circulaires : rien ne pourra plus avancer.
+                        for leg in restants.values():
+                            resultats[leg.leg_id] = LegResult(
+                                leg_id=leg.leg_id,
+                                kind=leg.kind,
+                                groupe=leg.groupe,
+                                status="skipped",
+                                error="dependance_circulaire",
+                            )
+                        restants.clear()
+                    continue
+
+                termines, _ = wait(list(en_vol), return_when=FIRST_COMPLETED)
+                for futur in termines:
+                    leg, resultat = en_vol.pop(futur)
+                    resultat.confirme_a_s = time.monotonic() - t0
+                    try:
+                        recu = futur.result()
+                    except Exception as exc:
+                        resultat.status = "failed"
+                        resultat.error = str(exc)
+                    else:
+                        resultat.receipt = dict(recu)
+                        resultat.status = "confirmed" if recu.get("status") == 1 else "failed"
+                        if resultat.status == "failed":
+                            resultat.error = "receipt_status_0"
+                    resultats[leg.leg_id] = resultat
+
+        latence = time.monotonic() - t0
+        ordre = [leg.leg_id for leg in graphe]
+        details = [asdict(resultats[leg_id]) for leg_id in ordre if leg_id in resultats]
+        nb_ok = sum(1 for leg_id in ordre if resultats.get(leg_id) and resultats[leg_id].status == "confirmed")
+        nb_ko = len(ordre) - nb_ok
+        if nb_ko == 0:
+            statut = "dry-run" if self.dry_run else "executed"
+        else:
+            statut = "partial" if nb_ok else "failed"
+
+        logger.info(
+            "Rééquilibrage %s (%s) : %d/%d étapes confirmées en %.3fs",
+            self.mode,
+            "dry-run" if self.dry_run else "réel",
+            nb_ok,
+            len(ordre),
+            latence,
+        )
+        return {
+            "status": statut,
+            "executed": not self.dry_run and nb_ok > 0,
+            "dry_run": self.dry_run,
+            "mode": self.mode,
+            "nb_etapes": len(legs),
+            "nb_approbations": len(approbations),
+            "approbations_couvertes": couvertes,
+            "nb_confirmees": nb_ok,
+            "nb_echecs": nb_ko,
+            "latence_totale_s": latence,
+            "legs": details,
+        }
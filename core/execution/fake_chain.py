@@ -0,0 +1,1026 @@
+# core/execution/fake_chain.py – V6.1.0
+"""Chaîne EVM simulée en mémoire (JSON-RPC) pour exercer la couche d'exécution sans réseau.
+
+Le simulateur n'interprète pas de bytecode : il reconnaît les sélecteurs des
+contrats utilisés par DeFiPilot et en reproduit la sémantique de façon
+déterministe :
+
+- ERC-20 (``decimals``, ``symbol``, ``balanceOf``, ``allowance``, ``approve``,
+  ``transfer``, ``transferFrom``, ``totalSupply``) avec événements ``Transfer``,
+- router/factory UniswapV2 (``getAmountsOut``, ``swapExactTokensForTokens``,
+  ``addLiquidity``, ``getPair``) et paires (``getReserves``, ``token0/1``,
+  LP ERC-20), frais de 0,3 %,
+- MiniChef SushiSwap (``deposit``, ``withdraw``, ``harvest``, ``userInfo``,
+  ``pendingSushi``),
+- Multicall3 (``aggregate3``, ``getBlockNumber``) à son adresse canonique.
+
+Les transactions signées (legacy, EIP-2930, EIP-1559) sont décodées, leur
+émetteur est recouvré via eth-account, et nonces, frais, gas limit et revert
+sont appliqués comme sur une vraie chaîne (une transaction à court de gas
+consomme toute sa limite). Chaque transaction s'exécute sur une vue
+journalisée de l'état, validée seulement en cas de succès.
+
+Deux points d'entrée : :class:`FakeChainProvider` (provider Web3 en
+processus) et :meth:`FakeChain.demarrer_serveur_http`, qui expose un
+endpoint HTTP local pour faire tourner sans modification les chemins de code
+qui construisent leur propre ``Web3(HTTPProvider(url))``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import RLock, Thread
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import rlp
+from eth_abi import decode, encode
+from eth_account import Account
+from eth_utils import function_signature_to_4byte_selector, keccak
+from web3.providers.base import BaseProvider
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "FakeChain",
+    "FakeChainProvider",
+    "MULTICALL3_ADDRESS",
+    "SELECTEURS",
+]
+
+MULTICALL3_ADDRESS = "0xca11bde05977b3631167028862be2a173976ca11"
+ADRESSE_NULLE = "0x" + "00" * 20
+MINIMUM_LIQUIDITY = 1000
+TOPIC_TRANSFER = "0x" + keccak(text="Transfer(address,address,uint256)").hex()
+
+_SIGNATURES = {
+    # ERC-20
+    "decimals": "decimals()",
+    "symbol": "symbol()",
+    "name": "name()",
+    "totalSupply": "totalSupply()",
+    "balanceOf": "balanceOf(address)",
+    "allowance": "allowance(address,address)",
+    "approve": "approve(address,uint256)",
+    "transfer": "transfer(address,uint256)",
+    "transferFrom": "transferFrom(address,address,uint256)",
+    # Router / factory UniswapV2
+    "getAmountsOut": "getAmountsOut(uint256,address[])",
+    "swapExactTokensForTokens": "swapExactTokensForTokens(uint256,uint256,address[],address,uint256)",
+    "addLiquidity": "addLiquidity(address,address,uint256,uint256,uint256,uint256,address,uint256)",
+    "factory": "factory()",
+    "getPair": "getPair(address,address)",
+    # Paire
+    "getReserves": "getReserves()",
+    "token0": "token0()",
+    "token1": "token1()",
+    # MiniChef
+    "deposit": "deposit(uint256,uint256,address)",
+    "withdraw": "withdraw(uint256,uint256,address)",
+    "harvest": "harvest(uint256,address)",
+    "userInfo": "userInfo(uint256,address)",
+    "pendingSushi": "pendingSushi(uint256,address)",
+    "lpToken": "lpToken(uint256)",
+    "poolLength": "poolLength()",
+    # Multicall3
+    "aggregate3": "aggregate3((address,bool,bytes)[])",
+    "getBlockNumber": "getBlockNumber()",
+}
+SELECTEURS: Dict[str, str] = {
+    nom: "0x" + function_signature_to_4byte_selector(sig).hex() for nom, sig in _SIGNATURES.items()
+}
+_NOMS_PAR_SELECTEUR: Dict[bytes, str] = {bytes.fromhex(s[2:]): nom for nom, s in SELECTEURS.items()}
+
+# Gas consommé par appel (déterministe)
+GAS_INTRINSEQUE = 21_000
+GAS_PAR_APPEL: Dict[str, int] = {
+    "approve": 25_000,
+    "transfer": 30_000,
+    "transferFrom": 38_000,
+    "swapExactTokensForTokens": 70_000,
+    "addLiquidity": 125_000,
+    "deposit": 88_000,
+    "withdraw": 74_000,
+    "harvest": 64_000,
+}
+GAS_PAR_SAUT = 45_000
+GAS_PREMIERE_LIQUIDITE = 50_000
+
+
+class _Revert(Exception):
+    """Exécution annulée (équivalent d'un ``revert`` Solidity)."""
+
+
+class _ManqueDeGas(Exception):
+    """Gas limit insuffisante pour l'exécution."""
+
+
+class _ErreurRPC(Exception):
+    def __init__(self, code: int, message: str, data: Optional[str] = None) -> None:
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+def _adr(valeur: Any) -> str:
+    if isinstance(valeur, (bytes, bytearray)):
+        return "0x" + bytes(valeur).hex().rjust(40, "0")[-40:]
+    return str(valeur).lower()
+
+
+def _hex(valeur: int) -> str:
+    return hex(int(valeur))
+
+
+def _entier(valeur: Any) -> int:
+    if isinstance(valeur, int):
+        return valeur
+    if isinstance(valeur, (bytes, bytearray)):
+        return int.from_bytes(valeur, "big")
+    if isinstance(valeur, str):
+        return int(valeur, 16) if valeur.startswith("0x") else int(valeur)
+    return int(valeur or 0)
+
+
+def _octets(valeur: Optional[str]) -> bytes:
+    if not valeur:
+        return b""
+    return bytes.fromhex(valeur[2:] if valeur.startswith("0x") else valeur)
+
+
+# ---------------------------------------------------------------------------
+# État journalisé
+# ---------------------------------------------------------------------------
+
+class _Vue:
+    """Couche d'écritures au-dessus d'un stockage parent (validée ou abandonnée)."""
+
+    def __init__(self, parent: Any) -> None:
+        self.parent = parent
+        self.ecritures: Dict[Tuple[Any, ...], Any] = {}
+        self.logs: List[Dict[str, Any]] = []
+
+    def lire(self, cle: Tuple[Any, ...], defaut: Any = 0) -> Any:
+        if cle in self.ecritures:
+            return self.ecritures[cle]
+        return self.parent.lire(cle, defaut)
+
+    def ecrire(self, cle: Tuple[Any, ...], valeur: Any) -> None:
+        self.ecritures[cle] = valeur
+
+    def valider(self) -> None:
+        """Reporte écritures et événements dans la vue parente."""
+        self.parent.ecritures.update(self.ecritures)
+        self.parent.logs.extend(self.logs)
+
+
+class _Stockage:
+    def __init__(self) -> None:
+        self.donnees: Dict[Tuple[Any, ...], Any] = {}
+        self.logs: List[Dict[str, Any]] = []
+
+    def lire(self, cle: Tuple[Any, ...], defaut: Any = 0) -> Any:
+        return self.donnees.get(cle, defaut)
+
+    def appliquer(self, ecritures: Dict[Tuple[Any, ...], Any]) -> None:
+        self.donnees.update(ecritures)
+
+
+# ---------------------------------------------------------------------------
+# Chaîne
+# ---------------------------------------------------------------------------
+
+class FakeChain:
+    """Chaîne EVM simulée, déterministe, sans réseau."""
+
+    def __init__(
+        self,
+        *,
+        chain_id: int = 137,
+        base_fee_wei: int = 30 * 10**9,
+        priority_fee_wei: int = 30 * 10**9,
+        block_time_s: float = 0.0,
+        latence_rpc_s: float = 0.0,
+        horodatage_genese: Optional[int] = None,
+        gas_limit_bloc: int = 30_000_000,
+    ) -> None:
+        self.chain_id = int(chain_id)
+        self.base_fee_wei = int(base_fee_wei)
+        self.priority_fee_wei = int(priority_fee_wei)
+        self.block_time_s = max(float(block_time_s), 0.0)
+        self.latence_rpc_s = max(float(latence_rpc_s), 0.0)
+        self.gas_limit_bloc = int(gas_limit_bloc)
+        self._horodatage_genese = int(horodatage_genese if horodatage_genese is not None else time.time())
+        self._t0 = time.monotonic()
+        self._lock = RLock()
+        self._etat = _Stockage()
+        self._compteur_adresses = 0
+
+        # Métadonnées statiques des contrats
+        self.tokens: Dict[str, Tuple[str, int]] = {}
+        self.routers: set[str] = set()
+        self.paires: Dict[Tuple[str, str], str] = {}
+        self.tokens_paire: Dict[str, Tuple[str, str]] = {}
+        self.minichefs: Dict[str, Dict[str, Any]] = {}
+
+        # Blocs, mempool, reçus
+        self.blocs: List[Dict[str, Any]] = []
+        self._mempool: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._txs: Dict[str, Dict[str, Any]] = {}
+        self._recus: Dict[str, Dict[str, Any]] = {}
+        self.appels: Counter = Counter()
+        self._serveur: Optional[ThreadingHTTPServer] = None
+        self._miner_bloc([])  # genèse
+
+    # ------------------------------------------------------------------
+    # Déploiement / préparation de l'état
+    # ------------------------------------------------------------------
+    def _nouvelle_adresse(self, graine: str) -> str:
+        self._compteur_adresses += 1
+        return "0x" + keccak(text=f"fake-chain:{graine}:{self._compteur_adresses}").hex()[-40:]
+
+    def deployer_token(self, symbole: str, decimales: int = 18, adresse: Optional[str] = None) -> str:
+        with self._lock:
+            adresse = _adr(adresse) if adresse else self._nouvelle_adresse(symbole)
+            self.tokens[adresse] = (symbole, int(decimales))
+            return adresse
+
+    def crediter(self, token: str, compte: str, montant: int) -> None:
+        """Crée ``montant`` unités de ``token`` sur ``compte`` (mint hors transaction)."""
+        with self._lock:
+            token, compte = _adr(token), _adr(compte)
+            d = self._etat.donnees
+            d[("bal", token, compte)] = d.get(("bal", token, compte), 0) + int(montant)
+            d[("supply", token)] = d.get(("supply", token), 0) + int(montant)
+
+    def crediter_natif(self, compte: str, montant_wei: int) -> None:
+        with self._lock:
+            d = self._etat.donnees
+            cle = ("natif", _adr(compte))
+            d[cle] = d.get(cle, 0) + int(montant_wei)
+
+    def deployer_router(self, adresse: Optional[str] = None) -> str:
+        """Router UniswapV2 jouant aussi le rôle de factory (``getPair``)."""
+        with self._lock:
+            adresse = _adr(adresse) if adresse else self._nouvelle_adresse("router")
+            self.routers.add(adresse)
+            return adresse
+
+    def creer_paire(self, token_a: str, token_b: str, reserve_a: int = 0, reserve_b: int = 0) -> str:
+        """Crée une paire (LP ERC-20 à 18 décimales) et l'amorce avec des réserves."""
+        with self._lock:
+            token_a, token_b = _adr(token_a), _adr(token_b)
+            t0, t1 = sorted((token_a, token_b))
+            if (t0, t1) in self.paires:
+                raise ValueError("paire déjà existante")
+            paire = self._nouvelle_adresse(f"pair:{t0}:{t1}")
+            self.paires[(t0, t1)] = paire
+            self.tokens_paire[paire] = (t0, t1)
+            self.tokens[paire] = ("UNI-V2", 18)
+            if reserve_a and reserve_b:
+                r0, r1 = (reserve_a, reserve_b) if token_a == t0 else (reserve_b, reserve_a)
+                d = self._etat.donnees
+                d[("bal", t0, paire)] = d.get(("bal", t0, paire), 0) + int(r0)
+                d[("bal", t1, paire)] = d.get(("bal", t1, paire), 0) + int(r1)
+                d[("supply", t0)] = d.get(("supply", t0), 0) + int(r0)
+                d[("supply", t1)] = d.get(("supply", t1), 0) + int(r1)
+                d[("reserves", paire)] = (int(r0), int(r1))
+                liquidite = math.isqrt(int(r0) * int(r1))
+                d[("bal", paire, ADRESSE_NULLE)] = liquidite
+                d[("supply", paire)] = liquidite
+            return paire
+
+    def deployer_minichef(self, token_recompense: str, adresse: Optional[str] = None) -> str:
+        with self._lock:
+            adresse = _adr(adresse) if adresse else self._nouvelle_adresse("minichef")
+            self.minichefs[adresse] = {"recompense": _adr(token_recompense), "pools": []}
+            return adresse
+
+    def ajouter_pool_minichef(self, minichef: str, lp_token: str, recompense_par_bloc: int = 10**17) -> int:
+        """Ajoute une pool ; ``recompense_par_bloc`` est versé par LP déposé (×1e18)."""
+        with self._lock:
+            chef = self.minichefs[_adr(minichef)]
+            chef["pools"].append({"lp": _adr(lp_token), "taux": int(recompense_par_bloc)})
+            return len(chef["pools"]) - 1
+
+    def solde(self, token: str, compte: str) -> int:
+        with self._lock:
+            return int(self._etat.lire(("bal", _adr(token), _adr(compte))))
+
+    def solde_natif(self, compte: str) -> int:
+        with self._lock:
+            return int(self._etat.lire(("natif", _adr(compte))))
+
+    def reserves(self, paire: str) -> Tuple[int, int]:
+        with self._lock:
+            return tuple(self._etat.lire(("reserves", _adr(paire)), (0, 0)))  # type: ignore[return-value]
+
+    def nonce(self, compte: str) -> int:
+        with self._lock:
+            return int(self._etat.lire(("nonce", _adr(compte))))
+
+    # ------------------------------------------------------------------
+    # Blocs
+    # ------------------------------------------------------------------
+    @property
+    def numero_bloc(self) -> int:
+        return len(self.blocs) - 1
+
+    def _horodatage_bloc(self, numero: int) -> int:
+        return self._horodatage_genese + numero * max(int(math.ceil(self.block_time_s)), 2)
+
+    def _miner_bloc(self, txs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        numero = len(self.blocs)
+        parent = self.blocs[-1]["hash"] if self.blocs else "0x" + "00" * 32
+        hash_bloc = "0x" + keccak(text=f"bloc:{self.chain_id}:{numero}:{parent}").hex()
+        gas_total = 0
+        hashes: List[str] = []
+        for index, tx in enumerate(txs):
+            recu = self._executer_tx(tx, numero, hash_bloc, index, gas_total)
+            gas_total = recu["_cumul"]
+            hashes.append(tx["hash"])
+        bloc = {
+            "number": numero,
+            "hash": hash_bloc,
+            "parentHash": parent,
+            "timestamp": self._horodatage_bloc(numero),
+            "baseFeePerGas": self.base_fee_wei,
+            "gasLimit": self.gas_limit_bloc,
+            "gasUsed": gas_total,
+            "transactions": hashes,
+        }
+        self.blocs.append(bloc)
+        return bloc
+
+    def _txs_executables(self) -> List[Dict[str, Any]]:
+        """Transactions du mempool dont le nonce est le suivant attendu (par émetteur)."""
+        prets: List[Dict[str, Any]] = []
+        for emetteur, file in list(self._mempool.items()):
+            attendu = int(self._etat.lire(("nonce", emetteur)))
+            while attendu in file:
+                prets.append(file.pop(attendu))
+                attendu += 1
+            if not file:
+                del self._mempool[emetteur]
+        return prets
+
+    def _avancer(self) -> None:
+        """Mine les blocs dus (mode intervalle) ; sans effet en automine."""
+        if self.block_time_s <= 0:
+            return
+        cible = int((time.monotonic() - self._t0) / self.block_time_s)
+        while self.numero_bloc < cible:
+            self._miner_bloc_avec_nonces()
+
+    def _miner_bloc_avec_nonces(self) -> Dict[str, Any]:
+        """Mine un bloc avec toutes les transactions exécutables du mempool."""
+        return self._miner_bloc(self._txs_executables())
+
+    def miner(self, nb_blocs: int = 1) -> None:
+        """Mine ``nb_blocs`` blocs immédiatement (inclut le mempool exécutable)."""
+        with self._lock:
+            for _ in range(max(int(nb_blocs), 1)):
+                self._miner_bloc_avec_nonces()
+
+    # ------------------------------------------------------------------
+    # Exécution
+    # ------------------------------------------------------------------
+    def _transfert(self, vue: _Vue, token: str, de: str, vers: str, montant: int) -> None:
+        if montant < 0:
+            raise _Revert("montant négatif")
+        solde = vue.lire(("bal", token, de))
+        if solde < montant:
+            raise _Revert("ERC20: transfer amount exceeds balance")
+        vue.ecrire(("bal", token, de), solde - montant)
+        vue.ecrire(("bal", token, vers), vue.lire(("bal", token, vers)) + montant)
+        self._log_transfer(vue, token, de, vers, montant)
+
+    def _log_transfer(self, vue: _Vue, token: str, de: str, vers: str, montant: int) -> None:
+        vue.logs.append(
+            {
+                "address": token,
+                "topics": [TOPIC_TRANSFER, "0x" + de[2:].rjust(64, "0"), "0x" + vers[2:].rjust(64, "0")],
+                "data": "0x" + int(montant).to_bytes(32, "big").hex(),
+            }
+        )
+
+    def _depenser_allowance(self, vue: _Vue, token: str, proprietaire: str, spender: str, montant: int) -> None:
+        cle = ("allow", token, proprietaire, spender)
+        autorise = vue.lire(cle)
+        if autorise < montant:
+            raise _Revert("ERC20: insufficient allowance")
+        if autorise != 2**256 - 1:
+            vue.ecrire(cle, autorise - montant)
+
+    def _mint(self, vue: _Vue, token: str, vers: str, montant: int) -> None:
+        vue.ecrire(("bal", token, vers), vue.lire(("bal", token, vers)) + montant)
+        vue.ecrire(("supply", token), vue.lire(("supply", token)) + montant)
+        self._log_transfer(vue, token, ADRESSE_NULLE, vers, montant)
+
+    def _paire(self, a: str, b: str) -> str:
+        paire = self.paires.get(tuple(sorted((a, b))))  # type: ignore[arg-type]
+        if paire is None:
+            raise _Revert("UniswapV2Library: PAIR_NOT_FOUND")
+        return paire
+
+    def _reserves_orientees(self, vue: _Vue, a: str, b: str) -> Tuple[str, int, int]:
+        paire = self._paire(a, b)
+        r0, r1 = vue.lire(("reserves", paire), (0, 0))
+        t0, _ = self.tokens_paire[paire]
+        return (paire, r0, r1) if a == t0 else (paire, r1, r0)
+
+    def _montants_sortie(self, vue: _Vue, montant: int, chemin: Sequence[str]) -> List[int]:
+        if len(chemin) < 2:
+            raise _Revert("UniswapV2Library: INVALID_PATH")
+        montants = [int(montant)]
+        for a, b in zip(chemin, chemin[1:]):
+            _, r_in, r_out = self._reserves_orientees(vue, a, b)
+            if montants[-1] <= 0:
+                raise _Revert("UniswapV2Library: INSUFFICIENT_INPUT_AMOUNT")
+            if r_in <= 0 or r_out <= 0:
+                raise _Revert("UniswapV2Library: INSUFFICIENT_LIQUIDITY")
+            avec_frais = montants[-1] * 997
+            montants.append(avec_frais * r_out // (r_in * 1000 + avec_frais))
+        return montants
+
+    def _maj_reserves(self, vue: _Vue, paire: str) -> None:
+        t0, t1 = self.tokens_paire[paire]
+        vue.ecrire(("reserves", paire), (vue.lire(("bal", t0, paire)), vue.lire(("bal", t1, paire))))
+
+    def _accumuler(self, vue: _Vue, chef: str, pid: int, compte: str, bloc: int) -> None:
+        pool = self.minichefs[chef]["pools"][pid]
+        depot = vue.lire(("depot", chef, pid, compte))
+        dernier = vue.lire(("depot_bloc", chef, pid, compte), bloc)
+        if depot and bloc > dernier:
+            gagne = depot * pool["taux"] * (bloc - dernier) // 10**18
+            vue.ecrire(("recompense", chef, pid, compte), vue.lire(("recompense", chef, pid, compte)) + gagne)
+        vue.ecrire(("depot_bloc", chef, pid, compte), bloc)
+
+    def _pool_chef(self, chef: str, pid: int) -> Dict[str, Any]:
+        pools = self.minichefs[chef]["pools"]
+        if not 0 <= pid < len(pools):
+            raise _Revert("MiniChef: invalid pid")
+        return pools[pid]
+
+    def _appeler(
+        self,
+        vue: _Vue,
+        emetteur: str,
+        cible: str,
+        data: bytes,
+        bloc: int,
+        horodatage: int,
+    ) -> Tuple[bytes, int]:
+        """Exécute un appel et retourne ``(données de retour, gas consommé hors intrinsèque)``."""
+        if len(data) < 4:
+            if cible in self.tokens or cible in self.routers or cible in self.minichefs:
+                raise _Revert("fallback non supporté")
+            return b"", 0  # transfert natif simple
+        nom = _NOMS_PAR_SELECTEUR.get(data[:4])
+        args = data[4:]
+        if nom is None:
+            raise _Revert(f"sélecteur inconnu 0x{data[:4].hex()}")
+        gas = GAS_PAR_APPEL.get(nom, 2_600)
+
+        # Multicall3
+        if cible == MULTICALL3_ADDRESS:
+            if nom == "getBlockNumber":
+                return encode(["uint256"], [bloc]), gas
+            if nom == "aggregate3":
+                (appels,) = decode(["(address,bool,bytes)[]"], args)
+                resultats = []
+                for sous_cible, tolerant, sous_data in appels:
+                    sous_vue = _Vue(vue)
+                    try:
+                        retour, sous_gas = self._appeler(
+                            sous_vue, emetteur, _adr(sous_cible), bytes(sous_data), bloc, horodatage
+                        )
+                    except _Revert as exc:
+                        if not tolerant:
+                            raise _Revert(f"Multicall3: call failed ({exc})") from exc
+                        resultats.append((False, str(exc).encode()))
+                        continue
+                    sous_vue.valider()
+                    gas += sous_gas
+                    resultats.append((True, retour))
+                return encode(["(bool,bytes)[]"], [resultats]), gas
+            raise _Revert("Multicall3: fonction non supportée")
+
+        # Router / factory
+        if cible in self.routers:
+            if nom == "getAmountsOut":
+                montant, chemin = decode(["uint256", "address[]"], args)
+                return encode(["uint256[]"], [self._montants_sortie(vue, montant, [_adr(a) for a in chemin])]), gas
+            if nom == "factory":
+                return encode(["address"], [cible]), gas
+            if nom == "getPair":
+                a, b = decode(["address", "address"], args)
+                paire = self.paires.get(tuple(sorted((_adr(a), _adr(b)))), ADRESSE_NULLE)  # type: ignore[arg-type]
+                return encode(["address"], [paire]), gas
+            if nom == "swapExactTokensForTokens":
+                montant, minimum, chemin, vers, echeance = decode(
+                    ["uint256", "uint256", "address[]", "address", "uint256"], args
+                )
+                if echeance < horodatage:
+                    raise _Revert("UniswapV2Router: EXPIRED")
+                chemin = [_adr(a) for a in chemin]
+                montants = self._montants_sortie(vue, montant, chemin)
+                if montants[-1] < minimum:
+                    raise _Revert("UniswapV2Router: INSUFFICIENT_OUTPUT_AMOUNT")
+                premiere = self._paire(chemin[0], chemin[1])
+                self._depenser_allowance(vue, chemin[0], emetteur, cible, montants[0])
+                self._transfert(vue, chemin[0], emetteur, premiere, montants[0])
+                for i, (a, b) in enumerate(zip(chemin, chemin[1:])):
+                    paire = self._paire(a, b)
+                    destinataire = self._paire(b, chemin[i + 2]) if i + 2 < len(chemin) else _adr(vers)
+                    self._transfert(vue, b, paire, destinataire, montants[i + 1])
+                    self._maj_reserves(vue, paire)
+                return encode(["uint256[]"], [montants]), gas + GAS_PAR_SAUT * (len(chemin) - 2)
+            if nom == "addLiquidity":
+                a, b, voulu_a, voulu_b, min_a, min_b, vers, echeance = decode(
+                    ["address", "address", "uint256", "uint256", "uint256", "uint256", "address", "uint256"], args
+                )
+                if echeance < horodatage:
+                    raise _Revert("UniswapV2Router: EXPIRED")
+                a, b = _adr(a), _adr(b)
+                if tuple(sorted((a, b))) not in self.paires:
+                    self.creer_paire(a, b)
+                paire, r_a, r_b = self._reserves_orientees(vue, a, b)
+                if r_a == 0 and r_b == 0:
+                    montant_a, montant_b = voulu_a, voulu_b
+                else:
+                    optimal_b = voulu_a * r_b // r_a
+                    if optimal_b <= voulu_b:
+                        if optimal_b < min_b:
+                            raise _Revert("UniswapV2Router: INSUFFICIENT_B_AMOUNT")
+                        montant_a, montant_b = voulu_a, optimal_b
+                    else:
+                        optimal_a = voulu_b * r_a // r_b
+                        if optimal_a < min_a:
+                            raise _Revert("UniswapV2Router: INSUFFICIENT_A_AMOUNT")
+                        montant_a, montant_b = optimal_a, voulu_b
+                self._depenser_allowance(vue, a, emetteur, cible, montant_a)
+                self._depenser_allowance(vue, b, emetteur, cible, montant_b)
+                self._transfert(vue, a, emetteur, paire, montant_a)
+                self._transfert(vue, b, emetteur, paire, montant_b)
+                offre = vue.lire(("supply", paire))
+                if offre == 0:
+                    liquidite = math.isqrt(montant_a * montant_b) - MINIMUM_LIQUIDITY
+                    self._mint(vue, paire, ADRESSE_NULLE, MINIMUM_LIQUIDITY)
+                    gas += GAS_PREMIERE_LIQUIDITE
+                else:
+                    liquidite = min(montant_a * offre // r_a, montant_b * offre // r_b)
+                if liquidite <= 0:
+                    raise _Revert("UniswapV2: INSUFFICIENT_LIQUIDITY_MINTED")
+                self._mint(vue, paire, _adr(vers), liquidite)
+                self._maj_reserves(vue, paire)
+                return encode(["uint256", "uint256", "uint256"], [montant_a, montant_b, liquidite]), gas
+            raise _Revert(f"router: fonction non supportée ({nom})")
+
+        # MiniChef
+        if cible in self.minichefs:
+            chef = self.minichefs[cible]
+            if nom == "poolLength":
+                return encode(["uint256"], [len(chef["pools"])]), gas
+            if nom == "lpToken":
+                (pid,) = decode(["uint256"], args)
+                return encode(["address"], [self._pool_chef(cible, pid)["lp"]]), gas
+            if nom in ("userInfo", "pendingSushi"):
+                pid, compte = decode(["uint256", "address"], args)
+                compte = _adr(compte)
+                self._pool_chef(cible, pid)
+                lecture = _Vue(vue)
+                self._accumuler(lecture, cible, pid, compte, bloc)
+                if nom == "userInfo":
+                    return encode(["uint256", "int256"], [lecture.lire(("depot", cible, pid, compte)), 0]), gas
+                return encode(["uint256"], [lecture.lire(("recompense", cible, pid, compte))]), gas
+            if nom == "deposit":
+                pid, montant, vers = decode(["uint256", "uint256", "address"], args)
+                pool, vers = self._pool_chef(cible, pid), _adr(vers)
+                self._accumuler(vue, cible, pid, vers, bloc)
+                self._depenser_allowance(vue, pool["lp"], emetteur, cible, montant)
+                self._transfert(vue, pool["lp"], emetteur, cible, montant)
+                vue.ecrire(("depot", cible, pid, vers), vue.lire(("depot", cible, pid, vers)) + montant)
+                return b"", gas
+            if nom == "withdraw":
+                pid, montant, vers = decode(["uint256", "uint256", "address"], args)
+                pool = self._pool_chef(cible, pid)
+                self._accumuler(vue, cible, pid, emetteur, bloc)
+                depot = vue.lire(("depot", cible, pid, emetteur))
+                if depot < montant:
+                    raise _Revert("MiniChef: withdraw amount exceeds deposit")
+                vue.ecrire(("depot", cible, pid, emetteur), depot - montant)
+                self._transfert(vue, pool["lp"], cible, _adr(vers), montant)
+                return b"", gas
+            if nom == "harvest":
+                pid, vers = decode(["uint256", "address"], args)
+                self._pool_chef(cible, pid)
+                self._accumuler(vue, cible, pid, emetteur, bloc)
+                du = vue.lire(("recompense", cible, pid, emetteur))
+                if du:
+                    vue.ecrire(("recompense", cible, pid, emetteur), 0)
+                    self._mint(vue, chef["recompense"], _adr(vers), du)
+                return b"", gas
+            raise _Revert(f"minichef: fonction non supportée ({nom})")
+
+        # Paire (getReserves/token0/token1) puis ERC-20 (tokens et LP)
+        if cible in self.tokens_paire:
+            t0, t1 = self.tokens_paire[cible]
+            if nom == "getReserves":
+                r0, r1 = vue.lire(("reserves", cible), (0, 0))
+                return encode(["uint112", "uint112", "uint32"], [r0, r1, horodatage % 2**32]), gas
+            if nom == "token0":
+                return encode(["address"], [t0]), gas
+            if nom == "token1":
+                return encode(["address"], [t1]), gas
+        if cible in self.tokens:
+            symbole, decimales = self.tokens[cible]
+            if nom == "decimals":
+                return encode(["uint8"], [decimales]), gas
+            if nom in ("symbol", "name"):
+                return encode(["string"], [symbole]), gas
+            if nom == "totalSupply":
+                return encode(["uint256"], [vue.lire(("supply", cible))]), gas
+            if nom == "balanceOf":
+                (compte,) = decode(["address"], args)
+                return encode(["uint256"], [vue.lire(("bal", cible, _adr(compte)))]), gas
+            if nom == "allowance":
+                proprietaire, spender = decode(["address", "address"], args)
+                return encode(["uint256"], [vue.lire(("allow", cible, _adr(proprietaire), _adr(spender)))]), gas
+            if nom == "approve":
+                spender, montant = decode(["address", "uint256"], args)
+                vue.ecrire(("allow", cible, emetteur, _adr(spender)), montant)
+                return encode(["bool"], [True]), gas
+            if nom == "transfer":
+                vers, montant = decode(["address", "uint256"], args)
+                self._transfert(vue, cible, emetteur, _adr(vers), montant)
+                return encode(["bool"], [True]), gas
+            if nom == "transferFrom":
+                de, vers, montant = decode(["address", "address", "uint256"], args)
+                self._depenser_allowance(vue, cible, _adr(de), emetteur, montant)
+                self._transfert(vue, cible, _adr(de), _adr(vers), montant)
+                return encode(["bool"], [True]), gas
+        raise _Revert(f"aucun contrat ne répond à {nom} sur {cible}")
+
+    def _simuler(self, appel: Dict[str, Any]) -> Tuple[bytes, int]:
+        """Exécute un appel sur une vue jetable (``eth_call`` / ``eth_estimateGas``)."""
+        vue = _Vue(self._etat)
+        emetteur = _adr(appel.get("from") or ADRESSE_NULLE)
+        cible = _adr(appel.get("to") or ADRESSE_NULLE)
+        data = _octets(appel.get("data") or appel.get("input"))
+        bloc = self.numero_bloc + 1
+        retour, gas = self._appeler(vue, emetteur, cible, data, bloc, self._horodatage_bloc(bloc))
+        return retour, GAS_INTRINSEQUE + gas + 16 * len(data)
+
+    def _executer_tx(self, tx: Dict[str, Any], bloc: int, hash_bloc: str, index: int, cumul: int) -> Dict[str, Any]:
+        emetteur = tx["from"]
+        prix = tx["effectiveGasPrice"]
+        self._etat.donnees[("nonce", emetteur)] = tx["nonce"] + 1
+        vue = _Vue(self._etat)
+        status = 1
+        retour = b""
+        try:
+            retour, gas_appel = self._appeler(
+                vue, emetteur, tx["to"], tx["data"], bloc, self._horodatage_bloc(bloc)
+            )
+            gas_utilise = GAS_INTRINSEQUE + gas_appel + 16 * len(tx["data"])
+            if gas_utilise > tx["gas"]:
+                raise _ManqueDeGas()
+            if tx["value"]:
+                solde = vue.lire(("natif", emetteur))
+                if solde < tx["value"]:
+                    raise _Revert("insufficient value")
+                vue.ecrire(("natif", emetteur), solde - tx["value"])
+                vue.ecrire(("natif", tx["to"]), vue.lire(("natif", tx["to"])) + tx["value"])
+        except _ManqueDeGas:
+            status, gas_utilise = 0, tx["gas"]
+        except _Revert as exc:
+            status, gas_utilise = 0, min(GAS_INTRINSEQUE + 16 * len(tx["data"]) + 2_600, tx["gas"])
+            logger.debug("Tx %s annulée: %s", tx["hash"], exc)
+        d = self._etat.donnees
+        d[("natif", emetteur)] = d.get(("natif", emetteur), 0) - gas_utilise * prix
+        logs: List[Dict[str, Any]] = []
+        if status == 1:
+            self._etat.appliquer(vue.ecritures)
+            logs = vue.logs
+        recu = {
+            "transactionHash": tx["hash"],
+            "transactionIndex": index,
+            "blockHash": hash_bloc,
+            "blockNumber": bloc,
+            "from": emetteur,
+            "to": tx["to"],
+            "cumulativeGasUsed": cumul + gas_utilise,
+            "gasUsed": gas_utilise,
+            "effectiveGasPrice": prix,
+            "contractAddress": None,
+            "logs": [
+                {
+                    **log,
+                    "logIndex": i,
+                    "blockHash": hash_bloc,
+                    "blockNumber": bloc,
+                    "transactionHash": tx["hash"],
+                    "transactionIndex": index,
+                    "removed": False,
+                }
+                for i, log in enumerate(logs)
+            ],
+            "logsBloom": "0x" + "00" * 256,
+            "status": status,
+            "type": tx["type"],
+            "_cumul": cumul + gas_utilise,
+            "_retour": retour,
+        }
+        tx["blockNumber"], tx["blockHash"], tx["transactionIndex"] = bloc, hash_bloc, index
+        self._recus[tx["hash"]] = recu
+        return recu
+
+    def _decoder_tx_brute(self, brute: bytes) -> Dict[str, Any]:
+        if not brute:
+            raise _ErreurRPC(-32602, "transaction vide")
+        if brute[0] >= 0xC0:
+            champs = rlp.decode(brute)
+            nonce, prix, gas, vers, valeur, data = champs[:6]
+            type_tx, max_fee, tip = 0, _entier(prix), _entier(prix)
+        elif brute[0] == 0x02:
+            champs = rlp.decode(brute[1:])
+            _, nonce, tip, max_fee, gas, vers, valeur, data = champs[:8]
+            type_tx, max_fee, tip = 2, _entier(max_fee), _entier(tip)
+        elif brute[0] == 0x01:
+            champs = rlp.decode(brute[1:])
+            _, nonce, prix, gas, vers, valeur, data = champs[:7]
+            type_tx, max_fee, tip = 1, _entier(prix), _entier(prix)
+        else:
+            raise _ErreurRPC(-32602, f"type de transaction non supporté: {brute[0]}")
+        emetteur = _adr(Account.recover_transaction(brute))
+        if type_tx == 2:
+            if max_fee < self.base_fee_wei:
+                raise _ErreurRPC(-32000, "max fee per gas less than block base fee")
+            effectif = min(max_fee, self.base_fee_wei + tip)
+        else:
+            if max_fee < self.base_fee_wei:
+                raise _ErreurRPC(-32000, "transaction underpriced")
+            effectif = max_fee
+        return {
+            "hash": "0x" + keccak(brute).hex(),
+            "from": emetteur,
+            "to": _adr(vers) if vers else None,
+            "nonce": _entier(nonce),
+            "gas": _entier(gas),
+            "value": _entier(valeur),
+            "data": bytes(data),
+            "type": type_tx,
+            "maxFeePerGas": max_fee,
+            "maxPriorityFeePerGas": tip,
+            "effectiveGasPrice": effectif,
+        }
+
+    # ------------------------------------------------------------------
+    # JSON-RPC
+    # ------------------------------------------------------------------
+    def _format_bloc(self, bloc: Dict[str, Any], complet: bool) -> Dict[str, Any]:
+        return {
+            "number": _hex(bloc["number"]),
+            "hash": bloc["hash"],
+            "parentHash": bloc["parentHash"],
+            "timestamp": _hex(bloc["timestamp"]),
+            "baseFeePerGas": _hex(bloc["baseFeePerGas"]),
+            "gasLimit": _hex(bloc["gasLimit"]),
+            "gasUsed": _hex(bloc["gasUsed"]),
+            "miner": ADRESSE_NULLE,
+            "extraData": "0x",
+            "difficulty": "0x0",
+            "totalDifficulty": "0x0",
+            "nonce": "0x0000000000000000",
+            "mixHash": "0x" + "00" * 32,
+            "sha3Uncles": "0x" + "00" * 32,
+            "logsBloom": "0x" + "00" * 256,
+            "stateRoot": "0x" + "00" * 32,
+            "transactionsRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32,
+            "size": "0x0",
+            "uncles": [],
+            "transactions": [self._format_tx(self._txs[h]) for h in bloc["transactions"]]
+            if complet
+            else list(bloc["transactions"]),
+        }
+
+    def _format_tx(self, tx: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "hash": tx["hash"],
+            "from": tx["from"],
+            "to": tx["to"],
+            "nonce": _hex(tx["nonce"]),
+            "gas": _hex(tx["gas"]),
+            "value": _hex(tx["value"]),
+            "input": "0x" + tx["data"].hex(),
+            "type": _hex(tx["type"]),
+            "gasPrice": _hex(tx["effectiveGasPrice"]),
+            "maxFeePerGas": _hex(tx["maxFeePerGas"]),
+            "maxPriorityFeePerGas": _hex(tx["maxPriorityFeePerGas"]),
+            "chainId": _hex(self.chain_id),
+            "blockNumber": _hex(tx["blockNumber"]) if tx.get("blockNumber") is not None else None,
+            "blockHash": tx.get("blockHash"),
+            "transactionIndex": _hex(tx["transactionIndex"]) if tx.get("transactionIndex") is not None else None,
+            "v": "0x0",
+            "r": "0x0",
+            "s": "0x0",
+        }
+
+    def _format_recu(self, recu: Dict[str, Any]) -> Dict[str, Any]:
+        sortie = {k: v for k, v in recu.items() if not k.startswith("_")}
+        for cle in ("transactionIndex", "blockNumber", "cumulativeGasUsed", "gasUsed", "effectiveGasPrice", "status", "type"):
+            sortie[cle] = _hex(sortie[cle])
+        sortie["logs"] = [
+            {**log, "logIndex": _hex(log["logIndex"]), "blockNumber": _hex(log["blockNumber"]),
+             "transactionIndex": _hex(log["transactionIndex"])}
+            for log in recu["logs"]
+        ]
+        return sortie
+
+    def _bloc_par_tag(self, tag: Any) -> Optional[Dict[str, Any]]:
+        if tag in (None, "latest", "pending", "safe", "finalized"):
+            return self.blocs[-1]
+        if tag == "earliest":
+            return self.blocs[0]
+        numero = _entier(tag)
+        return self.blocs[numero] if 0 <= numero < len(self.blocs) else None
+
+    def _methodes(self) -> Dict[str, Callable[[List[Any]], Any]]:
+        return {
+            "web3_clientVersion": lambda p: "DeFiPilot/FakeChain/V6.1.0",
+            "net_version": lambda p: str(self.chain_id),
+            "net_listening": lambda p: True,
+            "eth_chainId": lambda p: _hex(self.chain_id),
+            "eth_syncing": lambda p: False,
+            "eth_accounts": lambda p: [],
+            "eth_blockNumber": lambda p: _hex(self.numero_bloc),
+            "eth_gasPrice": lambda p: _hex(self.base_fee_wei + self.priority_fee_wei),
+            "eth_maxPriorityFeePerGas": lambda p: _hex(self.priority_fee_wei),
+            "eth_feeHistory": self._rpc_fee_history,
+            "eth_getBalance": lambda p: _hex(self._etat.lire(("natif", _adr(p[0])))),
+            "eth_getCode": lambda p: "0x60" if self._est_contrat(_adr(p[0])) else "0x",
+            "eth_getTransactionCount": self._rpc_nonce,
+            "eth_getBlockByNumber": self._rpc_bloc,
+            "eth_call": self._rpc_call,
+            "eth_estimateGas": self._rpc_estimate,
+            "eth_sendRawTransaction": self._rpc_send,
+            "eth_getTransactionReceipt": self._rpc_recu,
+            "eth_getTransactionByHash": lambda p: self._format_tx(self._txs[p[0]]) if p[0] in self._txs else None,
+        }
+
+    def _est_contrat(self, adresse: str) -> bool:
+        return (
+            adresse == MULTICALL3_ADDRESS
+            or adresse in self.tokens
+            or adresse in self.routers
+            or adresse in self.minichefs
+        )
+
+    def _rpc_fee_history(self, p: List[Any]) -> Dict[str, Any]:
+        nb = max(1, min(_entier(p[0]), self.numero_bloc + 1))
+        percentiles = p[2] if len(p) > 2 and p[2] else []
+        dernier = self.numero_bloc
+        return {
+            "oldestBlock": _hex(dernier - nb + 1),
+            "baseFeePerGas": [_hex(self.base_fee_wei)] * (nb + 1),
+            "gasUsedRatio": [self.blocs[n]["gasUsed"] / self.gas_limit_bloc for n in range(dernier - nb + 1, dernier + 1)],
+            "reward": [[_hex(self.priority_fee_wei) for _ in percentiles] for _ in range(nb)],
+        }
+
+    def _rpc_nonce(self, p: List[Any]) -> str:
+        compte = _adr(p[0])
+        nonce = int(self._etat.lire(("nonce", compte)))
+        if len(p) > 1 and p[1] == "pending":
+            file = self._mempool.get(compte, {})
+            while nonce in file:
+                nonce += 1
+        return _hex(nonce)
+
+    def _rpc_bloc(self, p: List[Any]) -> Optional[Dict[str, Any]]:
+        bloc = self._bloc_par_tag(p[0] if p else "latest")
+        return self._format_bloc(bloc, bool(p[1]) if len(p) > 1 else False) if bloc else None
+
+    def _rpc_call(self, p: List[Any]) -> str:
+        try:
+            retour, _ = self._simuler(p[0])
+        except _Revert as exc:
+            raise _ErreurRPC(3, f"execution reverted: {exc}", "0x") from exc
+        return "0x" + retour.hex()
+
+    def _rpc_estimate(self, p: List[Any]) -> str:
+        try:
+            _, gas = self._simuler(p[0])
+        except _Revert as exc:
+            raise _ErreurRPC(3, f"execution reverted: {exc}", "0x") from exc
+        return _hex(gas)
+
+    def _rpc_send(self, p: List[Any]) -> str:
+        tx = self._decoder_tx_brute(_octets(p[0]))
+        emetteur = tx["from"]
+        attendu = int(self._etat.lire(("nonce", emetteur)))
+        if tx["nonce"] < attendu:
+            raise _ErreurRPC(-32000, f"nonce too low: next nonce {attendu}, tx nonce {tx['nonce']}")
+        file = self._mempool.setdefault(emetteur, {})
+        if tx["nonce"] in file:
+            raise _ErreurRPC(-32000, "replacement transaction underpriced")
+        cout_max = tx["gas"] * tx["maxFeePerGas"] + tx["value"]
+        if self._etat.lire(("natif", emetteur)) < cout_max:
+            raise _ErreurRPC(-32000, "insufficient funds for gas * price + value")
+        file[tx["nonce"]] = tx
+        self._txs[tx["hash"]] = tx
+        if self.block_time_s <= 0:
+            for pret in self._txs_executables():
+                self._miner_bloc([pret])
+        return tx["hash"]
+
+    def _rpc_recu(self, p: List[Any]) -> Optional[Dict[str, Any]]:
+        recu = self._recus.get(p[0])
+        return self._format_recu(recu) if recu else None
+
+    def requete(self, methode: str, params: Optional[List[Any]] = None, id_requete: Any = 1) -> Dict[str, Any]:
+        """Traite une requête JSON-RPC et retourne la réponse (``result`` ou ``error``)."""
+        if self.latence_rpc_s:
+            time.sleep(self.latence_rpc_s)
+        with self._lock:
+            self.appels[methode] += 1
+            self._avancer()
+            gestionnaire = self._methodes().get(methode)
+            if gestionnaire is None:
+                return {"jsonrpc": "2.0", "id": id_requete, "error": {"code": -32601, "message": f"method not found: {methode}"}}
+            try:
+                resultat = gestionnaire(list(params or []))
+            except _ErreurRPC as exc:
+                erreur: Dict[str, Any] = {"code": exc.code, "message": str(exc)}
+                if exc.data is not None:
+                    erreur["data"] = exc.data
+                return {"jsonrpc": "2.0", "id": id_requete, "error": erreur}
+            except Exception as exc:
+                logger.exception("Erreur interne FakeChain sur %s", methode)
+                return {"jsonrpc": "2.0", "id": id_requete, "error": {"code": -32603, "message": str(exc)}}
+            return {"jsonrpc": "2.0", "id": id_requete, "result": resultat}
+
+    # ------------------------------------------------------------------
+    # Points d'entrée
+    # ------------------------------------------------------------------
+    def provider(self) -> "FakeChainProvider":
+        return FakeChainProvider(self)
+
+    def demarrer_serveur_http(self, hote: str = "127.0.0.1", port: int = 0) -> str:
+        """Expose la chaîne en HTTP JSON-RPC local et retourne son URL."""
+        if self._serveur is not None:
+            return f"http://{hote}:{self._serveur.server_address[1]}"
+        chaine = self
+
+        class _Gestionnaire(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - API http.server
+                corps = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                try:
+                    requete = json.loads(corps)
+                except ValueError:
+                    self.send_error(400)
+                    return
+                if isinstance(requete, list):
+                    reponse: Any = [chaine.requete(r.get("method"), r.get("params"), r.get("id")) for r in requete]
+                else:
+                    reponse = chaine.requete(requete.get("method"), requete.get("params"), requete.get("id"))
+                donnees = json.dumps(reponse).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(donnees)))
+                self.end_headers()
+                self.wfile.write(donnees)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        self._serveur = ThreadingHTTPServer((hote, port), _Gestionnaire)
+        self._serveur.daemon_threads = True
+        Thread(target=self._serveur.serve_forever, name="defipilot-fake-chain", daemon=True).start()
+        return f"http://{hote}:{self._serveur.server_address[1]}"
+
+    def arreter_serveur_http(self) -> None:
+        if self._serveur is not None:
+            self._serveur.shutdown()
+            self._serveur.server_close()
+            self._serveur = None
+
+
+class FakeChainProvider(BaseProvider):
+    """Provider Web3 en processus branché sur une :class:`FakeChain`."""
+
+    def __init__(self, chaine: FakeChain) -> None:
+        super().__init__()
+        self.chaine = chaine
+        self.endpoint_uri = f"fake-chain://{id(chaine)}"
+
+    def make_request(self, method: Any, params: Any) -> Dict[str, Any]:
+        return self.chaine.requete(str(method), list(params or []))
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
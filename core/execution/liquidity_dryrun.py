@@ -99,11 +99,26 @@ def _estimate_lp(
 
 # -------------------------------- Fonction publique --------------------------------
 
+def _reserves_depuis_cotation(pool: Dict[str, Any], quote_service: Any) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+    """Ratio de prix A→B coté (route directe) utilisé comme pseudo-réserves (1, prix)."""
+    token_a = pool.get("tokenA_address")
+    token_b = pool.get("tokenB_address")
+    if not token_a or not token_b:
+        return None, None
+    decA = int(pool.get("decimalsA", 6))
+    decB = int(pool.get("decimalsB", 18))
+    quote = quote_service.coter(token_a, token_b, 10**decA, chemins=[[token_a, token_b]], net_de_gas=False)
+    if not quote.amount_out:
+        return None, None
+    return Decimal("1"), Decimal(quote.amount_out) / (Decimal(10) ** decB)
+
+
 def ajouter_liquidite_dryrun(
     pool: Dict[str, Any],
     amountA: float,
     amountB: float,
     slippage_bps: int = 50,
+    quote_service: Optional[Any] = None,
 ) -> Dict[str, Any]:
     """Simule un ajout de liquidité (dry-run) sans appel réseau.
 
@@ -112,6 +127,9 @@ def ajouter_liquidite_dryrun(
         amountA: Montant du token A (unités humaines)
         amountB: Montant du token B (unités humaines)
         slippage_bps: Tolérance de slippage en basis points (50 = 0.5%)
+        quote_service: ``QuoteService`` optionnel ; si les réserves sont absentes et
+            que la pool fournit ``tokenA_address``/``tokenB_address``, le ratio est
+            déduit d'une cotation (seul appel réseau, mis en cache par bloc).
     """
     if amountA <= 0 or amountB <= 0:
         raise ValueError("Les montants doivent être strictement positifs")
@@ -123,6 +141,11 @@ def ajouter_liquidite_dryrun(
     resA = _to_decimal(pool["reservesA"]) if "reservesA" in pool else None
     resB = _to_decimal(pool["reservesB"]) if "reservesB" in pool else None
     total_lp = _to_decimal(pool["totalSupplyLP"]) if "totalSupplyLP" in pool else None
+    prix_cote: Optional[Decimal] = None
+    if quote_service is not None and (resA is None or resB is None):
+        ratioA, ratioB = _reserves_depuis_cotation(pool, quote_service)
+        if ratioA is not None and ratioB is not None:
+            resA, resB, prix_cote = ratioA, ratioB, ratioB
 
     amtA = _to_decimal(amountA)
     amtB = _to_decimal(amountB)
@@ -134,7 +157,11 @@ def ajouter_liquidite_dryrun(
 
     amtA_eff, amtB_eff, ratio_contraint = _enforce_ratio(amtA_eff, amtB_eff, resA, resB)
 
-    lp_estime, detail = _estimate_lp(amtA_eff, amtB_eff, resA, resB, total_lp)
+    if prix_cote is not None:
+        # Pseudo-réserves issues de la cotation : seul le ratio est significatif
+        lp_estime, detail = _estimate_lp(amtA_eff, amtB_eff, None, None, None)
+    else:
+        lp_estime, detail = _estimate_lp(amtA_eff, amtB_eff, resA, resB, total_lp)
 
     # ID de run utile pour tracer la simulation
     run_id = str(uuid4())
@@ -153,6 +180,7 @@ def ajouter_liquidite_dryrun(
         "slippage_applique_pct": float(slippage_pct),
         "ratio_contraint": ratio_contraint,
         "details": detail,
+        "prix_cote_B_par_A": float(prix_cote) if prix_cote is not None else None,
     }
 
 
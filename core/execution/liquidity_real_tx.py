@@ -23,11 +23,17 @@ from web3.exceptions import ContractLogicError, ABIFunctionNotFound
 
 from core.real_wallet import get_wallet_address, get_private_key
 from core.execution.journal import enregistrer_liquidity_csv, enregistrer_liquidity_jsonl
+from core.gas_estimator import activer_oracle_reseau
+from core.gas_limit_cache import cache_partage, cle_depuis_fonction
+from core.gas_oracle import obtenir_oracle
 
 logger = logging.getLogger(__name__)
 
 # Dossier ABI relatif à ce fichier (fonctionne sous Windows/Linux)
 ABI_DIR = Path(__file__).resolve().parent / "abis"
+if not ABI_DIR.is_dir():
+    # Module déplacé dans core/execution/ : les ABI sont restées dans core/abis/
+    ABI_DIR = Path(__file__).resolve().parent.parent / "abis"
 
 
 # =====================
@@ -171,6 +177,7 @@ def ajouter_liquidite_reelle(
                 or (getattr(w3, "isConnected", None) and w3.isConnected())
             ):
                 raise RuntimeError("Web3 non connecté")
+            activer_oracle_reseau(w3, str(chain).lower())
 
             wallet_cs = _to_checksum(w3, wallet)
             tokenA_cs = _to_checksum(w3, tokenA_address)
@@ -195,9 +202,9 @@ def ajouter_liquidite_reelle(
             amountB_min_wei = _to_wei(amountBMin, decB)
 
             try:
-                gas_price = w3.eth.gas_price
+                frais = obtenir_oracle(w3).frais_transaction("normal")
             except Exception:
-                gas_price = int(30 * 1e9)
+                frais = {"gasPrice": int(30 * 1e9)}
 
             nonce = w3.eth.get_transaction_count(wallet_cs)
             private_key = get_private_key(wallet_name)
@@ -211,7 +218,7 @@ def ajouter_liquidite_reelle(
                     tokenA_symbol, tokenB_symbol, amountA, amountB, slippage,
                 )
             else:
-                tx = router_contract.functions.addLiquidity(
+                add_fn = router_contract.functions.addLiquidity(
                     tokenA_cs,
                     tokenB_cs,
                     amountA_wei,
@@ -220,19 +227,27 @@ def ajouter_liquidite_reelle(
                     amountB_min_wei,
                     wallet_cs,
                     deadline_ts,
-                ).build_transaction({
+                )
+                tx_params = {
                     "from": wallet_cs,
-                    "gasPrice": gas_price,
+                    **frais,
                     "nonce": nonce,
                     "chainId": w3.eth.chain_id,
-                })
-                try:
-                    tx["gas"] = w3.eth.estimate_gas(tx)
-                except Exception:
-                    tx["gas"] = 600000
+                }
+                gas_key = cle_depuis_fonction(add_fn, 2)
+                learned_gas = cache_partage().limite(gas_key)
+                if learned_gas is not None:
+                    tx = add_fn.build_transaction({**tx_params, "gas": learned_gas})
+                else:
+                    tx = add_fn.build_transaction(tx_params)
+                    try:
+                        tx["gas"] = w3.eth.estimate_gas(tx)
+                    except Exception:
+                        tx["gas"] = 600000
                 signed_tx = w3.eth.account.sign_transaction(tx, private_key)
                 tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
                 receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+                cache_partage().observer_recu(gas_key, receipt, tx["gas"])
 
                 success = (receipt.status == 1)
                 tx_hash_str = tx_hash.hex()
@@ -0,0 +1,60 @@
+# core/execution/nonce_manager.py – V6.1.0
+"""Gestion locale des nonces d'un wallet pour l'envoi de transactions concurrentes.
+
+Le nonce est lu une seule fois sur la chaîne (compteur ``pending``), puis
+attribué localement de façon atomique. Les appels concurrents ne relisent
+donc plus ``eth_getTransactionCount`` et ne risquent pas d'obtenir deux fois
+le même nonce.
+"""
+
+from __future__ import annotations
+
+import logging
+from threading import Lock
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["NonceManager"]
+
+
+class NonceManager:
+    """Distributeur de nonces thread-safe pour une adresse donnée."""
+
+    def __init__(self, fetch_pending: Callable[[], int]) -> None:
+        self._fetch_pending = fetch_pending
+        self._lock = Lock()
+        self._next: Optional[int] = None
+
+    @classmethod
+    def depuis_web3(cls, w3: Any, address: str) -> "NonceManager":
+        """Construit un gestionnaire lisant le compteur ``pending`` via Web3."""
+        return cls(lambda: int(w3.eth.get_transaction_count(address, "pending")))
+
+    def prochain(self) -> int:
+        """Réserve et retourne le prochain nonce disponible."""
+        with self._lock:
+            if self._next is None:
+                self._next = int(self._fetch_pending())
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def liberer(self, nonce: int) -> bool:
+        """Rend un nonce réservé mais jamais diffusé.
+
+        Seul le dernier nonce attribué peut être rendu ; sinon un trou serait
+        créé dans la séquence et le gestionnaire est resynchronisé.
+        """
+        with self._lock:
+            if self._next is not None and nonce == self._next - 1:
+                self._next = nonce
+                return True
+        logger.warning("Nonce %s non rendu (hors séquence) → resynchronisation", nonce)
+        self.resynchroniser()
+        return False
+
+    def resynchroniser(self) -> None:
+        """Force une relecture du compteur ``pending`` au prochain appel."""
+        with self._lock:
+            self._next = None
@@ -1,25 +1,210 @@
 # ✅ Module d’estimation de gas à partir de config.json
+#
+# V6.1.0 : la configuration est chargée une seule fois (plus d'I/O par appel)
+# et, si un oracle de gas est enregistré pour le réseau, l'estimation USD est
+# calculée à partir des frais en cache (unités de gas × prix effectif × prix
+# du token natif). Les valeurs statiques de config.json restent le repli.
+# ``activer_oracle_reseau`` est appelé là où une instance Web3 est créée :
+# il démarre l'oracle partagé de l'endpoint et l'associe à une source de prix
+# du token natif (cotation routeur, repli ``prix_natif_usd`` de config.json).
 
 import json
+import logging
 import os
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
 
 CONFIG_PATH = "config.json"
 
+# Unités de gas typiques par opération (Uniswap V2 / SushiSwap)
+GAS_UNITS_PAR_OPERATION: Dict[str, int] = {
+    "approve": 46_000,
+    "swap": 150_000,
+    "add_liquidity": 200_000,
+    "stake": 120_000,
+    "harvest": 110_000,
+    "unstake": 130_000,
+}
+
+_config_cache: Optional[Dict[str, Any]] = None
+_config_lock = Lock()
+PRIX_NATIF_TTL_S = 60.0
+
+# réseau → (routeur V2, token natif wrappé, stablecoin USD, décimales du stablecoin)
+ROUTES_PRIX_NATIF: Dict[str, Tuple[str, str, str, int]] = {
+    "polygon": (
+        "0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506",  # SushiSwap V2
+        "0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270",  # WMATIC
+        "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174",  # USDC.e
+        6,
+    ),
+    "ethereum": (
+        "0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F",  # SushiSwap V2
+        "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2",  # WETH
+        "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48",  # USDC
+        6,
+    ),
+}
+
+_GET_AMOUNTS_OUT_ABI = [
+    {
+        "inputs": [
+            {"name": "amountIn", "type": "uint256"},
+            {"name": "path", "type": "address[]"},
+        ],
+        "name": "getAmountsOut",
+        "outputs": [{"name": "amounts", "type": "uint256[]"}],
+        "stateMutability": "view",
+        "type": "function",
+    }
+]
+
+SourcePrix = Union[float, Callable[[], float]]
+
+_oracles_reseau: Dict[str, Tuple[Any, SourcePrix, str]] = {}
+_prix_natif: Dict[str, Tuple[float, float]] = {}
+
+
 def charger_config():
     if not os.path.exists(CONFIG_PATH):
         raise FileNotFoundError("Le fichier config.json est introuvable")
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
         return json.load(f)
 
+
+def _config() -> Dict[str, Any]:
+    global _config_cache
+    if _config_cache is None:
+        with _config_lock:
+            if _config_cache is None:
+                _config_cache = charger_config()
+    return _config_cache
+
+
+def recharger_config() -> None:
+    """Invalide la configuration en cache (relue au prochain appel)."""
+    global _config_cache
+    with _config_lock:
+        _config_cache = None
+
+
+def enregistrer_oracle(reseau: str, oracle: Any, prix_natif_usd: SourcePrix, mode: str = "normal") -> None:
+    """Associe un ``GasOracle`` et le prix USD du token natif à un réseau.
+
+    ``prix_natif_usd`` est un prix fixe ou une source (callable) interrogée
+    au plus une fois par ``PRIX_NATIF_TTL_S``.
+    """
+    if not callable(prix_natif_usd):
+        prix_natif_usd = float(prix_natif_usd)
+    _oracles_reseau[reseau] = (oracle, prix_natif_usd, mode)
+    _prix_natif.pop(reseau, None)
+
+
+def prix_natif_config(reseau: str) -> Optional[float]:
+    """Prix USD du token natif dans config.json (section ``prix_natif_usd``), si présent."""
+    try:
+        prix = _config().get("prix_natif_usd", {}).get(reseau)
+    except (FileNotFoundError, AttributeError):
+        return None
+    return float(prix) if isinstance(prix, (int, float)) and prix > 0 else None
+
+
+def source_prix_natif(w3: Any, reseau: str) -> Callable[[], float]:
+    """Source du prix USD du token natif : cotation ``getAmountsOut`` natif → USDC.
+
+    Sans route connue pour le réseau ou si la cotation échoue, le prix de
+    config.json est utilisé ; ``ValueError`` si aucun n'est disponible.
+    """
+    route = ROUTES_PRIX_NATIF.get(reseau)
+
+    def prix() -> float:
+        if route is not None:
+            routeur, natif, stable, decimales = route
+            try:
+                contrat = w3.eth.contract(address=w3.to_checksum_address(routeur), abi=_GET_AMOUNTS_OUT_ABI)
+                chemin = [w3.to_checksum_address(natif), w3.to_checksum_address(stable)]
+                montants = contrat.functions.getAmountsOut(10**18, chemin).call()
+                return int(montants[-1]) / 10**decimales
+            except Exception as exc:
+                logger.debug("Cotation du token natif %s impossible : %s", reseau, exc)
+        repli = prix_natif_config(reseau)
+        if repli is None:
+            raise ValueError(f"Prix du token natif indisponible pour {reseau}")
+        return repli
+
+    return prix
+
+
+def activer_oracle_reseau(
+    w3: Any,
+    reseau: str,
+    prix_natif_usd: Optional[SourcePrix] = None,
+    mode: str = "normal",
+) -> Optional[Any]:
+    """Démarre l'oracle de gas de l'endpoint de ``w3`` et l'enregistre pour ``reseau``.
+
+    Appelé à la création des instances Web3 d'exécution ; un échec est
+    journalisé et n'empêche pas la transaction (``None`` retourné).
+    """
+    try:
+        from core.gas_oracle import obtenir_oracle
+
+        oracle = obtenir_oracle(w3, demarrer=True)
+        enregistrer_oracle(reseau, oracle, prix_natif_usd if prix_natif_usd is not None else source_prix_natif(w3, reseau), mode)
+        return oracle
+    except Exception as exc:
+        logger.warning("Oracle de gas non activé pour %s : %s", reseau, exc)
+        return None
+
+
+def _prix_natif_usd(reseau: str, source: SourcePrix) -> Optional[float]:
+    if not callable(source):
+        return source
+    en_cache = _prix_natif.get(reseau)
+    if en_cache is not None and monotonic() - en_cache[1] <= PRIX_NATIF_TTL_S:
+        return en_cache[0]
+    try:
+        prix = float(source())
+    except Exception as exc:
+        logger.debug("Prix natif indisponible pour %s : %s", reseau, exc)
+        return en_cache[0] if en_cache is not None else None
+    _prix_natif[reseau] = (prix, monotonic())
+    return prix
+
+
+def _estimation_live(operation: str, reseau: str) -> Optional[float]:
+    entree = _oracles_reseau.get(reseau)
+    unites = GAS_UNITS_PAR_OPERATION.get(operation)
+    if entree is None or unites is None:
+        return None
+    oracle, source, mode = entree
+    prix_wei = oracle.prix_effectif_wei(mode, rpc=False)
+    if prix_wei is None:
+        return None
+    prix_natif_usd = _prix_natif_usd(reseau, source)
+    if prix_natif_usd is None:
+        return None
+    return unites * prix_wei / 1e18 * prix_natif_usd
+
+
 def estimer_cout_gas(operation: str, reseau: str) -> float:
     """
     Estime le coût en $ de gas pour une opération donnée sur un réseau donné.
 
+    Utilise les frais en cache de l'oracle enregistré pour le réseau, sinon
+    la valeur statique ``gas_simulation`` de config.json.
+
     :param operation: "swap" ou "add_liquidity"
     :param reseau: "polygon" ou "ethereum"
     :return: coût estimé en USD
     """
-    config = charger_config()
+    live = _estimation_live(operation, reseau)
+    if live is not None:
+        return live
+    config = _config()
     try:
         return config["gas_simulation"][operation][reseau]
     except KeyError:
@@ -0,0 +1,214 @@
+# core/gas_limit_cache.py – V6.1.0
+"""Cache appris des gas limits par (contrat, sélecteur, forme de l'appel).
+
+Les opérations répétitives (approve, swap sur le même router, addLiquidity,
+harvest/withdraw MiniChef) consomment quasiment toujours la même quantité de
+gas. Plutôt que d'appeler ``eth_estimateGas`` avant chaque envoi, ce cache
+mémorise les ``gasUsed`` observés dans les reçus et, une fois « chaud »
+(``min_observations`` atteint), retourne un percentile glissant multiplié par
+une marge de sécurité.
+
+Les transactions tombées à court de gas (reçu en échec ayant consommé toute la
+limite) sont comptées comme « trop basses » et vident l'historique de la clé :
+l'estimation RPC reprend jusqu'à ce que le cache se réchauffe.
+
+Les fenêtres d'observations sont persistées dans un fichier JSON
+(``data/gas_limits.json`` pour l'instance partagée, rechargé à l'import) :
+les exécutions CLI ponctuelles (harvest, unstake, swap) profitent ainsi des
+reçus des exécutions précédentes.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from collections import deque
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CleGas = Tuple[str, str, int]
+
+DEFAULT_WINDOW = 50
+DEFAULT_PERCENTILE = 95.0
+DEFAULT_MARGIN = 1.2
+DEFAULT_MIN_OBSERVATIONS = 3
+CHEMIN_CACHE = "data/gas_limits.json"
+
+
+def cle_gas(contrat: Optional[str], selecteur: Optional[str], longueur_path: int = 0) -> CleGas:
+    """Clé normalisée (adresse en minuscules, sélecteur ``0x…`` sur 4 octets)."""
+    selecteur = (selecteur or "").lower()
+    if selecteur.startswith("0x"):
+        selecteur = selecteur[:10]
+    return (str(contrat or "").lower(), selecteur, int(longueur_path))
+
+
+def cle_depuis_transaction(tx: Dict[str, Any], longueur_path: int = 0) -> CleGas:
+    """Clé dérivée d'une transaction construite (champs ``to`` et ``data``)."""
+    return cle_gas(tx.get("to"), tx.get("data") or tx.get("input"), longueur_path)
+
+
+def cle_depuis_fonction(fonction: Any, longueur_path: int = 0) -> CleGas:
+    """Clé dérivée d'une ``ContractFunction`` Web3 (adresse + sélecteur)."""
+    selecteur = getattr(fonction, "selector", None) or getattr(fonction, "fn_name", "")
+    return cle_gas(getattr(fonction, "address", None), selecteur, longueur_path)
+
+
+def _percentile(valeurs: Deque[int], percentile: float) -> int:
+    tri = sorted(valeurs)
+    rang = max(0, math.ceil(percentile / 100.0 * len(tri)) - 1)
+    return tri[min(rang, len(tri) - 1)]
+
+
+class GasLimitCache:
+    """Percentiles glissants de ``gasUsed`` par clé, avec statistiques d'usage."""
+
+    def __init__(
+        self,
+        fenetre: int = DEFAULT_WINDOW,
+        percentile: float = DEFAULT_PERCENTILE,
+        marge: float = DEFAULT_MARGIN,
+        min_observations: int = DEFAULT_MIN_OBSERVATIONS,
+        chemin: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.fenetre = max(int(fenetre), 1)
+        self.percentile = min(max(float(percentile), 0.0), 100.0)
+        self.marge = max(float(marge), 1.0)
+        self.min_observations = max(int(min_observations), 1)
+        self.chemin = Path(chemin) if chemin is not None else None
+        self._lock = Lock()
+        self._observations: Dict[CleGas, Deque[int]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.trop_bas = 0
+        if self.chemin is not None:
+            self.charger()
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+    def charger(self) -> int:
+        """Recharge les fenêtres depuis ``chemin`` ; retourne le nombre de clés lues.
+
+        Un fichier absent ou illisible laisse le cache froid.
+        """
+        if self.chemin is None or not self.chemin.exists():
+            return 0
+        try:
+            with self.chemin.open("r", encoding="utf-8") as f:
+                entrees = json.load(f).get("observations", [])
+            observations = {
+                cle_gas(contrat, selecteur, longueur): deque((int(v) for v in valeurs), maxlen=self.fenetre)
+                for contrat, selecteur, longueur, valeurs in entrees
+            }
+        except (OSError, ValueError, TypeError, AttributeError) as exc:
+            logger.warning("Cache de gas limits illisible (%s) : %s", self.chemin, exc)
+            return 0
+        with self._lock:
+            self._observations = observations
+        return len(observations)
+
+    def _sauvegarder(self) -> None:
+        """Écriture atomique des fenêtres (appelée sous verrou)."""
+        if self.chemin is None:
+            return
+        donnees = {
+            "version": 1,
+            "observations": [[*cle, list(valeurs)] for cle, valeurs in self._observations.items()],
+        }
+        try:
+            self.chemin.parent.mkdir(parents=True, exist_ok=True)
+            temporaire = self.chemin.with_name(self.chemin.name + ".tmp")
+            with temporaire.open("w", encoding="utf-8") as f:
+                json.dump(donnees, f)
+            os.replace(temporaire, self.chemin)
+        except OSError as exc:
+            logger.warning("Cache de gas limits non persisté (%s) : %s", self.chemin, exc)
+
+    def limite(self, cle: CleGas) -> Optional[int]:
+        """Gas limit appris pour ``cle`` ou ``None`` si le cache est froid."""
+        with self._lock:
+            valeurs = self._observations.get(cle)
+            if not valeurs or len(valeurs) < self.min_observations:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return math.ceil(_percentile(valeurs, self.percentile) * self.marge)
+
+    def estimer(self, cle: CleGas, estimation_rpc: Callable[[], int], tampon: Callable[[int], int]) -> int:
+        """Gas limit depuis le cache, sinon ``tampon(estimation_rpc())``."""
+        limite = self.limite(cle)
+        if limite is not None:
+            return limite
+        return int(tampon(int(estimation_rpc())))
+
+    def observer(self, cle: CleGas, gas_used: Optional[int], gas_limit: Optional[int] = None, status: int = 1) -> None:
+        """Enregistre le ``gasUsed`` d'un reçu.
+
+        Un reçu en échec ayant consommé toute sa limite est compté comme
+        « limite trop basse » et réinitialise l'historique de la clé.
+        """
+        if gas_used is None:
+            return
+        gas_used = int(gas_used)
+        with self._lock:
+            if status != 1:
+                if gas_limit and gas_used >= int(gas_limit):
+                    self.trop_bas += 1
+                    self._observations.pop(cle, None)
+                    logger.warning("Gas limit trop basse pour %s (%s) → cache réinitialisé", cle, gas_limit)
+                    self._sauvegarder()
+                return
+            valeurs = self._observations.get(cle)
+            if valeurs is None:
+                valeurs = deque(maxlen=self.fenetre)
+                self._observations[cle] = valeurs
+            valeurs.append(gas_used)
+            self._sauvegarder()
+
+    def observer_recu(self, cle: CleGas, recu: Any, gas_limit: Optional[int] = None) -> None:
+        """Variante acceptant directement un reçu Web3 (ou un dict)."""
+        lire = recu.get if isinstance(recu, dict) else lambda k, d=None: getattr(recu, k, d)
+        status = lire("status", 1)
+        self.observer(cle, lire("gasUsed"), gas_limit, 1 if status in (1, None) else int(status))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "trop_bas": self.trop_bas,
+                "cles": len(self._observations),
+            }
+
+    def reinitialiser(self) -> None:
+        with self._lock:
+            self._observations.clear()
+            self.hits = self.misses = self.trop_bas = 0
+            self._sauvegarder()
+
+
+_cache_partage = GasLimitCache(chemin=CHEMIN_CACHE)
+
+
+def cache_partage() -> GasLimitCache:
+    """Instance partagée par les modules d'exécution."""
+    return _cache_partage
+
+
+__all__ = [
+    "CHEMIN_CACHE",
+    "CleGas",
+    "GasLimitCache",
+    "cache_partage",
+    "cle_gas",
+    "cle_depuis_fonction",
+    "cle_depuis_transaction",
+]
@@ -0,0 +1,300 @@
+# core/gas_oracle.py – V6.1.0
+"""Oracle de prix du gas partagé (EIP-1559) avec cache et échantillonnage en tâche de fond.
+
+Au lieu d'interroger ``eth_gasPrice`` avant chaque transaction, l'oracle
+échantillonne ``eth_feeHistory`` (un seul appel RPC couvrant ``nb_blocs``
+blocs) et conserve en cache :
+
+- la base fee du prochain bloc,
+- les percentiles de priority fee observés (10/50/90 par défaut),
+- le ``gasPrice`` legacy pour les chaînes sans EIP-1559.
+
+Les paramètres de frais sont ensuite dérivés localement pour trois modes
+(``slow``, ``normal``, ``urgent``). Un thread optionnel rafraîchit le cache
+à intervalle fixe ; sans lui, le cache est rafraîchi à la demande dès que
+son TTL est dépassé.
+"""
+
+from __future__ import annotations
+
+import logging
+import statistics
+from dataclasses import dataclass, field
+from threading import Event, Lock, Thread
+from time import monotonic
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 15.0
+DEFAULT_REFRESH_SECONDS = 5.0
+DEFAULT_BLOCK_COUNT = 20
+DEFAULT_PERCENTILES: Tuple[float, ...] = (10.0, 50.0, 90.0)
+
+# mode → (percentile de priority fee, multiplicateur de base fee pour maxFeePerGas)
+MODES_FRAIS: Dict[str, Tuple[float, float]] = {
+    "slow": (10.0, 1.25),
+    "normal": (50.0, 2.0),
+    "urgent": (90.0, 2.5),
+}
+
+
+@dataclass(frozen=True)
+class FeeSnapshot:
+    """Photographie des frais observés sur la chaîne."""
+
+    base_fee_wei: int
+    priority_fees_wei: Dict[float, int] = field(default_factory=dict)
+    gas_price_wei: int = 0
+    eip1559: bool = True
+    bloc: Optional[int] = None
+    horodatage: float = 0.0
+
+    def age(self) -> float:
+        return monotonic() - self.horodatage
+
+
+def _mode_valide(mode: str) -> Tuple[float, float]:
+    try:
+        return MODES_FRAIS[mode]
+    except KeyError:
+        raise ValueError(f"mode de frais inconnu: {mode} (attendu: {', '.join(MODES_FRAIS)})") from None
+
+
+def _lire(obj: Any, cle: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(cle)
+    return getattr(obj, cle, None)
+
+
+def _en_entier(valeur: Any) -> int:
+    if isinstance(valeur, str):
+        return int(valeur, 16) if valeur.startswith("0x") else int(valeur)
+    return int(valeur or 0)
+
+
+class GasOracle:
+    """Source de frais partagée pour un endpoint RPC donné."""
+
+    def __init__(
+        self,
+        w3: Any,
+        *,
+        ttl_s: float = DEFAULT_TTL_SECONDS,
+        intervalle_s: float = DEFAULT_REFRESH_SECONDS,
+        nb_blocs: int = DEFAULT_BLOCK_COUNT,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        priorite_min_wei: int = 0,
+    ) -> None:
+        self.w3 = w3
+        self._lock = Lock()
+        self._snapshot: Optional[FeeSnapshot] = None
+        self._thread: Optional[Thread] = None
+        self._stop = Event()
+        self.nb_appels_rpc = 0
+        self.configurer(
+            ttl_s=ttl_s,
+            intervalle_s=intervalle_s,
+            nb_blocs=nb_blocs,
+            percentiles=percentiles,
+            priorite_min_wei=priorite_min_wei,
+        )
+
+    def configurer(
+        self,
+        *,
+        ttl_s: Optional[float] = None,
+        intervalle_s: Optional[float] = None,
+        nb_blocs: Optional[int] = None,
+        percentiles: Optional[Sequence[float]] = None,
+        priorite_min_wei: Optional[int] = None,
+    ) -> None:
+        """Met à jour les options fournies ; le cache est invalidé si l'échantillonnage change."""
+        with self._lock:
+            if ttl_s is not None:
+                self.ttl_s = max(float(ttl_s), 0.0)
+            if intervalle_s is not None:
+                self.intervalle_s = max(float(intervalle_s), 0.5)
+            if nb_blocs is not None:
+                self.nb_blocs = max(int(nb_blocs), 1)
+                self._snapshot = None
+            if percentiles is not None:
+                self.percentiles = tuple(sorted({float(p) for p in percentiles} | {m[0] for m in MODES_FRAIS.values()}))
+                self._snapshot = None
+            if priorite_min_wei is not None:
+                self.priorite_min_wei = max(int(priorite_min_wei), 0)
+                self._snapshot = None
+
+    # ------------------------------------------------------------------
+    # Échantillonnage
+    # ------------------------------------------------------------------
+    def _echantillonner(self) -> FeeSnapshot:
+        try:
+            self.nb_appels_rpc += 1
+            historique = self.w3.eth.fee_history(self.nb_blocs, "latest", list(self.percentiles))
+            base_fees = [_en_entier(v) for v in (_lire(historique, "baseFeePerGas") or [])]
+            if not base_fees or not any(base_fees):
+                raise ValueError("baseFeePerGas absent (chaîne sans EIP-1559)")
+            rewards = _lire(historique, "reward") or []
+            priorites: Dict[float, int] = {}
+            for index, percentile in enumerate(self.percentiles):
+                valeurs = [_en_entier(bloc[index]) for bloc in rewards if len(bloc) > index]
+                valeurs_non_nulles = [v for v in valeurs if v > 0] or valeurs
+                tip = int(statistics.median(valeurs_non_nulles)) if valeurs_non_nulles else 0
+                priorites[percentile] = max(tip, self.priorite_min_wei)
+            base_fee = base_fees[-1]  # base fee du prochain bloc
+            oldest = _lire(historique, "oldestBlock")
+            bloc = _en_entier(oldest) + len(base_fees) - 1 if oldest is not None else None
+            return FeeSnapshot(
+                base_fee_wei=base_fee,
+                priority_fees_wei=priorites,
+                gas_price_wei=base_fee + priorites[MODES_FRAIS["normal"][0]],
+                eip1559=True,
+                bloc=bloc,
+                horodatage=monotonic(),
+            )
+        except Exception as exc:
+            logger.debug("eth_feeHistory indisponible (%s) → eth_gasPrice", exc)
+            self.nb_appels_rpc += 1
+            prix = int(self.w3.eth.gas_price)
+            return FeeSnapshot(base_fee_wei=prix, gas_price_wei=prix, eip1559=False, horodatage=monotonic())
+
+    def rafraichir(self) -> FeeSnapshot:
+        """Force un nouvel échantillonnage et met le cache à jour."""
+        snapshot = self._echantillonner()
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def snapshot_en_cache(self) -> Optional[FeeSnapshot]:
+        """Dernier échantillon connu, sans aucun appel RPC (peut être périmé)."""
+        with self._lock:
+            return self._snapshot
+
+    def snapshot(self, max_age_s: Optional[float] = None) -> FeeSnapshot:
+        """Échantillon du cache s'il est assez récent, sinon un échantillon frais.
+
+        En cas d'échec RPC, le dernier échantillon connu est retourné même s'il
+        est périmé ; une exception n'est levée que si aucun n'existe.
+        """
+        limite = self.ttl_s if max_age_s is None else max(float(max_age_s), 0.0)
+        courant = self.snapshot_en_cache()
+        if courant is not None and courant.age() <= limite:
+            return courant
+        try:
+            return self.rafraichir()
+        except Exception as exc:
+            if courant is None:
+                raise
+            logger.warning("Rafraîchissement du gas impossible (%s), cache âgé de %.1fs utilisé", exc, courant.age())
+            return courant
+
+    # ------------------------------------------------------------------
+    # Paramètres de frais
+    # ------------------------------------------------------------------
+    def frais_eip1559(self, mode: str = "normal") -> Dict[str, int]:
+        """Retourne ``maxFeePerGas`` / ``maxPriorityFeePerGas`` pour le mode demandé."""
+        percentile, multiplicateur = _mode_valide(mode)
+        snap = self.snapshot()
+        if not snap.eip1559:
+            raise RuntimeError("La chaîne ne supporte pas EIP-1559")
+        tip = snap.priority_fees_wei.get(percentile, 0)
+        return {
+            "maxFeePerGas": int(snap.base_fee_wei * multiplicateur) + tip,
+            "maxPriorityFeePerGas": tip,
+        }
+
+    def frais_transaction(self, mode: str = "normal") -> Dict[str, int]:
+        """Champs de frais à fusionner dans une transaction (EIP-1559 ou legacy)."""
+        _mode_valide(mode)
+        snap = self.snapshot()
+        if snap.eip1559:
+            return self.frais_eip1559(mode)
+        return {"gasPrice": snap.gas_price_wei}
+
+    def prix_effectif_wei(self, mode: str = "normal", *, rpc: bool = True) -> Optional[int]:
+        """Prix par unité de gas réellement payé attendu (base fee + tip).
+
+        Avec ``rpc=False``, seul le cache est consulté (``None`` si vide).
+        """
+        percentile, _ = _mode_valide(mode)
+        snap = self.snapshot() if rpc else self.snapshot_en_cache()
+        if snap is None:
+            return None
+        if not snap.eip1559:
+            return snap.gas_price_wei
+        return snap.base_fee_wei + snap.priority_fees_wei.get(percentile, 0)
+
+    # ------------------------------------------------------------------
+    # Tâche de fond
+    # ------------------------------------------------------------------
+    def demarrer(self) -> None:
+        """Démarre l'échantillonnage périodique en arrière-plan."""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = Thread(target=self._worker, name="defipilot-gas-oracle", daemon=True)
+            self._thread.start()
+
+    def arreter(self) -> None:
+        """Arrête la tâche de fond."""
+        if self._thread and self._thread.is_alive():
+            self._stop.set()
+            self._thread.join(timeout=self.intervalle_s * 2)
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.rafraichir()
+            except Exception as exc:  # pragma: no cover - journalisation informative
+                logger.error("Échantillonnage du gas en échec: %s", exc)
+            self._stop.wait(self.intervalle_s)
+
+
+_oracles: Dict[str, GasOracle] = {}
+_oracles_lock = Lock()
+
+
+def _cle_endpoint(w3: Any) -> str:
+    provider = getattr(w3, "provider", None)
+    uri = getattr(provider, "endpoint_uri", None)
+    return str(uri) if uri else f"provider-{id(provider if provider is not None else w3)}"
+
+
+def obtenir_oracle(w3: Any, *, demarrer: bool = False, **options: Any) -> GasOracle:
+    """Oracle partagé pour l'endpoint RPC de ``w3``.
+
+    Les modules d'exécution créent souvent une instance Web3 par appel ; la
+    clé est donc l'URL du provider pour que le cache survive entre appels.
+    Les ``options`` sont appliquées à l'oracle existant le cas échéant
+    (``TypeError`` pour une option inconnue, comme à la construction).
+    """
+    cle = _cle_endpoint(w3)
+    with _oracles_lock:
+        oracle = _oracles.get(cle)
+        if oracle is None:
+            oracle = GasOracle(w3, **options)
+            _oracles[cle] = oracle
+        else:
+            oracle.w3 = w3
+            if options:
+                oracle.configurer(**options)
+    if demarrer:
+        oracle.demarrer()
+    return oracle
+
+
+def oracles_actifs() -> Dict[str, GasOracle]:
+    """Oracles déjà créés, par endpoint (utilisé pour les estimations hors ligne)."""
+    with _oracles_lock:
+        return dict(_oracles)
+
+
+__all__ = [
+    "FeeSnapshot",
+    "GasOracle",
+    "MODES_FRAIS",
+    "obtenir_oracle",
+    "oracles_actifs",
+]
@@ -1,37 +1,197 @@
-import os
+"""Historique des gains par pool et bonus de scoring associé.
+
+Les agrégats sont tenus de façon incrémentale dans des tableaux indexés par
+un identifiant entier de pool (nombre d'observations, somme et moyenne
+mobile exponentielle des gains). Le vecteur de bonus est calculé une seule
+fois par modification de l'historique et par couple (bonus max, malus max) :
+une passe de scoring lit ensuite le bonus d'une pool par simple indexation.
+
+La persistance est binaire et compacte (``data/historique_pools.bin``) ;
+l'ancien fichier JSON est relu s'il est seul présent, et les dicts
+``{"count", "total_gain"}`` restent acceptés par ``maj_historique`` et
+``calculer_bonus``.
+"""
+
 import json
+import os
+import struct
+from array import array
+from collections.abc import Mapping
 
 HISTORIQUE_PATH = "data/historique_pools.json"
+HISTORIQUE_BIN_PATH = "data/historique_pools.bin"
+
+ALPHA_EWMA = 0.2
+GAIN_MOYEN_PLAFOND = 10000
+
+_MAGIC = b"DPH1"
+_CACHE = {}
+_ENTETE = struct.Struct("<4sId")
+
+
+class HistoriqueCompact(Mapping):
+    """Agrégats par pool en tableaux, vu comme un dict ``{nom: {...}}``."""
+
+    def __init__(self, alpha=ALPHA_EWMA):
+        self.alpha = float(alpha)
+        self.ids = {}
+        self.noms = []
+        self.counts = array("q")
+        self.totaux = array("d")
+        self.ewma = array("d")
+        self._bonus = {}
+
+    # -- accès dict (compatibilité) -----------------------------------
+    def __getitem__(self, nom_pool):
+        i = self.ids[nom_pool]
+        return {"count": self.counts[i], "total_gain": self.totaux[i], "ewma_gain": self.ewma[i]}
+
+    def __iter__(self):
+        return iter(self.noms)
+
+    def __len__(self):
+        return len(self.noms)
+
+    def __contains__(self, nom_pool):
+        return nom_pool in self.ids
+
+    # -- mise à jour --------------------------------------------------
+    def indice(self, nom_pool, creer=False):
+        """Identifiant entier de la pool (``None`` si inconnue et ``creer`` faux)."""
+        i = self.ids.get(nom_pool)
+        if i is None and creer:
+            i = len(self.noms)
+            self.ids[nom_pool] = i
+            self.noms.append(nom_pool)
+            self.counts.append(0)
+            self.totaux.append(0.0)
+            self.ewma.append(0.0)
+        return i
+
+    def ajouter(self, nom_pool, gain):
+        i = self.indice(nom_pool, creer=True)
+        gain = float(gain)
+        self.ewma[i] = gain if self.counts[i] == 0 else self.ewma[i] + self.alpha * (gain - self.ewma[i])
+        self.counts[i] += 1
+        self.totaux[i] += gain
+        self._bonus.clear()
+
+    # -- bonus ----------------------------------------------------------
+    def vecteur_bonus(self, max_bonus=0.15, max_malus=-0.10):
+        """Bonus de chaque pool (indexé par ``indice``), recalculé si l'historique a changé."""
+        cle = (max_bonus, max_malus)
+        vecteur = self._bonus.get(cle)
+        if vecteur is None:
+            vecteur = array("d", (
+                _bonus_gain_moyen(total / count, max_bonus, max_malus) if count else 0.0
+                for count, total in zip(self.counts, self.totaux)
+            ))
+            self._bonus[cle] = vecteur
+        return vecteur
+
+    def bonus(self, nom_pool, max_bonus=0.15, max_malus=-0.10):
+        i = self.ids.get(nom_pool)
+        return 0.0 if i is None else self.vecteur_bonus(max_bonus, max_malus)[i]
+
+    # -- sérialisation ----------------------------------------------------
+    def en_octets(self):
+        noms = "\0".join(self.noms).encode("utf-8")
+        return b"".join((
+            _ENTETE.pack(_MAGIC, len(self.noms), self.alpha),
+            struct.pack("<I", len(noms)),
+            noms,
+            self.counts.tobytes(),
+            self.totaux.tobytes(),
+            self.ewma.tobytes(),
+        ))
+
+    @classmethod
+    def depuis_octets(cls, donnees):
+        magic, n, alpha = _ENTETE.unpack_from(donnees, 0)
+        if magic != _MAGIC:
+            raise ValueError("Format d'historique inconnu")
+        pos = _ENTETE.size
+        (taille_noms,) = struct.unpack_from("<I", donnees, pos)
+        pos += 4
+        historique = cls(alpha)
+        historique.noms = donnees[pos:pos + taille_noms].decode("utf-8").split("\0") if n else []
+        historique.ids = {nom: i for i, nom in enumerate(historique.noms)}
+        pos += taille_noms
+        for tableau in (historique.counts, historique.totaux, historique.ewma):
+            taille = n * tableau.itemsize
+            tableau.frombytes(donnees[pos:pos + taille])
+            pos += taille
+        return historique
+
+    @classmethod
+    def depuis_dict(cls, historique, alpha=ALPHA_EWMA):
+        compact = cls(alpha)
+        for nom_pool, stats in historique.items():
+            i = compact.indice(nom_pool, creer=True)
+            compact.counts[i] = int(stats.get("count", 0))
+            compact.totaux[i] = float(stats.get("total_gain", 0.0))
+            compact.ewma[i] = float(stats.get("ewma_gain", compact.totaux[i] / compact.counts[i] if compact.counts[i] else 0.0))
+        return compact
+
+
+def _bonus_gain_moyen(gain_moyen, max_bonus, max_malus):
+    if gain_moyen >= GAIN_MOYEN_PLAFOND:
+        return max_bonus
+    elif gain_moyen <= 0:
+        return max_malus
+    else:
+        return max_malus + (gain_moyen / GAIN_MOYEN_PLAFOND) * (max_bonus - max_malus)
+
 
 def charger_historique():
+    if os.path.exists(HISTORIQUE_BIN_PATH):
+        with open(HISTORIQUE_BIN_PATH, "rb") as f:
+            return HistoriqueCompact.depuis_octets(f.read())
     if os.path.exists(HISTORIQUE_PATH):
         with open(HISTORIQUE_PATH, "r") as f:
-            return json.load(f)
-    return {}
+            return HistoriqueCompact.depuis_dict(json.load(f))
+    return HistoriqueCompact()
+
+def charger_historique_en_cache():
+    """Comme ``charger_historique``, sans relire un fichier inchangé depuis l'appel précédent."""
+    cle = tuple(_signature_fichier(chemin) for chemin in (HISTORIQUE_BIN_PATH, HISTORIQUE_PATH))
+    if _CACHE.get("cle") != cle:
+        _CACHE["historique"] = charger_historique()
+        _CACHE["cle"] = cle
+    return _CACHE["historique"]
+
+def _signature_fichier(chemin):
+    try:
+        st = os.stat(chemin)
+    except OSError:
+        return (chemin, None)
+    return (os.path.abspath(chemin), st.st_mtime_ns, st.st_size, st.st_ino)
 
 def sauvegarder_historique(historique):
     os.makedirs("data", exist_ok=True)
-    with open(HISTORIQUE_PATH, "w") as f:
-        json.dump(historique, f, indent=2)
+    if not isinstance(historique, HistoriqueCompact):
+        historique = HistoriqueCompact.depuis_dict(historique)
+    tmp = HISTORIQUE_BIN_PATH + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(historique.en_octets())
+    os.replace(tmp, HISTORIQUE_BIN_PATH)
 
 def maj_historique(historique, nom_pool, gain):
+    if isinstance(historique, HistoriqueCompact):
+        historique.ajouter(nom_pool, gain)
+        return
     if nom_pool not in historique:
         historique[nom_pool] = {"count": 0, "total_gain": 0.0}
     historique[nom_pool]["count"] += 1
     historique[nom_pool]["total_gain"] += gain
 
 def calculer_bonus(historique, nom_pool, max_bonus=0.15, max_malus=-0.10):
+    if isinstance(historique, HistoriqueCompact):
+        return historique.bonus(nom_pool, max_bonus, max_malus)
     if nom_pool not in historique:
         return 0.0
     count = historique[nom_pool]["count"]
     total_gain = historique[nom_pool]["total_gain"]
     if count == 0:
         return 0.0
-    gain_moyen = total_gain / count
-
-    if gain_moyen >= 10000:
-        return max_bonus
-    elif gain_moyen <= 0:
-        return max_malus
-    else:
-        return max_malus + (gain_moyen / 10000) * (max_bonus - max_malus)
+    return _bonus_gain_moyen(total_gain / count, max_bonus, max_malus)
@@ -0,0 +1,501 @@
+# core/history_store.py – V6.1.0
+"""Stockage SQLite (mode WAL) de l'historique des pools et des rendements.
+
+L'historique était dispersé dans des CSV en ajout seul, relus en entier par
+chaque analyse :
+
+- ``historique_rendements.csv`` / ``journal_top3_enrichi.csv`` /
+  ``historique_cycles.csv`` → table ``observations_pool`` (une ligne par pool
+  et par cycle : rang, TVL, APR, score, gain) ;
+- ``journal_rendement.csv`` / ``logs/journal_gain_simule.csv`` → table
+  ``soldes`` (gain et soldes du portefeuille simulé).
+
+Les tables sont indexées par horodatage et par pool. L'import est
+incrémental : pour chaque CSV on mémorise l'offset déjà lu, un nouvel import
+ne traite que les lignes ajoutées depuis (le fichier est relu en entier s'il
+a été remplacé ou tronqué). Les CSV restent la source d'écriture ; la base
+sert aux lectures (plages temporelles, agrégats par pool, bonus historique du
+scoring).
+
+Usage : python -m core.history_store import [fichiers…]
+        python -m core.history_store stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import logging
+import os
+import sqlite3
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CHEMIN_DB = "data/historique.sqlite"
+
+SOURCES_CSV: Tuple[str, ...] = (
+    "historique_rendements.csv",
+    "journal_top3_enrichi.csv",
+    "historique_cycles.csv",
+    "journal_rendement.csv",
+    "logs/journal_gain_simule.csv",
+)
+
+# Sources de gain par pool, par priorité : les colonnes de gain des CSV n'ont
+# pas le même sens (gain estimé 24 h de la pool, gain simulé du portefeuille),
+# une seule source est donc retenue par pool pour ``count`` / ``total_gain``.
+SOURCES_GAIN: Tuple[str, ...] = ("historique_cycles.csv", "historique_rendements.csv")
+
+HISTORIQUE_TTL_S = 300.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations_pool (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    source TEXT NOT NULL,
+    profil TEXT,
+    plateforme TEXT,
+    nom TEXT,
+    pool TEXT NOT NULL,
+    rang INTEGER,
+    tvl_usd REAL,
+    apr REAL,
+    score REAL,
+    gain REAL
+);
+CREATE INDEX IF NOT EXISTS ix_observations_ts ON observations_pool (ts);
+CREATE INDEX IF NOT EXISTS ix_observations_pool_ts ON observations_pool (pool, ts);
+
+CREATE TABLE IF NOT EXISTS soldes (
+    id INTEGER PRIMARY KEY,
+    ts TEXT NOT NULL,
+    source TEXT NOT NULL,
+    pool TEXT,
+    gain REAL,
+    solde_avant REAL,
+    solde_apres REAL,
+    score REAL
+);
+CREATE INDEX IF NOT EXISTS ix_soldes_ts ON soldes (ts);
+
+CREATE TABLE IF NOT EXISTS imports (
+    chemin TEXT PRIMARY KEY,
+    inode TEXT,
+    offset INTEGER NOT NULL,
+    entete TEXT
+);
+"""
+
+_COLONNES_OBSERVATION = ("ts", "source", "profil", "plateforme", "nom", "pool", "rang", "tvl_usd", "apr", "score", "gain")
+_COLONNES_SOLDE = ("ts", "source", "pool", "gain", "solde_avant", "solde_apres", "score")
+
+
+def _reel(valeur: Any) -> Optional[float]:
+    try:
+        return float(valeur)
+    except (TypeError, ValueError):
+        return None
+
+
+def _entier(valeur: Any) -> Optional[int]:
+    reel = _reel(valeur)
+    return int(reel) if reel is not None else None
+
+
+def cle_pool(plateforme: Optional[str], nom: Optional[str]) -> str:
+    """Clé de pool identique à celle du scoring (``"plateforme | nom"``)."""
+    return f"{plateforme} | {nom}" if plateforme else str(nom)
+
+
+def _observation(source: str, ts: Any, plateforme: Any, nom: Any, **champs: Any) -> Tuple[str, tuple]:
+    valeurs = {
+        "ts": str(ts),
+        "source": source,
+        "profil": champs.get("profil"),
+        "plateforme": plateforme or None,
+        "nom": nom,
+        "pool": cle_pool(plateforme, nom),
+        "rang": _entier(champs.get("rang")),
+        "tvl_usd": _reel(champs.get("tvl_usd")),
+        "apr": _reel(champs.get("apr")),
+        "score": _reel(champs.get("score")),
+        "gain": _reel(champs.get("gain")),
+    }
+    return "observations_pool", tuple(valeurs[c] for c in _COLONNES_OBSERVATION)
+
+
+def _solde(source: str, ts: Any, **champs: Any) -> Tuple[str, tuple]:
+    valeurs = {"ts": str(ts), "source": source, **{c: None for c in _COLONNES_SOLDE[2:]}}
+    valeurs.update({c: champs[c] if c == "pool" else _reel(champs[c]) for c in champs})
+    return "soldes", tuple(valeurs[c] for c in _COLONNES_SOLDE)
+
+
+Ligne = Dict[str, str]
+Convertisseur = Callable[[str, Ligne, List[str]], Optional[Tuple[str, tuple]]]
+
+
+def _historique_rendements(source: str, l: Ligne, brut: List[str]) -> Optional[Tuple[str, tuple]]:
+    return _observation(source, l["date"], l.get("plateforme"), l.get("nom_pool"), profil=l.get("profil"),
+                        tvl_usd=l.get("tvl_usd"), apr=l.get("apr"), score=l.get("score"), gain=l.get("gain_simule"))
+
+
+def _journal_top3_enrichi(source: str, l: Ligne, brut: List[str]) -> Optional[Tuple[str, tuple]]:
+    if len(brut) == 6:
+        # Ancien format sans en-tête : date, nom, plateforme, score, apr, profil.
+        return _observation(source, brut[0], brut[2], brut[1], score=brut[3], apr=brut[4], profil=brut[5])
+    return _observation(source, l["date"], None, l.get("pool_nom"), rang=l.get("rank"),
+                        apr=l.get("apr"), score=l.get("score"))
+
+
+def _historique_cycles(source: str, l: Ligne, brut: List[str]) -> Optional[Tuple[str, tuple]]:
+    return _observation(source, l["date"], l.get("plateforme"), l.get("nom"), rang=l.get("rang"),
+                        tvl_usd=l.get("TVL (USD)"), apr=l.get("APR (%)"), score=l.get("score"),
+                        gain=l.get("gain_estime_24h"))
+
+
+def _journal_rendement(source: str, l: Ligne, brut: List[str]) -> Optional[Tuple[str, tuple]]:
+    return _solde(source, l["date"], gain=l.get("gain_simule"), solde_avant=l.get("solde_avant"),
+                  solde_apres=l.get("solde_apres"))
+
+
+def _journal_gain_simule(source: str, l: Ligne, brut: List[str]) -> Optional[Tuple[str, tuple]]:
+    # Le fichier mélange deux formats : lignes sans en-tête de
+    # core.simulation (date, pool, gain, score) et lignes de
+    # core.journalisation (9 colonnes, avec en-tête).
+    if len(brut) == 4:
+        return _solde(source, brut[0], pool=brut[1], gain=brut[2], score=brut[3])
+    if "gain_journalier" in l:
+        return _solde(source, l["date"], pool=l.get("pool_selectionnee"), gain=l.get("gain_journalier"),
+                      solde_avant=l.get("solde_avant"), solde_apres=l.get("solde_apres"), score=l.get("score_pool"))
+    return None
+
+
+CONVERTISSEURS: Dict[str, Convertisseur] = {
+    "historique_rendements.csv": _historique_rendements,
+    "journal_top3_enrichi.csv": _journal_top3_enrichi,
+    "historique_cycles.csv": _historique_cycles,
+    "journal_rendement.csv": _journal_rendement,
+    "journal_gain_simule.csv": _journal_gain_simule,
+}
+
+_PREMIERES_COLONNES_ENTETE = {"date", "jour"}
+
+
+class HistoryStore:
+    """Base SQLite de l'historique, partagée entre threads."""
+
+    def __init__(self, chemin: str = CHEMIN_DB) -> None:
+        self.chemin = chemin
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(chemin, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def fermer(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Import
+    # ------------------------------------------------------------------
+    def importer_csv(self, chemin: str, convertisseur: Optional[Convertisseur] = None) -> int:
+        """Importe les lignes ajoutées à ``chemin`` depuis le dernier import.
+
+        :return: nombre de lignes insérées.
+        """
+        convertisseur = convertisseur or CONVERTISSEURS.get(os.path.basename(chemin))
+        if convertisseur is None:
+            raise ValueError(f"Aucun convertisseur connu pour {chemin}")
+        cle = os.path.abspath(chemin)
+        try:
+            st = os.stat(chemin)
+        except OSError:
+            return 0
+        inode = f"{st.st_dev}:{st.st_ino}"
+
+        with self._lock:
+            etat = self._conn.execute("SELECT inode, offset, entete FROM imports WHERE chemin = ?", (cle,)).fetchone()
+            offset, entete = 0, None
+            if etat is not None and etat["inode"] == inode and etat["offset"] <= st.st_size:
+                offset = etat["offset"]
+                entete = etat["entete"].split("\x1f") if etat["entete"] else None
+            elif etat is not None:
+                # Fichier remplacé ou tronqué : on repart de zéro pour cette source.
+                source = os.path.basename(chemin)
+                self._conn.execute("DELETE FROM observations_pool WHERE source = ?", (source,))
+                self._conn.execute("DELETE FROM soldes WHERE source = ?", (source,))
+            if st.st_size == offset:
+                return 0
+
+            with open(chemin, "rb") as f:
+                f.seek(offset)
+                brut = f.read(st.st_size - offset)
+            fin = brut.rfind(b"\n")
+            if fin < 0:
+                return 0
+            texte = brut[: fin + 1].decode("utf-8", errors="replace")
+
+            lignes: Dict[str, List[tuple]] = {"observations_pool": [], "soldes": []}
+            source = os.path.basename(chemin)
+            for ligne in csv.reader(io.StringIO(texte)):
+                if not ligne:
+                    continue
+                if ligne[0].strip().lower() in _PREMIERES_COLONNES_ENTETE:
+                    entete = [c.strip() for c in ligne]
+                    continue
+                dico = dict(zip(entete, ligne)) if entete else {}
+                try:
+                    resultat = convertisseur(source, dico, ligne)
+                except (KeyError, IndexError, ValueError):
+                    resultat = None
+                if resultat is not None:
+                    table, valeurs = resultat
+                    lignes[table].append(valeurs)
+
+            self._conn.executemany(
+                f"INSERT INTO observations_pool ({', '.join(_COLONNES_OBSERVATION)}) "
+                f"VALUES ({', '.join('?' * len(_COLONNES_OBSERVATION))})",
+                lignes["observations_pool"],
+            )
+            self._conn.executemany(
+                f"INSERT INTO soldes ({', '.join(_COLONNES_SOLDE)}) VALUES ({', '.join('?' * len(_COLONNES_SOLDE))})",
+                lignes["soldes"],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO imports (chemin, inode, offset, entete) VALUES (?, ?, ?, ?)",
+                (cle, inode, offset + fin + 1, "\x1f".join(entete) if entete else None),
+            )
+            self._conn.commit()
+        total = len(lignes["observations_pool"]) + len(lignes["soldes"])
+        logger.debug("history_store: %d ligne(s) importée(s) depuis %s", total, chemin)
+        return total
+
+    def synchroniser(self, chemins: Iterable[str] = SOURCES_CSV) -> int:
+        """Importe la queue de chaque CSV source existant."""
+        total = sum(self.importer_csv(chemin) for chemin in chemins if os.path.exists(chemin))
+        if total:
+            self.normaliser_cles()
+        return total
+
+    def normaliser_cles(self) -> int:
+        """Complète la plateforme des observations qui n'en ont pas (``journal_top3_enrichi``).
+
+        Une observation sans plateforme reçoit celle sous laquelle son nom a
+        été vu ailleurs, si elle est unique, et la clé ``"plateforme | nom"``
+        du scoring. Les noms ambigus restent tels quels.
+        """
+        with self._lock:
+            curseur = self._conn.execute(
+                "WITH connues AS (SELECT nom, MIN(plateforme) AS plateforme FROM observations_pool "
+                "WHERE plateforme IS NOT NULL GROUP BY nom HAVING COUNT(DISTINCT plateforme) = 1) "
+                "UPDATE observations_pool SET "
+                "plateforme = (SELECT plateforme FROM connues WHERE connues.nom = observations_pool.nom), "
+                "pool = (SELECT plateforme FROM connues WHERE connues.nom = observations_pool.nom) || ' | ' || nom "
+                "WHERE plateforme IS NULL AND nom IN (SELECT nom FROM connues)"
+            )
+            self._conn.commit()
+            return curseur.rowcount
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+    def _requete(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(r) for r in self._conn.execute(sql, params).fetchall()]
+
+    @staticmethod
+    def _filtres(debut: Optional[str], fin: Optional[str], **egalites: Any) -> Tuple[str, List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        if debut is not None:
+            clauses.append("ts >= ?")
+            params.append(str(debut))
+        if fin is not None:
+            clauses.append("ts < ?")
+            params.append(str(fin))
+        for colonne, valeur in egalites.items():
+            if valeur is not None:
+                clauses.append(f"{colonne} = ?")
+                params.append(valeur)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def observations(
+        self,
+        pool: Optional[str] = None,
+        debut: Optional[str] = None,
+        fin: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Observations de pools sur ``[debut, fin[`` (horodatages ISO), triées par date."""
+        where, params = self._filtres(debut, fin, pool=pool, source=source)
+        return self._requete(f"SELECT * FROM observations_pool{where} ORDER BY ts, id", params)
+
+    def soldes(self, debut: Optional[str] = None, fin: Optional[str] = None,
+               source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lignes de gain/solde du portefeuille sur ``[debut, fin[``."""
+        where, params = self._filtres(debut, fin, source=source)
+        return self._requete(f"SELECT * FROM soldes{where} ORDER BY ts, id", params)
+
+    def gains_par_jour(self, debut: Optional[str] = None, fin: Optional[str] = None,
+                       source: Optional[str] = None) -> Dict[str, float]:
+        """Somme des gains par jour (``YYYY-MM-DD``)."""
+        where, params = self._filtres(debut, fin, source=source)
+        lignes = self._requete(
+            f"SELECT substr(ts, 1, 10) AS jour, SUM(gain) AS gain FROM soldes{where} GROUP BY jour ORDER BY jour",
+            params,
+        )
+        return {l["jour"]: l["gain"] or 0.0 for l in lignes}
+
+    def agregats_pools(self, debut: Optional[str] = None, fin: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Agrégats par pool, au format attendu par ``core.historique.calculer_bonus``.
+
+        Chaque entrée contient ``count``/``total_gain`` (observations ayant un
+        gain, d'une seule source par pool : la première de ``SOURCES_GAIN``
+        qui en fournit) ainsi que ``nb_observations``, les moyennes d'APR et
+        de score et les premier/dernier horodatages (toutes sources).
+        """
+        where, params = self._filtres(debut, fin)
+        lignes = self._requete(
+            "SELECT pool, source, COUNT(*) AS nb, COUNT(gain) AS nb_gains, COALESCE(SUM(gain), 0.0) AS gains, "
+            "SUM(apr) AS somme_apr, COUNT(apr) AS nb_apr, SUM(score) AS somme_score, COUNT(score) AS nb_score, "
+            f"MIN(ts) AS premier, MAX(ts) AS dernier FROM observations_pool{where} GROUP BY pool, source",
+            params,
+        )
+        rang = {source: i for i, source in enumerate(SOURCES_GAIN)}
+        cumuls: Dict[str, Dict[str, Any]] = {}
+        for l in lignes:
+            c = cumuls.setdefault(l["pool"], {
+                "nb_observations": 0, "count": 0, "total_gain": 0.0, "somme_apr": 0.0, "nb_apr": 0,
+                "somme_score": 0.0, "nb_score": 0, "premier": l["premier"], "dernier": l["dernier"], "_rang": None,
+            })
+            c["nb_observations"] += l["nb"]
+            for cle in ("somme_apr", "nb_apr", "somme_score", "nb_score"):
+                c[cle] += l[cle] or 0
+            c["premier"] = min(c["premier"], l["premier"])
+            c["dernier"] = max(c["dernier"], l["dernier"])
+            priorite = rang.get(l["source"], len(SOURCES_GAIN))
+            if l["nb_gains"] and (c["_rang"] is None or priorite < c["_rang"]):
+                c.update(count=l["nb_gains"], total_gain=l["gains"], _rang=priorite)
+        return {
+            pool: {
+                "nb_observations": c["nb_observations"],
+                "count": c["count"],
+                "total_gain": c["total_gain"],
+                "apr_moyen": c["somme_apr"] / c["nb_apr"] if c["nb_apr"] else None,
+                "score_moyen": c["somme_score"] / c["nb_score"] if c["nb_score"] else None,
+                "premier": c["premier"],
+                "dernier": c["dernier"],
+            }
+            for pool, c in cumuls.items()
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            nb_obs = self._conn.execute("SELECT COUNT(*) FROM observations_pool").fetchone()[0]
+            nb_soldes = self._conn.execute("SELECT COUNT(*) FROM soldes").fetchone()[0]
+            nb_pools = self._conn.execute("SELECT COUNT(DISTINCT pool) FROM observations_pool").fetchone()[0]
+        return {"observations_pool": nb_obs, "soldes": nb_soldes, "pools": nb_pools}
+
+
+_stores: Dict[str, HistoryStore] = {}
+_stores_lock = Lock()
+
+
+def obtenir_store(chemin: str = CHEMIN_DB) -> HistoryStore:
+    """Instance partagée par chemin de base."""
+    cle = os.path.abspath(chemin)
+    with _stores_lock:
+        store = _stores.get(cle)
+        if store is None:
+            store = HistoryStore(chemin)
+            _stores[cle] = store
+        return store
+
+
+def historique_pools_depuis_store(chemin: str = CHEMIN_DB, synchroniser: bool = True) -> Dict[str, Dict[str, Any]]:
+    """Historique des pools pour le bonus du scoring.
+
+    Ne lit que si la base existe déjà (créée par ``python -m core.history_store
+    import``) ; sinon retourne ``{}`` sans rien créer.
+    """
+    if not os.path.exists(chemin):
+        return {}
+    try:
+        store = obtenir_store(chemin)
+        if synchroniser:
+            store.synchroniser()
+        return store.agregats_pools()
+    except sqlite3.Error as exc:
+        logger.warning("history_store: lecture impossible (%s)", exc)
+        return {}
+
+
+_historiques: Dict[str, Tuple[float, Dict[str, Dict[str, Any]]]] = {}
+
+
+def historique_pools_en_cache(chemin: str = CHEMIN_DB, ttl_s: float = HISTORIQUE_TTL_S) -> Dict[str, Dict[str, Any]]:
+    """``historique_pools_depuis_store`` mémorisé par base pendant ``ttl_s``.
+
+    Le scoring l'appelle à chaque passe sans historique fourni : la
+    synchronisation des CSV et l'agrégat ne sont refaits qu'une fois par TTL.
+    """
+    cle = os.path.abspath(chemin)
+    en_cache = _historiques.get(cle)
+    if en_cache is not None and monotonic() - en_cache[0] <= ttl_s:
+        return en_cache[1]
+    historique = historique_pools_depuis_store(chemin)
+    _historiques[cle] = (monotonic(), historique)
+    return historique
+
+
+def invalider_historique_en_cache() -> None:
+    """Force la relecture de la base au prochain ``historique_pools_en_cache``."""
+    _historiques.clear()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Historique SQLite DeFiPilot")
+    parser.add_argument("--db", default=CHEMIN_DB)
+    sous = parser.add_subparsers(dest="commande", required=True)
+    imp = sous.add_parser("import", help="Importer (incrémentalement) les CSV d'historique")
+    imp.add_argument("fichiers", nargs="*", default=list(SOURCES_CSV))
+    sous.add_parser("stats", help="Afficher le contenu de la base")
+    args = parser.parse_args(argv)
+
+    store = obtenir_store(args.db)
+    if args.commande == "import":
+        for fichier in args.fichiers:
+            if not os.path.exists(fichier):
+                print(f"[INFO] {fichier} absent, ignoré")
+                continue
+            print(f"[OK] {fichier} : {store.importer_csv(fichier)} ligne(s) importée(s)")
+    print(store.stats())
+
+
+__all__ = [
+    "CHEMIN_DB",
+    "CONVERTISSEURS",
+    "HISTORIQUE_TTL_S",
+    "HistoryStore",
+    "SOURCES_CSV",
+    "SOURCES_GAIN",
+    "cle_pool",
+    "historique_pools_depuis_store",
+    "historique_pools_en_cache",
+    "invalider_historique_en_cache",
+    "obtenir_store",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# core/journal_index.py – V6.1.0
+"""Index en mémoire des journaux CSV pour les contrôles de doublon.
+
+Les fonctions « déjà journalisé aujourd'hui ? » relisaient tout le CSV avant
+chaque ajout (coût O(N × taille du fichier) pour N pools par jour). Un
+``JournalIndex`` garde l'ensemble des clés déjà présentes (typiquement
+``(date, pool)``) et ne lit que les octets ajoutés depuis le dernier passage :
+
+- premier appel : lecture complète, une seule fois ;
+- fichier agrandi (ajout par ce processus ou un autre) : lecture de la queue
+  uniquement, à partir du dernier offset connu ;
+- fichier raccourci, remplacé (inode différent) ou supprimé : reconstruction.
+
+Le format des CSV et leurs consommateurs sont inchangés ; seule la vérification
+de présence passe en O(1).
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import logging
+import os
+from threading import Lock
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+Ligne = Union[List[str], Dict[str, str]]
+Extracteur = Callable[[Ligne], Optional[Hashable]]
+
+
+class JournalIndex:
+    """Ensemble des clés d'un journal CSV, tenu à jour par lecture incrémentale.
+
+    :param chemin: chemin du fichier CSV.
+    :param extraire: fonction ``ligne -> clé`` (``None`` pour ignorer la ligne).
+    :param entete: si vrai, la première ligne est un en-tête et ``extraire``
+        reçoit un dict (comme ``csv.DictReader``), sinon une liste.
+    """
+
+    def __init__(self, chemin: str, extraire: Extracteur, entete: bool = False) -> None:
+        self.chemin = chemin
+        self.extraire = extraire
+        self.entete = entete
+        self._lock = Lock()
+        self._cles: Set[Hashable] = set()
+        self._colonnes: Optional[List[str]] = None
+        self._offset = 0
+        self._inode: Optional[Tuple[int, int]] = None
+        self.nb_reconstructions = 0
+
+    def _reinitialiser(self) -> None:
+        self._cles.clear()
+        self._colonnes = None
+        self._offset = 0
+        self._inode = None
+
+    def _synchroniser(self) -> None:
+        try:
+            st = os.stat(self.chemin)
+        except OSError:
+            self._reinitialiser()
+            return
+        inode = (st.st_dev, st.st_ino)
+        if self._inode != inode or st.st_size < self._offset:
+            self._reinitialiser()
+            self._inode = inode
+            self.nb_reconstructions += 1
+        if st.st_size == self._offset:
+            return
+        with open(self.chemin, "rb") as f:
+            f.seek(self._offset)
+            brut = f.read(st.st_size - self._offset)
+        # Seules les lignes complètes sont indexées : une écriture en cours
+        # sera relue au prochain passage.
+        fin = brut.rfind(b"\n")
+        if fin < 0:
+            return
+        self._offset += fin + 1
+        self._indexer(brut[: fin + 1].decode("utf-8", errors="replace"))
+
+    def _indexer(self, texte: str) -> None:
+        for ligne in csv.reader(io.StringIO(texte)):
+            if self.entete:
+                if self._colonnes is None:
+                    self._colonnes = ligne
+                    continue
+                ligne = dict(zip(self._colonnes, ligne))
+            try:
+                cle = self.extraire(ligne)
+            except (IndexError, KeyError, ValueError):
+                continue
+            if cle is not None:
+                self._cles.add(cle)
+
+    def contient(self, cle: Hashable) -> bool:
+        """Vrai si ``cle`` figure dans le journal (état courant du fichier)."""
+        with self._lock:
+            self._synchroniser()
+            return cle in self._cles
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._synchroniser()
+            return len(self._cles)
+
+
+_index: Dict[Tuple[str, Extracteur, bool], JournalIndex] = {}
+_index_lock = Lock()
+
+
+def index_journal(chemin: str, extraire: Extracteur, entete: bool = False) -> JournalIndex:
+    """Index partagé pour ``(chemin absolu, extracteur, entete)``."""
+    cle = (os.path.abspath(chemin), extraire, entete)
+    with _index_lock:
+        index = _index.get(cle)
+        if index is None:
+            index = JournalIndex(cle[0], extraire, entete)
+            _index[cle] = index
+        return index
+
+
+def vider_index() -> None:
+    """Oublie tous les index partagés (tests, changement de répertoire)."""
+    with _index_lock:
+        _index.clear()
+
+
+__all__ = ["JournalIndex", "index_journal", "vider_index"]
@@ -0,0 +1,464 @@
+# core/journal_rotation.py – V6.1.0
+"""Rotation, compression et rétention des journaux JSONL.
+
+Les journaux (``journal_decisions.jsonl``, ``data/logs/journal_strategie.jsonl``,
+``journal_signaux.jsonl``, ``journal_control.jsonl``, ``exchange_bus.jsonl``…)
+grossissaient sans limite et chaque lecteur complet ralentissait avec le temps.
+Un ``GestionnaireRotation`` :
+
+- ferme le fichier actif en *segment* dès qu'il dépasse ``taille_max_mo`` ou
+  que son premier enregistrement date d'un jour précédent ;
+- compresse le segment (zstd si ``zstandard`` est installé, sinon gzip) dans
+  ``<dossier du journal>/archives_journaux/<nom>/`` ;
+- tient un ``manifest.json`` par journal (fichier, plage horaire, nombre
+  d'enregistrements de chaque segment) ;
+- supprime les segments au-delà de ``retention_jours`` / ``max_segments``.
+
+Le fichier actif garde son nom : les écrivains existants continuent d'ajouter
+leurs lignes (la rotation se fait sous le verrou ``core.sync_guard``).
+``lire_derniers`` et ``lire_intervalle`` lisent à travers les segments en
+n'ouvrant que ceux utiles d'après le manifeste.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import io
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+from core.sync_guard import acquire_lock, release_lock, tail_lines
+
+try:  # compression zstd optionnelle
+    import zstandard
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+Chemin = Union[str, "os.PathLike[str]"]
+
+DOSSIER_ARCHIVES = "archives_journaux"
+NOM_MANIFESTE = "manifest.json"
+EXTENSIONS = {"zstd": ".zst", "gzip": ".gz", "aucune": ""}
+CLES_HORODATAGE = ("timestamp", "ts", "date", "run_id")
+JOURNAUX_ROTATIFS: tuple[Path, ...] = (
+    Path("journal_decisions.jsonl"),
+    Path("journal_signaux.jsonl"),
+    Path("journal_control.jsonl"),
+    Path("exchange_bus.jsonl"),
+    Path("data/logs/journal_strategie.jsonl"),
+    Path("data/logs/journal_signaux.jsonl"),
+    Path("data/logs/ai_evaluation.jsonl"),
+)
+
+
+def compression_par_defaut() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _horodatage(obj: Any) -> Optional[float]:
+    """Premier horodatage exploitable d'un enregistrement (secondes epoch UTC)."""
+    if not isinstance(obj, Mapping):
+        return None
+    for cle in CLES_HORODATAGE:
+        valeur = obj.get(cle)
+        if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+            return float(valeur)
+        if isinstance(valeur, str) and valeur.strip():
+            texte = valeur.strip()
+            if texte.endswith("Z"):
+                texte = texte[:-1] + "+00:00"
+            try:
+                dt = datetime.fromisoformat(texte)
+            except ValueError:
+                continue
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            return dt.timestamp()
+    return None
+
+
+def _charger(ligne: str) -> Optional[Any]:
+    try:
+        return json.loads(ligne)
+    except ValueError:
+        return None
+
+
+def _jour(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+def dossier_archives(journal: Chemin) -> Path:
+    """Dossier des segments d'un journal (à côté du fichier actif)."""
+    p = Path(journal)
+    return p.parent / DOSSIER_ARCHIVES / p.stem
+
+
+# ---------------------------------------------------------------------------
+# Manifeste
+# ---------------------------------------------------------------------------
+@dataclass
+class Segment:
+    """Segment fermé d'un journal."""
+
+    fichier: str
+    compression: str
+    nb: int
+    debut: Optional[float]
+    fin: Optional[float]
+    taille: int
+    cree: float
+
+    def chevauche(self, debut: Optional[float], fin: Optional[float]) -> bool:
+        if self.debut is None or self.fin is None:
+            return True  # plage inconnue : le segment doit être lu
+        return (debut is None or self.fin >= debut) and (fin is None or self.debut <= fin)
+
+
+def lire_manifeste(journal: Chemin) -> List[Segment]:
+    """Segments d'un journal, du plus ancien au plus récent ([] si aucun)."""
+    chemin = dossier_archives(journal) / NOM_MANIFESTE
+    try:
+        brut = json.loads(chemin.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    segments: List[Segment] = []
+    for item in brut.get("segments", []) if isinstance(brut, dict) else []:
+        try:
+            segments.append(Segment(**item))
+        except TypeError:
+            logger.warning("Entrée de manifeste ignorée dans %s : %s", chemin, item)
+    return segments
+
+
+def _ecrire_manifeste(journal: Chemin, segments: Sequence[Segment]) -> None:
+    dossier = dossier_archives(journal)
+    dossier.mkdir(parents=True, exist_ok=True)
+    temporaire = dossier / (NOM_MANIFESTE + ".tmp")
+    contenu = {"journal": Path(journal).name, "segments": [asdict(s) for s in segments]}
+    temporaire.write_text(json.dumps(contenu, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temporaire, dossier / NOM_MANIFESTE)
+
+
+# ---------------------------------------------------------------------------
+# Lecture des segments
+# ---------------------------------------------------------------------------
+def _ouvrir_segment(chemin: Path, compression: str) -> io.TextIOBase:
+    if compression == "gzip":
+        return gzip.open(chemin, "rt", encoding="utf-8")
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"Le module zstandard est requis pour lire {chemin}")
+        flux = zstandard.ZstdDecompressor().stream_reader(open(chemin, "rb"), closefd=True)
+        return io.TextIOWrapper(flux, encoding="utf-8")
+    return open(chemin, "r", encoding="utf-8")
+
+
+def _lignes_segment(journal: Chemin, segment: Segment) -> List[str]:
+    chemin = dossier_archives(journal) / segment.fichier
+    try:
+        with _ouvrir_segment(chemin, segment.compression) as flux:
+            return [ligne.rstrip("\n") for ligne in flux if ligne.strip()]
+    except OSError as exc:
+        logger.warning("Segment illisible %s : %s", chemin, exc)
+        return []
+
+
+def lignes_archivees(journal: Chemin, n: int) -> List[str]:
+    """Les ``n`` dernières lignes brutes des segments (sans le fichier actif)."""
+    if n <= 0:
+        return []
+    segments = lire_manifeste(journal)
+    retenues: List[List[str]] = []
+    restant = n
+    for segment in reversed(segments):
+        if restant <= 0:
+            break
+        lignes = _lignes_segment(journal, segment)
+        retenues.append(lignes[-restant:])
+        restant -= len(retenues[-1])
+    return [ligne for bloc in reversed(retenues) for ligne in bloc]
+
+
+def lire_derniers(journal: Chemin, n: int) -> List[Any]:
+    """Les ``n`` derniers enregistrements, segments compris, du plus ancien au plus récent.
+
+    Seuls le fichier actif (lu depuis la fin) et les segments nécessaires
+    (d'après le nombre d'enregistrements du manifeste) sont ouverts.
+    """
+    if n <= 0:
+        return []
+    lignes = tail_lines(journal, n)
+    if len(lignes) < n:
+        lignes = lignes_archivees(journal, n - len(lignes)) + lignes
+    return [obj for obj in map(_charger, lignes) if obj is not None]
+
+
+def lire_intervalle(
+    journal: Chemin,
+    debut: Optional[Union[float, str]] = None,
+    fin: Optional[Union[float, str]] = None,
+) -> Iterator[Any]:
+    """Enregistrements horodatés entre ``debut`` et ``fin`` (inclus), segments compris.
+
+    Les bornes sont des secondes epoch ou des dates ISO 8601. Les segments
+    hors plage d'après le manifeste ne sont pas ouverts.
+    """
+    t1 = _horodatage({"ts": debut}) if debut is not None else None
+    t2 = _horodatage({"ts": fin}) if fin is not None else None
+
+    def retenir(lignes: Iterable[str]) -> Iterator[Any]:
+        for ligne in lignes:
+            obj = _charger(ligne)
+            ts = _horodatage(obj)
+            if ts is None or (t1 is not None and ts < t1) or (t2 is not None and ts > t2):
+                continue
+            yield obj
+
+    for segment in lire_manifeste(journal):
+        if segment.chevauche(t1, t2):
+            yield from retenir(_lignes_segment(journal, segment))
+    try:
+        with open(journal, "r", encoding="utf-8") as flux:
+            yield from retenir(flux)
+    except OSError:
+        return
+
+
+# ---------------------------------------------------------------------------
+# Rotation
+# ---------------------------------------------------------------------------
+class GestionnaireRotation:
+    """Fait tourner, compresse et purge les segments des journaux JSONL.
+
+    :param taille_max_mo: taille au-delà de laquelle le fichier actif est fermé.
+    :param par_jour: ferme aussi le fichier actif quand il contient un jour précédent.
+    :param compression: ``"zstd"``, ``"gzip"`` ou ``"aucune"``.
+    :param retention_jours: âge maximal (fin de plage) d'un segment conservé.
+    :param max_segments: nombre maximal de segments conservés par journal.
+    """
+
+    def __init__(
+        self,
+        taille_max_mo: float = 20.0,
+        par_jour: bool = True,
+        compression: Optional[str] = None,
+        retention_jours: Optional[float] = 90,
+        max_segments: Optional[int] = None,
+    ) -> None:
+        compression = compression or compression_par_defaut()
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Compression inconnue : {compression!r}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard absent : compression gzip utilisée à la place de zstd.")
+            compression = "gzip"
+        self.taille_max = int(taille_max_mo * 1024 * 1024)
+        self.par_jour = par_jour
+        self.compression = compression
+        self.retention_jours = retention_jours
+        self.max_segments = max_segments
+
+    @classmethod
+    def depuis_config(cls, config: Optional[Mapping[str, Any]]) -> "GestionnaireRotation":
+        """Paramètres lus dans la section ``logs.rotation`` de la configuration."""
+        section = ((config or {}).get("logs") or {}).get("rotation") or {}
+        options = {
+            cle: section[cle]
+            for cle in ("taille_max_mo", "par_jour", "compression", "retention_jours", "max_segments")
+            if cle in section
+        }
+        return cls(**options)
+
+    # -- décision ---------------------------------------------------------
+    def doit_tourner(self, journal: Chemin, maintenant: Optional[float] = None) -> bool:
+        p = Path(journal)
+        try:
+            taille = p.stat().st_size
+        except OSError:
+            return False
+        if taille == 0:
+            return False
+        if self.taille_max > 0 and taille >= self.taille_max:
+            return True
+        if self.par_jour:
+            try:
+                with open(p, "r", encoding="utf-8") as flux:
+                    premiere = flux.readline()
+            except OSError:
+                return False
+            ts = _horodatage(_charger(premiere))
+            if ts is not None and _jour(ts) < _jour(time.time() if maintenant is None else maintenant):
+                return True
+        return False
+
+    # -- rotation ---------------------------------------------------------
+    def faire_tourner(self, journal: Chemin, forcer: bool = False, maintenant: Optional[float] = None) -> Optional[Segment]:
+        """Ferme le fichier actif en segment compressé si nécessaire ; retourne le segment créé."""
+        p = Path(journal)
+        if not (forcer or self.doit_tourner(p, maintenant)):
+            return None
+        try:
+            if p.stat().st_size == 0:
+                return None
+        except OSError:
+            return None
+        dossier = dossier_archives(p)
+        dossier.mkdir(parents=True, exist_ok=True)
+        horodatage = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        ferme = dossier / f"{p.stem}-{horodatage}.jsonl"
+
+        verrou = acquire_lock(p, timeout_s=2.0, poll_s=0.05, stale_s=300)
+        try:
+            os.replace(p, ferme)  # les écrivains suivants recréent le fichier actif
+        except OSError as exc:
+            logger.warning("Rotation impossible de %s : %s", p, exc)
+            return None
+        finally:
+            if verrou:
+                release_lock(p)
+
+        segment = self._compresser(ferme)
+        segments = lire_manifeste(p) + [segment]
+        segments = self._purger(p, segments, maintenant)
+        _ecrire_manifeste(p, segments)
+        logger.info("Journal %s : segment %s (%d enregistrements)", p, segment.fichier, segment.nb)
+        return segment
+
+    def _compresser(self, ferme: Path) -> Segment:
+        nb = 0
+        debut: Optional[float] = None
+        fin: Optional[float] = None
+        cible = ferme.with_name(ferme.name + EXTENSIONS[self.compression])
+        with open(ferme, "rb") as source:
+            brut = source.read()
+        for ligne in brut.decode("utf-8", errors="replace").splitlines():
+            if not ligne.strip():
+                continue
+            nb += 1
+            ts = _horodatage(_charger(ligne))
+            if ts is not None:
+                debut = ts if debut is None else min(debut, ts)
+                fin = ts if fin is None else max(fin, ts)
+        if self.compression == "gzip":
+            with gzip.open(cible, "wb") as flux:
+                flux.write(brut)
+        elif self.compression == "zstd":
+            cible.write_bytes(zstandard.ZstdCompressor(level=10).compress(brut))
+        if cible != ferme:
+            ferme.unlink()
+        return Segment(
+            fichier=cible.name,
+            compression=self.compression,
+            nb=nb,
+            debut=debut,
+            fin=fin,
+            taille=cible.stat().st_size,
+            cree=time.time(),
+        )
+
+    def appliquer_retention(self, journal: Chemin, maintenant: Optional[float] = None) -> int:
+        """Purge les segments hors rétention sans rotation ; retourne le nombre supprimé."""
+        segments = lire_manifeste(journal)
+        if not segments:
+            return 0
+        conserves = self._purger(Path(journal), segments, maintenant)
+        if len(conserves) != len(segments):
+            _ecrire_manifeste(journal, conserves)
+        return len(segments) - len(conserves)
+
+    def _purger(self, journal: Path, segments: List[Segment], maintenant: Optional[float]) -> List[Segment]:
+        conserves = list(segments)
+        if self.retention_jours is not None:
+            limite = (time.time() if maintenant is None else maintenant) - float(self.retention_jours) * 86400
+            conserves = [s for s in conserves if (s.fin if s.fin is not None else s.cree) >= limite]
+        if self.max_segments is not None and self.max_segments >= 0:
+            conserves = conserves[-self.max_segments:] if self.max_segments else []
+        for segment in segments:
+            if segment not in conserves:
+                try:
+                    (dossier_archives(journal) / segment.fichier).unlink()
+                except OSError:
+                    pass
+        return conserves
+
+    def faire_tourner_journaux(
+        self, journaux: Iterable[Chemin] = JOURNAUX_ROTATIFS, forcer: bool = False
+    ) -> Dict[str, Segment]:
+        """Applique la rotation à plusieurs journaux ; retourne les segments créés."""
+        crees: Dict[str, Segment] = {}
+        for journal in journaux:
+            try:
+                segment = self.faire_tourner(journal, forcer=forcer)
+            except OSError as exc:
+                logger.warning("Rotation de %s en erreur : %s", journal, exc)
+                continue
+            if segment is not None:
+                crees[str(journal)] = segment
+            elif self.retention_jours is not None or self.max_segments is not None:
+                self.appliquer_retention(journal)
+        return crees
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DeFiPilot – rotation et lecture des journaux JSONL")
+    parser.add_argument("journaux", nargs="*", help="Journaux à traiter (défaut : journaux DeFiPilot)")
+    parser.add_argument("--forcer", action="store_true", help="Ferme le fichier actif même sous les seuils")
+    parser.add_argument("--taille-max-mo", type=float, default=20.0)
+    parser.add_argument("--compression", choices=sorted(EXTENSIONS), default=None)
+    parser.add_argument("--retention-jours", type=float, default=90)
+    parser.add_argument("--max-segments", type=int, default=None)
+    parser.add_argument("--derniers", type=int, default=0, help="Affiche les N derniers enregistrements")
+    parser.add_argument("--depuis", default=None, help="Affiche les enregistrements depuis cette date ISO")
+    parser.add_argument("--jusqu-a", default=None, help="… jusqu'à cette date ISO")
+    args = parser.parse_args(argv)
+
+    journaux = [Path(j) for j in args.journaux] or list(JOURNAUX_ROTATIFS)
+    if args.derniers or args.depuis or args.jusqu_a:
+        for journal in journaux:
+            enregistrements = (
+                lire_derniers(journal, args.derniers)
+                if args.derniers
+                else lire_intervalle(journal, args.depuis, args.jusqu_a)
+            )
+            for obj in enregistrements:
+                print(json.dumps(obj, ensure_ascii=False))
+        return 0
+
+    gestionnaire = GestionnaireRotation(
+        taille_max_mo=args.taille_max_mo,
+        compression=args.compression,
+        retention_jours=args.retention_jours,
+        max_segments=args.max_segments,
+    )
+    for journal, segment in gestionnaire.faire_tourner_journaux(journaux, forcer=args.forcer).items():
+        print(f"{journal} → {segment.fichier} ({segment.nb} enregistrements)")
+    return 0
+
+
+__all__ = [
+    "DOSSIER_ARCHIVES",
+    "GestionnaireRotation",
+    "JOURNAUX_ROTATIFS",
+    "Segment",
+    "dossier_archives",
+    "lignes_archivees",
+    "lire_derniers",
+    "lire_intervalle",
+    "lire_manifeste",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
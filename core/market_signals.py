@@ -15,11 +15,20 @@ Notes de compatibilité :
 
 from __future__ import annotations
 
-import json
 import math
 from dataclasses import dataclass, fields, replace
 from datetime import datetime, timezone
-from typing import Dict, Mapping, Optional, Sequence, Iterable, Tuple
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Sequence, Iterable, Tuple, Union
+
+import numpy as np
+
+from core import state_manager
+from core.pool_table import PoolTable
+from core.signal_bus import ajouter_jsonl
+
+PoolsStats = Union[Sequence[Mapping[str, float]], PoolTable]
 
 
 # ============================
@@ -58,6 +67,9 @@ class MarketParams:
     volatility_normalizer: float = 1.0  # CV ~ échelle 0..1 (1 = CV de 100%)
     apr_trend_normalizer: float = 0.1   # variation relative (10% ≈ 0.1)
 
+    # === V6.1 : suivi d'état (MarketContextTracker) ===
+    context_hysteresis: float = 0.02    # marge à repasser sous/sur un seuil pour quitter un contexte
+
 
 # ============================
 # Décision & extraction
@@ -72,6 +84,9 @@ class MarketDecision:
     last_context: Optional[str] = None
 
 
+_MARKET_PARAM_FIELDS = frozenset(field.name for field in fields(MarketParams))
+
+
 def load_params_from_config(cfg: Mapping[str, object]) -> MarketParams:
     """Charge les paramètres de marché à partir d'un mapping de config.
 
@@ -83,8 +98,7 @@ def load_params_from_config(cfg: Mapping[str, object]) -> MarketParams:
     if not isinstance(config_section, Mapping):
         return params
 
-    valid_fields = {field.name for field in fields(params)}
-    filtered_values = {k: v for k, v in config_section.items() if k in valid_fields}
+    filtered_values = {k: v for k, v in config_section.items() if k in _MARKET_PARAM_FIELDS}
     if not filtered_values:
         return params
 
@@ -95,71 +109,134 @@ def load_params_from_config(cfg: Mapping[str, object]) -> MarketParams:
 # Utilitaires
 # ============================
 
-def _extract_positive_values(
-    stats: Sequence[Mapping[str, float]],
-    key: str,
-) -> list[float]:
-    """Extrait les valeurs strictement positives d'une clé donnée."""
+@dataclass(frozen=True)
+class MarketStats:
+    """Statistiques agrégées des pools, calculées en une seule passe.
+
+    Les moyennes et sommes portent sur les valeurs strictement positives
+    (APR, volume 24h, TVL) ; la tendance sur les pools fournissant
+    ``apr_24h`` et ``apr_7d`` (avec ``apr_7d`` non nul).
+    """
+
+    apr_count: int = 0
+    apr_mean: float = 0.0
+    apr_stdev: float = 0.0
+    volume_sum: float = 0
+    tvl_sum: float = 0
+    trend_count: int = 0
+    trend_avg: float = 0.0
+
 
-    values: list[float] = []
+_NUMBER = (int, float)
+
+
+def _market_stats_one_pass(stats: Iterable[Mapping[str, float]]) -> MarketStats:
+    """Noyau fusionné : un seul parcours, variance APR par l'algorithme de Welford.
+
+    Les sommes sont accumulées dans l'ordre des pools, comme ``sum()`` sur les
+    listes extraites auparavant : moyennes et sommes sont inchangées.
+    """
+
+    number = _NUMBER
+    is_number = isinstance
+    apr_count = 0
+    apr_total = 0.0
+    apr_running_mean = 0.0
+    apr_m2 = 0.0
+    volume_sum = 0
+    tvl_sum = 0
+    trend_count = 0
+    trend_total = 0.0
     for item in stats:
-        value = item.get(key)
-        if isinstance(value, (int, float)) and value > 0:
-            values.append(float(value))
-    return values
+        get = item.get
+        value = get("apr")
+        if is_number(value, number) and value > 0:
+            x = float(value)
+            apr_count += 1
+            apr_total += x
+            delta = x - apr_running_mean
+            apr_running_mean += delta / apr_count
+            apr_m2 += delta * (x - apr_running_mean)
+        value = get("volume_24h")
+        if is_number(value, number) and value > 0:
+            volume_sum += float(value)
+        value = get("tvl")
+        if is_number(value, number) and value > 0:
+            tvl_sum += float(value)
+        a24 = get("apr_24h")
+        if a24 is not None:
+            a7 = get("apr_7d")
+            if is_number(a24, number) and is_number(a7, number) and a7 != 0:
+                a7 = float(a7)
+                scale = abs(a7)
+                trend_total += (float(a24) - a7) / (scale if scale > 1e-12 else 1e-12)
+                trend_count += 1
+    return MarketStats(
+        apr_count=apr_count,
+        apr_mean=apr_total / apr_count if apr_count else 0.0,
+        apr_stdev=math.sqrt(max(apr_m2, 0.0) / (apr_count - 1)) if apr_count >= 2 else 0.0,
+        volume_sum=volume_sum,
+        tvl_sum=tvl_sum,
+        trend_count=trend_count,
+        trend_avg=trend_total / trend_count if trend_count else 0.0,
+    )
+
 
+def _market_stats_columns(table: PoolTable) -> MarketStats:
+    """Même calcul en colonnes NumPy sur une :class:`PoolTable`."""
+
+    apr = table.positifs("apr")
+    a24 = table.colonne("apr_24h")
+    a7 = table.colonne("apr_7d")
+    valid = ~np.isnan(a24) & ~np.isnan(a7) & (a7 != 0)
+    trends = (a24[valid] - a7[valid]) / np.maximum(1e-12, np.abs(a7[valid]))
+    return MarketStats(
+        apr_count=int(apr.size),
+        apr_mean=float(apr.mean()) if apr.size else 0.0,
+        apr_stdev=float(apr.std(ddof=1)) if apr.size >= 2 else 0.0,
+        volume_sum=float(table.positifs("volume_24h").sum()),
+        tvl_sum=float(table.positifs("tvl").sum()),
+        trend_count=int(trends.size),
+        trend_avg=float(trends.mean()) if trends.size else 0.0,
+    )
 
-def _mean(values: Sequence[float]) -> float:
-    return sum(values) / len(values) if values else 0.0
 
+def compute_market_stats(pools_stats: PoolsStats) -> MarketStats:
+    """Calcule toutes les statistiques de :func:`detect_market_context` en une passe."""
 
-def _stdev(values: Sequence[float]) -> float:
-    n = len(values)
-    if n < 2:
-        return 0.0
-    m = _mean(values)
-    var = sum((x - m) ** 2 for x in values) / (n - 1)
-    return math.sqrt(var)
+    if isinstance(pools_stats, PoolTable):
+        return _market_stats_columns(pools_stats)
+    return _market_stats_one_pass(pools_stats)
 
 
 def _clamp(x: float, lo: float = 0.0, hi: float = 1.0) -> float:
     return max(lo, min(hi, x))
 
 
-def _compute_volatility_score(apr_values: Sequence[float], normalizer: float) -> Tuple[float, float]:
+def _compute_volatility_score(apr_mean: float, apr_stdev: float, normalizer: float) -> Tuple[float, float]:
     """Retourne (score_volatilité, cv) où le score augmente quand la volatilité baisse.
 
     - On mesure la dispersion *entre pools* des APR instantanés via le **coefficient de variation** : CV = stdev/mean.
     - Plus CV est **faible**, plus la situation est considérée stable (score proche de 1).
     - `normalizer` (~1.0) règle à quelle échelle un CV donné est ramené entre 0 et 1.
     """
-    if not apr_values:
+    if apr_mean <= 0:
         return 0.0, 0.0
-    m = _mean(apr_values)
-    if m <= 0:
-        return 0.0, 0.0
-    cv = _stdev(apr_values) / m
+    cv = apr_stdev / apr_mean
     score = _clamp(1.0 - (cv / max(1e-12, normalizer)))
     return score, cv
 
 
-def _compute_apr_trend_score(stats: Sequence[Mapping[str, float]], normalizer: float) -> Tuple[float, float]:
-    """Estime une tendance APR moyenne à partir de clés disponibles.
+def _compute_apr_trend_score(stats: MarketStats, normalizer: float) -> Tuple[float, float]:
+    """Mappe la tendance APR moyenne sur [0,1].
 
     Heuristique simple : si une pool fournit `apr_24h` et `apr_7d`, on considère la
     variation relative t = (apr_24h - apr_7d) / max(1e-12, abs(apr_7d)).
     On moyenne ces t, puis on mappe sur [0,1] via : score = clamp(0.5 + 0.5 * (t/normalizer)).
     """
-    trends: list[float] = []
-    for item in stats:
-        a24 = item.get("apr_24h")
-        a7 = item.get("apr_7d")
-        if isinstance(a24, (int, float)) and isinstance(a7, (int, float)) and a7 != 0:
-            t = (float(a24) - float(a7)) / max(1e-12, abs(float(a7)))
-            trends.append(t)
-    if not trends:
+    if not stats.trend_count:
         return 0.0, 0.0
-    tavg = _mean(trends)
+    tavg = stats.trend_avg
     score = _clamp(0.5 + 0.5 * (tavg / max(1e-12, normalizer)))
     return score, tavg
 
@@ -168,8 +245,16 @@ def _compute_apr_trend_score(stats: Sequence[Mapping[str, float]], normalizer: f
 # Détection de contexte
 # ============================
 
+def _context_from_score(score: float, params: MarketParams) -> str:
+    if score >= params.favorable_threshold:
+        return "favorable"
+    if score <= params.unfavorable_threshold:
+        return "defavorable"
+    return "neutre"
+
+
 def detect_market_context(
-    pools_stats: Sequence[Mapping[str, float]],
+    pools_stats: PoolsStats,
     params: MarketParams,
     last_context: Optional[str] = None,
 ) -> MarketDecision:
@@ -178,15 +263,15 @@ def detect_market_context(
     - Conserve les métriques historiques (apr_mean, volume_sum, tvl_sum).
     - Ajoute des métriques avancées V4.2 (volatility_cv, apr_trend_avg) — optionnelles.
     - Score normalisé par la somme des poids actifs pour rester dans [0,1].
+    - ``pools_stats`` peut être une :class:`PoolTable` (calcul en colonnes,
+      ``tvl`` lu dans la colonne canonique ``tvl_usd``).
     """
 
-    apr_values = _extract_positive_values(pools_stats, "apr")
-    volume_values = _extract_positive_values(pools_stats, "volume_24h")
-    tvl_values = _extract_positive_values(pools_stats, "tvl")
-
-    apr_mean = _mean(apr_values)
-    volume_sum = sum(volume_values)
-    tvl_sum = sum(tvl_values)
+    # Un seul parcours des pools pour toutes les statistiques.
+    stats = compute_market_stats(pools_stats)
+    apr_mean = stats.apr_mean
+    volume_sum = stats.volume_sum
+    tvl_sum = stats.tvl_sum
 
     # Scores de base (bornés 0..1)
     apr_score = _clamp(apr_mean / params.apr_normalizer) if params.apr_normalizer else 0.0
@@ -194,8 +279,8 @@ def detect_market_context(
     tvl_score = _clamp(tvl_sum / params.tvl_normalizer) if params.tvl_normalizer else 0.0
 
     # V4.2 : métriques avancées
-    volty_score, cv = _compute_volatility_score(apr_values, params.volatility_normalizer)
-    trend_score, trend_avg = _compute_apr_trend_score(pools_stats, params.apr_trend_normalizer)
+    volty_score, cv = _compute_volatility_score(stats.apr_mean, stats.apr_stdev, params.volatility_normalizer)
+    trend_score, trend_avg = _compute_apr_trend_score(stats, params.apr_trend_normalizer)
 
     # Agrégation pondérée (on normalise par la somme des poids *actifs*)
     weights = [
@@ -213,16 +298,11 @@ def detect_market_context(
             total_w = 1.0
     raw = sum(s * w for s, w in weights) / total_w
 
-    # Lissage conservé (ici identique à raw, mais compatible avec d'autres schémas)
+    # Lissage conservé (ici identique à raw, mais compatible avec d'autres schémas) ;
+    # le lissage réel d'un appel à l'autre est porté par MarketContextTracker.
     alpha = _clamp(params.smoothing_factor)
     smoothed = alpha * raw + (1 - alpha) * raw
-
-    if smoothed >= params.favorable_threshold:
-        context = "favorable"
-    elif smoothed <= params.unfavorable_threshold:
-        context = "defavorable"
-    else:
-        context = "neutre"
+    context = _context_from_score(smoothed, params)
 
     metrics = {
         "apr_mean": apr_mean,
@@ -241,27 +321,139 @@ def detect_market_context(
     )
 
 
+# ============================
+# Suivi d'état (EWMA)
+# ============================
+MARKET_CONTEXT_STATE_KEY = "market_context"
+_CONTEXTS = ("favorable", "neutre", "defavorable")
+
+
+class MarketContextTracker:
+    """Contexte de marché lissé, conservé d'un snapshot de pools à l'autre.
+
+    Chaque mise à jour applique une EWMA (``smoothing_factor`` = poids de la
+    nouvelle observation) au score et à chaque métrique, en O(1) par rapport à
+    l'historique : aucune fenêtre de signaux passés n'est relue. Un contexte
+    n'est quitté qu'une fois le score repassé de ``context_hysteresis`` de
+    l'autre côté de son seuil, ce qui évite les oscillations autour des seuils.
+
+    L'état (``to_dict``) se persiste dans ``core.state_manager`` sous la clé
+    :data:`MARKET_CONTEXT_STATE_KEY`.
+    """
+
+    def __init__(self, params: Optional[MarketParams] = None, state: Optional[Mapping[str, object]] = None) -> None:
+        self.params = params or MarketParams()
+        self.score: Optional[float] = None
+        self.raw_score: Optional[float] = None
+        self.metrics: Dict[str, float] = {}
+        self.context: Optional[str] = None
+        self.updates = 0
+        if state:
+            self.restore(state)
+
+    def _classify(self, score: float, previous: Optional[str]) -> str:
+        params = self.params
+        margin = max(0.0, params.context_hysteresis)
+        if previous == "favorable" and score >= params.favorable_threshold - margin:
+            return "favorable"
+        if previous == "defavorable" and score <= params.unfavorable_threshold + margin:
+            return "defavorable"
+        return _context_from_score(score, params)
+
+    def observe(self, decision: MarketDecision) -> MarketDecision:
+        """Intègre une décision brute (un snapshot) et retourne la décision lissée."""
+
+        alpha = _clamp(self.params.smoothing_factor)
+        raw = float(decision.score)
+        self.raw_score = raw
+        self.score = raw if self.score is None else alpha * raw + (1 - alpha) * self.score
+        for key, value in decision.metrics.items():
+            previous_value = self.metrics.get(key)
+            value = float(value)
+            self.metrics[key] = value if previous_value is None else alpha * value + (1 - alpha) * previous_value
+        previous = self.context
+        self.context = self._classify(self.score, previous)
+        self.updates += 1
+        return MarketDecision(
+            context=self.context,
+            score=self.score,
+            metrics=dict(self.metrics),
+            last_context=previous,
+        )
+
+    def update(self, pools_stats: PoolsStats) -> MarketDecision:
+        """Calcule la décision brute du snapshot de pools puis l'intègre à l'état."""
+
+        return self.observe(detect_market_context(pools_stats, self.params, last_context=self.context))
+
+    # -- persistance ------------------------------------------------------
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "score": self.score,
+            "raw_score": self.raw_score,
+            "metrics": dict(self.metrics),
+            "context": self.context,
+            "updates": self.updates,
+        }
+
+    def restore(self, state: Mapping[str, object]) -> None:
+        """Recharge un état ``to_dict`` ; les champs invalides sont ignorés."""
+
+        score = state.get("score")
+        raw_score = state.get("raw_score")
+        metrics = state.get("metrics")
+        context = state.get("context")
+        updates = state.get("updates")
+        self.score = float(score) if isinstance(score, (int, float)) else None
+        self.raw_score = float(raw_score) if isinstance(raw_score, (int, float)) else None
+        self.metrics = (
+            {str(k): float(v) for k, v in metrics.items() if isinstance(v, (int, float))}
+            if isinstance(metrics, Mapping)
+            else {}
+        )
+        self.context = context if context in _CONTEXTS else None
+        self.updates = int(updates) if isinstance(updates, int) else 0
+
+    @classmethod
+    def load(
+        cls,
+        params: Optional[MarketParams] = None,
+        path: Path = state_manager.STATE_PATH,
+        key: str = MARKET_CONTEXT_STATE_KEY,
+    ) -> "MarketContextTracker":
+        """Construit un tracker depuis l'état persistant (``core.state_manager``)."""
+
+        state = state_manager.get_state(path).get(key)
+        return cls(params, state if isinstance(state, Mapping) else None)
+
+    def save(self, path: Path = state_manager.STATE_PATH, key: str = MARKET_CONTEXT_STATE_KEY) -> None:
+        """Enregistre l'état dans ``core.state_manager`` (écrit au prochain ``save_state``)."""
+
+        state_manager.update_state({key: self.to_dict()}, path)
+
+
 # ============================
 # Allocation
 # ============================
 
+DEFAULT_ALLOCATION_POLICIES: Mapping[str, Mapping[str, float]] = MappingProxyType({
+    "favorable": MappingProxyType({"risque": 0.6, "modéré": 0.3, "prudent": 0.1}),
+    "neutre": MappingProxyType({"risque": 0.4, "modéré": 0.4, "prudent": 0.2}),
+    "defavorable": MappingProxyType({"risque": 0.2, "modéré": 0.3, "prudent": 0.5}),
+})
+# Vérifiée une fois au chargement plutôt qu'à chaque appel
+for _policy in DEFAULT_ALLOCATION_POLICIES.values():
+    if abs(sum(_policy.values()) - 1.0) > 1e-9:
+        raise ValueError("La somme des pondérations doit être égale à 1.0")
+del _policy
+
+
 def get_allocation_policy_for_context(context: str) -> Dict[str, float]:
     """Retourne la politique d'allocation adaptée au contexte fourni."""
 
-    policies: Dict[str, Dict[str, float]] = {
-        "favorable": {"risque": 0.6, "modéré": 0.3, "prudent": 0.1},
-        "neutre": {"risque": 0.4, "modéré": 0.4, "prudent": 0.2},
-        "defavorable": {"risque": 0.2, "modéré": 0.3, "prudent": 0.5},
-    }
-
-    if context not in policies:
+    if context not in DEFAULT_ALLOCATION_POLICIES:
         raise ValueError(f"Contexte inconnu: {context}")
-
-    policy = policies[context]
-    total = sum(policy.values())
-    if abs(total - 1.0) > 1e-9:
-        raise ValueError("La somme des pondérations doit être égale à 1.0")
-    return policy
+    return dict(DEFAULT_ALLOCATION_POLICIES[context])
 
 
 # ============================
@@ -299,5 +491,4 @@ def journaliser_signaux(
         "journal_path": journal_path,       # pour tracer la source exacte
     }
 
-    with open(journal_path, "a", encoding="utf-8") as fh:
-        fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    ajouter_jsonl(journal_path, entry)
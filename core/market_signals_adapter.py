@@ -11,7 +11,7 @@ Objectifs V4.2 :
 
 Contraintes :
 - Aucune dépendance web.
-- Bibliothèque standard + import de core.market_signals uniquement.
+- Bibliothèque standard + import de core.market_signals / core.policy_tables uniquement.
 - Commentaires/docstrings en français.
 """
 
@@ -21,19 +21,12 @@ from typing import Optional, Tuple, Dict, Any, Mapping
 
 from core.market_signals import (
     MarketParams,
+    MarketContextTracker,
     MarketDecision,
-    load_params_from_config,
     detect_market_context,
-    get_allocation_policy_for_context,
     journaliser_signaux,
 )
-
-# Mapping optionnel pour compat "bull/flat/bear" -> contexte V4.x
-_CONTEXT_ALIAS: Mapping[str, str] = {
-    "bull": "favorable",
-    "flat": "neutre",
-    "bear": "defavorable",
-}
+from core.policy_tables import tables_pour_config
 
 
 def _policy_from_cfg(context: str, cfg: Mapping[str, Any]) -> Optional[Dict[str, float]]:
@@ -51,34 +44,13 @@ def _policy_from_cfg(context: str, cfg: Mapping[str, Any]) -> Optional[Dict[str,
             "neutre": {...},
             "defavorable": {...}
         }
-    """
-    policies_cfg = cfg.get("ALLOCATION_POLICIES") if isinstance(cfg, Mapping) else None
-    if not isinstance(policies_cfg, Mapping):
-        return None
 
-    # Tentative 1 : clés déjà au format contexte V4.x
-    if context in policies_cfg:
-        policy = policies_cfg[context]
-    else:
-        # Tentative 2 : alias bull/flat/bear
-        # ex: context="favorable" -> alias_key="bull"
-        alias_key = next((k for k, v in _CONTEXT_ALIAS.items() if v == context), None)
-        if alias_key and alias_key in policies_cfg:
-            policy = policies_cfg[alias_key]
-        else:
-            return None
-
-    if not isinstance(policy, Mapping):
-        return None
-
-    p = {str(k): float(v) for k, v in policy.items() if k in ("risque", "modéré", "prudent")}
-    total = sum(p.values())
-    if total <= 0:
+    Le bloc est compilé une fois par version de config (``core.policy_tables``).
+    """
+    tables = tables_pour_config(cfg)
+    if context not in tables.policies_config:
         return None
-    # Normalise légèrement si nécessaire (tolérance petite dérive)
-    if abs(total - 1.0) > 1e-9:
-        p = {k: v / total for k, v in p.items()}
-    return p
+    return tables.policy(context)
 
 
 def calculer_contexte_et_policy(
@@ -88,6 +60,7 @@ def calculer_contexte_et_policy(
     run_id: Optional[str] = None,
     version: str = "V4.2.0",
     journal_path: str = "journal_signaux.jsonl",
+    tracker: Optional[MarketContextTracker] = None,
 ) -> Tuple[MarketDecision, Dict[str, float]]:
     """
     Calcule la décision de contexte de marché et renvoie la policy d'allocation correspondante.
@@ -99,22 +72,29 @@ def calculer_contexte_et_policy(
         run_id: identifiant optionnel pour traçabilité.
         version: version logique de l'exécution (ex: tag de release).
         journal_path: chemin du JSONL de journalisation.
+        tracker: état lissé (EWMA + hystérésis) mis à jour avec ce snapshot ;
+            ses paramètres remplacent ceux de cfg et il fournit lui-même last_context.
 
     Returns:
         (decision, policy)
     """
-    # 1) Charger les paramètres de signaux depuis cfg
-    params: MarketParams = load_params_from_config(cfg)
-
-    # 2) Détecter le contexte de marché
-    decision: MarketDecision = detect_market_context(
-        pools_stats=pools_stats,
-        params=params,
-        last_context=last_context,
-    )
+    # 1) Tables compilées depuis cfg (params + policies), recompilées si cfg change
+    tables = tables_pour_config(cfg)
+    params: MarketParams = tables.params
+
+    # 2) Détecter le contexte de marché (lissé d'un snapshot à l'autre si tracker)
+    decision: MarketDecision
+    if tracker is not None:
+        decision = tracker.update(pools_stats)
+    else:
+        decision = detect_market_context(
+            pools_stats=pools_stats,
+            params=params,
+            last_context=last_context,
+        )
 
     # 3) Récupérer la policy associée : priorité à la config si valide, sinon valeurs par défaut
-    policy = _policy_from_cfg(decision.context, cfg) or get_allocation_policy_for_context(decision.context)
+    policy = tables.policy(decision.context)
 
     # 4) Journaliser la décision + policy
     journaliser_signaux(
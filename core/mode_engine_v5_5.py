@@ -23,12 +23,13 @@ from pathlib import Path
 from typing import Any, Dict, List, Mapping
 
 from control.control_pilot import lire_signaux_consolides
+from core.historique import HistoriqueCompact
 from core.journal_strategy import journaliser_entree_strategique
 from core.market_signals_adapter import calculer_contexte_et_policy
 from core.mode_engine_v5_5 import determiner_mode_global_v5_5
 from core.rebalancing import generer_plan_reequilibrage_contexte
 from core.scoring import calculer_scores_et_gains, charger_ponderations
-from core.signals_normalizer import SignalNormalise, normaliser_signaux
+from core.signals_normalizer import SignalNormalise, normaliser_signaux, signal_en_dict
 from core.state_manager import get_state, save_state, update_state
 from core.strategy_snapshot import journaliser_decision
 from core.wallet_reader import lire_soldes_depuis_env
@@ -116,16 +117,7 @@ def _charger_signaux_normalises(limit: int = 50) -> List[SignalNormalise]:
         print(f"[WARN] Impossible de lire les signaux consolidés : {exc}")
         return []
 
-    bruts: List[Dict[str, Any]] = []
-    for s in signaux_consolides:
-        if hasattr(s, "to_dict"):
-            try:
-                bruts.append(s.to_dict())  # type: ignore[call-arg]
-                continue
-            except Exception:
-                pass
-        if isinstance(s, Mapping):
-            bruts.append(dict(s))
+    bruts: List[Dict[str, Any]] = [b for b in map(signal_en_dict, signaux_consolides) if b is not None]
 
     if not bruts:
         return []
@@ -157,7 +149,10 @@ def _calculer_scoring_pools(
         "historique_max_malus": float(base.get("historique_max_malus", 0.0)),
     }
 
-    hist = dict(historique_pools) if isinstance(historique_pools, Mapping) else {}
+    if isinstance(historique_pools, HistoriqueCompact):
+        hist = historique_pools
+    else:
+        hist = dict(historique_pools) if isinstance(historique_pools, Mapping) else None
 
     try:
         solde_ref = float(solde_total_usd)
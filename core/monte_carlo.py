@@ -0,0 +1,529 @@
+# core/monte_carlo.py – V6.1.0
+"""Scénarios Monte Carlo de risque sur l'allocation courante.
+
+``core.risk_analysis`` et ``control.risk_signals`` décrivent l'état présent
+(mode global, seuils sur des moyennes). Ce module projette l'allocation sur
+un horizon de quelques jours à partir de l'historique stocké
+(``core.history_store``) :
+
+- trajectoires d'APR, de TVL et de prix tirées soit par bootstrap par blocs
+  de jours historiques (la corrélation entre pools est conservée), soit par
+  un mouvement brownien géométrique corrélé calibré sur ce même historique ;
+- valeur du portefeuille sur chaque trajectoire calculée par lots vectorisés
+  (``core.simulateur_vectoriel.simuler_trajectoires``) ;
+- VaR, CVaR et percentiles de drawdown, transmis à la couche de risque
+  (``analyser_risque_v5_5(..., monte_carlo=...)`` et
+  ``calculer_signaux_risque({..., "monte_carlo": ...})``) avec les seuils
+  uniques ``SEUILS_DEFAUT`` surchargés par ``safety.monte_carlo`` ;
+- ``evaluer_risque_portefeuille`` : passe de risque du daemon, sur les
+  positions de l'état, bornée en temps et recalculée au plus une fois par
+  ``intervalle_s``.
+
+Chaque lot reçoit sa propre graine dérivée de ``seed`` (``SeedSequence``) :
+le résultat ne dépend ni du nombre de workers ni de l'ordre d'exécution. Les
+gros tirages sont répartis sur un ``ProcessPoolExecutor`` ; le budget de
+temps arrête le tirage au dernier lot complet (les lots suivants sont
+abandonnés et ``budget_atteint`` est levé).
+
+Sans série de prix, la variation de TVL sert d'approximation du prix
+(``beta_prix`` règle la part répercutée sur la position).
+
+Usage :
+    python -m core.monte_carlo --allocation allocation.json [--horizon 30] \\
+        [--trajectoires 10000] [--methode bootstrap|gbm] [--seed 42] [--budget 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as DelaiDepasse
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from core.history_store import CHEMIN_DB, HistoryStore, cle_pool, obtenir_store
+from core.simulateur_vectoriel import JOURS_PAR_AN, simuler_trajectoires
+
+logger = logging.getLogger(__name__)
+
+METHODES = ("bootstrap", "gbm")
+NIVEAUX_VAR = (0.95, 0.99)
+PERCENTILES_DRAWDOWN = (50, 95, 99)
+TAILLE_LOT = 2000
+SEUIL_PARALLELE = 20_000
+_APR_MIN = 1e-6
+
+# Seuils de la couche de risque (en % du capital), surchargés par ``safety.monte_carlo``.
+SEUILS_DEFAUT: Dict[str, float] = {"var_max_pct": 10.0, "cvar_max_pct": 20.0, "drawdown_max_pct": 25.0}
+# Passe de risque du daemon : tirage réduit, budget de temps court.
+PASSE_DEFAUT: Dict[str, Any] = {
+    "actif": True,
+    "horizon_jours": 7,
+    "nb_trajectoires": 2000,
+    "methode": "bootstrap",
+    "budget_s": 2.0,
+    "intervalle_s": 3600.0,
+    "seed": None,
+}
+
+
+# ---------------------------------------------------------------------------
+# Historique
+# ---------------------------------------------------------------------------
+@dataclass
+class HistoriqueMarche:
+    """Séries quotidiennes alignées ``(N, M)`` : APR (%), TVL (USD), prix optionnel."""
+
+    pools: List[str]
+    jours: List[str]
+    apr: np.ndarray
+    tvl: np.ndarray
+    prix: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        self.apr = np.asarray(self.apr, dtype=np.float64)
+        self.tvl = np.asarray(self.tvl, dtype=np.float64)
+        if self.prix is not None:
+            self.prix = np.asarray(self.prix, dtype=np.float64)
+        attendu = (len(self.jours), len(self.pools))
+        for nom, serie in (("apr", self.apr), ("tvl", self.tvl), ("prix", self.prix)):
+            if serie is not None and serie.shape != attendu:
+                raise ValueError(f"Série {nom} de forme {serie.shape}, attendu {attendu}")
+        if len(self.jours) < 2:
+            raise ValueError("Au moins deux jours d'historique sont nécessaires")
+
+    def variations(self) -> Dict[str, np.ndarray]:
+        """Variations journalières ``(N-1, M)`` : log-APR, log-TVL et log-prix."""
+        log_tvl = np.diff(np.log(np.maximum(self.tvl, 1.0)), axis=0)
+        return {
+            "apr": np.diff(np.log(np.maximum(self.apr, _APR_MIN)), axis=0),
+            "tvl": log_tvl,
+            "prix": np.diff(np.log(self.prix), axis=0) if self.prix is not None else None,
+        }
+
+
+def _remplir(serie: np.ndarray) -> np.ndarray:
+    """Complète les trous par la dernière valeur connue (puis la première pour le début)."""
+    for j in range(serie.shape[1]):
+        colonne = serie[:, j]
+        connus = np.flatnonzero(~np.isnan(colonne))
+        if connus.size == 0:
+            continue
+        indices = np.maximum.accumulate(np.where(np.isnan(colonne), 0, np.arange(colonne.size)))
+        indices[: connus[0]] = connus[0]
+        serie[:, j] = colonne[indices]
+    return serie
+
+
+def charger_historique_marche(
+    store: Optional[HistoryStore] = None,
+    pools: Optional[Sequence[str]] = None,
+    debut: Optional[str] = None,
+    fin: Optional[str] = None,
+    chemin: str = CHEMIN_DB,
+) -> HistoriqueMarche:
+    """Historique quotidien des pools depuis le store (dernière observation du jour)."""
+    store = store or obtenir_store(chemin)
+    voulues = set(pools) if pools is not None else None
+    par_jour: Dict[str, Dict[str, tuple]] = {}
+    for obs in store.observations(debut=debut, fin=fin):
+        if voulues is not None and obs["pool"] not in voulues:
+            continue
+        if obs.get("apr") is None and obs.get("tvl_usd") is None:
+            continue
+        par_jour.setdefault(str(obs["ts"])[:10], {})[obs["pool"]] = (obs.get("apr"), obs.get("tvl_usd"))
+
+    jours = sorted(par_jour)
+    noms = sorted({p for valeurs in par_jour.values() for p in valeurs})
+    colonnes = {nom: j for j, nom in enumerate(noms)}
+    apr = np.full((len(jours), len(noms)), np.nan)
+    tvl = np.full((len(jours), len(noms)), np.nan)
+    for i, jour in enumerate(jours):
+        for pool, (a, t) in par_jour[jour].items():
+            if a is not None:
+                apr[i, colonnes[pool]] = a
+            if t is not None:
+                tvl[i, colonnes[pool]] = t
+    apr, tvl = _remplir(apr), _remplir(tvl)
+    apr[np.isnan(apr)] = 0.0
+    tvl[np.isnan(tvl)] = 1.0
+    return HistoriqueMarche(pools=noms, jours=jours, apr=apr, tvl=tvl)
+
+
+# ---------------------------------------------------------------------------
+# Tirage des scénarios
+# ---------------------------------------------------------------------------
+def _indices_bootstrap(rng: np.random.Generator, nb: int, horizon: int, nb_variations: int, bloc: int) -> np.ndarray:
+    bloc = max(1, min(int(bloc), nb_variations))
+    nb_blocs = -(-horizon // bloc)
+    departs = rng.integers(0, nb_variations - bloc + 1, size=(nb, nb_blocs))
+    return (departs[:, :, None] + np.arange(bloc)).reshape(nb, -1)[:, :horizon]
+
+
+def tirer_scenarios(
+    historique: HistoriqueMarche,
+    nb: int,
+    horizon_jours: int,
+    rng: np.random.Generator,
+    *,
+    methode: str = "bootstrap",
+    bloc_jours: int = 5,
+) -> Dict[str, np.ndarray]:
+    """Trajectoires ``(P, H, M)`` d'APR (%), de log-variation de TVL et de prix.
+
+    ``bootstrap`` rejoue des blocs de jours historiques (mêmes jours pour
+    toutes les pools) ; ``gbm`` tire des variations log-normales corrélées
+    (moyenne et covariance estimées sur l'historique) depuis le dernier jour.
+    """
+    if methode not in METHODES:
+        raise ValueError(f"Méthode inconnue : {methode!r} (attendu {METHODES})")
+    variations = historique.variations()
+    nb_pools = len(historique.pools)
+    if methode == "bootstrap":
+        idx = _indices_bootstrap(rng, nb, horizon_jours, variations["apr"].shape[0], bloc_jours)
+        apr = historique.apr[1:][idx]
+        tvl = variations["tvl"][idx]
+        prix = variations["prix"][idx] if variations["prix"] is not None else None
+        return {"apr": apr, "tvl": tvl, "prix": prix}
+
+    series = [variations["apr"], variations["tvl"]] + ([variations["prix"]] if variations["prix"] is not None else [])
+    matrice = np.hstack(series)
+    moyenne = matrice.mean(axis=0)
+    covariance = np.atleast_2d(np.cov(matrice, rowvar=False)) if matrice.shape[0] > 1 else np.zeros((matrice.shape[1],) * 2)
+    racine = np.linalg.cholesky(covariance + np.eye(covariance.shape[0]) * 1e-12)
+    tirages = moyenne + rng.standard_normal((nb, horizon_jours, matrice.shape[1])) @ racine.T
+    log_apr0 = np.log(np.maximum(historique.apr[-1], _APR_MIN))
+    apr = np.exp(log_apr0 + np.cumsum(tirages[:, :, :nb_pools], axis=1))
+    tvl = tirages[:, :, nb_pools:2 * nb_pools]
+    prix = tirages[:, :, 2 * nb_pools:] if variations["prix"] is not None else None
+    return {"apr": apr, "tvl": tvl, "prix": prix}
+
+
+def facteurs_quotidiens(scenarios: Mapping[str, Optional[np.ndarray]], beta_prix: float = 1.0) -> np.ndarray:
+    """Facteur de croissance ``(P, H, M)`` : rendement du jour × variation de prix."""
+    rendement = 1.0 + scenarios["apr"] / 100.0 / JOURS_PAR_AN
+    prix = scenarios["prix"] if scenarios.get("prix") is not None else scenarios["tvl"] * float(beta_prix)
+    return rendement * np.exp(prix)
+
+
+# ---------------------------------------------------------------------------
+# Lots
+# ---------------------------------------------------------------------------
+_HISTORIQUE: Optional[HistoriqueMarche] = None
+_PARAMS: Dict[str, Any] = {}
+
+
+def _initialiser_worker(historique: HistoriqueMarche, params: Mapping[str, Any]) -> None:
+    global _HISTORIQUE, _PARAMS
+    _HISTORIQUE = historique
+    _PARAMS = dict(params)
+
+
+def _executer_lot(lot: tuple) -> Dict[str, np.ndarray]:
+    """Pertes finales, drawdown max et baisse de TVL pondérée, par trajectoire du lot."""
+    graine, nb = lot
+    assert _HISTORIQUE is not None, "worker non initialisé"
+    p = _PARAMS
+    rng = np.random.default_rng(graine)
+    scenarios = tirer_scenarios(
+        _HISTORIQUE, nb, p["horizon_jours"], rng, methode=p["methode"], bloc_jours=p["bloc_jours"]
+    )
+    poids = p["poids"]
+    valeurs = simuler_trajectoires(facteurs_quotidiens(scenarios, p["beta_prix"]), poids, 1.0)
+    sommets = np.maximum(np.maximum.accumulate(valeurs, axis=1), 1.0)
+    tvl_relative = np.exp(np.cumsum(scenarios["tvl"], axis=1)) @ (poids / poids.sum() if poids.sum() else poids)
+    return {
+        "pertes": 1.0 - valeurs[:, -1],
+        "drawdowns": (1.0 - valeurs / sommets).max(axis=1),
+        "baisses_tvl": 1.0 - np.minimum(tvl_relative.min(axis=1), 1.0),
+    }
+
+
+def _resumer(pertes: np.ndarray, drawdowns: np.ndarray, baisses_tvl: np.ndarray, capital: float) -> Dict[str, float]:
+    resume: Dict[str, float] = {
+        "rendement_moyen_pct": float(-pertes.mean() * 100),
+        "rendement_median_pct": float(-np.median(pertes) * 100),
+        "proba_perte_pct": float((pertes > 0).mean() * 100),
+    }
+    for niveau in NIVEAUX_VAR:
+        etiquette = int(round(niveau * 100))
+        var = float(np.quantile(pertes, niveau))
+        queue = pertes[pertes >= var]
+        cvar = float(queue.mean()) if queue.size else var
+        resume[f"var_{etiquette}_pct"] = var * 100
+        resume[f"var_{etiquette}_usd"] = var * capital
+        resume[f"cvar_{etiquette}_pct"] = cvar * 100
+        resume[f"cvar_{etiquette}_usd"] = cvar * capital
+    for q in PERCENTILES_DRAWDOWN:
+        resume[f"drawdown_p{q}_pct"] = float(np.percentile(drawdowns, q) * 100)
+        resume[f"baisse_tvl_p{q}_pct"] = float(np.percentile(baisses_tvl, q) * 100)
+    return resume
+
+
+# ---------------------------------------------------------------------------
+# Point d'entrée
+# ---------------------------------------------------------------------------
+def simuler_risque(
+    historique: HistoriqueMarche,
+    allocation: Mapping[str, float],
+    *,
+    horizon_jours: int = 30,
+    nb_trajectoires: int = 5000,
+    methode: str = "bootstrap",
+    seed: Optional[int] = None,
+    budget_s: Optional[float] = 5.0,
+    bloc_jours: int = 5,
+    beta_prix: float = 1.0,
+    max_workers: Optional[int] = None,
+    taille_lot: int = TAILLE_LOT,
+    seuil_parallele: int = SEUIL_PARALLELE,
+    horloge: Callable[[], float] = time.perf_counter,
+) -> Dict[str, Any]:
+    """VaR, CVaR et drawdowns de l'allocation (pool → USD) sur ``horizon_jours``.
+
+    Les pools absentes de l'historique sont traitées comme des liquidités et
+    listées dans ``pools_sans_historique``. Avec ``max_workers=0`` (ou sous
+    ``seuil_parallele`` trajectoires) tout tourne dans le processus courant.
+    ``horloge`` (secondes) mesure le budget et ``duree_s``.
+    """
+    if methode not in METHODES:
+        raise ValueError(f"Méthode inconnue : {methode!r} (attendu {METHODES})")
+    capital = float(sum(max(float(v), 0.0) for v in allocation.values()))
+    if capital <= 0:
+        raise ValueError("Allocation vide : aucun montant positif")
+    colonnes = {nom: j for j, nom in enumerate(historique.pools)}
+    poids = np.zeros(len(historique.pools))
+    sans_historique = []
+    for pool, montant in allocation.items():
+        if pool in colonnes:
+            poids[colonnes[pool]] += max(float(montant), 0.0) / capital
+        elif float(montant) > 0:
+            sans_historique.append(pool)
+    if sans_historique:
+        logger.warning("Pools sans historique traitées comme liquidités : %s", ", ".join(sans_historique))
+
+    horizon_jours = max(int(horizon_jours), 1)
+    nb_trajectoires = max(int(nb_trajectoires), 1)
+    taille_lot = max(int(taille_lot), 1)
+    tailles = [taille_lot] * (nb_trajectoires // taille_lot)
+    if nb_trajectoires % taille_lot:
+        tailles.append(nb_trajectoires % taille_lot)
+    graines = np.random.SeedSequence(seed).spawn(len(tailles))
+    lots = list(zip(graines, tailles))
+    params = {
+        "horizon_jours": horizon_jours,
+        "methode": methode,
+        "bloc_jours": bloc_jours,
+        "beta_prix": beta_prix,
+        "poids": poids,
+    }
+
+    workers = (os.cpu_count() or 1) if max_workers is None else max(int(max_workers), 0)
+    if workers <= 1 or len(lots) < 2 or nb_trajectoires < seuil_parallele:
+        workers = 0
+    echeance = horloge() + budget_s if budget_s is not None else math.inf
+    t0 = horloge()
+    resultats: List[Dict[str, np.ndarray]] = []
+    if workers == 0:
+        _initialiser_worker(historique, params)
+        for lot in lots:
+            resultats.append(_executer_lot(lot))
+            if horloge() >= echeance:
+                break
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_initialiser_worker, initargs=(historique, params))
+        try:
+            futures = [pool.submit(_executer_lot, lot) for lot in lots]
+            for future in futures:
+                # Le premier lot est toujours attendu : un rapport vide n'a pas de sens.
+                attente = None if not resultats or echeance == math.inf else max(echeance - horloge(), 0.0)
+                try:
+                    resultats.append(future.result(timeout=attente))
+                except DelaiDepasse:
+                    break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    duree = horloge() - t0
+
+    pertes = np.concatenate([r["pertes"] for r in resultats])
+    rapport: Dict[str, Any] = {
+        "methode": methode,
+        "seed": seed,
+        "horizon_jours": horizon_jours,
+        "nb_trajectoires": int(pertes.size),
+        "nb_trajectoires_demandees": nb_trajectoires,
+        "budget_atteint": len(resultats) < len(lots),
+        "duree_s": duree,
+        "workers": workers,
+        "capital_usd": capital,
+        "historique_jours": len(historique.jours),
+        "pools_sans_historique": sans_historique,
+    }
+    rapport.update(_resumer(
+        pertes,
+        np.concatenate([r["drawdowns"] for r in resultats]),
+        np.concatenate([r["baisses_tvl"] for r in resultats]),
+        capital,
+    ))
+    if rapport["budget_atteint"]:
+        logger.info("Budget de %.2fs atteint : %d/%d trajectoires", budget_s, pertes.size, nb_trajectoires)
+    return rapport
+
+
+# ---------------------------------------------------------------------------
+# Couche de risque
+# ---------------------------------------------------------------------------
+def _section_config(cfg: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+    safety = cfg.get("safety") if isinstance(cfg, Mapping) else None
+    section = safety.get("monte_carlo") if isinstance(safety, Mapping) else None
+    return section if isinstance(section, Mapping) else {}
+
+
+def seuils_monte_carlo(cfg: Optional[Mapping[str, Any]] = None) -> Dict[str, float]:
+    """Seuils VaR95 / CVaR99 / drawdown p95 (en %) : ``SEUILS_DEFAUT`` + ``safety.monte_carlo``."""
+    section = _section_config(cfg)
+    seuils = dict(SEUILS_DEFAUT)
+    for cle in SEUILS_DEFAUT:
+        valeur = section.get(cle)
+        if isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+            seuils[cle] = float(valeur)
+    return seuils
+
+
+def allocation_par_pool(positions: Any) -> Dict[str, float]:
+    """Montants investis (USD) par pool depuis les positions de l'état
+    (``pool`` / ``pool_id``, sinon clé du store ``plateforme | nom``, +
+    ``montant_investi_usd``)."""
+    allocation: Dict[str, float] = {}
+    for pos in positions if isinstance(positions, list) else ():
+        if not isinstance(pos, Mapping):
+            continue
+        pool = pos.get("pool") or pos.get("pool_id")
+        if not pool and pos.get("nom"):
+            pool = cle_pool(pos.get("plateforme"), pos.get("nom"))
+        try:
+            montant = float(pos.get("montant_investi_usd"))
+        except (TypeError, ValueError):
+            continue
+        if pool and montant > 0:
+            allocation[str(pool)] = allocation.get(str(pool), 0.0) + montant
+    return allocation
+
+
+def evaluer_risque_portefeuille(
+    allocation: Mapping[str, float],
+    cfg: Optional[Mapping[str, Any]] = None,
+    *,
+    precedent: Optional[Mapping[str, Any]] = None,
+    store: Optional[HistoryStore] = None,
+    maintenant: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """Rapport Monte Carlo de la passe de risque, ou None (désactivé, allocation
+    vide, historique insuffisant).
+
+    ``precedent`` (rapport de la passe précédente, conservé dans l'état) est
+    réutilisé tant que ``intervalle_s`` n'est pas écoulé et que l'allocation
+    n'a pas changé : le tirage ne coûte au plus ``budget_s`` qu'une fois par
+    intervalle. Le calcul reste dans le processus appelant.
+    """
+    options = {**PASSE_DEFAUT, **_section_config(cfg)}
+    if not options.get("actif") or not allocation:
+        return None
+    maintenant = time.time() if maintenant is None else float(maintenant)
+    cible = {pool: round(float(montant), 6) for pool, montant in allocation.items()}
+    if (
+        isinstance(precedent, Mapping)
+        and precedent.get("allocation") == cible
+        and maintenant - float(precedent.get("calcule_le", 0.0)) < float(options["intervalle_s"])
+    ):
+        return dict(precedent)
+    try:
+        if store is None and not os.path.exists(CHEMIN_DB):
+            return None
+        historique = charger_historique_marche(store, pools=list(cible))
+        rapport = simuler_risque(
+            historique,
+            cible,
+            horizon_jours=int(options["horizon_jours"]),
+            nb_trajectoires=int(options["nb_trajectoires"]),
+            methode=str(options["methode"]),
+            seed=options.get("seed"),
+            budget_s=float(options["budget_s"]),
+            max_workers=0,
+        )
+    except ValueError as exc:
+        logger.info("Passe Monte Carlo ignorée : %s", exc)
+        return None
+    rapport.update({"allocation": cible, "calcule_le": maintenant, "seuils": seuils_monte_carlo(cfg)})
+    return rapport
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DeFiPilot – scénarios Monte Carlo de risque")
+    parser.add_argument("--allocation", required=True, help="Allocation courante (JSON pool → USD)")
+    parser.add_argument("--db", default=CHEMIN_DB, help="Base d'historique SQLite")
+    parser.add_argument("--debut", default=None)
+    parser.add_argument("--fin", default=None)
+    parser.add_argument("--horizon", type=int, default=30, help="Horizon en jours")
+    parser.add_argument("--trajectoires", type=int, default=10_000)
+    parser.add_argument("--methode", choices=METHODES, default="bootstrap")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--budget", type=float, default=5.0, help="Budget de temps (s)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sortie", default=None, help="Écrit le rapport en JSON")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        print(f"[ERROR] Base d'historique introuvable : {args.db} (python -m core.history_store import)")
+        return 1
+    with open(args.allocation, "r", encoding="utf-8") as f:
+        allocation = json.load(f)
+    historique = charger_historique_marche(obtenir_store(args.db), pools=list(allocation), debut=args.debut, fin=args.fin)
+    rapport = simuler_risque(
+        historique,
+        allocation,
+        horizon_jours=args.horizon,
+        nb_trajectoires=args.trajectoires,
+        methode=args.methode,
+        seed=args.seed,
+        budget_s=args.budget,
+        max_workers=args.workers,
+    )
+    print(f"[INFO] {rapport['nb_trajectoires']} trajectoire(s) sur {rapport['horizon_jours']} jours "
+          f"en {rapport['duree_s']:.2f}s ({rapport['methode']}, {rapport['historique_jours']} jours d'historique)")
+    print(f"       VaR95  = {rapport['var_95_pct']:.2f}% ({rapport['var_95_usd']:.2f} USD)  "
+          f"CVaR95 = {rapport['cvar_95_pct']:.2f}%")
+    print(f"       VaR99  = {rapport['var_99_pct']:.2f}%  CVaR99 = {rapport['cvar_99_pct']:.2f}%")
+    print(f"       drawdown p50/p95/p99 = {rapport['drawdown_p50_pct']:.2f}% / "
+          f"{rapport['drawdown_p95_pct']:.2f}% / {rapport['drawdown_p99_pct']:.2f}%")
+    if args.sortie:
+        with open(args.sortie, "w", encoding="utf-8") as f:
+            json.dump(rapport, f, ensure_ascii=False, indent=2)
+        print(f"[OK] Rapport écrit dans {args.sortie}")
+    return 0
+
+
+__all__ = [
+    "HistoriqueMarche",
+    "METHODES",
+    "PASSE_DEFAUT",
+    "SEUILS_DEFAUT",
+    "allocation_par_pool",
+    "charger_historique_marche",
+    "evaluer_risque_portefeuille",
+    "facteurs_quotidiens",
+    "seuils_monte_carlo",
+    "simuler_risque",
+    "tirer_scenarios",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
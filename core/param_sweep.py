@@ -0,0 +1,411 @@
+# core/param_sweep.py – V6.1.0
+"""Balayage parallèle de paramètres de stratégie par backtest.
+
+Chaque essai est un jeu de paramètres appliqué à une configuration de base,
+puis rejoué par ``core.backtest.Backtest`` sur le même historique. Les essais
+sont répartis sur un ``ProcessPoolExecutor`` ; l'historique (snapshots +
+signaux, en lecture seule) est écrit une fois en colonnes ``.npy`` dans un
+répertoire temporaire que chaque worker ouvre avec ``np.load(mmap_mode="r")``.
+Les pages sont partagées entre processus via le cache du système : aucun
+worker ne détient sa propre copie, les pools d'un snapshot sont reconstruits
+à la demande pendant le rejeu, et seul le dict de paramètres transite par
+essai.
+
+Clés de paramètres (notation pointée) :
+- ``market_params.<champ>`` : champs de ``core.market_signals.MarketParams`` ;
+- ``rebalancing.<cle>`` : surcharges de ``core.rebalancing.DEFAULT_PARAMS`` ;
+- ``exposure_table.<profil>.<contexte>`` : table d'exposition de
+  ``core.strategy_engine`` (part investie selon le contexte) ;
+- ``ALLOCATION_POLICIES.<contexte>.<poche>`` ou toute autre clé de config ;
+- ``backtest.<argument>`` : arguments de ``Backtest`` (``frais_bps``,
+  ``profil``, ``capital_usd``…).
+
+Usage :
+    python -m core.param_sweep --snapshots snaps.jsonl --espace espace.json \\
+        [--mode grille|aleatoire] [--essais 64] [--workers 8] [--sortie resultats.csv]
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import csv
+import itertools
+import json
+import logging
+import numbers
+import os
+import pickle
+import random
+import tempfile
+import time
+from collections.abc import Sequence as SequenceABC
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.backtest import Backtest, charger_signaux, charger_snapshots
+
+logger = logging.getLogger(__name__)
+
+PREFIXE_BACKTEST = "backtest."
+METRIQUES: Tuple[str, ...] = (
+    "pnl_usd",
+    "rendement_pct",
+    "turnover_usd",
+    "turnover_ratio",
+    "frais_usd",
+    "drawdown_max_pct",
+    "nb_reequilibrages",
+    "exposition_moyenne",
+    "duree_reelle_s",
+)
+
+
+# ---------------------------------------------------------------------------
+# Espaces de recherche
+# ---------------------------------------------------------------------------
+def grille(espace: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Produit cartésien des valeurs de chaque paramètre."""
+    cles = list(espace)
+    return [dict(zip(cles, valeurs)) for valeurs in itertools.product(*(list(espace[c]) for c in cles))]
+
+
+def aleatoire(espace: Mapping[str, Any], n: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """``n`` tirages : liste → choix uniforme, ``{"min", "max"}`` → uniforme continu
+    (entier si ``"entier": true``)."""
+    rng = random.Random(seed)
+    essais: List[Dict[str, Any]] = []
+    for _ in range(max(int(n), 0)):
+        params: Dict[str, Any] = {}
+        for cle, domaine in espace.items():
+            if isinstance(domaine, Mapping):
+                bas, haut = float(domaine["min"]), float(domaine["max"])
+                params[cle] = rng.randint(int(bas), int(haut)) if domaine.get("entier") else rng.uniform(bas, haut)
+            else:
+                params[cle] = rng.choice(list(domaine))
+        essais.append(params)
+    return essais
+
+
+def appliquer_params(cfg_base: Mapping[str, Any], params: Mapping[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Configuration et arguments de ``Backtest`` pour un jeu de paramètres."""
+    cfg = copy.deepcopy(dict(cfg_base))
+    options: Dict[str, Any] = {}
+    for cle, valeur in params.items():
+        if cle.startswith(PREFIXE_BACKTEST):
+            options[cle[len(PREFIXE_BACKTEST):]] = valeur
+            continue
+        noeud = cfg
+        *parents, feuille = cle.split(".")
+        for partie in parents:
+            enfant = noeud.get(partie)
+            if not isinstance(enfant, dict):
+                enfant = {}
+                noeud[partie] = enfant
+            noeud = enfant
+        noeud[feuille] = valeur
+    return cfg, options
+
+
+# ---------------------------------------------------------------------------
+# Jeu de données partagé
+# ---------------------------------------------------------------------------
+class _Absent:
+    """Marqueur de clé absente (``None`` est une valeur légitime)."""
+
+
+_ABSENT = _Absent()
+
+
+def _ecrire_table(lignes: Sequence[Mapping[str, Any]], dossier: str, prefixe: str) -> Dict[str, Any]:
+    """Écrit une table de dicts en colonnes ``.npy`` ; retourne sa description.
+
+    Colonnes numériques → ``float64`` + masque de présence ; autres valeurs →
+    codes ``int32`` dans un vocabulaire (−1 = clé absente).
+    """
+    cles: List[str] = []
+    for ligne in lignes:
+        cles.extend(c for c in ligne if c not in cles)
+    colonnes: Dict[str, Dict[str, Any]] = {}
+    for i, cle in enumerate(cles):
+        valeurs = [ligne.get(cle, _ABSENT) for ligne in lignes]
+        presentes = [v for v in valeurs if v is not _ABSENT]
+        base = os.path.join(dossier, f"{prefixe}_{i}")
+        if all(isinstance(v, numbers.Real) and not isinstance(v, bool) for v in presentes):
+            np.save(base + "_v.npy", np.array([np.nan if v is _ABSENT else float(v) for v in valeurs], dtype=np.float64))
+            np.save(base + "_m.npy", np.array([v is not _ABSENT for v in valeurs], dtype=bool))
+            colonnes[cle] = {"base": base, "entier": all(isinstance(v, numbers.Integral) for v in presentes)}
+            continue
+        vocabulaire: List[Any] = []
+        index: Dict[bytes, int] = {}
+        codes = np.full(len(valeurs), -1, dtype=np.int32)
+        for j, v in enumerate(valeurs):
+            if v is _ABSENT:
+                continue
+            empreinte = pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL)
+            if empreinte not in index:
+                index[empreinte] = len(vocabulaire)
+                vocabulaire.append(v)
+            codes[j] = index[empreinte]
+        np.save(base + "_c.npy", codes)
+        colonnes[cle] = {"base": base, "vocabulaire": vocabulaire}
+    return {"n": len(lignes), "colonnes": colonnes}
+
+
+class TableProjetee(SequenceABC):
+    """Lignes (dicts) reconstruites à la demande depuis des colonnes projetées en mémoire."""
+
+    def __init__(self, description: Mapping[str, Any]) -> None:
+        self._n = int(description["n"])
+        self._colonnes: List[Tuple[str, Any, Any, Any]] = []
+        for cle, col in description["colonnes"].items():
+            if "vocabulaire" in col:
+                codes = np.load(col["base"] + "_c.npy", mmap_mode="r")
+                self._colonnes.append((cle, codes, None, col["vocabulaire"]))
+            else:
+                valeurs = np.load(col["base"] + "_v.npy", mmap_mode="r")
+                masque = np.load(col["base"] + "_m.npy", mmap_mode="r")
+                self._colonnes.append((cle, valeurs, masque, col["entier"]))
+
+    def __len__(self) -> int:
+        return self._n
+
+    def tranche(self, debut: int, fin: int) -> List[Dict[str, Any]]:
+        """Lignes ``[debut, fin)`` ; une seule lecture par colonne."""
+        lignes: List[Dict[str, Any]] = [{} for _ in range(max(fin - debut, 0))]
+        for cle, donnees, masque, extra in self._colonnes:
+            if masque is None:
+                for ligne, code in zip(lignes, donnees[debut:fin].tolist()):
+                    if code >= 0:
+                        ligne[cle] = extra[code]
+            else:
+                for ligne, valeur, present in zip(lignes, donnees[debut:fin].tolist(), masque[debut:fin].tolist()):
+                    if present:
+                        ligne[cle] = int(valeur) if extra else valeur
+        return lignes
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return self.tranche(i, i + 1)[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.tranche(0, self._n))
+
+
+class SnapshotsProjetes(SequenceABC):
+    """Snapshots ``(epoch_s, pools)`` dont les pools sont lus à la demande."""
+
+    def __init__(self, description: Mapping[str, Any]) -> None:
+        self._ts = np.load(description["ts"], mmap_mode="r")
+        self._bornes = np.load(description["bornes"], mmap_mode="r")
+        self._pools = TableProjetee(description["pools"])
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return float(self._ts[i]), self._pools.tranche(int(self._bornes[i]), int(self._bornes[i + 1]))
+
+    def __iter__(self) -> Iterator[Tuple[float, List[Dict[str, Any]]]]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class DatasetPartage:
+    """Historique écrit une fois en colonnes ``.npy``, projeté en mémoire par les workers.
+
+    Le répertoire temporaire est supprimé à la fermeture (ou en sortie de ``with``).
+    """
+
+    def __init__(self, snapshots: Sequence[Any], signaux: Sequence[Any], dossier: Optional[str] = None) -> None:
+        self._repertoire = tempfile.TemporaryDirectory(prefix="defipilot_sweep_", dir=dossier)
+        self.chemin = self._repertoire.name
+        snapshots = list(snapshots)
+        bornes = np.zeros(len(snapshots) + 1, dtype=np.int64)
+        pools: List[Mapping[str, Any]] = []
+        for i, (_, pools_snapshot) in enumerate(snapshots):
+            pools.extend(pools_snapshot)
+            bornes[i + 1] = len(pools)
+        description = {
+            "snapshots": {
+                "ts": os.path.join(self.chemin, "ts.npy"),
+                "bornes": os.path.join(self.chemin, "bornes.npy"),
+                "pools": _ecrire_table(pools, self.chemin, "pools"),
+            },
+            "signaux": _ecrire_table([dict(s) for s in signaux], self.chemin, "signaux"),
+        }
+        np.save(description["snapshots"]["ts"], np.array([float(t) for t, _ in snapshots], dtype=np.float64))
+        np.save(description["snapshots"]["bornes"], bornes)
+        with open(os.path.join(self.chemin, "description.pkl"), "wb") as f:
+            pickle.dump(description, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self.taille = sum(e.stat().st_size for e in os.scandir(self.chemin))
+
+    def fermer(self) -> None:
+        self._repertoire.cleanup()
+
+    def __enter__(self) -> "DatasetPartage":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.fermer()
+
+
+def charger_dataset(chemin: str) -> Dict[str, Any]:
+    """Vues en lecture seule (``mmap_mode="r"``) sur un ``DatasetPartage``."""
+    with open(os.path.join(chemin, "description.pkl"), "rb") as f:
+        description = pickle.load(f)
+    return {
+        "snapshots": SnapshotsProjetes(description["snapshots"]),
+        "signaux": TableProjetee(description["signaux"]),
+    }
+
+
+_DATASET: Optional[Dict[str, Any]] = None
+_CFG_BASE: Dict[str, Any] = {}
+
+
+def _initialiser_worker(chemin: str, cfg_base: Mapping[str, Any]) -> None:
+    global _DATASET, _CFG_BASE
+    _DATASET = charger_dataset(chemin)
+    _CFG_BASE = dict(cfg_base)
+
+
+def _executer_essai(essai: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    index, params = essai
+    ligne: Dict[str, Any] = {"essai": index, **params}
+    assert _DATASET is not None, "worker non initialisé"
+    try:
+        cfg, options = appliquer_params(_CFG_BASE, params)
+        rapport = Backtest(_DATASET["snapshots"], _DATASET["signaux"], cfg, **options).executer()
+        ligne.update({m: rapport.get(m) for m in METRIQUES})
+        ligne["erreur"] = None
+    except Exception as exc:  # un essai invalide ne doit pas interrompre le balayage
+        ligne.update({m: None for m in METRIQUES})
+        ligne["erreur"] = f"{type(exc).__name__}: {exc}"
+    return ligne
+
+
+# ---------------------------------------------------------------------------
+# Balayage
+# ---------------------------------------------------------------------------
+def balayer(
+    snapshots: Sequence[Any],
+    signaux: Sequence[Any],
+    essais: Sequence[Mapping[str, Any]],
+    cfg_base: Optional[Mapping[str, Any]] = None,
+    *,
+    max_workers: Optional[int] = None,
+    trier_par: Optional[str] = "pnl_usd",
+) -> Dict[str, Any]:
+    """Exécute tous les essais et retourne ``{"resultats", "duree_s", "essais_par_s", "workers"}``.
+
+    Avec ``max_workers=0`` les essais tournent dans le processus courant
+    (même chemin de code, utile pour le débogage et les comparaisons).
+    """
+    cfg_base = dict(cfg_base or {})
+    workers = (os.cpu_count() or 1) if max_workers is None else max(int(max_workers), 0)
+    numerotes = [(i, dict(p)) for i, p in enumerate(essais)]
+    t0 = time.perf_counter()
+    with DatasetPartage(snapshots, signaux) as dataset:
+        if workers == 0:
+            _initialiser_worker(dataset.chemin, cfg_base)
+            resultats = [_executer_essai(e) for e in numerotes]
+        else:
+            taille_lot = max(1, len(numerotes) // (workers * 4))
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_initialiser_worker, initargs=(dataset.chemin, cfg_base)
+            ) as pool:
+                resultats = list(pool.map(_executer_essai, numerotes, chunksize=taille_lot))
+    duree = time.perf_counter() - t0
+    if trier_par:
+        resultats.sort(key=lambda r: (r.get(trier_par) is None, -(r.get(trier_par) or 0.0)))
+    return {
+        "resultats": resultats,
+        "duree_s": duree,
+        "essais_par_s": len(numerotes) / duree if duree else 0.0,
+        "workers": workers,
+    }
+
+
+def ecrire_tableau(resultats: Sequence[Mapping[str, Any]], chemin: str) -> None:
+    """Écrit le tableau des résultats en CSV (une colonne par paramètre et métrique)."""
+    colonnes: List[str] = []
+    for ligne in resultats:
+        for cle in ligne:
+            if cle not in colonnes:
+                colonnes.append(cle)
+    with open(chemin, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=colonnes)
+        writer.writeheader()
+        writer.writerows(resultats)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DeFiPilot – balayage de paramètres par backtest")
+    parser.add_argument("--snapshots", required=True)
+    parser.add_argument("--signaux", default="data/logs/journal_signaux.jsonl")
+    parser.add_argument("--ai", default="data/logs/ai_evaluation.jsonl")
+    parser.add_argument("--cfg", default=None, help="Configuration de base (JSON)")
+    parser.add_argument("--espace", required=True, help="Espace de recherche (JSON)")
+    parser.add_argument("--mode", choices=("grille", "aleatoire"), default="grille")
+    parser.add_argument("--essais", type=int, default=32, help="Nombre de tirages en mode aléatoire")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sortie", default="resultats_sweep.csv")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    with open(args.espace, "r", encoding="utf-8") as f:
+        espace = json.load(f)
+    cfg: Dict[str, Any] = {}
+    if args.cfg:
+        with open(args.cfg, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+
+    essais = grille(espace) if args.mode == "grille" else aleatoire(espace, args.essais, args.seed)
+    bilan = balayer(
+        charger_snapshots(args.snapshots),
+        charger_signaux(args.signaux, args.ai),
+        essais,
+        cfg,
+        max_workers=args.workers,
+    )
+    ecrire_tableau(bilan["resultats"], args.sortie)
+    print(f"[INFO] {len(essais)} essai(s) en {bilan['duree_s']:.2f}s sur {bilan['workers']} worker(s) "
+          f"({bilan['essais_par_s']:.2f} essais/s) → {args.sortie}")
+    for ligne in bilan["resultats"][: args.top]:
+        params = {k: v for k, v in ligne.items() if k not in METRIQUES and k not in ("essai", "erreur")}
+        print(f"  #{ligne['essai']:<4} pnl={ligne['pnl_usd']!s:>10} turnover={ligne['turnover_usd']!s:>10} {params}")
+    return 0
+
+
+__all__ = [
+    "DatasetPartage",
+    "METRIQUES",
+    "SnapshotsProjetes",
+    "TableProjetee",
+    "aleatoire",
+    "appliquer_params",
+    "balayer",
+    "charger_dataset",
+    "ecrire_tableau",
+    "grille",
+]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+
@@ -0,0 +1,188 @@
+# core/policy_tables.py – V6.1.0
+"""
+Tables de décision précompilées à partir de la configuration.
+
+Les adaptateurs (``core.market_signals_adapter``, ``core.engine.strategy_adapter``)
+relisaient et normalisaient la configuration à chaque itération : filtrage des
+champs de ``MarketParams`` par réflexion, résolution des alias bull/flat/bear,
+normalisation des policies. Ce module effectue ce travail une seule fois par
+version de configuration et produit des tables figées :
+
+- ``params``        : ``MarketParams`` issu de ``market_params`` ;
+- ``policies``      : contexte → policy d'allocation (config prioritaire, sinon défaut) ;
+- ``ponderations``  : profil → pondérations de scoring (``core.scoring.PROFILS``
+  complété par un bloc ``PROFILS`` optionnel de la config).
+
+La version d'une configuration est l'empreinte JSON des seules sections lues
+ci-dessus : toute modification de l'une d'elles produit une nouvelle empreinte
+et donc une recompilation, le reste de la config n'invalide rien.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from core.market_signals import DEFAULT_ALLOCATION_POLICIES, MarketParams, load_params_from_config
+from core.scoring import PROFILS
+
+logger = logging.getLogger(__name__)
+
+SECTIONS_CONFIG = ("market_params", "ALLOCATION_POLICIES", "PROFILS")
+PROFIL_DEFAUT = "modere"
+TAILLE_CACHE = 8
+
+# Mapping optionnel pour compat "bull/flat/bear" -> contexte V4.x
+ALIAS_CONTEXTES: Mapping[str, str] = MappingProxyType({
+    "bull": "favorable",
+    "flat": "neutre",
+    "bear": "defavorable",
+})
+_CLES_POLICY = ("risque", "modéré", "prudent")
+
+
+@dataclass(frozen=True)
+class TablesPolitique:
+    """Résultat figé de la compilation d'une configuration."""
+
+    version: str
+    params: MarketParams
+    policies: Mapping[str, Mapping[str, float]]
+    ponderations: Mapping[str, Mapping[str, float]]
+    policies_config: frozenset = frozenset()
+
+    def policy(self, context: str) -> Dict[str, float]:
+        """Policy du contexte (copie sérialisable) ; ValueError si contexte inconnu."""
+        try:
+            return dict(self.policies[context])
+        except KeyError:
+            raise ValueError(f"Contexte inconnu: {context}") from None
+
+    def ponderations_profil(self, profil: str) -> Mapping[str, float]:
+        """Pondérations du profil, repli sur le profil modéré comme ``charger_ponderations``."""
+        return self.ponderations.get(profil) or self.ponderations[PROFIL_DEFAUT]
+
+
+def _sections(cfg: Optional[Mapping[str, Any]]) -> Tuple[Any, ...]:
+    if not isinstance(cfg, Mapping):
+        return ()
+    return tuple(cfg.get(cle) for cle in SECTIONS_CONFIG)
+
+
+def empreinte_config(cfg: Optional[Mapping[str, Any]]) -> str:
+    """Version de la configuration : JSON canonique des sections compilées."""
+    if not isinstance(cfg, Mapping):
+        return "null"
+    return json.dumps(dict(zip(SECTIONS_CONFIG, _sections(cfg))), sort_keys=True, default=str)
+
+
+def _policy_normalisee(policy: Any) -> Optional[Dict[str, float]]:
+    """Garde risque/modéré/prudent et normalise la somme à 1 (None si invalide)."""
+    if not isinstance(policy, Mapping):
+        return None
+    try:
+        p = {str(k): float(v) for k, v in policy.items() if k in _CLES_POLICY}
+    except (TypeError, ValueError):
+        return None
+    total = sum(p.values())
+    if total <= 0:
+        return None
+    # Normalise légèrement si nécessaire (tolérance petite dérive)
+    if abs(total - 1.0) > 1e-9:
+        p = {k: v / total for k, v in p.items()}
+    return p
+
+
+def _policies_depuis_config(policies_cfg: Any) -> Dict[str, Dict[str, float]]:
+    """Policies valides de ``ALLOCATION_POLICIES``, clés contexte prioritaires sur les alias."""
+    if not isinstance(policies_cfg, Mapping):
+        return {}
+    resultat: Dict[str, Dict[str, float]] = {}
+    for alias, contexte in ALIAS_CONTEXTES.items():
+        cle = contexte if contexte in policies_cfg else alias
+        if cle in policies_cfg:
+            policy = _policy_normalisee(policies_cfg[cle])
+            if policy is not None:
+                resultat[contexte] = policy
+    return resultat
+
+
+def _ponderations_depuis_config(profils_cfg: Any) -> Dict[str, Mapping[str, float]]:
+    ponderations: Dict[str, Dict[str, Any]] = {nom: dict(base) for nom, base in PROFILS.items()}
+    if isinstance(profils_cfg, Mapping):
+        for nom, valeurs in profils_cfg.items():
+            if isinstance(valeurs, Mapping):
+                ponderations.setdefault(str(nom), dict(ponderations[PROFIL_DEFAUT])).update(valeurs)
+            else:
+                logger.warning("Profil %r ignoré : pondérations invalides", nom)
+    return {nom: MappingProxyType(valeurs) for nom, valeurs in ponderations.items()}
+
+
+def compiler_config(cfg: Optional[Mapping[str, Any]], version: Optional[str] = None) -> TablesPolitique:
+    """Compile la configuration en tables figées (sans cache)."""
+    cfg = cfg if isinstance(cfg, Mapping) else {}
+    depuis_config = _policies_depuis_config(cfg.get("ALLOCATION_POLICIES"))
+    policies = {contexte: MappingProxyType(dict(policy)) for contexte, policy in DEFAULT_ALLOCATION_POLICIES.items()}
+    policies.update((contexte, MappingProxyType(policy)) for contexte, policy in depuis_config.items())
+    return TablesPolitique(
+        version=empreinte_config(cfg) if version is None else version,
+        params=load_params_from_config(cfg),
+        policies=MappingProxyType(policies),
+        ponderations=MappingProxyType(_ponderations_depuis_config(cfg.get("PROFILS"))),
+        policies_config=frozenset(depuis_config),
+    )
+
+
+_CACHE: "OrderedDict[str, TablesPolitique]" = OrderedDict()
+# (copie profonde des sections, tables) de la dernière config servie : évite
+# la sérialisation JSON tant que la config ne change pas d'une itération à l'autre
+_DERNIER: Optional[Tuple[Tuple[Any, ...], TablesPolitique]] = None
+
+
+def tables_pour_config(cfg: Optional[Mapping[str, Any]]) -> TablesPolitique:
+    """Tables de la configuration, compilées au premier appel pour chaque version.
+
+    Une configuration modifiée change d'empreinte et est recompilée ; les
+    ``TAILLE_CACHE`` dernières versions sont conservées.
+    """
+    global _DERNIER
+    sections = _sections(cfg)
+    dernier = _DERNIER
+    if dernier is not None and dernier[0] == sections:
+        return dernier[1]
+
+    version = empreinte_config(cfg)
+    tables = _CACHE.get(version)
+    if tables is None:
+        tables = compiler_config(cfg, version)
+        _CACHE[version] = tables
+        if len(_CACHE) > TAILLE_CACHE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(version)
+    _DERNIER = (copy.deepcopy(sections), tables)
+    return tables
+
+
+def invalider_cache() -> None:
+    """Oublie toutes les tables compilées (rechargement explicite de la config)."""
+    global _DERNIER
+    _DERNIER = None
+    _CACHE.clear()
+
+
+__all__ = [
+    "ALIAS_CONTEXTES",
+    "PROFIL_DEFAUT",
+    "SECTIONS_CONFIG",
+    "TablesPolitique",
+    "compiler_config",
+    "empreinte_config",
+    "invalider_cache",
+    "tables_pour_config",
+]
@@ -0,0 +1,312 @@
+# core/pool_table.py – V6.1.0
+"""Table canonique des pools : colonnes typées et vue ligne compacte.
+
+Les pools circulaient sous forme de dicts libres aux clés hétérogènes
+(``apr``/``apy``, ``tvl``/``tvl_usd``/``tvlUsd``, ``nom``/``symbol``/``pool``…) ;
+chaque consommateur refaisait ses ``.get()`` et ses ``isinstance``.
+
+``PoolTable`` normalise une seule fois à l'ingestion :
+
+- colonnes numériques en tableaux NumPy ``float64`` (``NaN`` = valeur absente) ;
+- colonnes texte en listes de ``str`` (``""`` = valeur absente) ;
+- ``PoolRow`` (``__slots__``) donne une vue ligne sans copie, compatible
+  ``get``/``[]`` avec les anciens dicts, alias de clés compris.
+
+``core.market_signals``, ``core.scoring``, ``core.rebalancing_intra`` et
+``StrategyEngine.select_candidates`` acceptent une ``PoolTable`` à la place
+d'une liste de dicts et travaillent alors en colonnes.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+COLONNES_NUMERIQUES: Tuple[str, ...] = (
+    "apr",
+    "apr_24h",
+    "apr_7d",
+    "tvl_usd",
+    "volume_24h",
+    "score",
+    "montant_usd",
+)
+COLONNES_TEXTE: Tuple[str, ...] = ("pool_id", "plateforme", "nom", "chaine", "categorie")
+# colonne canonique → clés acceptées en entrée, par ordre de priorité
+ALIAS: Dict[str, Tuple[str, ...]] = {
+    "pool_id": ("pool_id", "id"),
+    "plateforme": ("plateforme", "platform", "project"),
+    "nom": ("nom", "symbol", "symbols", "pool"),
+    "chaine": ("chaine", "chain"),
+    "categorie": ("categorie",),
+    "apr": ("apr", "apy"),
+    "apr_24h": ("apr_24h",),
+    "apr_7d": ("apr_7d",),
+    "tvl_usd": ("tvl_usd", "tvl", "tvlUsd"),
+    "volume_24h": ("volume_24h", "volumeUsd1d"),
+    "score": ("score",),
+    "montant_usd": ("montant_usd",),
+}
+_COLONNE_DE_CLE: Dict[str, str] = {cle: colonne for colonne, cles in ALIAS.items() for cle in cles}
+_ABSENT = object()
+
+
+def colonne_canonique(cle: str) -> str:
+    """Nom de colonne canonique d'une clé (alias compris) ; ``KeyError`` si inconnue."""
+    try:
+        return _COLONNE_DE_CLE[cle]
+    except KeyError:
+        raise KeyError(f"Colonne de pool inconnue : {cle}") from None
+
+
+def _nombre(valeur: Any) -> float:
+    if isinstance(valeur, bool) or valeur is None:
+        return math.nan
+    if isinstance(valeur, (int, float)):
+        return float(valeur)
+    try:
+        return float(str(valeur))
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _premiere(pool: Mapping[str, Any], cles: Tuple[str, ...]) -> Any:
+    for cle in cles:
+        valeur = pool.get(cle)
+        if valeur is not None:
+            return valeur
+    return None
+
+
+class PoolRow:
+    """Vue sur la ligne ``indice`` d'une :class:`PoolTable` (aucune copie).
+
+    Les attributs (``row.apr``, ``row.nom``…) renvoient la valeur brute de la
+    colonne (``NaN`` / ``""`` si absente) ; ``get`` et ``[]`` se comportent
+    comme sur l'ancien dict de pool, valeur absente = clé absente.
+    """
+
+    __slots__ = ("table", "indice")
+
+    def __init__(self, table: "PoolTable", indice: int) -> None:
+        self.table = table
+        self.indice = indice
+
+    def get(self, cle: str, defaut: Any = None) -> Any:
+        colonne = _COLONNE_DE_CLE.get(cle)
+        if colonne is None:
+            return defaut
+        if colonne in self.table.nombres:
+            valeur = float(self.table.nombres[colonne][self.indice])
+            return defaut if math.isnan(valeur) else valeur
+        return self.table.textes[colonne][self.indice] or defaut
+
+    def __getitem__(self, cle: str) -> Any:
+        valeur = self.get(cle, _ABSENT)
+        if valeur is _ABSENT:
+            raise KeyError(cle)
+        return valeur
+
+    def __contains__(self, cle: object) -> bool:
+        return isinstance(cle, str) and self.get(cle, _ABSENT) is not _ABSENT
+
+    @property
+    def nom_complet(self) -> str:
+        """Clé d'historique ``"plateforme | nom"``."""
+        return f"{self.plateforme} | {self.nom}"
+
+    def en_dict(self) -> Dict[str, Any]:
+        """Ligne au format dict canonique (valeurs absentes omises)."""
+        pool: Dict[str, Any] = {}
+        for colonne in COLONNES_TEXTE:
+            valeur = self.table.textes[colonne][self.indice]
+            if valeur:
+                pool[colonne] = valeur
+        for colonne in COLONNES_NUMERIQUES:
+            valeur = float(self.table.nombres[colonne][self.indice])
+            if not math.isnan(valeur):
+                pool[colonne] = valeur
+        return pool
+
+    def __repr__(self) -> str:
+        return f"PoolRow({self.indice}, {self.en_dict()!r})"
+
+
+def _propriete_numerique(colonne: str) -> property:
+    return property(lambda ligne: float(ligne.table.nombres[colonne][ligne.indice]), doc=f"Colonne ``{colonne}``.")
+
+
+def _propriete_texte(colonne: str) -> property:
+    return property(lambda ligne: ligne.table.textes[colonne][ligne.indice], doc=f"Colonne ``{colonne}``.")
+
+
+for _colonne in COLONNES_NUMERIQUES:
+    setattr(PoolRow, _colonne, _propriete_numerique(_colonne))
+for _colonne in COLONNES_TEXTE:
+    setattr(PoolRow, _colonne, _propriete_texte(_colonne))
+
+
+class PoolTable:
+    """Univers de pools en colonnes canoniques (une ligne par pool)."""
+
+    __slots__ = ("textes", "nombres")
+
+    def __init__(
+        self,
+        textes: Optional[Mapping[str, Sequence[str]]] = None,
+        nombres: Optional[Mapping[str, Any]] = None,
+    ) -> None:
+        textes = {colonne_canonique(cle): valeurs for cle, valeurs in (textes or {}).items()}
+        nombres = {colonne_canonique(cle): valeurs for cle, valeurs in (nombres or {}).items()}
+        tailles = {len(valeurs) for valeurs in (*textes.values(), *nombres.values())}
+        if len(tailles) > 1:
+            raise ValueError(f"Colonnes de longueurs différentes : {sorted(tailles)}")
+        n = tailles.pop() if tailles else 0
+        self.textes: Dict[str, List[str]] = {
+            colonne: list(textes[colonne]) if colonne in textes else [""] * n for colonne in COLONNES_TEXTE
+        }
+        self.nombres: Dict[str, np.ndarray] = {
+            colonne: np.asarray(nombres[colonne], dtype=np.float64) if colonne in nombres else np.full(n, np.nan)
+            for colonne in COLONNES_NUMERIQUES
+        }
+
+    # -- construction ---------------------------------------------------------
+    @classmethod
+    def depuis_dicts(cls, pools: Iterable[Mapping[str, Any]]) -> "PoolTable":
+        """Normalise des dicts de pools (alias de clés résolus, nombres convertis)."""
+        textes: Dict[str, List[str]] = {colonne: [] for colonne in COLONNES_TEXTE}
+        nombres: Dict[str, List[float]] = {colonne: [] for colonne in COLONNES_NUMERIQUES}
+        alias_textes = [(textes[colonne], ALIAS[colonne]) for colonne in COLONNES_TEXTE]
+        alias_nombres = [(nombres[colonne], ALIAS[colonne]) for colonne in COLONNES_NUMERIQUES]
+        for pool in pools:
+            for valeurs, cles in alias_textes:
+                valeur = _premiere(pool, cles)
+                valeurs.append("" if valeur is None else str(valeur))
+            for valeurs, cles in alias_nombres:
+                valeurs.append(_nombre(_premiere(pool, cles)))
+        return cls(textes, nombres)
+
+    @classmethod
+    def depuis_candidats(cls, candidats: Iterable[Any]) -> "PoolTable":
+        """Construit la table depuis des ``PoolCandidate`` (métadonnées non conservées)."""
+        candidats = list(candidats)
+        return cls(
+            {
+                "pool_id": [c.pool_id for c in candidats],
+                "plateforme": [c.platform for c in candidats],
+                "nom": [c.symbols for c in candidats],
+                "chaine": [c.chain for c in candidats],
+            },
+            {
+                "apr": [_nombre(c.apr) for c in candidats],
+                "tvl_usd": [_nombre(c.tvl) for c in candidats],
+                "score": [_nombre(c.score) for c in candidats],
+            },
+        )
+
+    @classmethod
+    def depuis_table_flux(cls, table: Any) -> "PoolTable":
+        """Reprend une ``flux_pools.TablePools`` sans recopier ses tableaux numériques."""
+        textes: Dict[str, Sequence[str]] = {"pool_id": table.ids}
+        textes.update({cle: valeurs for cle, valeurs in table.textes.items() if cle in _COLONNE_DE_CLE})
+        nombres = {cle: valeurs for cle, valeurs in table.nombres.items() if cle in _COLONNE_DE_CLE}
+        return cls(textes, nombres)
+
+    # -- accès ----------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.nombres["apr"])
+
+    def __iter__(self) -> Iterator[PoolRow]:
+        return (PoolRow(self, i) for i in range(len(self)))
+
+    def __getitem__(self, indice: int) -> PoolRow:
+        n = len(self)
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError(indice)
+        return PoolRow(self, indice)
+
+    def colonne(self, cle: str) -> Any:
+        """Colonne d'une clé (alias compris) : tableau NumPy ou liste de textes."""
+        colonne = colonne_canonique(cle)
+        return self.nombres[colonne] if colonne in self.nombres else self.textes[colonne]
+
+    def remplie(self, cle: str, defaut: float = 0.0) -> np.ndarray:
+        """Colonne numérique, valeurs absentes remplacées par ``defaut``."""
+        valeurs = self.colonne(cle)
+        return np.where(np.isnan(valeurs), defaut, valeurs)
+
+    def positifs(self, cle: str) -> np.ndarray:
+        """Valeurs strictement positives d'une colonne numérique (ordre conservé)."""
+        valeurs = self.colonne(cle)
+        return valeurs[valeurs > 0]
+
+    def noms_complets(self) -> List[str]:
+        """Clés d'historique ``"plateforme | nom"`` de chaque ligne."""
+        return [f"{plateforme} | {nom}" for plateforme, nom in zip(self.textes["plateforme"], self.textes["nom"])]
+
+    def masque(self, cle: str, valeur: Any) -> np.ndarray:
+        """Masque booléen des lignes dont la colonne vaut ``valeur``."""
+        valeurs = self.colonne(cle)
+        if isinstance(valeurs, np.ndarray):
+            return valeurs == valeur
+        return np.fromiter((v == valeur for v in valeurs), dtype=bool, count=len(valeurs))
+
+    def extraire(self, selection: Any) -> "PoolTable":
+        """Sous-table des lignes sélectionnées (indices ou masque booléen), dans l'ordre donné."""
+        indices = np.asarray(selection)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = indices.astype(np.intp, copy=False)
+        positions = indices.tolist()
+        return PoolTable(
+            {colonne: [valeurs[i] for i in positions] for colonne, valeurs in self.textes.items()},
+            {colonne: valeurs[indices] for colonne, valeurs in self.nombres.items()},
+        )
+
+    def definir(self, cle: str, valeurs: Any) -> None:
+        """Remplace une colonne numérique (même longueur que la table)."""
+        colonne = colonne_canonique(cle)
+        if colonne not in self.nombres:
+            raise KeyError(f"Colonne non numérique : {cle}")
+        tableau = np.asarray(valeurs, dtype=np.float64)
+        if tableau.shape != (len(self),):
+            raise ValueError(f"Longueur {tableau.shape} ≠ {len(self)}")
+        self.nombres[colonne] = tableau
+
+    # -- conversions ----------------------------------------------------------
+    def en_dicts(self) -> List[Dict[str, Any]]:
+        return [ligne.en_dict() for ligne in self]
+
+    def candidat(self, indice: int) -> Any:
+        """Ligne au format ``PoolCandidate`` du moteur de stratégie."""
+        from core.strategy_engine import PoolCandidate
+
+        score = float(self.nombres["score"][indice])
+        apr = float(self.nombres["apr"][indice])
+        tvl = float(self.nombres["tvl_usd"][indice])
+        return PoolCandidate(
+            pool_id=self.textes["pool_id"][indice],
+            platform=self.textes["plateforme"][indice],
+            chain=self.textes["chaine"][indice],
+            symbols=self.textes["nom"][indice],
+            tvl=0.0 if math.isnan(tvl) else tvl,
+            apr=0.0 if math.isnan(apr) else apr,
+            score=None if math.isnan(score) else score,
+        )
+
+    def __repr__(self) -> str:
+        return f"PoolTable({len(self)} pools)"
+
+
+__all__ = [
+    "ALIAS",
+    "COLONNES_NUMERIQUES",
+    "COLONNES_TEXTE",
+    "PoolRow",
+    "PoolTable",
+    "colonne_canonique",
+]
@@ -0,0 +1,382 @@
+# core/quote_service.py – V6.1.0
+"""Service de cotation pré-trade : routes candidates cotées en un seul appel Multicall3.
+
+Pour un swap ``token_in → token_out``, le service évalue la route directe et
+les routes passant par un token intermédiaire (WMATIC, USDC par défaut). Tous
+les ``getAmountsOut`` — de toutes les demandes d'un lot — sont regroupés dans
+un unique ``aggregate3`` Multicall3, accompagné de ``getBlockNumber`` et de la
+cotation du token natif utilisée pour convertir le coût du gas.
+
+Les cotations sont mises en cache par bloc : tant que la chaîne n'a pas
+avancé (ou, à défaut de numéro de bloc, pendant ``ttl_s``), une même demande
+ne refait aucun appel RPC. La meilleure route est celle dont la sortie nette
+du coût de gas (exprimé en ``token_out``) est maximale.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from threading import Lock
+from time import monotonic
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.gas_limit_cache import cache_partage, cle_gas
+from core.gas_oracle import obtenir_oracle
+
+logger = logging.getLogger(__name__)
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+WMATIC_POLYGON = "0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270"
+USDC_POLYGON = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
+INTERMEDIAIRES_DEFAUT: Tuple[str, ...] = (WMATIC_POLYGON, USDC_POLYGON)
+
+SELECTEUR_SWAP = "0x38ed1739"  # swapExactTokensForTokens
+GAS_SWAP_BASE = 110_000
+GAS_PAR_SAUT = 45_000
+DEFAULT_TTL_SECONDS = 2.0  # ≈ temps de bloc Polygon
+
+MULTICALL3_ABI: List[Dict[str, Any]] = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+    {
+        "inputs": [],
+        "name": "getBlockNumber",
+        "outputs": [{"internalType": "uint256", "name": "blockNumber", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+
+@dataclass(frozen=True)
+class RouteQuote:
+    """Cotation d'une route candidate."""
+
+    path: Tuple[str, ...]
+    amount_out: int
+    gas_estime: int
+    cout_gas_out: int
+    amount_out_net: int
+
+
+@dataclass
+class QuoteResult:
+    """Résultat d'une demande : meilleure route et ensemble des candidates cotées."""
+
+    token_in: str
+    token_out: str
+    amount_in: int
+    meilleure: Optional[RouteQuote]
+    candidates: List[RouteQuote] = field(default_factory=list)
+    bloc: Optional[int] = None
+    depuis_cache: bool = False
+
+    @property
+    def path(self) -> Optional[List[str]]:
+        return list(self.meilleure.path) if self.meilleure else None
+
+    @property
+    def amount_out(self) -> int:
+        return self.meilleure.amount_out if self.meilleure else 0
+
+
+def chemins_candidats(token_in: str, token_out: str, intermediaires: Iterable[str]) -> List[Tuple[str, ...]]:
+    """Route directe puis routes à un saut via chaque intermédiaire pertinent."""
+    bas_in, bas_out = token_in.lower(), token_out.lower()
+    chemins: List[Tuple[str, ...]] = [(token_in, token_out)]
+    for hop in intermediaires:
+        if hop.lower() not in (bas_in, bas_out):
+            chemins.append((token_in, hop, token_out))
+    return chemins
+
+
+def _gas_route(router: str, longueur: int) -> int:
+    appris = cache_partage().limite(cle_gas(router, SELECTEUR_SWAP, longueur))
+    return appris if appris is not None else GAS_SWAP_BASE + GAS_PAR_SAUT * max(longueur - 2, 0)
+
+
+class QuoteService:
+    """Cotation multi-routes d'un router UniswapV2 via Multicall3."""
+
+    def __init__(
+        self,
+        w3: Any,
+        router_address: str,
+        *,
+        intermediaires: Sequence[str] = INTERMEDIAIRES_DEFAUT,
+        token_natif: str = WMATIC_POLYGON,
+        multicall_address: str = MULTICALL3_ADDRESS,
+        ttl_s: float = DEFAULT_TTL_SECONDS,
+        gas_mode: str = "normal",
+    ) -> None:
+        from web3 import Web3  # import local : web3 reste optionnel hors exécution réelle
+        from core.swap_reel import ROUTER_V2_ABI
+
+        self.w3 = w3
+        self._cs = Web3.to_checksum_address
+        self.router_address = self._cs(router_address)
+        self.intermediaires = tuple(self._cs(a) for a in intermediaires)
+        self.token_natif = self._cs(token_natif)
+        self.ttl_s = max(float(ttl_s), 0.0)
+        self.gas_mode = gas_mode
+        self._router = w3.eth.contract(address=self.router_address, abi=ROUTER_V2_ABI)
+        self._multicall = w3.eth.contract(address=self._cs(multicall_address), abi=MULTICALL3_ABI)
+        self._lock = Lock()
+        self._cache: Dict[Tuple[str, int, Tuple[str, ...]], Tuple[Optional[int], float, Optional[int]]] = {}
+        self.nb_appels_rpc = 0
+
+    # ------------------------------------------------------------------
+    # Cache
+    # ------------------------------------------------------------------
+    def _cle(self, amount_in: int, path: Tuple[str, ...]) -> Tuple[str, int, Tuple[str, ...]]:
+        return (self.router_address, int(amount_in), tuple(a.lower() for a in path))
+
+    def _bloc_connu(self) -> Optional[int]:
+        """Bloc courant sans appel RPC (échantillon de l'oracle de gas, s'il existe)."""
+        try:
+            snap = obtenir_oracle(self.w3).snapshot_en_cache()
+        except Exception:
+            snap = None
+        if snap is not None and snap.bloc is not None and snap.age() <= self.ttl_s:
+            return snap.bloc
+        return None
+
+    def _lire_cache(self, cle: Tuple[str, int, Tuple[str, ...]], bloc: Optional[int]) -> Optional[Tuple[Optional[int], Optional[int]]]:
+        entree = self._cache.get(cle)
+        if entree is None:
+            return None
+        montant, horodatage, bloc_entree = entree
+        if bloc is not None and bloc_entree is not None:
+            return (montant, bloc_entree) if bloc_entree >= bloc else None
+        return (montant, bloc_entree) if monotonic() - horodatage <= self.ttl_s else None
+
+    def invalider(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    # ------------------------------------------------------------------
+    # Appels
+    # ------------------------------------------------------------------
+    def _appel_groupe(self, requetes: List[Tuple[int, Tuple[str, ...]]]) -> Tuple[List[Optional[int]], Optional[int]]:
+        """Cote toutes les requêtes (montant, path) en un seul ``aggregate3``."""
+        appels = [
+            (self._multicall.address, True, self._multicall.encodeABI(fn_name="getBlockNumber", args=[])),
+        ]
+        for montant, path in requetes:
+            data = self._router.encodeABI(fn_name="getAmountsOut", args=[int(montant), [self._cs(a) for a in path]])
+            appels.append((self.router_address, True, data))
+
+        try:
+            self.nb_appels_rpc += 1
+            reponses = self._multicall.functions.aggregate3(appels).call()
+        except Exception as exc:
+            logger.debug("Multicall3 indisponible (%s) → getAmountsOut séquentiels", exc)
+            return self._appels_sequentiels(requetes), None
+
+        bloc: Optional[int] = None
+        ok, data = reponses[0]
+        if ok and data:
+            bloc = int(self.w3.codec.decode(["uint256"], bytes(data))[0])
+        montants: List[Optional[int]] = []
+        for ok, data in reponses[1:]:
+            if not ok or not data:
+                montants.append(None)
+                continue
+            try:
+                montants.append(int(self.w3.codec.decode(["uint256[]"], bytes(data))[0][-1]))
+            except Exception:
+                montants.append(None)
+        return montants, bloc
+
+    def _appels_sequentiels(self, requetes: List[Tuple[int, Tuple[str, ...]]]) -> List[Optional[int]]:
+        montants: List[Optional[int]] = []
+        for montant, path in requetes:
+            try:
+                self.nb_appels_rpc += 1
+                sorties = self._router.functions.getAmountsOut(int(montant), [self._cs(a) for a in path]).call()
+                montants.append(int(sorties[-1]))
+            except Exception:
+                montants.append(None)
+        return montants
+
+    # ------------------------------------------------------------------
+    # API publique
+    # ------------------------------------------------------------------
+    def coter_lot(
+        self,
+        demandes: Sequence[Tuple[str, str, int]],
+        *,
+        chemins: Optional[Sequence[Optional[Sequence[Sequence[str]]]]] = None,
+        net_de_gas: bool = True,
+        gas_mode: Optional[str] = None,
+    ) -> List[QuoteResult]:
+        """Cote un lot de demandes ``(token_in, token_out, amount_in)`` en un aller-retour.
+
+        ``chemins`` permet d'imposer, par demande, la liste des routes à évaluer.
+        ``gas_mode`` (slow/normal/urgent, défaut : celui du service) fixe le prix
+        du gas des routes nettes ; le cache ne contient que les sorties brutes
+        et reste partagé entre modes.
+        """
+        bloc = self._bloc_connu()
+        plans: List[List[Tuple[str, ...]]] = []
+        for index, (token_in, token_out, _) in enumerate(demandes):
+            imposes = chemins[index] if chemins and index < len(chemins) else None
+            if imposes:
+                plans.append([tuple(self._cs(a) for a in p) for p in imposes])
+            else:
+                plans.append(chemins_candidats(self._cs(token_in), self._cs(token_out), self.intermediaires))
+
+        # Cotation du token natif (conversion du coût du gas) pour chaque token de sortie
+        natifs: Dict[str, Tuple[str, ...]] = {}
+        if net_de_gas:
+            for _, token_out, _ in demandes:
+                sortie = self._cs(token_out)
+                if sortie != self.token_natif:
+                    natifs[sortie] = (self.token_natif, sortie)
+
+        valeurs: Dict[Tuple[str, int, Tuple[str, ...]], Optional[int]] = {}
+        a_coter: List[Tuple[int, Tuple[str, ...]]] = []
+        bloc_cache: Optional[int] = None
+        tout_en_cache = True
+        with self._lock:
+            for (_, _, montant), plan in zip(demandes, plans):
+                for path in plan:
+                    requete = (int(montant), path)
+                    cle = self._cle(*requete)
+                    trouve = self._lire_cache(cle, bloc)
+                    if trouve is None:
+                        a_coter.append(requete)
+                        tout_en_cache = False
+                    else:
+                        valeurs[cle] = trouve[0]
+                        bloc_cache = trouve[1]
+            for path in natifs.values():
+                requete = (10**18, path)
+                cle = self._cle(*requete)
+                trouve = self._lire_cache(cle, bloc)
+                if trouve is None:
+                    a_coter.append(requete)
+                else:
+                    valeurs[cle] = trouve[0]
+
+        bloc_lot = bloc_cache
+        if a_coter:
+            uniques = list(dict.fromkeys(a_coter))
+            montants, bloc_lot = self._appel_groupe(uniques)
+            maintenant = monotonic()
+            with self._lock:
+                for requete, sortie in zip(uniques, montants):
+                    cle = self._cle(*requete)
+                    self._cache[cle] = (sortie, maintenant, bloc_lot)
+                    valeurs[cle] = sortie
+
+        prix_gas = 0
+        if net_de_gas:
+            try:
+                prix_gas = int(obtenir_oracle(self.w3).prix_effectif_wei(gas_mode or self.gas_mode) or 0)
+            except Exception as exc:
+                logger.debug("Prix du gas indisponible (%s) → cotation brute", exc)
+
+        resultats: List[QuoteResult] = []
+        for (token_in, token_out, montant), plan in zip(demandes, plans):
+            sortie = self._cs(token_out)
+            if sortie == self.token_natif:
+                taux_natif: Optional[int] = 10**18
+            else:
+                taux_natif = valeurs.get(self._cle(10**18, natifs.get(sortie, ()))) if net_de_gas else None
+            candidates: List[RouteQuote] = []
+            for path in plan:
+                amount_out = valeurs.get(self._cle(int(montant), path))
+                if not amount_out:
+                    continue
+                gas = _gas_route(self.router_address, len(path))
+                cout = (gas * prix_gas * taux_natif) // 10**18 if (prix_gas and taux_natif) else 0
+                candidates.append(RouteQuote(path, int(amount_out), gas, int(cout), int(amount_out) - int(cout)))
+            meilleure = max(candidates, key=lambda c: c.amount_out_net) if candidates else None
+            resultats.append(
+                QuoteResult(
+                    token_in=self._cs(token_in),
+                    token_out=sortie,
+                    amount_in=int(montant),
+                    meilleure=meilleure,
+                    candidates=candidates,
+                    bloc=bloc_lot,
+                    depuis_cache=tout_en_cache,
+                )
+            )
+        return resultats
+
+    def coter(
+        self,
+        token_in: str,
+        token_out: str,
+        amount_in: int,
+        *,
+        chemins: Optional[Sequence[Sequence[str]]] = None,
+        net_de_gas: bool = True,
+        gas_mode: Optional[str] = None,
+    ) -> QuoteResult:
+        """Cote une seule demande (toutes ses routes candidates en un aller-retour)."""
+        return self.coter_lot(
+            [(token_in, token_out, amount_in)], chemins=[chemins], net_de_gas=net_de_gas, gas_mode=gas_mode
+        )[0]
+
+
+_services: Dict[Tuple[str, str], QuoteService] = {}
+_services_lock = Lock()
+
+
+def obtenir_quote_service(w3: Any, router_address: str, **options: Any) -> QuoteService:
+    """Service partagé par (endpoint RPC, router) pour que le cache survive entre appels.
+
+    Les ``options`` ne servent qu'à la création ; le mode de gas propre à un
+    appel se passe à ``coter`` / ``coter_lot`` (``gas_mode``).
+    """
+    provider = getattr(w3, "provider", None)
+    endpoint = str(getattr(provider, "endpoint_uri", None) or id(provider if provider is not None else w3))
+    cle = (endpoint, router_address.lower())
+    with _services_lock:
+        service = _services.get(cle)
+        if service is None:
+            service = QuoteService(w3, router_address, **options)
+            _services[cle] = service
+        else:
+            service.w3 = w3
+    return service
+
+
+__all__ = [
+    "MULTICALL3_ADDRESS",
+    "QuoteResult",
+    "QuoteService",
+    "RouteQuote",
+    "chemins_candidats",
+    "obtenir_quote_service",
+]
@@ -1,7 +1,13 @@
 # core/rebalancing_intra.py — V4.6.1
 """Module de transformation d'un plan de rééquilibrage catégoriel en ajustements théoriques par pool."""
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Union
+
+import numpy as np
+
+from core.pool_table import PoolTable
+
+EtatPools = Union[List[Dict[str, Any]], PoolTable]
 
 
 def _as_float(value: Any) -> float:
@@ -15,16 +21,21 @@ def _as_float(value: Any) -> float:
         return 0.0
 
 
-def _filtrer_pools_par_categorie(etat_pools: List[Dict[str, Any]], categorie: str) -> List[Dict[str, Any]]:
+def _filtrer_pools_par_categorie(etat_pools: EtatPools, categorie: str) -> EtatPools:
     """Retourne une copie superficielle des pools appartenant à la catégorie demandée."""
 
+    if isinstance(etat_pools, PoolTable):
+        return etat_pools.extraire(etat_pools.masque("categorie", categorie))
     return [dict(pool) for pool in etat_pools if pool.get("categorie") == categorie]
 
 
-def _calculer_poids(pools: List[Dict[str, Any]]) -> List[float]:
+def _calculer_poids(pools: EtatPools) -> List[float]:
     """Calcule les poids relatifs pour une liste de pools en s'appuyant sur les scores tronqués à zéro."""
 
-    scores = [max(_as_float(pool.get("score")), 0.0) for pool in pools]
+    if isinstance(pools, PoolTable):
+        scores = np.maximum(pools.remplie("score"), 0.0).tolist()
+    else:
+        scores = [max(_as_float(pool.get("score")), 0.0) for pool in pools]
     total = sum(scores)
     if not pools:
         return []
@@ -35,7 +46,7 @@ def _calculer_poids(pools: List[Dict[str, Any]]) -> List[float]:
 
 
 def repartir_delta_intra_categorie(
-    etat_pools: List[Dict[str, Any]],
+    etat_pools: EtatPools,
     categorie: str,
     action: str,
     montant_usd: float,
@@ -45,7 +56,7 @@ def repartir_delta_intra_categorie(
     Paramètres
     ----------
     etat_pools : liste de dictionnaires décrivant les pools simulées, dont les clés utilisées sont
-        "pool_id", "categorie", "montant_usd" et "score".
+        "pool_id", "categorie", "montant_usd" et "score", ou :class:`PoolTable` équivalente.
     categorie : catégorie cible pour l'ajustement.
     action : type d'ajustement, doit valoir "augmenter" ou "reduire".
     montant_usd : montant positif associé à l'action de la catégorie.
@@ -109,14 +120,14 @@ def repartir_delta_intra_categorie(
 
 
 def generer_actions_pools_depuis_plan(
-    etat_pools: List[Dict[str, Any]],
+    etat_pools: EtatPools,
     plan: Dict[str, Any],
 ) -> List[Dict[str, Any]]:
     """Transforme un plan de rééquilibrage catégoriel en liste d'actions par pool.
 
     Paramètres
     ----------
-    etat_pools : liste de dictionnaires représentant l'état simulé des pools.
+    etat_pools : liste de dictionnaires (ou :class:`PoolTable`) représentant l'état simulé des pools.
     plan : dictionnaire contenant une clé "actions" listant des ajustements catégoriels de la forme
         {"action": str, "categorie": str, "montant_usd": float}.
 
@@ -11,6 +11,8 @@ from __future__ import annotations
 
 from typing import Any, Mapping, MutableMapping
 
+from core.monte_carlo import seuils_monte_carlo
+
 # Mappage des modes vers les niveaux de risque standards.
 _MODE_TO_RISK = {
     "NORMAL": "LOW",
@@ -20,6 +22,8 @@ _MODE_TO_RISK = {
     "PANIC": "CRITICAL",
 }
 
+_RISK_LEVELS = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+
 # Paramètres par défaut pour chaque mode : sécurité prioritaire.
 _DEFAULT_RULES: dict[str, MutableMapping[str, Any]] = {
     "NORMAL": {
@@ -99,12 +103,54 @@ def _apply_mode_policy(result: dict[str, Any], mode_policy: Any, reasons: list[s
 
 
 
-def analyser_risque_v5_5(decision: Any, strategy_cfg: Mapping[str, Any] | None) -> dict[str, Any]:
+def _apply_monte_carlo(
+    result: dict[str, Any],
+    monte_carlo: Mapping[str, Any],
+    seuils: Mapping[str, float],
+    reasons: list[str],
+) -> None:
+    """Durcit la décision si les scénarios Monte Carlo dépassent les seuils.
+
+    Un dépassement relève le niveau de risque d'un cran et interdit les
+    nouvelles positions ; les sorties restent toujours permises.
+    """
+
+    result["monte_carlo"] = dict(monte_carlo)
+    reasons.append(
+        f"Scénarios Monte Carlo : VaR95={monte_carlo.get('var_95_pct')}%, "
+        f"drawdown p95={monte_carlo.get('drawdown_p95_pct')}%."
+    )
+
+    depassements: list[str] = []
+    for cle_seuil, cle_mesure in (
+        ("var_max_pct", "var_95_pct"),
+        ("cvar_max_pct", "cvar_99_pct"),
+        ("drawdown_max_pct", "drawdown_p95_pct"),
+    ):
+        mesure = monte_carlo.get(cle_mesure)
+        seuil = seuils[cle_seuil]
+        if isinstance(mesure, (int, float)) and mesure > seuil:
+            depassements.append(f"{cle_mesure}={mesure:.2f} > {seuil}")
+
+    if depassements:
+        index = _RISK_LEVELS.index(result["risk_level"]) if result["risk_level"] in _RISK_LEVELS else 0
+        result["risk_level"] = _RISK_LEVELS[min(index + 1, len(_RISK_LEVELS) - 1)]
+        result["allow_new_positions"] = False
+        reasons.append("Seuils Monte Carlo dépassés : " + ", ".join(depassements) + ".")
+
+
+def analyser_risque_v5_5(
+    decision: Any,
+    strategy_cfg: Mapping[str, Any] | None,
+    monte_carlo: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
     """Analyse la décision de risque en V5.5.
 
     Args:
         decision: Objet contenant ``mode_v5_5`` (optionnel).
         strategy_cfg: Configuration de stratégie (peut être None).
+        monte_carlo: Rapport de ``core.monte_carlo.simuler_risque`` (optionnel),
+            comparé aux seuils ``safety.monte_carlo`` de la configuration.
 
     Returns:
         Un dictionnaire détaillant le niveau de risque et les actions permises.
@@ -166,6 +212,9 @@ def analyser_risque_v5_5(decision: Any, strategy_cfg: Mapping[str, Any] | None)
         "reasons": reasons,
     }
 
+    if isinstance(monte_carlo, Mapping):
+        _apply_monte_carlo(result, monte_carlo, seuils_monte_carlo(strategy_cfg), reasons)
+
     return result
 
 
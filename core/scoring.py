@@ -1,6 +1,11 @@
 # core/scoring.py – Version V1.8 avec bonus historique
 
+import numpy as np
+
 from core import historique
+from core.classement import ClassementPools, indices_top_k
+from core.history_store import historique_pools_en_cache
+from core.pool_table import PoolTable
 
 PROFILS = {
     "prudent": {"apr": 0.2, "tvl": 0.8, "historique_max_bonus": 0.10, "historique_max_malus": -0.05},
@@ -26,15 +31,17 @@ def charger_profil_utilisateur():
     }
 
 
-def calculer_score_pool(pool, ponderations, historique_pools, profil):
+def _score_brut(pool, ponderations):
     apr = pool.get("apr", 0)
     tvl = pool.get("tvl_usd", 0)
 
-    score = (
+    return (
         apr * ponderations["apr"] +
         tvl * ponderations["tvl"]
     )
 
+
+def calculer_score_pool(pool, ponderations, historique_pools, profil):
     nom_pool = f"{pool.get('plateforme')} | {pool.get('nom')}"
     bonus = historique.calculer_bonus(
         historique_pools,
@@ -42,11 +49,51 @@ def calculer_score_pool(pool, ponderations, historique_pools, profil):
         max_bonus=profil.get("historique_max_bonus", 0.15),
         max_malus=profil.get("historique_max_malus", -0.10),
     )
-    score *= (1 + bonus)
+    score = _score_brut(pool, ponderations) * (1 + bonus)
     return round(score, 2)
 
 
+def _calculer_scores_table(table, ponderations, historique_pools, profil):
+    """Scores d'une ``PoolTable`` en colonnes (mêmes valeurs que la passe par dict)."""
+    max_bonus = profil.get("historique_max_bonus", 0.15)
+    max_malus = profil.get("historique_max_malus", -0.10)
+    noms = table.noms_complets()
+    if isinstance(historique_pools, historique.HistoriqueCompact):
+        vecteur = np.append(np.asarray(historique_pools.vecteur_bonus(max_bonus, max_malus), dtype=np.float64), 0.0)
+        ids = historique_pools.ids
+        bonus = vecteur[np.fromiter((ids.get(nom, -1) for nom in noms), dtype=np.intp, count=len(noms))]
+    else:
+        par_nom = {}
+        for nom in noms:
+            if nom not in par_nom:
+                par_nom[nom] = historique.calculer_bonus(historique_pools, nom, max_bonus=max_bonus, max_malus=max_malus)
+        bonus = np.fromiter((par_nom[nom] for nom in noms), dtype=np.float64, count=len(noms))
+    brut = table.remplie("apr") * ponderations["apr"] + table.remplie("tvl_usd") * ponderations["tvl"]
+    # round() Python (arrondi exact) plutôt que np.round, pour des scores identiques.
+    table.definir("score", [round(score, 2) for score in (brut * (1 + bonus)).tolist()])
+    return table
+
+
 def calculer_scores(pools, ponderations, historique_pools, profil):
+    # Sans historique fourni (None), le bonus s'appuie sur la base SQLite (si importée),
+    # relue au plus une fois par TTL et non à chaque passe. Un {} explicite reste
+    # « aucun historique ».
+    if historique_pools is None:
+        historique_pools = historique_pools_en_cache()
+    if isinstance(pools, PoolTable):
+        return _calculer_scores_table(pools, ponderations, historique_pools, profil)
+    if isinstance(historique_pools, historique.HistoriqueCompact):
+        # Vecteur de bonus calculé une fois pour la passe, lu par indice.
+        vecteur = historique_pools.vecteur_bonus(
+            profil.get("historique_max_bonus", 0.15),
+            profil.get("historique_max_malus", -0.10),
+        )
+        ids = historique_pools.ids
+        for pool in pools:
+            i = ids.get(f"{pool.get('plateforme')} | {pool.get('nom')}")
+            bonus = 0.0 if i is None else vecteur[i]
+            pool["score"] = round(_score_brut(pool, ponderations) * (1 + bonus), 2)
+        return pools
     for pool in pools:
         pool["score"] = calculer_score_pool(pool, ponderations, historique_pools, profil)
     return pools
@@ -55,9 +102,11 @@ def calculer_scores(pools, ponderations, historique_pools, profil):
 def calculer_scores_et_gains(pools, profil, solde, historique_pools):
     ponderations = profil["ponderations"]
     pools = calculer_scores(pools, ponderations, historique_pools, profil)
-    pools_tries = sorted(pools, key=lambda p: p["score"], reverse=True)
+    if isinstance(pools, PoolTable):
+        top3 = [pools[i] for i in indices_top_k(pools.colonne("score"), 3).tolist()]
+    else:
+        top3 = ClassementPools.construire((i, (p["score"],), p) for i, p in enumerate(pools)).top(3)
 
-    top3 = pools_tries[:3]
     resultats = []
     gain_total = 0
 
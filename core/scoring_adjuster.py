@@ -1,13 +1,27 @@
-# core/scoring_adjuster.py – V5.1.0
+# core/scoring_adjuster.py – V6.1.0
+"""Ajustement des scores de pools selon le contexte et les signaux normalisés.
+
+Les coefficients (contexte, IA, risque) ne dépendent que des signaux : ils
+sont calculés une fois par tick (``calculer_coefficients``) puis appliqués à
+toutes les pools d'un coup par ``ajuster_scores_batch``.
+"""
 from __future__ import annotations
 
 from dataclasses import dataclass, field
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 from .signals_normalizer import SignalNormalise
 
-__all__ = ["ajuster_score_pool", "ScoreDetails"]
+__all__ = [
+    "CoefficientsSignaux",
+    "ScoreDetails",
+    "ajuster_score_pool",
+    "ajuster_scores_batch",
+    "calculer_coefficients",
+]
 
 LOGGER = logging.getLogger(__name__)
 
@@ -26,14 +40,37 @@ class ScoreDetails:
     drapeaux_risque: List[str] = field(default_factory=list)
 
 
-def ajuster_score_pool(
-    pool: Dict[str, object],
-    score_initial: float,
-    signaux: List[SignalNormalise],
-    contexte: str,
-    retourner_details: bool = False,
-) -> float | tuple[float, ScoreDetails]:
-    """Ajuste dynamiquement le score d'une pool selon les signaux fournis."""
+@dataclass(frozen=True)
+class CoefficientsSignaux:
+    """Coefficients d'ajustement dérivés des signaux d'un tick (communs à toutes les pools)."""
+
+    coeff_contexte: float
+    coeff_ai: float
+    coeff_risque: float
+    contexte: str
+    ai_score_moyen: Optional[float] = None
+    drapeaux_risque: Tuple[str, ...] = ()
+
+    def appliquer(self, score_initial: float) -> float:
+        """Score ajusté, sans plafond mais jamais négatif."""
+        score = score_initial * self.coeff_contexte * self.coeff_ai * self.coeff_risque
+        return 0.0 if score < 0 else score
+
+    def details(self, score_initial: float, score_final: float) -> ScoreDetails:
+        return ScoreDetails(
+            score_initial=score_initial,
+            score_final=score_final,
+            coeff_contexte=self.coeff_contexte,
+            coeff_ai=self.coeff_ai,
+            coeff_risque=self.coeff_risque,
+            contexte=self.contexte,
+            ai_score_moyen=self.ai_score_moyen,
+            drapeaux_risque=list(self.drapeaux_risque),
+        )
+
+
+def calculer_coefficients(signaux: Sequence[SignalNormalise], contexte: str) -> CoefficientsSignaux:
+    """Calcule une seule fois les coefficients contexte / IA / risque d'un tick."""
 
     coeff_contexte = _calculer_coeff_contexte(contexte)
     coeff_ai, ai_score_moyen = _calculer_coeff_ai(signaux)
@@ -48,13 +85,33 @@ def ajuster_score_pool(
     else:
         LOGGER.debug("Aucun drapeau risque ➜ coeff %.3f", coeff_risque)
 
+    return CoefficientsSignaux(
+        coeff_contexte=coeff_contexte,
+        coeff_ai=coeff_ai,
+        coeff_risque=coeff_risque,
+        contexte=contexte,
+        ai_score_moyen=ai_score_moyen,
+        drapeaux_risque=tuple(drapeaux_risque),
+    )
+
+
+def ajuster_score_pool(
+    pool: Dict[str, object],
+    score_initial: float,
+    signaux: List[SignalNormalise],
+    contexte: str,
+    retourner_details: bool = False,
+) -> float | tuple[float, ScoreDetails]:
+    """Ajuste dynamiquement le score d'une pool selon les signaux fournis.
+
+    Pour plusieurs pools d'un même tick, préférer ``ajuster_scores_batch``.
+    """
+
+    coefficients = calculer_coefficients(signaux, contexte)
+
     # Calcul du score ajusté sans plafonner artificiellement à 10,
     # mais en évitant les valeurs négatives.
-    score_intermediaire = score_initial * coeff_contexte * coeff_ai * coeff_risque
-    if score_intermediaire < 0:
-        score_final = 0.0
-    else:
-        score_final = score_intermediaire
+    score_final = coefficients.appliquer(score_initial)
 
     if retourner_details:
         LOGGER.info(
@@ -64,40 +121,70 @@ def ajuster_score_pool(
             score_initial,
             score_final,
         )
-        details = ScoreDetails(
-            score_initial=score_initial,
-            score_final=score_final,
-            coeff_contexte=coeff_contexte,
-            coeff_ai=coeff_ai,
-            coeff_risque=coeff_risque,
-            contexte=contexte,
-            ai_score_moyen=ai_score_moyen,
-            drapeaux_risque=drapeaux_risque,
-        )
-        return score_final, details
+        return score_final, coefficients.details(score_initial, score_final)
 
     return score_final
 
 
+def ajuster_scores_batch(
+    scores: Sequence[float] | np.ndarray,
+    signaux: Sequence[SignalNormalise] = (),
+    contexte: str = "",
+    *,
+    coefficients: Optional[CoefficientsSignaux] = None,
+    retourner_details: bool = False,
+) -> np.ndarray | tuple[np.ndarray, List[ScoreDetails]]:
+    """Ajuste un vecteur de scores (une entrée par pool) en une opération.
+
+    Les coefficients sont calculés une fois depuis ``signaux`` et ``contexte``
+    (ou fournis via ``coefficients`` s'ils sont déjà connus pour le tick).
+    Résultat identique à ``ajuster_score_pool`` appelé pool par pool ; les
+    ``ScoreDetails`` par pool ne sont construits que si ``retourner_details``.
+    """
+
+    if coefficients is None:
+        coefficients = calculer_coefficients(signaux, contexte)
+
+    initiaux = np.asarray(scores, dtype=float)
+    ajustes = initiaux * coefficients.coeff_contexte * coefficients.coeff_ai * coefficients.coeff_risque
+    finaux = np.where(ajustes < 0, 0.0, ajustes)
+
+    if not retourner_details:
+        return finaux
+
+    LOGGER.info(
+        "Ajustement de %d pool(s) (%s) : coeff global %.3f",
+        finaux.size,
+        coefficients.contexte,
+        coefficients.coeff_contexte * coefficients.coeff_ai * coefficients.coeff_risque,
+    )
+    details = [
+        coefficients.details(initial, final)
+        for initial, final in zip(initiaux.tolist(), finaux.tolist())
+    ]
+    return finaux, details
+
+
+_COEFFS_CONTEXTE: Mapping[str, float] = {
+    "favorable": 1.08,
+    "bull": 1.06,
+    "haussier": 1.05,
+    "neutre": 1.0,
+    "defavorable": 0.9,
+    "bear": 0.92,
+    "risque": 0.93,
+    "crash": 0.87,
+}
+
 
 def _calculer_coeff_contexte(contexte: str) -> float:
     """Calcule le coefficient global selon le contexte de marché."""
 
     contexte_normalise = (contexte or "").strip().lower()
-    mapping = {
-        "favorable": 1.08,
-        "bull": 1.06,
-        "haussier": 1.05,
-        "neutre": 1.0,
-        "defavorable": 0.9,
-        "bear": 0.92,
-        "risque": 0.93,
-        "crash": 0.87,
-    }
-    return mapping.get(contexte_normalise, 1.0)
-
-
-def _calculer_coeff_ai(signaux: List[SignalNormalise]) -> Tuple[float, Optional[float]]:
+    return _COEFFS_CONTEXTE.get(contexte_normalise, 1.0)
+
+
+def _calculer_coeff_ai(signaux: Sequence[SignalNormalise]) -> Tuple[float, Optional[float]]:
     """Calcule le coefficient lié aux scores IA des signaux."""
 
     ai_scores: List[float] = []
@@ -125,7 +212,7 @@ def _calculer_coeff_ai(signaux: List[SignalNormalise]) -> Tuple[float, Optional[
     return coeff, moyenne
 
 
-def _evaluer_risque(signaux: List[SignalNormalise]) -> Tuple[float, List[str]]:
+def _evaluer_risque(signaux: Sequence[SignalNormalise]) -> Tuple[float, List[str]]:
     """Analyse les métriques des signaux pour déduire un coefficient de risque."""
 
     coeff = 1.0
@@ -0,0 +1,537 @@
+# core/signal_bus.py – V6.1.0
+"""Bus de signaux en mémoire, transport Unix et puits JSONL asynchrone.
+
+Les composants échangeaient uniquement en ajoutant des lignes à des JSONL
+(``journal_signaux.jsonl``, ``journal_control.jsonl``, ``exchange_bus.jsonl``,
+``ai_evaluation.jsonl``) puis en les relisant. Un ``SignalBus`` leur donne :
+
+- des sujets, chacun avec un tampon circulaire des ``capacite`` derniers
+  messages (``dernier`` / ``derniers`` en mémoire, sans I/O) ;
+- des abonnés appelés à chaque publication et ``attendre`` pour bloquer
+  jusqu'au prochain message (pas de scrutation de fichier) ;
+- la persistance : un sujet peut être associé à un journal JSONL dans lequel
+  un ``JsonlSink`` recopie les messages depuis un thread dédié (par lots,
+  sous le verrou ``core.sync_guard`` comme les écrivains existants) ;
+- un transport optionnel entre processus par socket Unix
+  (``ServeurBus`` / ``ClientBus``, une ligne JSON par trame).
+
+Un bus peut être *activé* pour le processus (``activer_bus``) : les écrivains
+de journaux existants (``write_exchange_payload``, ``journaliser_signaux``…)
+passent alors par ``ajouter_jsonl``, qui publie sur le sujet du fichier au
+lieu d'écrire de façon synchrone, et ``read_last_exchange`` lit le tampon.
+Sans bus actif, le comportement fichier est inchangé.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import queue
+import socket
+from collections import Counter, deque
+from pathlib import Path
+from threading import Condition, Event, Lock, Thread
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple, Union
+
+from core.sync_guard import acquire_lock, release_lock
+
+logger = logging.getLogger(__name__)
+
+Chemin = Union[str, "os.PathLike[str]"]
+Abonne = Callable[[str, Dict[str, Any]], None]
+
+CAPACITE_DEFAUT = 256
+JOURNAUX_DEFAUT: Dict[str, str] = {
+    "signaux": "journal_signaux.jsonl",
+    "control": "journal_control.jsonl",
+    "exchange": "exchange_bus.jsonl",
+    "ai_evaluation": "data/logs/ai_evaluation.jsonl",
+}
+PREFIXE_SUJET_JOURNAL = "journal:"
+_MAX_RECENTS = 4096
+
+_ARRET = object()
+
+
+def _cle_chemin(chemin: Chemin) -> str:
+    return os.path.abspath(os.fspath(chemin))
+
+
+def _ligne_json(payload: Mapping[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False)
+
+
+def _ecrire_fichier(chemin: Path, lignes: List[str], verrouiller: bool) -> None:
+    try:
+        chemin.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        pass
+    verrou = acquire_lock(chemin, timeout_s=2.0, poll_s=0.05, stale_s=300) if verrouiller else False
+    try:
+        with chemin.open("a", encoding="utf-8") as flux:
+            flux.write("\n".join(lignes))
+            flux.write("\n")
+    finally:
+        if verrou:
+            release_lock(chemin)
+
+
+# ---------------------------------------------------------------------------
+# Puits JSONL
+# ---------------------------------------------------------------------------
+class JsonlSink:
+    """Écrit des lignes JSON dans des fichiers depuis un thread d'arrière-plan.
+
+    Les messages en attente sont regroupés par fichier : chaque fichier est
+    ouvert (et verrouillé) une seule fois par lot. Les lignes écrites sont
+    mémorisées brièvement pour qu'un lecteur du même processus puisse les
+    reconnaître (``consommer_ecrit``) et ne pas les republier.
+    """
+
+    def __init__(self, verrouiller: bool = True) -> None:
+        self.verrouiller = verrouiller
+        self._file: "queue.Queue[Any]" = queue.Queue()
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+        self._recents: Dict[str, Counter] = {}
+        self.nb_ecrits = 0
+        self.nb_erreurs = 0
+
+    def _demarrer(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = Thread(target=self._boucle, name="JsonlSink", daemon=True)
+                self._thread.start()
+
+    def ecrire(self, chemin: Chemin, payload: Mapping[str, Any]) -> None:
+        """Met le message en file ; l'écriture a lieu dans le thread du puits."""
+        self._demarrer()
+        self._file.put((Path(chemin), _ligne_json(payload)))
+
+    def _boucle(self) -> None:
+        while True:
+            lot: List[Any] = [self._file.get()]
+            while True:
+                try:
+                    lot.append(self._file.get_nowait())
+                except queue.Empty:
+                    break
+            par_fichier: Dict[Path, List[str]] = {}
+            arret = False
+            for item in lot:
+                if item is _ARRET:
+                    arret = True
+                    continue
+                chemin, ligne = item
+                par_fichier.setdefault(chemin, []).append(ligne)
+            for chemin, lignes in par_fichier.items():
+                self._ecrire_lignes(chemin, lignes)
+            for _ in lot:
+                self._file.task_done()
+            if arret:
+                return
+
+    def _ecrire_lignes(self, chemin: Path, lignes: List[str]) -> None:
+        with self._lock:
+            recents = self._recents.setdefault(_cle_chemin(chemin), Counter())
+            if len(recents) > _MAX_RECENTS:
+                recents.clear()
+            recents.update(lignes)
+        try:
+            _ecrire_fichier(chemin, lignes, self.verrouiller)
+            self.nb_ecrits += len(lignes)
+        except OSError as exc:
+            self.nb_erreurs += len(lignes)
+            logger.warning("Écriture impossible dans %s : %s", chemin, exc)
+
+    def consommer_ecrit(self, chemin: Chemin, ligne: str) -> bool:
+        """Vrai (une fois par écriture) si ``ligne`` a été écrite par ce puits dans ``chemin``."""
+        with self._lock:
+            recents = self._recents.get(_cle_chemin(chemin))
+            if not recents or recents[ligne] <= 0:
+                return False
+            recents[ligne] -= 1
+            if recents[ligne] <= 0:
+                del recents[ligne]
+            return True
+
+    def vider(self) -> None:
+        """Attend que tous les messages déjà en file soient écrits."""
+        if self._thread is not None:
+            self._file.join()
+
+    def fermer(self) -> None:
+        """Écrit les messages restants puis arrête le thread."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None and thread.is_alive():
+            self._file.put(_ARRET)
+            thread.join()
+
+
+# ---------------------------------------------------------------------------
+# Bus
+# ---------------------------------------------------------------------------
+class SignalBus:
+    """Bus publish/subscribe en mémoire, par sujet.
+
+    :param sink: puits asynchrone pour la persistance (optionnel).
+    :param journaux: sujet → fichier JSONL où chaque message est recopié.
+    :param capacite: taille du tampon circulaire de chaque sujet.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[JsonlSink] = None,
+        journaux: Optional[Mapping[str, Chemin]] = None,
+        capacite: int = CAPACITE_DEFAUT,
+    ) -> None:
+        self.sink = sink
+        self.capacite = max(int(capacite), 1)
+        self.journaux: Dict[str, Path] = {}
+        self._par_chemin: Dict[str, str] = {}
+        for sujet, chemin in (journaux or {}).items():
+            self.associer_journal(sujet, chemin)
+        self._condition = Condition()
+        self._sequences: Dict[str, int] = {}
+        self._historique: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._abonnes: Dict[str, List[Abonne]] = {}
+
+    # -- journaux -------------------------------------------------------
+    def associer_journal(self, sujet: str, chemin: Chemin) -> None:
+        """Recopie les messages de ``sujet`` dans ``chemin`` (via le puits)."""
+        self.journaux[sujet] = Path(chemin)
+        self._par_chemin.setdefault(_cle_chemin(chemin), sujet)
+
+    def sujet_journal(self, chemin: Chemin, creer: bool = True) -> Optional[str]:
+        """Sujet associé à un fichier (créé à la volée si ``creer``)."""
+        cle = _cle_chemin(chemin)
+        sujet = self._par_chemin.get(cle)
+        if sujet is None and creer:
+            sujet = PREFIXE_SUJET_JOURNAL + cle
+            self.associer_journal(sujet, chemin)
+        return sujet
+
+    def publier_journal(self, chemin: Chemin, message: Mapping[str, Any]) -> int:
+        """Publie sur le sujet du fichier ; le puits y ajoute la ligne."""
+        return self.publier(self.sujet_journal(chemin) or "", message)
+
+    # -- publication ----------------------------------------------------
+    def publier(self, sujet: str, message: Mapping[str, Any], journaliser: bool = True) -> int:
+        """Publie ``message`` sur ``sujet`` et retourne son numéro de séquence.
+
+        ``journaliser=False`` n'écrit pas dans le journal associé (message
+        provenant déjà de ce fichier).
+        """
+        message = dict(message)
+        with self._condition:
+            sequence = self._sequences.get(sujet, 0) + 1
+            self._sequences[sujet] = sequence
+            historique = self._historique.get(sujet)
+            if historique is None:
+                historique = self._historique[sujet] = deque(maxlen=self.capacite)
+            historique.append(message)
+            abonnes = list(self._abonnes.get(sujet, ()))
+            self._condition.notify_all()
+        chemin = self.journaux.get(sujet)
+        if journaliser and chemin is not None and self.sink is not None:
+            self.sink.ecrire(chemin, message)
+        for abonne in abonnes:
+            try:
+                abonne(sujet, message)
+            except Exception:  # un abonné défaillant ne doit pas bloquer les autres
+                logger.exception("Abonné en erreur sur le sujet %s", sujet)
+        return sequence
+
+    def abonner(self, sujet: str, callback: Abonne) -> Callable[[], None]:
+        """Appelle ``callback(sujet, message)`` à chaque publication ; retourne le désabonnement."""
+        with self._condition:
+            self._abonnes.setdefault(sujet, []).append(callback)
+
+        def desabonner() -> None:
+            with self._condition:
+                abonnes = self._abonnes.get(sujet, [])
+                if callback in abonnes:
+                    abonnes.remove(callback)
+
+        return desabonner
+
+    # -- lecture --------------------------------------------------------
+    def dernier(self, sujet: str) -> Optional[Dict[str, Any]]:
+        """Dernier message publié sur ``sujet`` (None si aucun)."""
+        with self._condition:
+            historique = self._historique.get(sujet)
+            return historique[-1] if historique else None
+
+    def derniers(self, sujet: str, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Jusqu'aux ``n`` derniers messages du tampon, du plus ancien au plus récent."""
+        with self._condition:
+            historique = list(self._historique.get(sujet, ()))
+        return historique if n is None or n <= 0 else historique[-n:]
+
+    def sequence(self, sujet: str) -> int:
+        """Numéro de séquence du dernier message de ``sujet`` (0 si aucun)."""
+        with self._condition:
+            return self._sequences.get(sujet, 0)
+
+    def sujets(self) -> List[str]:
+        with self._condition:
+            return sorted(self._historique)
+
+    def attendre(self, sujet: str, apres: int = 0, timeout: Optional[float] = None) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """Attend un message de séquence > ``apres`` ; None si ``timeout`` expire."""
+        with self._condition:
+            ok = self._condition.wait_for(lambda: self._sequences.get(sujet, 0) > apres, timeout)
+            return (self._sequences[sujet], self._historique[sujet][-1]) if ok else None
+
+
+# ---------------------------------------------------------------------------
+# Bus actif du processus
+# ---------------------------------------------------------------------------
+_bus_actif: Optional[SignalBus] = None
+_bus_lock = Lock()
+
+
+def activer_bus(bus: Optional[SignalBus]) -> Optional[SignalBus]:
+    """Fait de ``bus`` le bus du processus ; retourne le précédent."""
+    global _bus_actif
+    with _bus_lock:
+        precedent, _bus_actif = _bus_actif, bus
+    return precedent
+
+
+def desactiver_bus(bus: Optional[SignalBus] = None) -> None:
+    """Désactive le bus courant (seulement s'il s'agit de ``bus`` quand il est donné)."""
+    global _bus_actif
+    with _bus_lock:
+        if bus is None or _bus_actif is bus:
+            _bus_actif = None
+
+
+def bus_actif() -> Optional[SignalBus]:
+    return _bus_actif
+
+
+def ajouter_jsonl(chemin: Chemin, payload: Mapping[str, Any], verrouiller: bool = False) -> None:
+    """Ajoute une ligne à un journal JSONL.
+
+    Avec un bus actif muni d'un puits, le message est publié sur le sujet du
+    fichier et écrit en arrière-plan ; sinon il est écrit immédiatement
+    (sous verrou ``sync_guard`` si ``verrouiller``).
+    """
+    bus = _bus_actif
+    if bus is not None and bus.sink is not None:
+        bus.publier_journal(chemin, payload)
+        return
+    _ecrire_fichier(Path(chemin), [_ligne_json(payload)], verrouiller)
+
+
+def dernier_jsonl(chemin: Chemin) -> Optional[Dict[str, Any]]:
+    """Dernier message du journal tenu en mémoire par le bus actif (None sinon)."""
+    bus = _bus_actif
+    if bus is None:
+        return None
+    sujet = bus.sujet_journal(chemin, creer=False)
+    return bus.dernier(sujet) if sujet is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Transport Unix
+# ---------------------------------------------------------------------------
+def _verifier_transport_unix() -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Transport par socket Unix indisponible sur cette plateforme")
+
+
+class _Connexion:
+    """Flux de trames JSON (une par ligne) sur une socket."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self.sock = sock
+        self._envoi = Lock()
+        self._lecteur = sock.makefile("r", encoding="utf-8")
+
+    def envoyer(self, trame: Mapping[str, Any]) -> None:
+        donnees = (_ligne_json(trame) + "\n").encode("utf-8")
+        with self._envoi:
+            self.sock.sendall(donnees)
+
+    def trames(self):
+        for ligne in self._lecteur:
+            if not ligne.strip():
+                continue
+            try:
+                trame = json.loads(ligne)
+            except ValueError:
+                logger.warning("Trame invalide ignorée : %.80s", ligne)
+                continue
+            if isinstance(trame, dict):
+                yield trame
+
+    def fermer(self) -> None:
+        for action in (lambda: self.sock.shutdown(socket.SHUT_RDWR), self._lecteur.close, self.sock.close):
+            try:
+                action()
+            except OSError:
+                pass
+
+
+class ServeurBus:
+    """Expose un ``SignalBus`` aux autres processus via une socket Unix.
+
+    Trames reçues : ``{"op": "pub", "sujet", "message"}``,
+    ``{"op": "sub", "sujet"}`` et ``{"op": "get", "sujet", "n", "id"}`` ;
+    trames envoyées : ``{"op": "msg", "sujet", "message"}`` (abonnements) et
+    ``{"op": "res", "id", "messages"}`` (réponses).
+    """
+
+    def __init__(self, bus: SignalBus, chemin_socket: Chemin) -> None:
+        _verifier_transport_unix()
+        self.bus = bus
+        self.chemin_socket = os.fspath(chemin_socket)
+        self._sock: Optional[socket.socket] = None
+        self._connexions: List[_Connexion] = []
+        self._lock = Lock()
+        self._arret = Event()
+
+    def demarrer(self) -> "ServeurBus":
+        if os.path.exists(self.chemin_socket):
+            os.unlink(self.chemin_socket)  # socket orpheline d'une exécution précédente
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.chemin_socket)
+        sock.listen()
+        self._sock = sock
+        Thread(target=self._accepter, name="ServeurBus", daemon=True).start()
+        return self
+
+    def _accepter(self) -> None:
+        assert self._sock is not None
+        while not self._arret.is_set():
+            try:
+                client, _ = self._sock.accept()
+            except OSError:
+                return
+            connexion = _Connexion(client)
+            with self._lock:
+                self._connexions.append(connexion)
+            Thread(target=self._servir, args=(connexion,), name="ServeurBus-client", daemon=True).start()
+
+    def _servir(self, connexion: _Connexion) -> None:
+        desabonnements: List[Callable[[], None]] = []
+
+        def relayer(sujet: str, message: Dict[str, Any]) -> None:
+            try:
+                connexion.envoyer({"op": "msg", "sujet": sujet, "message": message})
+            except OSError:
+                for desabonner in desabonnements:
+                    desabonner()
+
+        try:
+            for trame in connexion.trames():
+                op = trame.get("op")
+                sujet = str(trame.get("sujet", ""))
+                if op == "pub" and isinstance(trame.get("message"), dict):
+                    self.bus.publier(sujet, trame["message"])
+                elif op == "sub":
+                    desabonnements.append(self.bus.abonner(sujet, relayer))
+                elif op == "get":
+                    connexion.envoyer({"op": "res", "id": trame.get("id"), "messages": self.bus.derniers(sujet, trame.get("n"))})
+        except (OSError, ValueError):
+            pass
+        finally:
+            for desabonner in desabonnements:
+                desabonner()
+            connexion.fermer()
+            with self._lock:
+                if connexion in self._connexions:
+                    self._connexions.remove(connexion)
+
+    def arreter(self) -> None:
+        self._arret.set()
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        with self._lock:
+            connexions, self._connexions = self._connexions, []
+        for connexion in connexions:
+            connexion.fermer()
+        try:
+            os.unlink(self.chemin_socket)
+        except OSError:
+            pass
+
+
+class ClientBus:
+    """Accès à un ``ServeurBus`` depuis un autre processus."""
+
+    def __init__(self, chemin_socket: Chemin, timeout: float = 2.0) -> None:
+        _verifier_transport_unix()
+        self.timeout = timeout
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(os.fspath(chemin_socket))
+        self._connexion = _Connexion(sock)
+        self._abonnes: Dict[str, List[Abonne]] = {}
+        self._reponses: Dict[int, Any] = {}
+        self._attente = Condition()
+        self._ids = itertools.count(1)
+        Thread(target=self._recevoir, name="ClientBus", daemon=True).start()
+
+    def _recevoir(self) -> None:
+        try:
+            for trame in self._connexion.trames():
+                if trame.get("op") == "msg":
+                    sujet = str(trame.get("sujet", ""))
+                    for callback in list(self._abonnes.get(sujet, ())):
+                        try:
+                            callback(sujet, trame.get("message") or {})
+                        except Exception:
+                            logger.exception("Abonné distant en erreur sur le sujet %s", sujet)
+                elif trame.get("op") == "res":
+                    with self._attente:
+                        self._reponses[trame.get("id")] = trame.get("messages") or []
+                        self._attente.notify_all()
+        except (OSError, ValueError):
+            pass
+
+    def publier(self, sujet: str, message: Mapping[str, Any]) -> None:
+        self._connexion.envoyer({"op": "pub", "sujet": sujet, "message": dict(message)})
+
+    def abonner(self, sujet: str, callback: Abonne) -> None:
+        self._abonnes.setdefault(sujet, []).append(callback)
+        self._connexion.envoyer({"op": "sub", "sujet": sujet})
+
+    def derniers(self, sujet: str, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        ident = next(self._ids)
+        self._connexion.envoyer({"op": "get", "sujet": sujet, "n": n, "id": ident})
+        with self._attente:
+            if not self._attente.wait_for(lambda: ident in self._reponses, self.timeout):
+                raise TimeoutError(f"Pas de réponse du bus pour {sujet!r}")
+            return self._reponses.pop(ident)
+
+    def dernier(self, sujet: str) -> Optional[Dict[str, Any]]:
+        messages = self.derniers(sujet, 1)
+        return messages[-1] if messages else None
+
+    def fermer(self) -> None:
+        self._connexion.fermer()
+
+
+__all__ = [
+    "CAPACITE_DEFAUT",
+    "ClientBus",
+    "JOURNAUX_DEFAUT",
+    "JsonlSink",
+    "ServeurBus",
+    "SignalBus",
+    "activer_bus",
+    "ajouter_jsonl",
+    "bus_actif",
+    "desactiver_bus",
+    "dernier_jsonl",
+]
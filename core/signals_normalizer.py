@@ -1,10 +1,18 @@
-# core/signals_normalizer.py – V5.1.0
-"""Outils de normalisation des signaux consolidés."""
+# core/signals_normalizer.py – V6.1.0
+"""Outils de normalisation des signaux consolidés.
+
+Les alias de champs (horodatage, contexte, score, métriques) sont résolus une
+fois par forme de signal et les lots sont traités par colonnes ;
+``NormaliseurSignaux`` garde en cache les signaux déjà normalisés par offset
+de journal pour ne traiter que les nouveaux à chaque boucle.
+"""
 
 from __future__ import annotations
 
 import math
-from typing import Any, Dict, List, Optional, TypedDict
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, TypedDict
 
 
 class SignalNormalise(TypedDict, total=False):
@@ -16,7 +24,50 @@ class SignalNormalise(TypedDict, total=False):
     ai_score: float
 
 
-__all__ = ["SignalNormalise", "normaliser_signaux"]
+__all__ = ["NormaliseurSignaux", "SignalNormalise", "normaliser_signaux", "signal_en_dict"]
+
+_CLES_TIMESTAMP = ("timestamp", "ts")
+_CLES_CONTEXTE = ("AI_context", "context", "contexte")
+_CLES_SCORE = ("AI_confidence", "context_score")
+_CLES_METRIQUES_PRIORITAIRES = (
+    "APR",
+    "apr",
+    "APY",
+    "apy",
+    "TVL",
+    "tvl",
+    "tvl_usd",
+    "volatilite",
+    "volatility",
+    "volume",
+    "fees",
+    "liquidity",
+    "utilization",
+)
+_PRIORITAIRES = frozenset(_CLES_METRIQUES_PRIORITAIRES)
+
+
+class _Schema(NamedTuple):
+    """Clés utiles d'une forme de signal, dans leur ordre de priorité."""
+
+    timestamp: Tuple[str, ...]
+    contexte: Tuple[str, ...]
+    score: Tuple[str, ...]
+    prioritaires: Tuple[str, ...]
+    autres: Tuple[str, ...]
+
+
+@lru_cache(maxsize=256)
+def _schema(cles: Tuple[Any, ...]) -> _Schema:
+    """Résout les alias une fois par forme de signal (tuple ordonné des clés)."""
+    presentes = set(cles)
+    return _Schema(
+        timestamp=tuple(c for c in _CLES_TIMESTAMP if c in presentes),
+        contexte=tuple(c for c in _CLES_CONTEXTE if c in presentes),
+        score=tuple(c for c in _CLES_SCORE if c in presentes),
+        prioritaires=tuple(c for c in _CLES_METRIQUES_PRIORITAIRES if c in presentes),
+        autres=tuple(c for c in cles if c not in _PRIORITAIRES),
+    )
 
 
 def normaliser_signaux(signaux_bruts: List[Dict[str, Any]]) -> List[SignalNormalise]:
@@ -29,101 +80,149 @@ def normaliser_signaux(signaux_bruts: List[Dict[str, Any]]) -> List[SignalNormal
     - retourne uniquement les signaux pour lesquels au moins une de ces
       informations est disponible.
     """
-
-    signaux_normalises: List[SignalNormalise] = []
-
-    for signal in signaux_bruts:
-        if not isinstance(signal, dict):
-            continue
-
-        timestamp = _extraire_timestamp(signal)
-        context_label = _extraire_context_label(signal)
-        ai_score = _extraire_ai_score(signal)
-        metrics = _extraire_metrics(signal)
-
-        if (
-            timestamp is None
-            and context_label is None
-            and not metrics
-            and ai_score is None
-        ):
-            continue
-
-        signal_norm: SignalNormalise = {}
-        if timestamp:
-            signal_norm["timestamp"] = timestamp
-        if context_label:
-            signal_norm["context_label"] = context_label
-        if ai_score is not None:
-            signal_norm["ai_score"] = ai_score
-        if metrics:
-            signal_norm["metrics"] = metrics
-
-        signaux_normalises.append(signal_norm)
-
-    return signaux_normalises
-
-
-def _extraire_timestamp(signal: Dict[str, Any]) -> Optional[str]:
-    for cle in ("timestamp", "ts"):
-        texte = signal.get(cle)
-        if isinstance(texte, str):
-            valeur = texte.strip()
-        elif texte is None:
-            continue
-        else:
-            valeur = str(texte).strip()
-        if valeur:
-            return valeur
-    return None
+    return [signal for signal in _normaliser_lot(signaux_bruts) if signal is not None]
 
 
-def _extraire_context_label(signal: Dict[str, Any]) -> Optional[str]:
-    for cle in ("AI_context", "context", "contexte"):
-        label = _normaliser_label_contexte(signal.get(cle))
-        if label:
-            return label
+def signal_en_dict(signal: Any) -> Optional[Dict[str, Any]]:
+    """Convertit un ``SignalConsolide`` (``to_dict()``) ou un mapping en dict brut."""
+    # SignalConsolide possède to_dict(), mais on garde une compatibilité large
+    if hasattr(signal, "to_dict"):
+        try:
+            return signal.to_dict()
+        except Exception:
+            pass
+    if isinstance(signal, Mapping):
+        return dict(signal)
     return None
 
 
-def _extraire_ai_score(signal: Dict[str, Any]) -> Optional[float]:
-    for cle in ("AI_confidence", "context_score"):
-        valeur = signal.get(cle)
-        score = _convertir_float(valeur)
-        if score is not None:
-            return score
-    return None
-
+class NormaliseurSignaux:
+    """Normalisation incrémentale : chaque signal n'est normalisé qu'une fois.
 
-def _extraire_metrics(signal: Dict[str, Any]) -> Dict[str, Any]:
-    metrics: Dict[str, Any] = {}
-    cles_prioritaires = (
-        "APR",
-        "apr",
-        "APY",
-        "apy",
-        "TVL",
-        "tvl",
-        "tvl_usd",
-        "volatilite",
-        "volatility",
-        "volume",
-        "fees",
-        "liquidity",
-        "utilization",
-    )
+    Les résultats sont mis en cache sous la clé fournie par l'appelant
+    (offset du signal dans son journal) ; d'une itération à l'autre seuls les
+    signaux dont l'offset est inconnu sont convertis et normalisés, en un lot.
+    Les signaux renvoyés sont partagés avec le cache et se lisent sans les
+    modifier.
+    """
 
-    for cle in cles_prioritaires:
-        if cle in signal and signal[cle] is not None:
-            metrics[cle] = signal[cle]
+    def __init__(self, capacite: int = 1000) -> None:
+        self.capacite = capacite
+        self.nb_normalises = 0
+        self._cache: "OrderedDict[Hashable, Optional[SignalNormalise]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def normaliser(
+        self,
+        entrees: Iterable[Tuple[Hashable, Any]],
+        convertir: Callable[[Any], Optional[Dict[str, Any]]] = signal_en_dict,
+    ) -> List[SignalNormalise]:
+        """Normalise des couples (offset, signal) ; l'ordre des entrées est conservé."""
+        entrees = list(entrees)
+        cache = self._cache
+        nouveaux = [(cle, signal) for cle, signal in entrees if cle not in cache]
+        if nouveaux:
+            normalises = _normaliser_lot([convertir(signal) for _, signal in nouveaux])
+            for (cle, _), normalise in zip(nouveaux, normalises):
+                cache[cle] = normalise
+            self.nb_normalises += len(nouveaux)
+
+        resultat: List[SignalNormalise] = []
+        for cle, _ in entrees:
+            cache.move_to_end(cle)
+            normalise = cache[cle]
+            if normalise is not None:
+                resultat.append(normalise)
+        while len(cache) > self.capacite:
+            cache.popitem(last=False)
+        return resultat
+
+    def vider(self) -> None:
+        self._cache.clear()
+
+
+def _normaliser_lot(signaux_bruts: Sequence[Any]) -> List[Optional[SignalNormalise]]:
+    """Normalise un lot par colonnes ; ``None`` aux positions sans signal exploitable.
+
+    Les signaux sont regroupés par forme puis chaque champ (horodatage,
+    contexte, score) est résolu colonne par colonne sur le groupe.
+    """
+    resultats: List[Optional[SignalNormalise]] = [None] * len(signaux_bruts)
+    groupes: Dict[Tuple[Any, ...], List[int]] = {}
+    for i, signal in enumerate(signaux_bruts):
+        if isinstance(signal, dict) and signal:
+            groupes.setdefault(tuple(signal), []).append(i)
+
+    for cles, indices in groupes.items():
+        schema = _schema(cles)
+        signaux = [signaux_bruts[i] for i in indices]
+        timestamps = _premiere_valeur(signaux, schema.timestamp, _convertir_timestamp)
+        contextes = _premiere_valeur(signaux, schema.contexte, _normaliser_label_contexte)
+        scores = _premiere_valeur(signaux, schema.score, _convertir_float)
+        prioritaires, autres = schema.prioritaires, schema.autres
+
+        for j, signal in enumerate(signaux):
+            metrics = {c: signal[c] for c in prioritaires if signal[c] is not None}
+            for c in autres:
+                if _est_nombre(signal[c]):
+                    metrics[c] = signal[c]
+            timestamp, context_label, ai_score = timestamps[j], contextes[j], scores[j]
+            if timestamp is None and context_label is None and not metrics and ai_score is None:
+                continue
+
+            signal_norm: SignalNormalise = {}
+            if timestamp:
+                signal_norm["timestamp"] = timestamp
+            if context_label:
+                signal_norm["context_label"] = context_label
+            if ai_score is not None:
+                signal_norm["ai_score"] = ai_score
+            if metrics:
+                signal_norm["metrics"] = metrics
+            resultats[indices[j]] = signal_norm
+
+    return resultats
+
+
+def _premiere_valeur(
+    signaux: Sequence[Dict[str, Any]],
+    cles: Tuple[str, ...],
+    convertir: Callable[[Any], Any],
+) -> List[Any]:
+    """Colonne de la première valeur convertible parmi ``cles`` (alias par priorité)."""
+    colonne: List[Any] = [None] * len(signaux)
+    restants: Sequence[int] = range(len(signaux))
+    for cle in cles:
+        suivants: List[int] = []
+        for i in restants:
+            valeur = convertir(signaux[i][cle])
+            if valeur is None:
+                suivants.append(i)
+            else:
+                colonne[i] = valeur
+        restants = suivants
+        if not restants:
+            break
+    return colonne
+
+
+def _convertir_timestamp(texte: Any) -> Optional[str]:
+    if texte is None:
+        return None
+    valeur = texte.strip() if isinstance(texte, str) else str(texte).strip()
+    return valeur or None
 
-    for cle, valeur in signal.items():
-        if cle in metrics:
-            continue
-        if _est_nombre(valeur):
-            metrics[cle] = valeur
 
-    return metrics
+_LABELS_CONTEXTE: Dict[str, str] = {
+    **dict.fromkeys(("favorable", "bull", "bullish", "positif"), "favorable"),
+    **dict.fromkeys(("neutre", "neutral", "flat"), "neutre"),
+    **dict.fromkeys(
+        ("defavorable", "défavorable", "unfavorable", "bear", "bearish", "negatif", "négatif"),
+        "defavorable",
+    ),
+}
 
 
 def _normaliser_label_contexte(brut: Any) -> Optional[str]:
@@ -132,26 +231,7 @@ def _normaliser_label_contexte(brut: Any) -> Optional[str]:
     texte = _nettoyer_str(brut)
     if not texte:
         return None
-
-    mapping_favorable = {"favorable", "bull", "bullish", "positif"}
-    mapping_neutre = {"neutre", "neutral", "flat"}
-    mapping_defavorable = {
-        "defavorable",
-        "défavorable",
-        "unfavorable",
-        "bear",
-        "bearish",
-        "negatif",
-        "négatif",
-    }
-
-    if texte in mapping_favorable:
-        return "favorable"
-    if texte in mapping_neutre:
-        return "neutre"
-    if texte in mapping_defavorable:
-        return "defavorable"
-    return None
+    return _LABELS_CONTEXTE.get(texte)
 
 
 def _convertir_float(valeur: Any) -> Optional[float]:
@@ -2,6 +2,10 @@
 # 🧩 Version : V2.9 – Journalisation du slippage LP (import désactivé pour test V3.2)
 
 from typing import Tuple
+
+from core.simulateur_vectoriel import simuler_portefeuilles
+
+SLIPPAGE_LP = 0.02  # slippage LP simulé de 2 %
 # from .journal import enregistrer_slippage_lp  # Désactivé temporairement
 
 def simuler_gains(pool: dict) -> Tuple[str, float]:
@@ -24,7 +28,7 @@ def simuler_gain_farming_lp(montant_lp: float, farming_apr: float) -> float:
     Simule les gains journaliers issus du farming de LP tokens.
     """
     try:
-        montant_lp = montant_lp * 0.98  # slippage LP simulé de 2 %
+        montant_lp = montant_lp * (1 - SLIPPAGE_LP)
         gain = (montant_lp * farming_apr / 100) / 365
         return round(gain, 4)
     except Exception as e:
@@ -37,7 +41,7 @@ def simuler_farming_lp(date: str, nom_pool: str, plateforme: str, montant_lp: fl
     Simule le farming de LP tokens et journalise le slippage subi.
     """
     try:
-        slippage_lp = montant_lp * 0.02  # slippage LP simulé de 2 %
+        slippage_lp = montant_lp * SLIPPAGE_LP
         montant_apres_slippage = montant_lp - slippage_lp
         # enregistrer_slippage_lp(date, nom_pool, plateforme, montant_lp, slippage_lp, profil)  # Désactivé
         gain = (montant_apres_slippage * farming_apr / 100) / 365
@@ -45,3 +49,19 @@ def simuler_farming_lp(date: str, nom_pool: str, plateforme: str, montant_lp: fl
     except Exception as e:
         print(f"[ERREUR] Échec du farming LP : {e}")
         return 0.0
+
+
+def simuler_farming_lp_jours(montant_lp: float, farming_apr: float, nb_jours: int) -> float:
+    """
+    Gains de farming LP cumulés sur ``nb_jours`` jours (intérêts simples, comme
+    ``simuler_gain_farming_lp`` répété), en une passe ``core.simulateur_vectoriel``.
+    """
+    try:
+        resultat = simuler_portefeuilles(
+            [0.0], [[1.0]], int(nb_jours), float(montant_lp),
+            farming_apr=[float(farming_apr)], slippage_lp=SLIPPAGE_LP, composer=False,
+        )
+        return round(float(resultat.gains[0]), 4)
+    except Exception as e:
+        print(f"[ERREUR] Échec du calcul farming LP : {e}")
+        return 0.0
@@ -0,0 +1,256 @@
+# core/simulateur_vectoriel.py – V6.1.0
+"""Simulation vectorisée de portefeuilles sur N jours × M pools × K profils.
+
+Les simulateurs historiques (``simulateur_multi``, ``WalletSimule``,
+``core.simulateur_logique``) avançaient pool par pool et jour par jour et
+réécrivaient ``wallet_simule.json`` à chaque pas ; leurs simulations sur
+plusieurs jours délèguent désormais ici (``simuler_solde``). Les positions
+sont des tableaux NumPy ``(K, M)`` et les rendements quotidiens une matrice
+``(N, M)`` :
+
+- entre deux rééquilibrages, la valeur de chaque profil se calcule en une
+  opération (produit cumulé des facteurs quotidiens puis produit matriciel) ;
+- un rééquilibrage remet les positions aux poids cibles (frais en bps sur le
+  volume déplacé) ;
+- rien n'est écrit pendant la simulation : ``ResultatSimulation.sauvegarder``
+  écrit le résultat une seule fois à la fin.
+
+Conventions reprises du code existant : APR en pourcentage, année de 365
+jours, slippage LP appliqué au montant placé en farming
+(``core.simulateur_logique.simuler_farming_lp``).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from core.scoring import PROFILS
+
+JOURS_PAR_AN = 365
+
+Tableau = Union[np.ndarray, Sequence[float], Sequence[Sequence[float]]]
+
+
+def _rendements_quotidiens(apr: Tableau, nb_jours: int, nb_pools: Optional[int] = None) -> np.ndarray:
+    """APR (%) constant ``(M,)`` ou par jour ``(N, M)`` → taux quotidiens ``(N, M)``."""
+    taux = np.asarray(apr, dtype=np.float64) / 100.0 / JOURS_PAR_AN
+    if taux.ndim == 1:
+        taux = np.broadcast_to(taux, (nb_jours, taux.shape[0]))
+    if taux.shape[0] != nb_jours or (nb_pools is not None and taux.shape[1] != nb_pools):
+        raise ValueError(f"Rendements de forme {taux.shape}, attendu ({nb_jours}, {nb_pools or 'M'})")
+    return taux
+
+
+def poids_par_profil(
+    apr: Tableau,
+    tvl: Tableau,
+    profils: Mapping[str, Mapping[str, float]] = PROFILS,
+    top_n: int = 3,
+) -> Dict[str, np.ndarray]:
+    """Poids cibles ``(M,)`` par profil : répartition égale sur les ``top_n``
+    meilleures pools au sens de ``core.scoring`` (apr × w_apr + tvl × w_tvl)."""
+    apr = np.asarray(apr, dtype=np.float64)
+    tvl = np.asarray(tvl, dtype=np.float64)
+    n = max(1, min(int(top_n), apr.shape[0]))
+    resultat: Dict[str, np.ndarray] = {}
+    for nom, ponderations in profils.items():
+        scores = apr * float(ponderations["apr"]) + tvl * float(ponderations["tvl"])
+        meilleurs = np.argpartition(-scores, n - 1)[:n]
+        poids = np.zeros_like(apr)
+        poids[meilleurs] = 1.0 / n
+        resultat[nom] = poids
+    return resultat
+
+
+@dataclass
+class ResultatSimulation:
+    """Trajectoires et bilan d'une simulation (une ligne par profil)."""
+
+    profils: list
+    valeurs: np.ndarray  # (K, N) valeur en fin de jour
+    positions_finales: np.ndarray  # (K, M)
+    capital_initial: np.ndarray  # (K,)
+    frais: np.ndarray  # (K,)
+    turnover: np.ndarray  # (K,)
+    nb_reequilibrages: int
+
+    @property
+    def valeur_finale(self) -> np.ndarray:
+        return self.valeurs[:, -1] if self.valeurs.shape[1] else self.capital_initial
+
+    @property
+    def gains(self) -> np.ndarray:
+        return self.valeur_finale - self.capital_initial
+
+    def resume(self) -> Dict[str, Dict[str, float]]:
+        return {
+            profil: {
+                "capital_initial": float(self.capital_initial[k]),
+                "valeur_finale": float(self.valeur_finale[k]),
+                "gain": float(self.gains[k]),
+                "rendement_pct": float(self.gains[k] / self.capital_initial[k] * 100) if self.capital_initial[k] else 0.0,
+                "frais": float(self.frais[k]),
+                "turnover": float(self.turnover[k]),
+            }
+            for k, profil in enumerate(self.profils)
+        }
+
+    def sauvegarder(self, chemin: str, trajectoires: bool = False) -> None:
+        """Écrit le bilan (JSON) en une fois ; ``trajectoires`` ajoute un ``.npz``."""
+        dossier = os.path.dirname(chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        with open(chemin, "w", encoding="utf-8") as f:
+            json.dump(
+                {"nb_jours": int(self.valeurs.shape[1]), "nb_reequilibrages": self.nb_reequilibrages,
+                 "profils": self.resume()},
+                f,
+                indent=2,
+                ensure_ascii=False,
+            )
+        if trajectoires:
+            np.savez_compressed(
+                os.path.splitext(chemin)[0] + ".npz",
+                valeurs=self.valeurs,
+                positions_finales=self.positions_finales,
+            )
+
+
+def simuler_portefeuilles(
+    apr: Tableau,
+    poids: Union[Tableau, Mapping[str, Tableau]],
+    nb_jours: int,
+    capital: Union[float, Tableau] = 1000.0,
+    *,
+    farming_apr: Optional[Tableau] = None,
+    slippage_lp: float = 0.0,
+    composer: bool = True,
+    reequilibrages: Union[Iterable[int], Mapping[int, Any], None] = None,
+    frais_bps: float = 0.0,
+) -> ResultatSimulation:
+    """Simule K profils sur ``nb_jours`` jours et M pools en une passe vectorisée.
+
+    :param apr: APR (%) par pool, constant ``(M,)`` ou quotidien ``(N, M)``.
+    :param poids: poids cibles ``(K, M)`` (ou dict profil → ``(M,)``), lignes de somme 1.
+    :param capital: capital initial, scalaire ou ``(K,)``.
+    :param farming_apr: APR de farming (%) additionnel, appliqué au montant
+        après ``slippage_lp`` (fraction perdue à l'entrée en LP).
+    :param composer: intérêts composés quotidiens (sinon intérêts simples,
+        comme ``simuler_gains`` appliqué jour après jour sans réinvestir).
+    :param reequilibrages: jours (0 ≤ j < N) où les positions sont remises
+        aux poids cibles, ou dict jour → nouveaux poids ``(K, M)``.
+    :param frais_bps: frais sur le volume déplacé lors d'un rééquilibrage.
+    """
+    if isinstance(poids, Mapping):
+        profils = list(poids)
+        cibles = np.vstack([np.asarray(poids[p], dtype=np.float64) for p in profils])
+    else:
+        cibles = np.atleast_2d(np.asarray(poids, dtype=np.float64))
+        profils = [f"profil_{k}" for k in range(cibles.shape[0])]
+    nb_profils, nb_pools = cibles.shape
+    nb_jours = int(nb_jours)
+
+    taux = _rendements_quotidiens(apr, nb_jours, nb_pools)
+    if farming_apr is not None:
+        taux = taux + _rendements_quotidiens(farming_apr, nb_jours, nb_pools) * (1.0 - slippage_lp)
+
+    capital_initial = np.broadcast_to(np.asarray(capital, dtype=np.float64), (nb_profils,)).copy()
+    positions = cibles * capital_initial[:, None]
+
+    if isinstance(reequilibrages, Mapping):
+        evenements = {int(j): np.atleast_2d(np.asarray(p, dtype=np.float64)) for j, p in reequilibrages.items()}
+    else:
+        evenements = {int(j): None for j in (reequilibrages or ())}
+    bornes = sorted(j for j in evenements if 0 < j < nb_jours)
+
+    valeurs = np.empty((nb_profils, nb_jours))
+    frais = np.zeros(nb_profils)
+    turnover = np.zeros(nb_profils)
+    debut = 0
+    for fin in bornes + [nb_jours]:
+        segment = taux[debut:fin]
+        if segment.shape[0]:
+            if composer:
+                facteurs = np.cumprod(1.0 + segment, axis=0)  # (L, M)
+            else:
+                facteurs = 1.0 + np.cumsum(segment, axis=0)
+            valeurs[:, debut:fin] = positions @ facteurs.T
+            positions = positions * facteurs[-1]
+        if fin < nb_jours:
+            nouvelles = evenements[fin]
+            if nouvelles is not None:
+                cibles = nouvelles
+            total = positions.sum(axis=1)
+            visees = cibles * total[:, None]
+            deplace = np.abs(visees - positions).sum(axis=1) / 2.0
+            cout = deplace * frais_bps / 10_000
+            positions = cibles * (total - cout)[:, None]
+            frais += cout
+            turnover += deplace
+        debut = fin
+
+    return ResultatSimulation(
+        profils=profils,
+        valeurs=valeurs,
+        positions_finales=positions,
+        capital_initial=capital_initial,
+        frais=frais,
+        turnover=turnover,
+        nb_reequilibrages=len(bornes),
+    )
+
+
+def simuler_solde(
+    solde: float,
+    pools: Sequence[Mapping[str, Any]],
+    nb_jours: int,
+    poids: Optional[Tableau] = None,
+    *,
+    composer: bool = True,
+) -> float:
+    """Valeur d'un solde placé ``nb_jours`` jours sur ``pools`` (clé ``apr`` en %).
+
+    Point d'entrée des portefeuilles simulés (``WalletSimule``) : un seul
+    profil, répartition égale par défaut, aucune écriture.
+    """
+    if not pools or int(nb_jours) <= 0:
+        return float(solde)
+    apr = [float(pool.get("apr", 0) or 0) for pool in pools]
+    cibles = [1.0 / len(pools)] * len(pools) if poids is None else poids
+    resultat = simuler_portefeuilles(apr, [cibles], int(nb_jours), float(solde), composer=composer)
+    return float(resultat.valeur_finale[0])
+
+
+def simuler_trajectoires(
+    facteurs: np.ndarray,
+    poids: Tableau,
+    capital: float = 1000.0,
+) -> np.ndarray:
+    """Valeur de fin de jour ``(P, N)`` d'une allocation fixe sur P scénarios.
+
+    :param facteurs: facteurs de croissance quotidiens par pool ``(P, N, M)``
+        (rendement × variation de prix), tirés par exemple par ``core.monte_carlo``.
+    :param poids: allocation ``(M,)`` conservée sans rééquilibrage ; une somme
+        inférieure à 1 laisse le reste en liquidités.
+    """
+    facteurs = np.asarray(facteurs, dtype=np.float64)
+    poids = np.asarray(poids, dtype=np.float64)
+    if facteurs.ndim != 3 or facteurs.shape[2] != poids.shape[0]:
+        raise ValueError(f"Facteurs de forme {facteurs.shape}, attendu (P, N, {poids.shape[0]})")
+    cumules = np.cumprod(facteurs, axis=1)
+    liquidites = max(0.0, 1.0 - float(poids.sum()))
+    return (cumules @ poids + liquidites) * float(capital)
+
+
+__all__ = [
+    "ResultatSimulation",
+    "poids_par_profil",
+    "simuler_portefeuilles",
+    "simuler_solde",
+    "simuler_trajectoires",
+]
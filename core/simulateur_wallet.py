@@ -6,6 +6,7 @@ import csv
 from datetime import datetime
 # from core.journal import enregistrer_slippage_lp  # Désactivé temporairement
 from core.utils import ligne_deja_presente
+from core.simulateur_vectoriel import simuler_solde
 
 FICHIER_WALLET = "data/wallet_simule.json"
 FICHIER_LOG = "logs/journal_top3.csv"
@@ -54,6 +55,14 @@ class WalletSimule:
         self._sauvegarder()
         return solde_avant, montant, self.solde
 
+    def simuler_jours(self, pools, nb_jours: int, poids=None, composer: bool = True):
+        """Place le solde ``nb_jours`` jours sur ``pools`` en une passe vectorisée ;
+        une seule sauvegarde à la fin (au lieu d'un ``investir`` par jour)."""
+        solde_avant = self.solde
+        self.solde = simuler_solde(self.solde, pools, nb_jours, poids, composer=composer)
+        self._sauvegarder()
+        return solde_avant, self.solde - solde_avant, self.solde
+
 
 class WalletLP:
     def __init__(self) -> None:
@@ -2,6 +2,9 @@ import csv
 import os
 from datetime import datetime
 
+from core.history_store import CHEMIN_DB, obtenir_store
+from core.journal_index import index_journal
+
 FICHIER_JOURNAL = "logs/journal_gain_simule.csv"
 FICHIER_SWAP_LP = "logs/journal_swaps_lp.csv"
 
@@ -13,20 +16,28 @@ def enregistrer_gain_simule(date, pool, gain, score):
         writer.writerow([date, pool, gain, score])
 
 def afficher_gains_historique():
-    """Affiche un résumé des gains par jour."""
+    """Affiche un résumé des gains par jour.
+
+    Lit la base d'historique si elle a été importée, sinon le CSV.
+    """
     if not os.path.exists(FICHIER_JOURNAL):
         print("Aucun journal de gains trouvé.")
         return
 
-    journaux = {}
-    with open(FICHIER_JOURNAL, mode="r", encoding="utf-8") as fichier:
-        lecteur = csv.reader(fichier)
-        for ligne in lecteur:
-            if len(ligne) != 4:
-                continue
-            date, _, gain, _ = ligne
-            gain = float(gain)
-            journaux[date] = journaux.get(date, 0) + gain
+    if os.path.exists(CHEMIN_DB):
+        store = obtenir_store()
+        store.importer_csv(FICHIER_JOURNAL)
+        journaux = store.gains_par_jour(source=os.path.basename(FICHIER_JOURNAL))
+    else:
+        journaux = {}
+        with open(FICHIER_JOURNAL, mode="r", encoding="utf-8") as fichier:
+            lecteur = csv.reader(fichier)
+            for ligne in lecteur:
+                if len(ligne) != 4:
+                    continue
+                date, _, gain, _ = ligne
+                gain = float(gain)
+                journaux[date] = journaux.get(date, 0) + gain
 
     print("📈 Résumé des rendements journaliers :")
     for date, gain in sorted(journaux.items()):
@@ -43,16 +54,10 @@ def swap_lp_existe(date, nom_pool):
     """Vérifie si un swap LP est déjà enregistré pour ce jour et cette pool."""
     if not os.path.exists(FICHIER_SWAP_LP):
         return False
+    return index_journal(FICHIER_SWAP_LP, _cle_swap_lp).contient((date.isoformat(), nom_pool))
 
-    with open(FICHIER_SWAP_LP, mode="r", encoding="utf-8") as fichier:
-        lecteur = csv.reader(fichier)
-        for ligne in lecteur:
-            if len(ligne) != 4:
-                continue
-            date_ligne, nom, _, _ = ligne
-            if date_ligne == date.isoformat() and nom == nom_pool:
-                return True
-    return False
+def _cle_swap_lp(ligne):
+    return (ligne[0], ligne[1]) if len(ligne) == 4 else None
 
 def lire_swaps_lp(date):
     """Lit tous les swaps LP enregistrés pour une date donnée."""
@@ -9,17 +9,58 @@ EN: Skeleton version operating in dry-run only with optional integration
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol
+from typing import Any, Dict, List, Mapping, Optional, Protocol, Tuple, Union
 import json
 import time
 from datetime import datetime
 
+import numpy as np
+
+from .allocation_optimizer import (
+    ParametresOptimiseur,
+    bornes_allocation,
+    capital_portefeuille,
+    optimiser_allocations,
+)
+from .classement import ClassementPools, indices_top_k
+from .pool_table import PoolTable
 from .strategy_context import StrategyContext
 
 
+# FR: Facteur d'exposition par profil et contexte IA (surchargé par ``exposure_table``).
+# EN: Exposure factor per profile and AI context (overridden by ``exposure_table``).
+EXPOSURE_TABLE: Dict[str, Dict[str, float]] = {
+    "prudent": {"favorable": 1.0, "neutre": 0.9, "defavorable": 0.7},
+    "modere": {"favorable": 1.0, "neutre": 1.0, "defavorable": 0.8},
+    "agressif": {"favorable": 1.1, "neutre": 1.0, "defavorable": 0.9},
+}
+
+
+def exposure_factor(
+    profile: str,
+    label: Optional[str],
+    table: Optional[Mapping[str, Mapping[str, float]]] = None,
+) -> float:
+    """FR: Facteur d'exposition du profil pour un contexte ; ``table`` surcharge
+    ``EXPOSURE_TABLE`` entrée par entrée.
+    EN: Profile exposure factor for a context; ``table`` overrides
+    ``EXPOSURE_TABLE`` entry by entry.
+    """
+    label = (label or "neutre").lower()
+    if label not in {"favorable", "neutre", "defavorable"}:
+        label = "neutre"
+    profile_table = dict(EXPOSURE_TABLE.get(profile) or {})
+    override = (table or {}).get(profile)
+    if isinstance(override, Mapping):
+        profile_table.update(override)
+    if not profile_table:
+        return 1.0
+    return float(profile_table.get(label, 1.0))
+
+
 class MarketState(Enum):
     """FR: États de marché simplifiés. EN: Simplified market states."""
 
@@ -137,7 +178,16 @@ class StrategyEngine:
         self.pool_source: PoolSource = _DefaultPoolSource()
         self.executor: Executor = _DefaultExecutor()
         self.cfg = self.load_config()
+        if self.cfg.get("pool_sources"):
+            # FR: Sources configurées, collectées en parallèle. EN: Configured sources, fetched concurrently.
+            from core.defi_sources.multi_sources import CollecteurPools
+
+            self.pool_source = CollecteurPools.depuis_config(self.cfg)
         self.profile = self.cfg.get("profile_default", "prudent")
+        # FR: Index de classement conservé entre deux sélections. EN: Ranking index kept across selections.
+        self._classement: Optional[ClassementPools] = None
+        self._classement_mode: Optional[Tuple[Any, ...]] = None
+        self._classement_stats: List[Tuple[Any, float, float]] = []
         self._log_info(f"StrategyEngine initialized with profile '{self.profile}'")
 
     def load_config(self) -> Dict[str, Any]:
@@ -212,6 +262,21 @@ class StrategyEngine:
         self._log_info(f"Detected market state: {state.value}")
         return state
 
+    @staticmethod
+    def _context_weights(context: Optional[StrategyContext]) -> Tuple[float, float]:
+        """FR: Pondérations (APR, facteur TVL) du score effectif selon le contexte.
+        EN: (APR, TVL factor) weights of the effective score for the context.
+        """
+
+        if context is None:
+            return 1.0, 1.0
+        label = context.label
+        if label == "favorable":
+            return 1.0, 0.5
+        if label == "defavorable":
+            return 0.6, 0.4
+        return 0.8, 0.2
+
     def _compute_effective_score(
         self,
         pool: PoolCandidate,
@@ -227,44 +292,93 @@ class StrategyEngine:
         base_apr = float(pool.apr)
         base_tvl = float(pool.tvl)
         tvl_factor = base_tvl / 1e9 if base_tvl > 0 else 0.0
+        apr_weight, tvl_weight = self._context_weights(context)
+        return base_apr * apr_weight + tvl_factor * tvl_weight
 
-        if context is None:
-            return base_apr + tvl_factor
+    def _select_from_table(
+        self,
+        pools: PoolTable,
+        context: Optional[StrategyContext],
+        max_concurrent: int,
+    ) -> List[PoolCandidate]:
+        """FR: Sélection en colonnes sur une ``PoolTable`` (même ordre que la version par objet).
+        EN: Column-wise selection on a ``PoolTable`` (same order as the per-object path).
+        """
 
-        label = context.label
-        if label == "favorable":
-            return base_apr * 1.0 + tvl_factor * 0.5
-        if label == "defavorable":
-            return base_apr * 0.6 + tvl_factor * 0.4
-        return base_apr * 0.8 + tvl_factor * 0.2
+        apr = pools.remplie("apr")
+        tvl = pools.remplie("tvl_usd")
+        scores = pools.colonne("score")
+        if not np.isnan(scores).all():
+            # lexsort : dernière clé prioritaire ; stable comme sorted(..., reverse=True).
+            order = np.lexsort((-tvl, -apr, -np.where(np.isnan(scores), -np.inf, scores)))
+        else:
+            apr_weight, tvl_weight = self._context_weights(context)
+            tvl_factor = np.where(tvl > 0, tvl / 1e9, 0.0)
+            order = indices_top_k(apr * apr_weight + tvl_factor * tvl_weight, max_concurrent)
+        return [pools.candidat(i) for i in order[:max_concurrent].tolist()]
+
+    def _ranking_key(self, pool: PoolCandidate, context: Optional[StrategyContext], explicit: bool) -> Tuple[float, ...]:
+        """FR: Clé de classement décroissante d'un pool. EN: Descending ranking key of a pool."""
+
+        if explicit:
+            return (pool.score if pool.score is not None else float("-inf"), pool.apr, pool.tvl)
+        return (self._compute_effective_score(pool, context),)
+
+    def _update_ranking(self, pools: List[PoolCandidate], context: Optional[StrategyContext]) -> ClassementPools:
+        """FR: Met à jour l'index de classement : seuls les pools dont les stats ont changé sont re-scorés.
+        EN: Update the ranking index: only pools whose stats changed are re-scored.
+
+        Les pools sont indexés par position (départage des égalités comme un tri stable) ;
+        un changement de mode (scores explicites ou non) ou de contexte reconstruit l'index.
+        """
+
+        explicit = any(pool.score is not None for pool in pools)
+        mode = (True,) if explicit else (False, self._context_weights(context))
+        ranking = self._classement
+        if ranking is None or mode != self._classement_mode:
+            self._classement_stats = [(pool.score, pool.apr, pool.tvl) for pool in pools]
+            ranking = ClassementPools.construire(
+                (i, self._ranking_key(pool, context, explicit), None) for i, pool in enumerate(pools)
+            )
+            self._classement, self._classement_mode = ranking, mode
+            return ranking
+
+        stats = self._classement_stats
+        known = len(stats)
+        for i, pool in enumerate(pools):
+            current = (pool.score, pool.apr, pool.tvl)
+            if i < known and stats[i] == current:
+                continue
+            if i < known:
+                stats[i] = current
+            else:
+                stats.append(current)
+            ranking.mettre_a_jour(i, self._ranking_key(pool, context, explicit), ordre=i)
+        for i in range(len(pools), known):
+            ranking.retirer(i)
+        del stats[len(pools):]
+        return ranking
 
     def select_candidates(
         self,
-        pools: List[PoolCandidate],
+        pools: Union[List[PoolCandidate], PoolTable],
         context: Optional[StrategyContext] = None,
     ) -> List[PoolCandidate]:
         """FR: Sélectionne les meilleurs pools. EN: Select top pool candidates."""
         max_concurrent = self.cfg["allocations"]["max_concurrent"]
-        if not pools:
+        if not len(pools):
             self._log_warn("No pools provided; selection empty")
             return []
 
-        # Si des scores explicites sont fournis, on respecte la logique existante.
-        if any(pool.score is not None for pool in pools):
-            sorted_pools = sorted(
-                pools,
-                key=lambda p: (p.score if p.score is not None else float("-inf"), p.apr, p.tvl),
-                reverse=True,
-            )
-        else:
-            # Sinon, on utilise le score effectif dépendant du contexte global.
-            sorted_pools = sorted(
-                pools,
-                key=lambda p: self._compute_effective_score(p, context),
-                reverse=True,
-            )
+        if isinstance(pools, PoolTable):
+            selected = self._select_from_table(pools, context, max_concurrent)
+            self._log_info(f"Selected {len(selected)} pool candidates")
+            return selected
 
-        selected = sorted_pools[:max_concurrent]
+        # Scores explicites (score, apr, tvl) s'ils sont fournis, sinon score effectif
+        # dépendant du contexte global ; top-k sur l'index plutôt qu'un tri complet.
+        ranking = self._update_ranking(pools, context)
+        selected = [pools[i] for i in ranking.top_cles(max_concurrent)]
         self._log_info(f"Selected {len(selected)} pool candidates")
         return selected
 
@@ -276,33 +390,94 @@ class StrategyEngine:
         if context is None:
             return 1.0
 
-        label = getattr(context, "label", "neutre") or "neutre"
-        label = label.lower()
-        if label not in {"favorable", "neutre", "defavorable"}:
-            label = "neutre"
-
-        exposure_table: Dict[str, Dict[str, float]] = {
-            "prudent": {"favorable": 1.0, "neutre": 0.9, "defavorable": 0.7},
-            "modere": {"favorable": 1.0, "neutre": 1.0, "defavorable": 0.8},
-            "agressif": {"favorable": 1.1, "neutre": 1.0, "defavorable": 0.9},
-        }
+        return exposure_factor(
+            self.profile, getattr(context, "label", "neutre"), self.cfg.get("exposure_table")
+        )
 
-        profile_table = exposure_table.get(self.profile)
-        if profile_table is None:
-            return 1.0
-        return profile_table.get(label, 1.0)
+    def _risk_cap(self, market: MarketState) -> Optional[float]:
+        """FR: Plafond de risque du profil pour l'état de marché. EN: Profile risk cap for the market state."""
+        guardrails = self.cfg.get("market_guardrails", {})
+        market_guard = guardrails.get(market.value) or guardrails.get(market.name)
+        if isinstance(market_guard, dict):
+            caps = market_guard.get("risk_caps")
+            if isinstance(caps, dict):
+                cap = caps.get(self.profile)
+                if isinstance(cap, (int, float)):
+                    return float(cap)
+        return None
 
     def compute_allocations(
         self,
         candidates: List[PoolCandidate],
         market: MarketState,
         context: Optional[StrategyContext] = None,
+        snapshot: Optional[PortfolioSnapshot] = None,
     ) -> List[Allocation]:
-        """FR: Calcule les allocations cibles. EN: Compute target allocations."""
+        """FR: Calcule les allocations cibles. Parts uniformes par défaut ; optimiseur
+        sous contraintes si une section ``optimizer`` est configurée (ou
+        ``allocations.method == "optimizer"``), ``method == "uniform"`` l'emportant.
+        Le capital de l'optimiseur est ``optimizer.capital_usd`` ou, à défaut, la
+        valeur des soldes du ``snapshot`` (prix ``optimizer.prix_usd``, stablecoins
+        à 1 USD) ; sans capital connu, repli sur les parts uniformes. Les
+        allocations de l'optimiseur peuvent totaliser moins que le budget
+        d'exposition : les pools dont le rendement ne couvre pas le gas sont
+        écartées et leur part reste non investie.
+        EN: Compute target allocations. Uniform shares by default; constrained
+        optimizer when an ``optimizer`` section is configured (or
+        ``allocations.method == "optimizer"``). Its capital comes from
+        ``optimizer.capital_usd`` or the snapshot balances; optimizer allocations
+        may sum to less than the exposure budget (pools below gas cost are dropped
+        and their share stays uninvested).
+        """
         if not candidates:
             self._log_warn("No candidates to allocate")
             return []
 
+        allocations_cfg = self.cfg["allocations"]
+        optimizer_cfg = self.cfg.get("optimizer")
+        method = allocations_cfg.get("method")
+        if method == "uniform" or (method != "optimizer" and not isinstance(optimizer_cfg, dict)):
+            return self._compute_uniform_allocations(candidates, market, context)
+
+        params = ParametresOptimiseur.depuis_config(self.cfg)
+        if params.capital_usd is None:
+            prices = optimizer_cfg.get("prix_usd") if isinstance(optimizer_cfg, dict) else None
+            capital = capital_portefeuille(snapshot.balances, prices) if snapshot is not None else 0.0
+            if capital <= 0:
+                self._log_warn("Portfolio value unknown; using uniform allocations")
+                return self._compute_uniform_allocations(candidates, market, context)
+            params = replace(params, capital_usd=capital)
+
+        exposure_factor = self._compute_exposure_factor(context)
+        budget = min(1.0, exposure_factor)
+        lower, upper = bornes_allocation(
+            len(candidates),
+            float(allocations_cfg["min_pct"]),
+            float(allocations_cfg["max_pct"]),
+            self._risk_cap(market),
+            exposure_factor,
+            budget,
+        )
+        result = optimiser_allocations(candidates, lower, upper, budget, params)
+        dropped = [c.pool_id for c, w in zip(candidates, result.poids) if w <= 0]
+        if dropped:
+            self._log_info(f"Pools skipped (yield below gas cost): {', '.join(dropped)}")
+        invested = float(result.poids.sum())
+        if invested < budget - 1e-9:
+            self._log_info(f"Allocated {invested:.1%} of a {budget:.1%} exposure budget; the rest stays uninvested")
+        return [
+            Allocation(pool_id=candidate.pool_id, target_pct=float(weight), risk_level=self.profile)
+            for candidate, weight in zip(candidates, result.poids)
+            if weight > 0
+        ]
+
+    def _compute_uniform_allocations(
+        self,
+        candidates: List[PoolCandidate],
+        market: MarketState,
+        context: Optional[StrategyContext] = None,
+    ) -> List[Allocation]:
+        """FR: Heuristique historique à parts uniformes. EN: Legacy uniform-share heuristic."""
         allocations_cfg = self.cfg["allocations"]
         min_pct = float(allocations_cfg["min_pct"])
         max_pct = float(allocations_cfg["max_pct"])
@@ -328,18 +503,9 @@ class StrategyEngine:
             for allocation in allocations:
                 allocation.target_pct /= total
 
-        guardrails = self.cfg.get("market_guardrails", {})
-        guard_key = market.value
-        market_guard = guardrails.get(guard_key) or guardrails.get(market.name)
-        risk_caps: Dict[str, float] = {}
-        if isinstance(market_guard, dict):
-            caps = market_guard.get("risk_caps")
-            if isinstance(caps, dict):
-                risk_caps = {str(k): float(v) for k, v in caps.items() if isinstance(v, (int, float))}
-
+        cap = self._risk_cap(market)
         adjusted = False
         for allocation in allocations:
-            cap = risk_caps.get(allocation.risk_level)
             if cap is not None and allocation.target_pct > cap:
                 allocation.target_pct = cap
                 adjusted = True
@@ -398,7 +564,7 @@ class StrategyEngine:
 
     def run(
         self,
-        pools: Optional[List[PoolCandidate]] = None,
+        pools: Optional[Union[List[PoolCandidate], PoolTable]] = None,
         context: Optional[StrategyContext] = None,
     ) -> Dict[str, Any]:
         """FR: Orchestration complète. EN: Full orchestration."""
@@ -407,7 +573,7 @@ class StrategyEngine:
         market = self.detect_market_state()
         pool_list = pools if pools is not None else self.pool_source.list_pools()
         candidates = self.select_candidates(pool_list, context=context)
-        allocations = self.compute_allocations(candidates, market, context=context)
+        allocations = self.compute_allocations(candidates, market, context=context, snapshot=snapshot)
         actions = self.build_actions(allocations, snapshot)
 
         for action in actions:
@@ -0,0 +1,386 @@
+# core/supervisor.py – V6.1.0
+"""Superviseur mono-processus : daemon, ControlPilot et GUI coopérants.
+
+``start_defipilot.py`` et ``run_defipilot.py`` lançaient jusqu'à trois
+processus Python qui importaient chacun web3, rechargeaient l'état et
+relisaient les mêmes journaux pour se parler. Le superviseur les fait
+tourner comme tâches (threads) d'un seul processus :
+
+- une tâche de lecture suit les journaux d'entrée (signaux marché et IA) en
+  ne lisant que les lignes ajoutées, et publie chaque événement sur le bus ;
+- le daemon (``journal_daemon.executer_iteration``) consomme les signaux
+  consolidés en mémoire et publie son snapshot stratégie ;
+- ControlPilot se réveille à chaque nouveau signal (ou à son intervalle) et
+  publie son résumé et le payload d'échange ;
+- la GUI lit le bus et l'état partagé (``core.state_manager``) au lieu des
+  fichiers.
+
+Les journaux (``journal_control.jsonl``, ``exchange_bus.jsonl``, journaux
+du daemon) restent écrits, par le ``JsonlSink`` asynchrone du bus. Pendant
+son exécution, le bus du superviseur est le bus actif du processus : les
+écrivains de journaux du même processus publient directement sur le bus et
+les lignes qu'ils produisent ne sont pas relues par les suiveurs.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from collections import deque
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from control.control_pilot import ControlPilot, consolider_signaux_indexes
+from core.exchange_format import sign_payload
+from core.journal_rotation import GestionnaireRotation
+from core.pool_table import PoolTable
+from core.signal_bus import JsonlSink, SignalBus, activer_bus, desactiver_bus
+from core.signals_normalizer import NormaliseurSignaux
+
+logger = logging.getLogger(__name__)
+
+SUJET_SIGNAUX = "signaux"
+SUJET_SIGNAUX_CONSOLIDES = "signaux_consolides"
+SUJET_CONTROL = "control"
+SUJET_EXCHANGE = "exchange"
+SUJET_STRATEGIE = "strategie"
+
+JOURNAUX_CONSOLIDES: Tuple[Path, ...] = (
+    Path("data/logs/journal_signaux.jsonl"),
+    Path("data/logs/ai_evaluation.jsonl"),
+)
+HISTORIQUE_GUI = 120
+HISTORIQUE_CONTROL = 200
+HISTORIQUE_CONSOLIDES = 250
+
+
+class SuiveurJsonl:
+    """Suit un journal JSONL en ne lisant que les lignes complètes ajoutées.
+
+    Au premier passage seules les ``initial`` dernières lignes sont retenues ;
+    un fichier remplacé ou raccourci est relu depuis le début. ``ignorer``
+    écarte des lignes brutes (celles que le processus a lui-même écrites).
+    """
+
+    def __init__(self, chemin: Path, initial: int = 100, ignorer: Optional[Callable[[str], bool]] = None) -> None:
+        self.chemin = Path(chemin)
+        self.initial = initial
+        self.ignorer = ignorer
+        self._offset = 0
+        self._inode: Optional[Tuple[int, int]] = None
+        self._premier = True
+
+    def lire_nouveaux(self) -> List[Dict[str, Any]]:
+        try:
+            st = os.stat(self.chemin)
+        except OSError:
+            self._offset, self._inode = 0, None
+            return []
+        inode = (st.st_dev, st.st_ino)
+        if self._inode != inode or st.st_size < self._offset:
+            self._offset, self._inode = 0, inode
+        if st.st_size == self._offset:
+            self._premier = False
+            return []
+        with open(self.chemin, "rb") as f:
+            f.seek(self._offset)
+            brut = f.read(st.st_size - self._offset)
+        fin = brut.rfind(b"\n")
+        if fin < 0:
+            return []
+        self._offset += fin + 1
+        evenements: List[Dict[str, Any]] = []
+        for ligne in brut[: fin + 1].decode("utf-8", errors="replace").splitlines():
+            if not ligne.strip() or (self.ignorer is not None and self.ignorer(ligne)):
+                continue
+            try:
+                obj = json.loads(ligne)
+            except ValueError:
+                continue
+            if isinstance(obj, dict):
+                evenements.append(obj)
+        if self._premier:
+            self._premier = False
+            evenements = evenements[-self.initial:] if self.initial > 0 else []
+        return evenements
+
+
+class Superviseur:
+    """Orchestre les composants DeFiPilot dans un seul processus.
+
+    :param pools_stats: stats de pools pour le daemon, ``PoolTable`` ou liste
+        de dicts (``None`` : pas de daemon).
+    :param source_pools: ``journal_daemon.SourcePools`` relue avant chaque
+        itération du daemon après la première (``None`` : pools fixes).
+    :param max_loops: itérations du daemon avant arrêt (0 = illimité).
+    """
+
+    def __init__(
+        self,
+        pools_stats: Optional[Union[PoolTable, List[Dict[str, Any]]]],
+        config: Optional[Mapping[str, Any]] = None,
+        *,
+        journal_signaux: Path = Path("journal_signaux.jsonl"),
+        journal_control: Path = Path("journal_control.jsonl"),
+        exchange_bus: Path = Path("exchange_bus.jsonl"),
+        journaux_consolides: Sequence[Path] = JOURNAUX_CONSOLIDES,
+        interval_daemon: float = 30.0,
+        interval_control: float = 60.0,
+        interval_lecture: float = 1.0,
+        max_events: int = 100,
+        max_loops: int = 0,
+        etat: Optional[Dict[str, Any]] = None,
+        source_pools: Any = None,
+    ) -> None:
+        self.pools_stats = pools_stats
+        self.source_pools = source_pools
+        self.config: Mapping[str, Any] = config or {}
+        self.interval_daemon = float(interval_daemon)
+        self.interval_control = float(interval_control)
+        self.interval_lecture = float(interval_lecture)
+        self.max_loops = int(max_loops or 0)
+        self.nb_iterations = 0
+        self.nb_resumes = 0
+
+        self.sink = JsonlSink()
+        self.bus = SignalBus(
+            self.sink,
+            journaux={SUJET_SIGNAUX: journal_signaux, SUJET_CONTROL: journal_control, SUJET_EXCHANGE: exchange_bus},
+        )
+        self.control = ControlPilot(input_path=journal_signaux, output_path=journal_control, max_events=max_events)
+        self._etat = etat
+        self.rotation = GestionnaireRotation.depuis_config(self.config)
+        self._bus_precedent: Optional[SignalBus] = None
+
+        # Un suiveur par journal d'entrée, qui publie sur le sujet du fichier ;
+        # les journaux consolidés sont relayés vers SUJET_SIGNAUX_CONSOLIDES.
+        self._suiveurs: List[Tuple[SuiveurJsonl, str]] = [
+            (self._suiveur(journal_signaux, max(max_events, HISTORIQUE_GUI)), SUJET_SIGNAUX),
+        ]
+        sujets_consolides: List[str] = []
+        for chemin in journaux_consolides:
+            sujet = self.bus.sujet_journal(chemin) or ""
+            if sujet not in sujets_consolides:
+                sujets_consolides.append(sujet)
+            if sujet != SUJET_SIGNAUX:
+                self._suiveurs.append((self._suiveur(chemin, HISTORIQUE_CONSOLIDES), sujet))
+        for sujet in sujets_consolides:
+            self.bus.abonner(sujet, self._relayer_consolide)
+
+        self._lock = Lock()
+        self._signaux: Deque[Dict[str, Any]] = deque(maxlen=max(max_events, HISTORIQUE_GUI))
+        # Signaux consolidés indexés par leur offset dans le flux (ordre d'arrivée) :
+        # le normaliseur ne traite à chaque itération que les offsets inédits.
+        self._consolides: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=HISTORIQUE_CONSOLIDES)
+        self._offset_consolides = 0
+        self.normaliseur = NormaliseurSignaux(capacite=HISTORIQUE_CONSOLIDES)
+        self._resumes: Deque[Dict[str, Any]] = deque(maxlen=HISTORIQUE_CONTROL)
+        self.bus.abonner(SUJET_SIGNAUX, self._memoriser(self._signaux))
+        self.bus.abonner(SUJET_SIGNAUX_CONSOLIDES, self._memoriser_consolide)
+        self.bus.abonner(SUJET_CONTROL, self._memoriser(self._resumes))
+
+        self._arret = Event()
+        self._taches: List[Thread] = []
+
+    def _suiveur(self, chemin: Path, initial: int) -> SuiveurJsonl:
+        return SuiveurJsonl(chemin, initial=initial, ignorer=lambda ligne: self.sink.consommer_ecrit(chemin, ligne))
+
+    def _relayer_consolide(self, _sujet: str, message: Dict[str, Any]) -> None:
+        self.bus.publier(SUJET_SIGNAUX_CONSOLIDES, message)
+
+    def _memoriser(self, file: Deque[Dict[str, Any]]) -> Callable[[str, Dict[str, Any]], None]:
+        def ajouter(_sujet: str, message: Dict[str, Any]) -> None:
+            with self._lock:
+                file.append(message)
+
+        return ajouter
+
+    def _memoriser_consolide(self, _sujet: str, message: Dict[str, Any]) -> None:
+        with self._lock:
+            self._consolides.append((self._offset_consolides, message))
+            self._offset_consolides += 1
+
+    # ------------------------------------------------------------------
+    # Tâches
+    # ------------------------------------------------------------------
+    def lire_entrees(self) -> int:
+        """Publie les événements ajoutés aux journaux d'entrée ; retourne leur nombre."""
+        total = 0
+        for suiveur, sujet in self._suiveurs:
+            for evenement in suiveur.lire_nouveaux():
+                self.bus.publier(sujet, evenement, journaliser=False)
+                total += 1
+        return total
+
+    def iteration_daemon(self) -> Optional[Dict[str, Any]]:
+        """Une itération du daemon sur les signaux en mémoire ; publie le snapshot."""
+        import journal_daemon
+
+        if self._etat is None:
+            self._etat = journal_daemon.initialiser_etat()
+        if self.source_pools is not None and self.nb_iterations:
+            self.pools_stats = self.source_pools.charger()
+        with self._lock:
+            entrees = list(self._consolides)
+        consolides = consolider_signaux_indexes(entrees, limit=50)
+        snapshot = journal_daemon.executer_iteration(
+            self._etat,
+            self.pools_stats or [],
+            self.config,
+            signaux_consolides=[signal for _, signal in consolides],
+            offsets_signaux=[offset for offset, _ in consolides],
+            normaliseur=self.normaliseur,
+            ecrire=self.bus.publier_journal,
+        )
+        self.nb_iterations += 1
+        if snapshot is not None:
+            self.bus.publier(SUJET_STRATEGIE, snapshot)
+        return snapshot
+
+    def iteration_control(self) -> bool:
+        """Une analyse ControlPilot sur les signaux en mémoire ; publie résumé et échange."""
+        with self._lock:
+            evenements = list(self._signaux)
+        resume = self.control.analyser(evenements)
+        if resume is None:
+            return False
+        self.bus.publier(SUJET_CONTROL, resume.to_dict())
+        self.bus.publier(SUJET_EXCHANGE, sign_payload(self.control.construire_exchange(evenements, resume)))
+        self.nb_resumes += 1
+        return True
+
+    def _tache_lecture(self) -> None:
+        while not self._arret.is_set():
+            try:
+                self.lire_entrees()
+            except Exception:
+                logger.exception("Lecture des journaux d'entrée en erreur")
+            self._arret.wait(self.interval_lecture)
+
+    def _tache_daemon(self) -> None:
+        while not self._arret.is_set():
+            try:
+                self.iteration_daemon()
+                self.rotation.faire_tourner_journaux()
+            except Exception:
+                logger.exception("Itération du daemon en erreur")
+            if self.max_loops and self.nb_iterations >= self.max_loops:
+                logger.info("Nombre maximal de boucles atteint, arrêt du superviseur.")
+                self._arret.set()
+                return
+            self._arret.wait(self.interval_daemon)
+
+    def _tache_control(self) -> None:
+        vu = 0
+        derniere = 0.0
+        while not self._arret.is_set():
+            nouveau = self.bus.attendre(SUJET_SIGNAUX, apres=vu, timeout=min(self.interval_lecture, 1.0))
+            if nouveau is not None:
+                vu = nouveau[0]
+            maintenant = time.monotonic()
+            if nouveau is not None or maintenant - derniere >= self.interval_control:
+                try:
+                    self.iteration_control()
+                except Exception:
+                    logger.exception("Analyse ControlPilot en erreur")
+                derniere = maintenant
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+    def demarrer(self) -> None:
+        """Active le bus, lit les entrées existantes puis démarre les tâches en arrière-plan."""
+        self._bus_precedent = activer_bus(self.bus)
+        self.lire_entrees()
+        taches: List[Tuple[str, Callable[[], None]]] = [("lecture", self._tache_lecture), ("control", self._tache_control)]
+        if self.pools_stats is not None:
+            taches.append(("daemon", self._tache_daemon))
+        for nom, cible in taches:
+            thread = Thread(target=cible, name=f"defipilot-{nom}", daemon=True)
+            thread.start()
+            self._taches.append(thread)
+
+    def arreter(self, timeout: float = 5.0) -> None:
+        """Arrête les tâches, écrit les messages en attente et sauvegarde l'état."""
+        self._arret.set()
+        for thread in self._taches:
+            thread.join(timeout)
+        self._taches.clear()
+        desactiver_bus(self.bus)
+        if self._bus_precedent is not None:
+            activer_bus(self._bus_precedent)
+            self._bus_precedent = None
+        self.sink.fermer()
+        try:
+            from core.state_manager import save_state
+
+            save_state()
+        except Exception as exc:
+            logger.warning("Sauvegarde de l'état impossible : %s", exc)
+
+    def attendre(self, timeout: Optional[float] = None) -> bool:
+        """Bloque jusqu'à l'arrêt (``max_loops`` atteint ou ``arreter``)."""
+        return self._arret.wait(timeout)
+
+    @property
+    def actif(self) -> bool:
+        return not self._arret.is_set()
+
+    def executer(self, gui: bool = True) -> int:
+        """Démarre les tâches puis la GUI (thread principal) ou attend l'arrêt."""
+        self.demarrer()
+        try:
+            if gui:
+                from gui.main_window import MainWindow
+
+                MainWindow(source=SourceBus(self)).mainloop()
+            else:
+                while not self.attendre(1.0):
+                    pass
+        except KeyboardInterrupt:
+            print("[INFO] Arrêt demandé par l'utilisateur (Ctrl+C).")
+        finally:
+            self.arreter()
+        return 0
+
+    # ------------------------------------------------------------------
+    # Lecture en mémoire
+    # ------------------------------------------------------------------
+    def signaux(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._signaux)
+
+    def resumes_control(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._resumes)
+
+
+class SourceBus:
+    """Fournisseur de données de la GUI à partir du superviseur (aucune lecture de fichier)."""
+
+    def __init__(self, superviseur: Superviseur) -> None:
+        self.superviseur = superviseur
+
+    def lire_signaux(self) -> Iterable[Dict[str, Any]]:
+        return self.superviseur.signaux()[-HISTORIQUE_GUI:]
+
+    def lire_evenements_control(self) -> Iterable[Dict[str, Any]]:
+        return self.superviseur.resumes_control()
+
+    def lire_snapshot_strategie(self) -> Optional[Dict[str, Any]]:
+        return self.superviseur.bus.dernier(SUJET_STRATEGIE)
+
+
+__all__ = [
+    "SUJET_CONTROL",
+    "SUJET_EXCHANGE",
+    "SUJET_SIGNAUX",
+    "SUJET_SIGNAUX_CONSOLIDES",
+    "SUJET_STRATEGIE",
+    "SourceBus",
+    "SuiveurJsonl",
+    "Superviseur",
+]
@@ -19,6 +19,10 @@ from web3.exceptions import ContractLogicError
 
 from core.real_wallet import get_wallet_address, get_private_key
 from core.journal_swaps import log_swap_event  # journalisation CSV
+from core.gas_estimator import activer_oracle_reseau
+from core.gas_limit_cache import cache_partage, cle_depuis_fonction
+from core.gas_oracle import obtenir_oracle
+from core.quote_service import obtenir_quote_service
 
 # get_polygon_rpc_url est optionnel
 try:
@@ -132,6 +136,7 @@ def _get_web3() -> Web3:
     w3 = Web3(Web3.HTTPProvider(rpc_url))
     if not w3.is_connected():
         raise RuntimeError("Web3 non connecté à Polygon (RPC invalide/HS).")
+    activer_oracle_reseau(w3, "polygon")
     return w3
 
 
@@ -145,13 +150,25 @@ def _router_sushiswap_v2(w3: Web3, address: str):
     return w3.eth.contract(address=Web3.to_checksum_address(address), abi=ROUTER_V2_ABI)
 
 
+def _build_tx_with_gas(w3: Web3, function, tx_params: Dict[str, Any], key) -> Dict[str, Any]:
+    """FR: build_transaction + gas limit (cache appris, sinon estimate_gas × 1.15).
+    EN: build_transaction + gas limit (learned cache, else estimate_gas × 1.15)."""
+    learned = cache_partage().limite(key)
+    if learned is not None:
+        return function.build_transaction({**tx_params, "gas": learned})
+    tx = function.build_transaction(tx_params)
+    gas_est = w3.eth.estimate_gas(tx)
+    tx["gas"] = math.floor(gas_est * 1.15)
+    return tx
+
+
 def _ensure_allowance(
     w3: Web3,
     token_contract,
     owner: str,
     spender: str,
     required_amount: int,
-    gas_price_wei: int,
+    frais: Dict[str, int],
     nonce: int,
     wait_receipt: bool,
     private_key: str,
@@ -162,23 +179,27 @@ def _ensure_allowance(
         return nonce
 
     logger.info("Allowance insuffisante → approve… / Allowance too low → approve…")
-    approve_tx = token_contract.functions.approve(spender, required_amount).build_transaction(
+    approve_fn = token_contract.functions.approve(spender, required_amount)
+    gas_key = cle_depuis_fonction(approve_fn)
+    approve_tx = _build_tx_with_gas(
+        w3,
+        approve_fn,
         {
             "from": owner,
-            "gasPrice": gas_price_wei,
+            **frais,
             "nonce": nonce,
             "chainId": w3.eth.chain_id,
-        }
+        },
+        gas_key,
     )
-    gas_est = w3.eth.estimate_gas(approve_tx)
-    approve_tx["gas"] = math.floor(gas_est * 1.15)
 
     signed_approve = w3.eth.account.sign_transaction(approve_tx, private_key)
     tx_hash = w3.eth.send_raw_transaction(signed_approve.rawTransaction)
     logger.info("Approve tx envoyée: %s", tx_hash.hex())
 
     if wait_receipt:
-        w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        cache_partage().observer_recu(gas_key, receipt, approve_tx["gas"])
         logger.info("Approve confirmée")
 
     # log approve as an info event (optional)
@@ -219,6 +240,8 @@ def effectuer_swap_reel(
     confirm: bool = False,
     wait_receipt: bool = True,
     gas_price_wei: Optional[int] = None,
+    gas_mode: str = "normal",
+    auto_route: bool = True,
     dry_run: bool = False,
 ) -> Dict[str, Any]:
     """
@@ -226,6 +249,11 @@ def effectuer_swap_reel(
 
     Retourne un dict: dex, tx_hash (ou None), status, amount_in_wei, amount_out_min_wei,
     slippage_bps, path, recipient, network="polygon".
+
+    Les frais proviennent de l'oracle de gas partagé (EIP-1559, ``gas_mode`` =
+    slow/normal/urgent) ; ``gas_price_wei`` force une transaction legacy.
+    Sans ``path`` explicite et avec ``auto_route``, la route (directe ou via
+    WMATIC/USDC) est choisie par le service de cotation (un seul Multicall3).
     """
     if dex not in DEX_ROUTER_ADDRESSES:
         if dex == "uniswap_v3":
@@ -246,7 +274,7 @@ def effectuer_swap_reel(
     # Normalisation adresses & path
     token_in = Web3.to_checksum_address(token_in)
     token_out = Web3.to_checksum_address(token_out)
-    path = [Web3.to_checksum_address(a) for a in (path or [token_in, token_out])]
+    explicit_path = [Web3.to_checksum_address(a) for a in path] if path else None
 
     # Router (checksum)
     router_address = DEX_ROUTER_ADDRESSES[dex]
@@ -254,10 +282,28 @@ def effectuer_swap_reel(
     router = _router_sushiswap_v2(w3, router_checksum)
     token_in_contract = _erc20(w3, token_in)
 
-    # Slippage → amountOutMin
+    # Cotation (routes candidates en un aller-retour, cache par bloc) → amountOutMin
+    quoted_out: Optional[int] = None
+    path = explicit_path or [token_in, token_out]
     try:
-        amounts: List[int] = router.functions.getAmountsOut(int(amount_in_wei), path).call()
-        amount_out_min = math.floor(amounts[-1] * (10000 - slippage_bps) / 10000)
+        quote = obtenir_quote_service(w3, router_checksum).coter(
+            token_in,
+            token_out,
+            int(amount_in_wei),
+            chemins=[path] if (explicit_path or not auto_route) else None,
+            gas_mode=gas_mode,
+        )
+        if quote.meilleure is not None:
+            path = list(quote.meilleure.path)
+            quoted_out = quote.meilleure.amount_out
+    except Exception as exc:
+        logger.warning("Service de cotation indisponible (%s) → getAmountsOut direct", exc)
+
+    try:
+        if quoted_out is None:
+            amounts: List[int] = router.functions.getAmountsOut(int(amount_in_wei), path).call()
+            quoted_out = amounts[-1]
+        amount_out_min = math.floor(quoted_out * (10000 - slippage_bps) / 10000)
     except Exception as exc:
         logger.error("Échec getAmountsOut: %s", exc)
         raise
@@ -291,7 +337,10 @@ def effectuer_swap_reel(
     if require_confirmation and not confirm:
         return preview
 
-    gas_price = int(gas_price_wei or w3.eth.gas_price)
+    if gas_price_wei:
+        frais: Dict[str, int] = {"gasPrice": int(gas_price_wei)}
+    else:
+        frais = obtenir_oracle(w3).frais_transaction(gas_mode)
     nonce = w3.eth.get_transaction_count(wallet_address)
 
     # Approve si nécessaire (spender = router_checksum)
@@ -301,7 +350,7 @@ def effectuer_swap_reel(
         owner=wallet_address,
         spender=router_checksum,
         required_amount=int(amount_in_wei),
-        gas_price_wei=gas_price,
+        frais=frais,
         nonce=nonce,
         wait_receipt=wait_receipt,
         private_key=private_key,
@@ -309,24 +358,26 @@ def effectuer_swap_reel(
 
     # Build swap tx
     deadline = int(time.time()) + 15 * 60
-    tx = router.functions.swapExactTokensForTokens(
+    swap_fn = router.functions.swapExactTokensForTokens(
         int(amount_in_wei),
         int(amount_out_min),
         path,
         recipient_address,
         int(deadline),
-    ).build_transaction(
+    )
+    gas_key = cle_depuis_fonction(swap_fn, len(path))
+    tx = _build_tx_with_gas(
+        w3,
+        swap_fn,
         {
             "from": wallet_address,
-            "gasPrice": gas_price,
+            **frais,
             "nonce": nonce,
             "chainId": w3.eth.chain_id,
-        }
+        },
+        gas_key,
     )
 
-    gas_est = w3.eth.estimate_gas(tx)
-    tx["gas"] = math.floor(gas_est * 1.15)
-
     signed_tx = w3.eth.account.sign_transaction(tx, private_key)
     tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
 
@@ -341,7 +392,8 @@ def effectuer_swap_reel(
         pass
 
     if wait_receipt:
-        w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+        cache_partage().observer_recu(gas_key, receipt, tx["gas"])
         result["status"] = "confirmed"
         # Journalisation: confirmed
         try:
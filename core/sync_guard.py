@@ -61,12 +61,37 @@ def is_fresh(target: os.PathLike | str, max_age_s: int) -> bool:
     except OSError: return False
     return (time.time() - mtime) <= max_age_s
 
+_TAIL_BLOCK = 64 * 1024
+
+def tail_lines(target: os.PathLike | str, max_lines: int) -> List[str]:
+    """Dernières lignes non vides, lues par blocs depuis la fin du fichier."""
+    p = Path(target)
+    if max_lines <= 0:
+        return _tail_lines(p, max_lines)
+    try:
+        with p.open("rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            chunks: List[bytes] = []
+            newlines = 0
+            while pos > 0 and newlines <= max_lines:
+                size = min(_TAIL_BLOCK, pos)
+                pos -= size
+                f.seek(pos)
+                chunk = f.read(size)
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+    except OSError: return []
+    lines = [ln for ln in b"".join(reversed(chunks)).decode("utf-8", errors="replace").splitlines() if ln.strip()]
+    if pos > 0 and lines: lines = lines[1:]  # première ligne possiblement tronquée
+    return lines[-max_lines:]
+
 def _tail_lines(p: Path, max_lines: int) -> List[str]:
+    if max_lines > 0: return tail_lines(p, max_lines)
     try:
         with p.open("r", encoding="utf-8") as f:
-            lines = [ln.rstrip("\\n") for ln in f if ln.strip()]
+            return [ln.rstrip("\n") for ln in f if ln.strip()]
     except OSError: return []
-    return lines[-max_lines:] if max_lines>0 else lines
 
 def safe_read_jsonl(target: os.PathLike | str, *, max_lines: int = 100,
                     wait_if_locked: bool = True, timeout_s: float = 2.0,
@@ -77,6 +102,10 @@ def safe_read_jsonl(target: os.PathLike | str, *, max_lines: int = 100,
         if not wait_if_locked or time.time() >= deadline: break
         time.sleep(0.02)
     lines = _tail_lines(p, max_lines)
+    if 0 < max_lines and len(lines) < max_lines:
+        # Journal tourné : compléter avec les segments archivés (core.journal_rotation).
+        from core.journal_rotation import lignes_archivees
+        lines = lignes_archivees(p, max_lines - len(lines)) + lines
     if not parse: return lines
     out: List[Any] = []
     for ln in lines:
@@ -1,19 +1,25 @@
 # core/utils.py
 
 import os
-import csv
+
+from core.journal_index import index_journal
+
+
+def _premiere_colonne(ligne):
+    return ligne[0] if ligne else None
+
 
 def ligne_deja_presente(fichier, date_str):
-    """Vérifie si une ligne pour la date donnée existe dans le fichier CSV."""
+    """Vérifie si une ligne pour la date donnée existe dans le fichier CSV.
+
+    Les dates présentes sont indexées (lecture incrémentale du fichier) :
+    la vérification ne relit plus tout le journal à chaque appel.
+    """
     if not os.path.exists(fichier):
         return False
 
     try:
-        with open(fichier, "r", encoding="utf-8") as f:
-            lecteur = csv.reader(f)
-            for ligne in lecteur:
-                if ligne and ligne[0] == date_str:
-                    return True
+        return index_journal(fichier, _premiere_colonne).contient(date_str)
     except Exception as e:
         print(f"[ERREUR] Impossible de lire le fichier {fichier} : {e}")
     return False
@@ -189,8 +189,12 @@ class KeyMetricsCard(Card):
 class MainWindow(tk.Tk):
     """Fenêtre principale du tableau de bord DeFiPilot."""
 
-    def __init__(self) -> None:
+    def __init__(self, source: Optional[Any] = None) -> None:
+        """``source`` : fournisseur en mémoire (superviseur) exposant
+        ``lire_signaux()``, ``lire_evenements_control()`` et
+        ``lire_snapshot_strategie()`` ; par défaut les journaux sont relus."""
         super().__init__()
+        self._source = source
         self.title(APP_TITLE)
         self.minsize(*MIN_SIZE)
 
@@ -370,6 +374,8 @@ class MainWindow(tk.Tk):
     # ------------------------------------------------------------------ #
 
     def _read_signals(self) -> List[Dict[str, Any]]:
+        if self._source is not None:
+            return list(self._source.lire_signaux())
         try:
             payloads = safe_read_jsonl(
                 self._signals_path,
@@ -387,6 +393,8 @@ class MainWindow(tk.Tk):
         return result
 
     def _read_control_events(self) -> List[Dict[str, Any]]:
+        if self._source is not None:
+            return list(self._source.lire_evenements_control())
         if not self._control_path.exists():
             return []
         try:
@@ -415,6 +423,8 @@ class MainWindow(tk.Tk):
         return {}
 
     def _read_strategy_snapshot(self) -> Optional[Dict[str, Any]]:
+        if self._source is not None:
+            return self._source.lire_snapshot_strategie()
         try:
             snapshot = lire_dernier_snapshot()
         except Exception:
@@ -20,6 +20,15 @@ Boucle simple :
   dans data/logs/journal_strategie.jsonl.
 - V5.3.0 : ajoute un journal stratégique dédié (journal_strategy.jsonl)
   via core.journal_strategy.journaliser_entree_strategique().
+- V6.1.0 : le contexte de marché est lissé d'une itération à l'autre par
+  core.market_signals.MarketContextTracker (état persisté sous `market_context`).
+- V6.1.0 : passe de risque à chaque itération : scénarios Monte Carlo
+  (core.monte_carlo) sur les positions, bornés en temps et réutilisés dans
+  l'état (`monte_carlo`) entre deux recalculs, puis core.risk_analysis
+  (état `analyse_risque`, résumé dans le snapshot stratégie).
+- V6.1.0 : univers de pools relu à chaque itération (SourcePools) ; un payload
+  « yields » DefiLlama (fichier ou URL) passe par core.defi_sources.flux_pools.IngestionPools,
+  qui garde le snapshot précédent (data/pools_snapshot.npz) et ne retraite que le diff.
 """
 
 from __future__ import annotations
@@ -29,23 +38,33 @@ import json
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Mapping
+from typing import Any, Callable, Hashable, Mapping, Sequence
 
 from control.control_pilot import lire_signaux_consolides
+from core.defi_sources.flux_pools import DiffPools, IngestionPools, est_source_yields
+from core.market_signals import MARKET_CONTEXT_STATE_KEY, MarketContextTracker
 from core.market_signals_adapter import calculer_contexte_et_policy
+from core.policy_tables import TablesPolitique, tables_pour_config
+from core.pool_table import PoolTable
 from core.rebalancing import generer_plan_reequilibrage_contexte
-from core.signals_normalizer import normaliser_signaux, SignalNormalise
+from core.signals_normalizer import NormaliseurSignaux, normaliser_signaux, signal_en_dict, SignalNormalise
 from core.state_manager import get_state, update_state, save_state
 from core.wallet_reader import lire_soldes_depuis_env
 from core.scoring import calculer_scores_et_gains, charger_ponderations
 from core.strategy_snapshot import journaliser_decision
 from core.journal_strategy import journaliser_entree_strategique
+from core.historique import HistoriqueCompact, charger_historique_en_cache
+from core.journal_rotation import GestionnaireRotation
+from core.monte_carlo import allocation_par_pool, evaluer_risque_portefeuille
+from core.risk_analysis import analyser_risque_v5_5
 
 
 VERSION = "V5.3.0"
 DECISIONS_JOURNAL_PATH = Path("journal_decisions.jsonl")
 STRATEGY_JOURNAL_PATH = Path("data/logs/journal_strategie.jsonl")
+CHEMIN_SNAPSHOT_POOLS = Path("data/pools_snapshot.npz")
 StateDict = dict[str, Any]
+EcrivainJsonl = Callable[[Path, dict[str, Any]], None]
 
 
 # ---------------------------------------------------------------------------
@@ -126,39 +145,39 @@ def _calculer_allocation_categorielle(etat: StateDict) -> dict[str, float]:
     return allocation
 
 
-def _charger_signaux_normalises(limit: int = 50) -> list[SignalNormalise]:
+def _charger_signaux_normalises(
+    limit: int = 50,
+    signaux_consolides: Sequence[Any] | None = None,
+    offsets: Sequence[Hashable] | None = None,
+    normaliseur: NormaliseurSignaux | None = None,
+) -> list[SignalNormalise]:
     """Lit les signaux consolidés (ControlPilot) et les normalise pour la stratégie.
 
     Étapes :
     - lecture via control.control_pilot.lire_signaux_consolides(),
+      sauf si ``signaux_consolides`` est fourni (superviseur : signaux déjà en mémoire),
     - conversion en dict(),
-    - normalisation via core.signals_normalizer.normaliser_signaux().
+    - normalisation via core.signals_normalizer.normaliser_signaux(), ou via
+      ``normaliseur`` si les ``offsets`` des signaux sont connus : seuls les
+      signaux absents de son cache sont alors convertis et normalisés.
 
     En cas d'erreur, retourne une liste vide et loggue un avertissement simple.
     """
-    try:
-        signaux_consolides = lire_signaux_consolides(limit=limit, include_ai=True)
-    except Exception as exc:  # best effort
-        print(f"[WARN] Impossible de lire les signaux consolidés : {exc}")
-        return []
-
-    bruts: list[dict[str, Any]] = []
-    for s in signaux_consolides:
-        # SignalConsolide possède to_dict(), mais on garde une compatibilité large
-        if hasattr(s, "to_dict"):
-            try:
-                bruts.append(s.to_dict())  # type: ignore[call-arg]
-                continue
-            except Exception:
-                pass
-        if isinstance(s, Mapping):
-            bruts.append(dict(s))
-
-    if not bruts:
-        return []
+    if signaux_consolides is None:
+        try:
+            signaux_consolides = lire_signaux_consolides(limit=limit, include_ai=True)
+        except Exception as exc:  # best effort
+            print(f"[WARN] Impossible de lire les signaux consolidés : {exc}")
+            return []
 
     try:
-        signaux_norm = normaliser_signaux(bruts)
+        if normaliseur is not None and offsets is not None and len(offsets) == len(signaux_consolides):
+            signaux_norm = normaliseur.normaliser(zip(offsets, signaux_consolides))
+        else:
+            bruts = [brut for brut in map(signal_en_dict, signaux_consolides) if brut is not None]
+            if not bruts:
+                return []
+            signaux_norm = normaliser_signaux(bruts)
     except Exception as exc:  # best effort
         print(f"[WARN] Normalisation des signaux impossible : {exc}")
         return []
@@ -169,19 +188,23 @@ def _charger_signaux_normalises(limit: int = 50) -> list[SignalNormalise]:
 
 
 def _calculer_scoring_pools(
-    pools_stats: list[dict[str, Any]],
+    pools_stats: PoolTable | Sequence[Mapping[str, Any]],
     profil_nom: str,
     solde_total_usd: float,
     historique_pools: Any,
+    tables: TablesPolitique | None = None,
 ) -> dict[str, Any]:
     """Calcule le scoring des pools à partir de core.scoring.
 
-    - Utilise charger_ponderations(profil_nom) pour récupérer les pondérations.
+    - Utilise la table profil → pondérations compilée depuis la config si
+      fournie, sinon charger_ponderations(profil_nom).
     - Construit un dict de profil compatible avec calculer_scores_et_gains().
-    - Passe un historique_pools si disponible, sinon un dict vide.
+    - Passe un historique_pools si disponible, sinon None (le scoring lit
+      alors les agrégats de la base SQLite, si importée).
+    - Une PoolTable est scorée en colonnes (colonne "score" remplie sur place).
     - Retourne un résumé (profil, solde de référence, top3, gain total/jour).
     """
-    base = charger_ponderations(profil_nom)
+    base = tables.ponderations_profil(profil_nom) if tables is not None else charger_ponderations(profil_nom)
 
     profil = {
         "nom": profil_nom,
@@ -193,10 +216,13 @@ def _calculer_scoring_pools(
         "historique_max_malus": float(base.get("historique_max_malus", 0.0)),
     }
 
-    if isinstance(historique_pools, Mapping):
+    # HistoriqueCompact transmis tel quel : le scoring lit son vecteur de bonus.
+    if isinstance(historique_pools, HistoriqueCompact):
+        hist = historique_pools
+    elif isinstance(historique_pools, Mapping):
         hist = dict(historique_pools)
     else:
-        hist = {}
+        hist = None
 
     try:
         solde_ref = float(solde_total_usd)
@@ -205,7 +231,7 @@ def _calculer_scoring_pools(
 
     # calculer_scores_et_gains modifie les pools pour ajouter "score"
     resultats_top3, gain_total = calculer_scores_et_gains(
-        pools=list(pools_stats),
+        pools=pools_stats if isinstance(pools_stats, PoolTable) else list(pools_stats),
         profil=profil,
         solde=solde_ref,
         historique_pools=hist,
@@ -276,6 +302,7 @@ def _journaliser_decisions(
     profil: str,
     mode: str = "simulation",
     path: Path = DECISIONS_JOURNAL_PATH,
+    ecrire: EcrivainJsonl = _append_jsonl,
 ) -> None:
     """Journalise les actions de rééquilibrage simulées dans un fichier JSONL.
 
@@ -338,7 +365,7 @@ def _journaliser_decisions(
         event["details"] = details
 
         try:
-            _append_jsonl(path, event)
+            ecrire(path, event)
         except Exception as exc:  # best effort
             print(f"[WARN] Impossible d'écrire dans {path}: {exc}")
             break
@@ -353,10 +380,13 @@ def _journaliser_snapshot_strategie(
     allocation_simulee: Mapping[str, float] | None,
     scoring_info: Mapping[str, Any] | None,
     nb_signaux: int,
-) -> None:
+    ecrire: EcrivainJsonl = _append_jsonl,
+    analyse_risque: Mapping[str, Any] | None = None,
+) -> dict[str, Any]:
     """Journalise un snapshot complet de la stratégie et du portefeuille.
 
-    Ce snapshot servira pour la GUI et pour l'analyse historique des décisions.
+    Ce snapshot servira pour la GUI et pour l'analyse historique des décisions ;
+    il est aussi retourné (le superviseur le publie sur le bus).
     """
     payload: dict[str, Any] = {
         "timestamp": datetime.now(timezone.utc)
@@ -394,6 +424,16 @@ def _journaliser_snapshot_strategie(
             "profil_scoring": scoring_info.get("profil", {}),
         }
 
+    if isinstance(analyse_risque, Mapping):
+        monte_carlo = analyse_risque.get("monte_carlo")
+        payload["risque"] = {
+            "risk_level": analyse_risque.get("risk_level"),
+            "allow_new_positions": analyse_risque.get("allow_new_positions"),
+            "monte_carlo": {
+                cle: monte_carlo.get(cle) for cle in ("var_95_pct", "cvar_99_pct", "drawdown_p95_pct")
+            } if isinstance(monte_carlo, Mapping) else None,
+        }
+
     # Journal stratégique V5.3 (journal_strategy.jsonl)
     try:
         journaliser_entree_strategique(
@@ -420,10 +460,308 @@ def _journaliser_snapshot_strategie(
         )
 
     try:
-        _append_jsonl(path, payload)
+        ecrire(path, payload)
     except Exception as exc:
         print(f"[WARN] Impossible d'écrire le snapshot stratégie dans {path}: {exc}")
 
+    return payload
+
+
+def _passe_risque(etat: StateDict, decision: Any, config: Mapping[str, Any]) -> dict[str, Any]:
+    """Scénarios Monte Carlo sur les positions puis analyse de risque V5.5.
+
+    Le rapport est conservé dans l'état (`monte_carlo`) : il n'est recalculé
+    qu'une fois par `safety.monte_carlo.intervalle_s` ou si les positions changent.
+    """
+    try:
+        rapport = evaluer_risque_portefeuille(
+            allocation_par_pool(etat.get("positions")),
+            config,
+            precedent=etat.get("monte_carlo"),
+        )
+    except Exception as exc:
+        print(f"[WARN] Passe Monte Carlo impossible : {exc}")
+        rapport = None
+    if rapport is None:
+        etat.pop("monte_carlo", None)
+    else:
+        etat["monte_carlo"] = rapport
+
+    analyse = analyser_risque_v5_5(decision, config, monte_carlo=rapport)
+    etat["analyse_risque"] = analyse
+    if rapport is not None and not analyse.get("allow_new_positions"):
+        print(f"[WARN] Risque {analyse.get('risk_level')} : nouvelles positions suspendues (seuils Monte Carlo).")
+    return analyse
+
+
+# ---------------------------------------------------------------------------
+# Chargement des entrées
+# ---------------------------------------------------------------------------
+
+
+def charger_pools_stats(pools_path: Path) -> PoolTable | None:
+    """Lit le fichier de stats de pools (liste de dicts ou clé 'pools') en PoolTable.
+
+    Les alias de clés (tvl/tvl_usd, apy/apr…) sont résolus une fois ici ;
+    contexte de marché et scoring travaillent ensuite en colonnes.
+    Retourne None (après un message d'erreur) si le fichier est absent ou invalide.
+    """
+    if not pools_path.exists():
+        print(f"[ERROR] Fichier pools introuvable : {pools_path}")
+        return None
+
+    try:
+        pools_data = _read_json(pools_path)
+    except Exception as exc:
+        print(f"[ERROR] Impossible de lire le fichier pools {pools_path} : {exc}")
+        return None
+
+    if isinstance(pools_data, Mapping):
+        pools_data = pools_data.get("pools")
+    if isinstance(pools_data, list):
+        return PoolTable.depuis_dicts(p for p in pools_data if isinstance(p, Mapping))
+    print("[ERROR] Format de pools invalide (attendu: liste de dicts ou clé 'pools').")
+    return None
+
+
+class SourcePools:
+    """Univers de pools relu à chaque itération du daemon.
+
+    Un payload « yields » DefiLlama (fichier ``{"data": [...]}`` ou URL) est
+    ingéré en flux par ``IngestionPools`` : le snapshot précédent est gardé
+    entre deux itérations (et entre deux lancements via ``chemin_snapshot``)
+    et la PoolTable n'est reconstruite que si le diff n'est pas vide.
+    Un fichier au format interne n'est relu que si sa date de modification change.
+    En cas d'échec de lecture, les pools de l'itération précédente sont conservées.
+    """
+
+    def __init__(self, source: str | Path, chemin_snapshot: str | Path | None = CHEMIN_SNAPSHOT_POOLS) -> None:
+        self.source = source
+        self.ingestion: IngestionPools | None = None
+        if est_source_yields(source):
+            self.ingestion = IngestionPools(chemin_snapshot=str(chemin_snapshot) if chemin_snapshot else None)
+        self.pools: PoolTable | None = None
+        self.diff: DiffPools | None = None
+        self._mtime: float | None = None
+
+    def charger(self) -> PoolTable | None:
+        """Pools courantes (None si la source n'a encore jamais pu être lue)."""
+        if self.ingestion is None:
+            return self._charger_fichier()
+        try:
+            resultat = self.ingestion.ingerer(self.source)
+        except (OSError, ValueError) as exc:
+            print(f"[ERROR] Impossible de lire la source de pools {self.source} : {exc}")
+            return self.pools
+        self.diff = resultat.diff
+        if self.pools is None or resultat.diff:
+            self.pools = PoolTable.depuis_table_flux(resultat.table)
+        return self.pools
+
+    def _charger_fichier(self) -> PoolTable | None:
+        chemin = Path(self.source)
+        try:
+            mtime = chemin.stat().st_mtime
+        except OSError:
+            mtime = None
+        if self.pools is not None and mtime == self._mtime:
+            return self.pools
+        pools = charger_pools_stats(chemin)
+        if pools is not None:
+            self.pools, self._mtime = pools, mtime
+        return self.pools
+
+
+def charger_config(cfg: str | None) -> Mapping[str, Any]:
+    """Lit la configuration JSON optionnelle (mapping vide en cas d'absence ou d'erreur)."""
+    config: Mapping[str, Any] = {}
+    if cfg is not None:
+        cfg_path = Path(cfg)
+        if cfg_path.exists():
+            try:
+                config_obj = _read_json(cfg_path)
+                config = _ensure_mapping(config_obj)
+            except Exception as exc:
+                print(f"[WARN] Impossible de lire la configuration {cfg_path} : {exc}")
+        else:
+            print(f"[WARN] Fichier de configuration introuvable : {cfg_path}")
+    return config
+
+
+def initialiser_etat() -> StateDict:
+    """Charge l'état partagé et y ajoute les soldes du wallet (lecture seule, best effort)."""
+    etat: StateDict = get_state() or {}
+    try:
+        soldes_wallet = lire_soldes_depuis_env()
+        if isinstance(soldes_wallet, Mapping):
+            etat.setdefault("soldes_wallet", {}).update(dict(soldes_wallet))
+    except Exception as exc:
+        print(f"[WARN] Impossible de lire les soldes du wallet : {exc}")
+    return etat
+
+
+# ---------------------------------------------------------------------------
+# Itération
+# ---------------------------------------------------------------------------
+
+
+def executer_iteration(
+    etat: StateDict,
+    pools_stats: PoolTable | Sequence[Mapping[str, Any]],
+    config: Mapping[str, Any],
+    *,
+    signaux_consolides: Sequence[Any] | None = None,
+    offsets_signaux: Sequence[Hashable] | None = None,
+    normaliseur: NormaliseurSignaux | None = None,
+    ecrire: EcrivainJsonl = _append_jsonl,
+) -> dict[str, Any] | None:
+    """Exécute une itération complète du daemon et retourne le snapshot stratégie.
+
+    ``pools_stats`` est de préférence une ``PoolTable`` (``SourcePools``,
+    ``charger_pools_stats``) : contexte de marché et scoring la lisent en
+    colonnes ; une liste de dicts reste acceptée.
+    ``signaux_consolides`` évite la relecture des journaux de signaux ;
+    accompagnés de leurs ``offsets_signaux``, ``normaliseur`` ne normalise
+    que les signaux qu'il n'a pas encore vus. ``ecrire`` remplace l'ajout
+    direct aux JSONL (puits asynchrone du superviseur). Retourne None si le
+    contexte/policy n'a pas pu être calculé.
+    """
+    run_id = (
+        datetime.now(timezone.utc)
+        .isoformat(timespec="seconds")
+        .replace("+00:00", "Z")
+    )
+
+    # 1) Calculer contexte + policy via core.market_signals_adapter : le snapshot
+    #    de pools courant met à jour l'état lissé (EWMA + hystérésis) conservé
+    #    dans l'état, au lieu de reconstruire le contexte depuis 50 signaux.
+    #    Les tables (params, policies, pondérations) ne sont recompilées que si la config change.
+    tables = tables_pour_config(config)
+    tracker = MarketContextTracker(tables.params, etat.get(MARKET_CONTEXT_STATE_KEY))
+    try:
+        decision, profil_effectif = calculer_contexte_et_policy(
+            pools_stats,
+            config,
+            run_id=run_id,
+            tracker=tracker,
+        )
+    except Exception as exc:
+        print(f"[ERROR] Echec de calcul du contexte/policy : {exc}")
+        return None
+    etat[MARKET_CONTEXT_STATE_KEY] = tracker.to_dict()
+
+    # 2) Charger les signaux normalisés (entrée du plan de rééquilibrage)
+    signaux_norm = _charger_signaux_normalises(
+        limit=50,
+        signaux_consolides=signaux_consolides,
+        offsets=offsets_signaux,
+        normaliseur=normaliseur,
+    )
+    nb_signaux = len(signaux_norm)
+
+    # 3) Calculer l'allocation actuelle par catégorie de risque
+    allocation_actuelle = _calculer_allocation_categorielle(etat)
+
+    # 3 bis) Passe de risque (Monte Carlo borné en temps + analyse V5.5)
+    analyse_risque = _passe_risque(etat, decision, config)
+
+    # 4) Calculer le scoring des pools
+    solde_total = sum(allocation_actuelle.values())
+    historique_pools = etat.get("historique_pools")
+    if not historique_pools:
+        # Historique compact persisté (data/historique_pools.bin) : bonus lus par indice,
+        # fichier relu seulement s'il a changé depuis l'itération précédente.
+        historique_pools = charger_historique_en_cache() or None
+    try:
+        scoring_info = _calculer_scoring_pools(
+            pools_stats=pools_stats,
+            profil_nom=profil_effectif,
+            solde_total_usd=solde_total,
+            historique_pools=historique_pools,
+            tables=tables,
+        )
+        etat["dernier_scoring_pools"] = scoring_info
+    except Exception as exc:
+        print(f"[WARN] Echec du calcul de scoring des pools : {exc}")
+        scoring_info = None
+
+    # 5) Générer un plan de rééquilibrage simulé via core.rebalancing
+    try:
+        plan_reeq = generer_plan_reequilibrage_contexte(
+            decision=decision,
+            allocation_actuelle_usd=allocation_actuelle,
+            scoring_info=scoring_info,
+            state=etat,
+            config=config,
+            signaux_norm=signaux_norm,
+        )
+    except TypeError:
+        # Fallback si la signature est plus simple dans la version actuelle
+        try:
+            plan_reeq = generer_plan_reequilibrage_contexte(
+                decision,
+                allocation_actuelle,
+            )
+        except Exception as exc:
+            print(f"[WARN] Impossible de générer le plan de rééquilibrage : {exc}")
+            plan_reeq = None
+    except Exception as exc:
+        print(f"[WARN] Impossible de générer le plan de rééquilibrage : {exc}")
+        plan_reeq = None
+
+    # 6) Simuler l'allocation après rééquilibrage
+    allocation_simulee = None
+    if isinstance(plan_reeq, Mapping):
+        actions = plan_reeq.get("actions")
+        if isinstance(actions, list):
+            allocation_simulee = _simuler_allocation_apres_reequilibrage(
+                allocation_actuelle_usd=allocation_actuelle,
+                actions=actions,
+            )
+            etat["allocation_simulee_apres_reequilibrage"] = allocation_simulee
+
+    # 7) Journaliser les décisions de rééquilibrage simulées (journal_decisions.jsonl)
+    try:
+        context_value = getattr(decision, "context", None)
+        context_str = context_value or "inconnu"
+        _journaliser_decisions(
+            plan=plan_reeq,
+            run_id=run_id,
+            context=context_str,
+            profil=profil_effectif,
+            mode="simulation",
+            ecrire=ecrire,
+        )
+    except Exception as exc:
+        print(f"[WARN] Echec de la journalisation des décisions : {exc}")
+
+    # 8) Journaliser le snapshot stratégie (STRATEGY_JOURNAL_PATH + journal stratégique)
+    snapshot: dict[str, Any] | None = None
+    try:
+        snapshot = _journaliser_snapshot_strategie(
+            path=STRATEGY_JOURNAL_PATH,
+            run_id=run_id,
+            decision=decision,
+            profil_effectif=profil_effectif,
+            allocation_actuelle=allocation_actuelle,
+            allocation_simulee=allocation_simulee,
+            scoring_info=scoring_info,
+            nb_signaux=nb_signaux,
+            ecrire=ecrire,
+            analyse_risque=analyse_risque,
+        )
+    except Exception as exc:
+        print(f"[WARN] Echec de la journalisation du snapshot stratégie : {exc}")
+
+    # 9) Sauvegarder l'état mis à jour
+    try:
+        update_state(etat)
+        save_state()
+    except Exception as exc:
+        print(f"[WARN] Impossible de sauvegarder l'état : {exc}")
+
+    return snapshot if snapshot is not None else {"run_id": run_id}
+
 
 # ---------------------------------------------------------------------------
 # Boucle principale
@@ -433,11 +771,11 @@ def _journaliser_snapshot_strategie(
 def main(argv: list[str] | None = None) -> int:
     """Point d'entrée du journaliseur continu de signaux.
 
-    - Charge les stats de pools.
+    - Charge les stats de pools (relues à chaque boucle via ``SourcePools``).
     - Charge une configuration optionnelle.
     - Lit/initialise l'état.
     - Lit les soldes du wallet au démarrage (lecture seule).
-    - Boucle à intervalle régulier pour :
+    - Boucle à intervalle régulier pour exécuter ``executer_iteration`` :
       - charger les signaux normalisés,
       - calculer le contexte & la policy,
       - générer un plan de rééquilibrage simulé,
@@ -448,7 +786,10 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument(
         "--pools",
         required=True,
-        help="Fichier JSON des stats de pools (liste de dicts)",
+        help=(
+            "Fichier JSON des stats de pools (liste de dicts), ou payload "
+            "« yields » DefiLlama (fichier ou URL) relu en flux à chaque boucle"
+        ),
     )
     parser.add_argument(
         "--cfg",
@@ -473,51 +814,17 @@ def main(argv: list[str] | None = None) -> int:
 
     args = parser.parse_args(argv)
 
-    pools_path = Path(args.pools)
-    if not pools_path.exists():
-        print(f"[ERROR] Fichier pools introuvable : {pools_path}")
-        return 1
-
-    try:
-        pools_data = _read_json(pools_path)
-    except Exception as exc:
-        print(f"[ERROR] Impossible de lire le fichier pools {pools_path} : {exc}")
-        return 1
-
-    if isinstance(pools_data, list):
-        pools_stats: list[dict[str, Any]] = [
-            p for p in pools_data if isinstance(p, Mapping)
-        ]
-    elif isinstance(pools_data, Mapping) and isinstance(pools_data.get("pools"), list):
-        pools_stats = [
-            p for p in pools_data.get("pools", []) if isinstance(p, Mapping)
-        ]
-    else:
-        print("[ERROR] Format de pools invalide (attendu: liste de dicts ou clé 'pools').")
+    pools_path = args.pools
+    source_pools = SourcePools(pools_path)
+    pools_stats = source_pools.charger()
+    if pools_stats is None:
         return 1
 
-    config: Mapping[str, Any] = {}
-    if args.cfg is not None:
-        cfg_path = Path(args.cfg)
-        if cfg_path.exists():
-            try:
-                config_obj = _read_json(cfg_path)
-                config = _ensure_mapping(config_obj)
-            except Exception as exc:
-                print(f"[WARN] Impossible de lire la configuration {cfg_path} : {exc}")
-        else:
-            print(f"[WARN] Fichier de configuration introuvable : {cfg_path}")
-
-    # Chargement/initialisation de l'état
-    etat: StateDict = get_state() or {}
+    config = charger_config(args.cfg)
 
-    # Lecture des soldes du wallet au démarrage (lecture seule, best effort)
-    try:
-        soldes_wallet = lire_soldes_depuis_env()
-        if isinstance(soldes_wallet, Mapping):
-            etat.setdefault("soldes_wallet", {}).update(dict(soldes_wallet))
-    except Exception as exc:
-        print(f"[WARN] Impossible de lire les soldes du wallet : {exc}")
+    # Chargement/initialisation de l'état + soldes du wallet
+    etat = initialiser_etat()
+    rotation = GestionnaireRotation.depuis_config(config)
 
     # Boucle principale
     interval = max(1, int(args.interval))
@@ -534,121 +841,14 @@ def main(argv: list[str] | None = None) -> int:
 
     while True:
         loop_count += 1
-        run_id = (
-            datetime.now(timezone.utc)
-            .isoformat(timespec="seconds")
-            .replace("+00:00", "Z")
-        )
-
-        print(f"[LOOP] run_id={run_id} (boucle {loop_count})")
-
-        # 1) Charger les signaux normalisés
-        signaux_norm = _charger_signaux_normalises(limit=50)
-        nb_signaux = len(signaux_norm)
+        print(f"[LOOP] boucle {loop_count}")
 
-        # 2) Calculer contexte + policy via core.market_signals_adapter
-        try:
-            decision, profil_effectif = calculer_contexte_et_policy(
-                signaux_norm,
-                config,
-            )
-        except Exception as exc:
-            print(f"[ERROR] Echec de calcul du contexte/policy : {exc}")
-            time.sleep(interval)
-            if max_loops and loop_count >= max_loops:
-                break
-            continue
-
-        # 3) Calculer l'allocation actuelle par catégorie de risque
-        allocation_actuelle = _calculer_allocation_categorielle(etat)
-
-        # 4) Calculer le scoring des pools
-        solde_total = sum(allocation_actuelle.values())
-        historique_pools = etat.get("historique_pools")
-        try:
-            scoring_info = _calculer_scoring_pools(
-                pools_stats=pools_stats,
-                profil_nom=profil_effectif,
-                solde_total_usd=solde_total,
-                historique_pools=historique_pools,
-            )
-            etat["dernier_scoring_pools"] = scoring_info
-        except Exception as exc:
-            print(f"[WARN] Echec du calcul de scoring des pools : {exc}")
-            scoring_info = None
-
-        # 5) Générer un plan de rééquilibrage simulé via core.rebalancing
-        try:
-            plan_reeq = generer_plan_reequilibrage_contexte(
-                decision=decision,
-                allocation_actuelle_usd=allocation_actuelle,
-                scoring_info=scoring_info,
-                state=etat,
-                config=config,
-                signaux_norm=signaux_norm,
-            )
-        except TypeError:
-            # Fallback si la signature est plus simple dans la version actuelle
-            try:
-                plan_reeq = generer_plan_reequilibrage_contexte(
-                    decision,
-                    allocation_actuelle,
-                )
-            except Exception as exc:
-                print(f"[WARN] Impossible de générer le plan de rééquilibrage : {exc}")
-                plan_reeq = None
-        except Exception as exc:
-            print(f"[WARN] Impossible de générer le plan de rééquilibrage : {exc}")
-            plan_reeq = None
-
-        # 6) Simuler l'allocation après rééquilibrage
-        allocation_simulee = None
-        if isinstance(plan_reeq, Mapping):
-            actions = plan_reeq.get("actions")
-            if isinstance(actions, list):
-                allocation_simulee = _simuler_allocation_apres_reequilibrage(
-                    allocation_actuelle_usd=allocation_actuelle,
-                    actions=actions,
-                )
-                etat["allocation_simulee_apres_reequilibrage"] = allocation_simulee
-
-        # 7) Journaliser les décisions de rééquilibrage simulées (journal_decisions.jsonl)
-        try:
-            context_value = getattr(decision, "context", None)
-            context_str = context_value or "inconnu"
-            _journaliser_decisions(
-                plan=plan_reeq,
-                run_id=run_id,
-                context=context_str,
-                profil=profil_effectif,
-                mode="simulation",
-            )
-        except Exception as exc:
-            print(f"[WARN] Echec de la journalisation des décisions : {exc}")
-
-        # 8) Journaliser le snapshot stratégie (STRATEGY_JOURNAL_PATH + journal stratég."""
-        try:
-            _journaliser_snapshot_strategie(
-                path=STRATEGY_JOURNAL_PATH,
-                run_id=run_id,
-                decision=decision,
-                profil_effectif=profil_effectif,
-                allocation_actuelle=allocation_actuelle,
-                allocation_simulee=allocation_simulee,
-                scoring_info=scoring_info,
-                nb_signaux=nb_signaux,
-            )
-        except Exception as exc:
-            print(f"[WARN] Echec de la journalisation du snapshot stratégie : {exc}")
-
-        # 9) Sauvegarder l'état mis à jour
-        try:
-            update_state(etat)
-            save_state()
-        except Exception as exc:
-            print(f"[WARN] Impossible de sauvegarder l'état : {exc}")
+        if loop_count > 1:
+            pools_stats = source_pools.charger()
+        executer_iteration(etat, pools_stats, config)
+        rotation.faire_tourner_journaux()
 
-        # 10) Gestion de la boucle (max_loops / interval)
+        # Gestion de la boucle (max_loops / interval)
         if max_loops and loop_count >= max_loops:
             print("[INFO] Nombre maximal de boucles atteint, arrêt du daemon.")
             break
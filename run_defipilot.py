@@ -11,6 +11,9 @@ Options :
     --interval   : intervalle entre deux écritures (secondes, défaut 30)
     --max-loops  : nombre max d’itérations pour le daemon (0 = infini)
     --journal    : chemin du journal JSONL (défaut: journal_signaux.jsonl)
+    --processus  : lance le daemon dans un processus séparé (ancien mode) ;
+                   par défaut daemon, ControlPilot et GUI partagent ce processus
+                   via core.supervisor.
 """
 
 from __future__ import annotations
@@ -52,6 +55,11 @@ def main(argv: list[str] | None = None) -> int:
         default="journal_signaux.jsonl",
         help="Chemin du journal JSONL (défaut: journal_signaux.jsonl)",
     )
+    parser.add_argument(
+        "--processus",
+        action="store_true",
+        help="Lance le daemon dans un processus séparé (ancien mode)",
+    )
     args = parser.parse_args(argv)
 
     root_dir = Path(__file__).resolve().parent
@@ -62,6 +70,32 @@ def main(argv: list[str] | None = None) -> int:
     # On s'assure que le GUI lira le même fichier JSONL
     os.environ["DEFIPILOT_JOURNAL"] = str(journal_path)
 
+    if not args.processus:
+        from core.supervisor import Superviseur
+        from journal_daemon import SourcePools, charger_config
+
+        # Chemins relatifs du daemon et de ControlPilot (JOURNAUX_CONSOLIDES,
+        # exchange_bus.jsonl, data/logs/..., fichier d'état) ancrés sur le projet.
+        os.chdir(root_dir)
+        source_pools = SourcePools(pools_path)
+        pools_stats = source_pools.charger()
+        if pools_stats is None:
+            return 1
+        print("========================================")
+        print(" DeFiPilot — Lancement global (superviseur)")
+        print("========================================")
+        print(f"Pools   : {pools_path}")
+        print(f"Journal : {journal_path}")
+        print("========================================")
+        return Superviseur(
+            pools_stats,
+            charger_config(str(cfg_path) if cfg_path else None),
+            journal_signaux=journal_path,
+            interval_daemon=args.interval,
+            max_loops=args.max_loops,
+            source_pools=source_pools,
+        ).executer(gui=True)
+
     # Commande pour lancer le daemon
     daemon_cmd = [
         sys.executable,
@@ -4,6 +4,8 @@ import csv
 import os
 from datetime import date
 
+from core.journal_index import index_journal
+
 FICHIER_CSV = "journal_simulation.csv"
 
 def deja_journalise_aujourdhui(pool_id: str) -> bool:
@@ -15,13 +17,11 @@ def deja_journalise_aujourdhui(pool_id: str) -> bool:
     """
     if not os.path.exists(FICHIER_CSV):
         return False
+    index = index_journal(FICHIER_CSV, _cle_journal, entete=True)
+    return index.contient((str(date.today()), pool_id))
 
-    with open(FICHIER_CSV, newline='') as csvfile:
-        reader = csv.DictReader(csvfile)
-        for row in reader:
-            if row.get('date') == str(date.today()) and row.get('pool_id') == pool_id:
-                return True
-    return False
+def _cle_journal(row: dict) -> tuple:
+    return (row.get('date'), row.get('pool_id'))
 
 def journaliser_resultats(pool: dict, gain: float) -> None:
     """
@@ -2,6 +2,7 @@
 
 from core.engine import profil, scoring, config_loader
 import core.historique_rendements as historique_rendements
+from core.simulateur_vectoriel import simuler_portefeuilles
 from defi_sources import defillama
 from graphiques import gains_profils
 
@@ -9,13 +10,10 @@ SOLDE_INITIAL = 1000.0
 DUREE_SIMULATION_JOURS = 7  # ← simulation sur 7 jours
 
 def simuler_investissement(pools, solde, jours=7, pond_apr=1.0):
-    montant_par_pool = solde / len(pools)
-    gains = []
-    for pool in pools:
-        apr = pool.get("apr", 0)
-        gain = montant_par_pool * (apr / 100) * (jours / 365) * pond_apr
-        gains.append(gain)
-    return round(sum(gains), 2)
+    # Répartition égale, intérêts simples : une seule passe vectorisée.
+    aprs = [pool.get("apr", 0) * pond_apr for pool in pools]
+    resultat = simuler_portefeuilles(aprs, [[1 / len(pools)] * len(pools)], jours, solde, composer=False)
+    return round(float(resultat.gains[0]), 2)
 
 
 def formater_resultats(profil_nom, top3, gain):
@@ -3,6 +3,8 @@
 import os
 import json
 
+from core.simulateur_vectoriel import simuler_solde
+
 FICHIER_SIMULATION = "wallet_simulation.json"
 
 class WalletSimule:
@@ -32,6 +34,14 @@ class WalletSimule:
         self._sauvegarder()
         return solde_avant, gain_estime, self.solde
 
+    def simuler_jours(self, pools, nb_jours, poids=None, composer=True):
+        """Simulation sur ``nb_jours`` jours déléguée à ``core.simulateur_vectoriel`` ;
+        le fichier de simulation n'est écrit qu'une fois."""
+        solde_avant = self.solde
+        self.solde = simuler_solde(self.solde, pools, nb_jours, poids, composer=composer)
+        self._sauvegarder()
+        return solde_avant, self.solde - solde_avant, self.solde
+
     def reset(self, nouveau_montant=100.0):
         self.solde = nouveau_montant
         self._sauvegarder()
@@ -3,12 +3,17 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import List, Optional, Dict, Any
+import argparse
+import os
 import subprocess
 import sys
 import json
 import time
 
-"""Lance DeFiPilot en mode complet en démarrant le daemon, ControlPilot et la GUI tout en supervisant le journal de contrôle et en assurant un arrêt propre via Ctrl+C."""
+"""Lance DeFiPilot en mode complet en démarrant le daemon, ControlPilot et la GUI tout en supervisant le journal de contrôle et en assurant un arrêt propre via Ctrl+C.
+
+Par défaut les trois composants tournent dans ce processus (core.supervisor) et échangent via le bus
+de signaux en mémoire ; --processus rétablit le lancement en trois processus séparés."""
 
 base_dir = Path(__file__).resolve().parent
 journal_daemon_script = base_dir / "journal_daemon.py"
@@ -94,7 +99,48 @@ def afficher_resume_console(resume: Dict[str, Any]) -> None:
         tvl_texte = "?"
     print(f"[SUPERVISION] {ts} | contexte={contexte} | APR={apr_texte} | TVL={tvl_texte}")
 
-def main() -> int:
+def lancer_superviseur(gui: bool = True) -> int:
+    from core.supervisor import Superviseur
+    from journal_daemon import SourcePools
+
+    # Même répertoire de travail que les processus séparés (cwd=base_dir) : les
+    # chemins relatifs (JOURNAUX_CONSOLIDES, exchange_bus.jsonl, data/logs/...,
+    # fichier d'état) restent ancrés sur le projet quel que soit le dossier de lancement.
+    os.chdir(base_dir)
+    source_pools = SourcePools(pools_path)
+    pools_stats = source_pools.charger()
+    if pools_stats is None:
+        return 1
+    superviseur = Superviseur(
+        pools_stats,
+        source_pools=source_pools,
+        journal_signaux=journal_path,
+        journal_control=control_output_path,
+        interval_daemon=30,
+        interval_control=60,
+        max_events=100,
+    )
+    superviseur.bus.abonner("control", lambda _sujet, resume: afficher_resume_console(resume))
+    print("========================================")
+    print(" DeFiPilot — Lancement global (superviseur)")
+    print("========================================")
+    print(f"Pools    : {pools_path}")
+    print(f"Journal  : {journal_path}")
+    print(f"Contrôle : {control_output_path}")
+    print(f"GUI      : {'oui' if gui else 'non'}")
+    print("========================================")
+    return superviseur.executer(gui=gui)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="DeFiPilot — Lancement global")
+    parser.add_argument("--processus", action="store_true", help="Lance daemon, ControlPilot et GUI dans trois processus séparés.")
+    parser.add_argument("--sans-gui", action="store_true", dest="sans_gui", help="Superviseur sans interface graphique.")
+    args = parser.parse_args(argv)
+    if not args.processus:
+        return lancer_superviseur(gui=not args.sans_gui)
+    return lancer_processus()
+
+def lancer_processus() -> int:
     processes = start_processes()
     interval_supervision = 30
     derniere_signature: Optional[str] = None
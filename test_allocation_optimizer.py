@@ -0,0 +1,176 @@
+import random
+import time
+
+import numpy as np
+
+from core.allocation_optimizer import (
+    ParametresOptimiseur,
+    bornes_allocation,
+    capital_portefeuille,
+    couts_gas_entree,
+    evaluer_allocation,
+    matrice_covariance,
+    optimiser_allocations,
+    projeter_boite_budget,
+    resoudre_qp,
+)
+from core.strategy_context import StrategyContext
+from core.strategy_engine import MarketState, PoolCandidate, PortfolioSnapshot, StrategyEngine
+
+NB_CANDIDATS = 300
+PLATEFORMES = ["uniswap", "curve", "aave", "balancer"]
+JETONS = ["USDC", "WETH", "MATIC", "DAI", "WBTC", "USDT"]
+
+
+def _candidats(n: int, rng: random.Random) -> list:
+    return [
+        PoolCandidate(
+            f"p{i}", rng.choice(PLATEFORMES), rng.choice(["polygon", "ethereum"]),
+            "-".join(rng.sample(JETONS, 2)), tvl=rng.uniform(1e5, 1e8), apr=rng.uniform(0, 60),
+            metadata={"volatility": rng.uniform(0.05, 0.8)} if i % 3 else None,
+        )
+        for i in range(n)
+    ]
+
+
+def _realisable(w, lb, ub, budget, tol=1e-9) -> bool:
+    return bool(np.all(w >= lb - tol) and np.all(w <= ub + tol) and w.sum() <= budget + tol)
+
+
+def _heuristique(n: int, min_pct: float, max_pct: float, plafond: float) -> np.ndarray:
+    """Parts uniformes de ``_compute_uniform_allocations`` (facteur d'exposition 1)."""
+    part = max(min(1.0 / n, max_pct), min_pct)
+    w = np.full(n, part / max(1.0, part * n))
+    return np.minimum(w, plafond)
+
+
+def main() -> None:
+    rng = random.Random(21)
+    nrng = np.random.default_rng(21)
+
+    print("=== PROJECTION BOÎTE ∩ BUDGET ===")
+    for _ in range(300):
+        n = rng.randrange(1, 40)
+        lb = nrng.uniform(0, 0.5 / n, n)
+        ub = lb + nrng.uniform(0, 0.6, n)
+        budget = float(nrng.uniform(lb.sum(), 1.2))
+        v = nrng.normal(0.2, 0.5, n)
+        w = projeter_boite_budget(v, lb, ub, budget)
+        assert _realisable(w, lb, ub, budget)
+        distance = np.sum((w - v) ** 2)
+        for _ in range(20):
+            autre = projeter_boite_budget(w + nrng.normal(0, 0.05, n), lb, ub, budget)
+            assert distance <= np.sum((autre - v) ** 2) + 1e-9
+
+    print("=== QP : OPTIMALITÉ ===")
+    for _ in range(40):
+        candidats = _candidats(rng.randrange(2, 30), rng)
+        params = ParametresOptimiseur(capital_usd=10_000.0, aversion_risque=rng.choice([0.5, 2.0, 8.0]))
+        n = len(candidats)
+        r = np.array([c.apr / 100 for c in candidats])
+        cov = matrice_covariance(candidats, params)
+        assert np.allclose(cov, cov.T) and np.linalg.eigvalsh(cov).min() > -1e-12
+        lb, ub = bornes_allocation(n, 0.02, 0.4, 0.3)
+        w, _ = resoudre_qp(r, cov, lb, ub, 1.0, params.aversion_risque)
+        assert _realisable(w, lb, ub, 1.0)
+        objectif = lambda x: r @ x - params.aversion_risque / 2 * x @ cov @ x
+        for _ in range(50):
+            x = projeter_boite_budget(w + nrng.normal(0, 0.05, n), lb, ub, 1.0)
+            assert objectif(w) >= objectif(x) - 1e-9
+
+    print("=== LP GLOUTON (SANS AVERSION) ===")
+    lb, ub = np.full(4, 0.1), np.full(4, 0.4)
+    w, iterations = resoudre_qp(np.array([0.05, 0.2, 0.1, 0.3]), np.eye(4), lb, ub, 1.0, 0.0)
+    assert iterations == 0 and np.allclose(w, [0.1, 0.4, 0.1, 0.4])
+
+    print("=== GAS ===")
+    candidats = _candidats(6, rng)
+    gas = couts_gas_entree(candidats, lambda op, reseau: {"swap": 1.0, "add_liquidity": 2.0}[op] if reseau == "polygon" else 1 / 0)
+    assert gas.tolist() == [3.0 if c.chain == "polygon" else 0.0 for c in candidats]
+    modeste = [PoolCandidate(f"g{i}", "dex", "ethereum", "A-B", 1e6, apr) for i, apr in enumerate([40.0, 30.0, 1.0])]
+    params = ParametresOptimiseur(capital_usd=1_000.0, aversion_risque=0.0)
+    lb, ub = bornes_allocation(3, 0.1, 0.5)
+    resultat = optimiser_allocations(modeste, lb, ub, 1.0, params, gas=np.full(3, 9.7))
+    assert resultat.poids[2] == 0.0 and np.allclose(resultat.poids[:2], [0.5, 0.5]), "pool ne couvrant pas son gas écartée"
+    assert abs(resultat.gas_usd - 19.4) < 1e-9 and resultat.objectif_usd > 0
+    try:
+        optimiser_allocations(modeste, lb, ub, 1.0, ParametresOptimiseur())
+        raise AssertionError("capital requis")
+    except ValueError:
+        pass
+
+    print("=== CAPITAL DU PORTEFEUILLE ===")
+    assert capital_portefeuille({"USDC": 2_000.0, "dai": 500, "WETH": 2.0, "POL": 100.0}, {"weth": 3_000.0}) == 8_500.0
+    assert capital_portefeuille({}) == 0.0
+
+    print(f"=== OPTIMISEUR VS HEURISTIQUE ({NB_CANDIDATS} candidats) ===")
+    candidats = _candidats(NB_CANDIDATS, rng)
+    params = ParametresOptimiseur(capital_usd=10_000.0)
+    r = np.array([c.apr / 100 for c in candidats])
+    cov = matrice_covariance(candidats, params)
+    gas = couts_gas_entree(candidats, lambda op, reseau: 0.05 if reseau == "polygon" else 5.0)
+    lb, ub = bornes_allocation(NB_CANDIDATS, 0.001, 0.05, 0.04)
+    t0 = time.perf_counter()
+    resultat = optimiser_allocations(candidats, lb, ub, 1.0, params, gas=gas, covariance=cov)
+    duree = time.perf_counter() - t0
+    retenus = resultat.poids > 0
+    assert _realisable(resultat.poids[retenus], lb[retenus], ub[retenus], 1.0)
+    heuristique = _heuristique(NB_CANDIDATS, 0.001, 0.05, 0.04)
+    objectif_heuristique = sum(evaluer_allocation(heuristique, r, cov, gas, params) * np.array([1, -1, -1]))
+    print(
+        f"objectif {resultat.objectif_usd:.2f} USD (heuristique {objectif_heuristique:.2f}), "
+        f"{int(retenus.sum())} pools, {resultat.iterations} itérations, {duree * 1e3:.1f} ms"
+    )
+    assert resultat.objectif_usd > objectif_heuristique
+    assert duree < 0.5
+
+    print("=== STRATEGY ENGINE ===")
+    moteur = StrategyEngine(config_path="strategy_config.json", dry_run=True)
+    pools = [
+        PoolCandidate("stable", "curve", "polygon", "USDC-DAI", 5e7, 6.0, metadata={"volatility": 0.02}),
+        PoolCandidate("risque", "uniswap", "polygon", "WETH-MATIC", 1e7, 45.0, metadata={"volatility": 0.9}),
+        PoolCandidate("moyen", "aave", "polygon", "WBTC-USDC", 2e7, 15.0),
+    ]
+    neutre = StrategyContext("2030-01-01T00:00:00Z", "neutre", 0.5, 0.8, "", {}, 3)
+    portefeuille = PortfolioSnapshot({"USDC": 4_000.0, "WETH": 2.0}, {}, 0.0)
+    assert "optimizer" not in moteur.cfg
+    defaut = moteur.compute_allocations(pools, MarketState.NEUTRE, neutre, snapshot=portefeuille)
+    assert [round(a.target_pct, 12) for a in defaut] == [round(1 / 3, 12)] * 3, "heuristique uniforme par défaut"
+
+    moteur.cfg["optimizer"] = {"prix_usd": {"WETH": 3_000.0}}
+    sans_capital = moteur.compute_allocations(pools, MarketState.NEUTRE, neutre)
+    assert [a.target_pct for a in sans_capital] == [a.target_pct for a in defaut], "capital inconnu : repli uniforme"
+    allocations = moteur.compute_allocations(pools, MarketState.NEUTRE, neutre, snapshot=portefeuille)
+    parts = {a.pool_id: a.target_pct for a in allocations}
+    assert all(0.1 - 1e-9 <= p <= 0.4 + 1e-9 for p in parts.values()) and sum(parts.values()) <= 1 + 1e-9
+    assert abs(sum(parts.values()) - 1.0) < 1e-9 and abs(parts["moyen"] - 0.4) < 1e-9
+    assert parts["risque"] < 0.4, "forte volatilité pénalisée par l'aversion au risque"
+    moteur.cfg["optimizer"] = {"aversion_risque": 0.0, "capital_usd": 10_000.0}
+    neutre_risque = {a.pool_id: a.target_pct for a in moteur.compute_allocations(pools, MarketState.NEUTRE, neutre)}
+    assert np.allclose([neutre_risque[p] for p in ("risque", "moyen", "stable")], [0.4, 0.4, 0.2])
+    moteur.cfg["optimizer"] = {"prix_usd": {"WETH": 3_000.0}}
+    favorable = moteur.compute_allocations(pools, MarketState.FAVORABLE, neutre, snapshot=portefeuille)
+    assert all(a.target_pct <= 0.25 + 1e-9 for a in favorable), "plafond de risque du marché"
+
+    # Capital modeste sur ethereum : le gas écarte la pool à 4 % et le reste n'est pas investi
+    ethereum = [PoolCandidate(f"e{apr:g}", "dex", "ethereum", f"T{apr:g}-USDC", 1e7, apr) for apr in (4.0, 8.0, 25.0)]
+    gas_eth = couts_gas_entree(ethereum)
+    if gas_eth.any():
+        # au plafond de 40 %, la pool à 4 % rapporte 90 % de son gas sur l'horizon (30 j)
+        capital = 0.9 * gas_eth[0] * 365 / 30 / (0.04 * 0.4)
+        reduit = PortfolioSnapshot({"USDC": capital}, {}, 0.0)
+        parts_eth = {a.pool_id: a.target_pct for a in moteur.compute_allocations(ethereum, MarketState.NEUTRE, neutre, snapshot=reduit)}
+        assert "e4" not in parts_eth and np.isclose(sum(parts_eth.values()), 0.8), "somme sous le budget documentée"
+    del moteur.cfg["optimizer"]
+
+    moteur.cfg["allocations"]["method"] = "uniform"
+    moteur.cfg["optimizer"] = {"capital_usd": 10_000.0}
+    uniformes = moteur.compute_allocations(pools, MarketState.NEUTRE, neutre)
+    assert [round(a.target_pct, 12) for a in uniformes] == [round(1 / 3, 12)] * 3
+    print(parts)
+
+    print("✅ Optimiseur d'allocation OK")
+
+
+if __name__ == "__main__":
+    main()
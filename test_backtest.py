@@ -0,0 +1,61 @@
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import backtest
+from core.backtest import Backtest, FenetreSignaux, charger_snapshots
+from tests.donnees_backtest import CFG, donnees_synthetiques
+
+
+def main() -> None:
+    dossier = tempfile.mkdtemp()
+    snapshots, signaux = donnees_synthetiques(jours=90)
+    chemin_snap = os.path.join(dossier, "snapshots.jsonl")
+    chemin_sig = os.path.join(dossier, "signaux.jsonl")
+    with open(chemin_snap, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(s) + "\n" for s in snapshots)
+    with open(chemin_sig, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(s) + "\n" for s in signaux)
+
+    print("=== FENÊTRE DE SIGNAUX ===")
+    fenetre = FenetreSignaux(signaux)
+    assert fenetre.visibles(0) == []
+    visibles = fenetre.visibles(datetime(2025, 2, 1, tzinfo=timezone.utc).timestamp())
+    assert len(visibles) == 50 and visibles[0]["timestamp"] >= visibles[-1]["timestamp"]
+
+    print("=== REJEU 90 JOURS (horaire) ===")
+    sleep_original = time.sleep
+    time.sleep = lambda *_: (_ for _ in ()).throw(AssertionError("sleep interdit en backtest"))
+    avant = set(os.listdir("."))
+    try:
+        rapport = Backtest(charger_snapshots(chemin_snap), signaux, CFG, capital_usd=10_000, frais_bps=10).executer()
+    finally:
+        time.sleep = sleep_original
+    print({k: v for k, v in rapport.items() if k != "courbe"})
+    assert set(os.listdir(".")) == avant, "aucun journal ne doit être écrit"
+    assert rapport["nb_etapes"] == 90 * 24
+    assert 89 < rapport["duree_simulee_jours"] < 90
+    assert rapport["duree_reelle_s"] < 30
+    assert rapport["pnl_usd"] > 0 and rapport["turnover_usd"] > 0 and rapport["nb_reequilibrages"] > 1
+    assert len(rapport["contextes"]) >= 2
+    assert abs(rapport["rendement_brut_usd"] - rapport["frais_usd"] - rapport["pnl_usd"]) < 1e-6
+    assert abs(sum(rapport["allocation_finale_usd"].values()) - rapport["valeur_finale_usd"]) < 1e-6
+    assert len(rapport["courbe"]) == rapport["nb_etapes"]
+    assert 0.8 <= rapport["exposition_moyenne"] <= 1.0, "table d'exposition du profil modere"
+
+    print("=== POINT D'ENTRÉE ===")
+    sortie = os.path.join(dossier, "rapport.json")
+    chemin_cfg = os.path.join(dossier, "cfg.json")
+    with open(chemin_cfg, "w", encoding="utf-8") as f:
+        json.dump(CFG, f)
+    code = backtest.main(["--snapshots", chemin_snap, "--cfg", chemin_cfg, "--signaux", chemin_sig, "--ai", os.path.join(dossier, "absent"),
+                          "--frais-bps", "10", "--sortie", sortie])
+    assert code == 0
+    with open(sortie, encoding="utf-8") as f:
+        assert round(json.load(f)["pnl_usd"], 6) == round(rapport["pnl_usd"], 6)
+
+
+if __name__ == "__main__":
+    main()
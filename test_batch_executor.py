@@ -0,0 +1,47 @@
+from core.execution.batch_executor import BatchRebalanceExecutor, StubChain, construire_dag
+import time
+
+from core.strategy_engine import Allocation, PortfolioSnapshot, StrategyEngine
+
+
+def main() -> None:
+    engine = StrategyEngine(config_path="strategy_config.json", dry_run=True)
+    allocations = [
+        Allocation(pool_id=f"pool{i}", target_pct=0.25, risk_level="neutral", notes="")
+        for i in range(4)
+    ]
+    snapshot = PortfolioSnapshot(balances={"USDC": 1000.0}, allowances={}, timestamp=time.time())
+    actions = engine.build_actions(allocations, snapshot)
+
+    legs = construire_dag(actions)
+    print("=== DAG ===")
+    for leg in legs:
+        print(leg.leg_id, "<-", list(leg.depends_on))
+
+    print("=== LATENCE (bloc 50 ms) ===")
+    rapports = {}
+    for mode in ("sequentiel", "dag"):
+        executor = BatchRebalanceExecutor(StubChain(block_time_s=0.05), mode=mode)
+        rapport = executor.execute(actions)
+        rapports[mode] = rapport
+        print(
+            f"{mode:<10} status={rapport['status']} "
+            f"confirmees={rapport['nb_confirmees']} approbations={rapport['nb_approbations']} "
+            f"latence={rapport['latence_totale_s']:.3f}s"
+        )
+    assert rapports["dag"]["nb_echecs"] == 0
+    assert rapports["dag"]["latence_totale_s"] < rapports["sequentiel"]["latence_totale_s"]
+    nonces = sorted(l["nonce"] for l in rapports["dag"]["legs"] if l["nonce"] is not None)
+    assert nonces == list(range(len(nonces))), "nonces non contigus"
+
+    print("=== ECHEC D'UNE ETAPE ===")
+    chaine = StubChain(block_time_s=0.01, echecs={"pool1:add_liquidity:4"})
+    rapport = BatchRebalanceExecutor(chaine).execute(actions)
+    statuts = {l["leg_id"]: l["status"] for l in rapport["legs"]}
+    print(rapport["status"], statuts["pool1:add_liquidity:4"], statuts["pool1:stake:5"])
+    assert statuts["pool1:stake:5"] == "skipped"
+    assert statuts["pool2:stake:8"] == "confirmed"
+
+
+if __name__ == "__main__":
+    main()
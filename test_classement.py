@@ -0,0 +1,103 @@
+import random
+
+import numpy as np
+
+from core.classement import ClassementPools, indices_top_k
+from core.scoring import calculer_scores_et_gains, charger_profil_utilisateur
+from core.strategy_context import StrategyContext
+from core.strategy_engine import PoolCandidate, StrategyEngine
+
+NB_POOLS = 100_000
+
+
+def _reference(cles_tri: dict, k: int) -> list:
+    """Ordre de sorted(..., reverse=True) sur l'ordre d'insertion, tronqué à k."""
+    return [cle for cle, _ in sorted(cles_tri.items(), key=lambda item: item[1], reverse=True)[:k]]
+
+
+def main() -> None:
+    rng = random.Random(13)
+
+    print("=== INDEX INCRÉMENTAL ===")
+    classement = ClassementPools()
+    attendu: dict = {}
+    for etape in range(5_000):
+        cle = rng.randrange(300)
+        if rng.random() < 0.2:
+            classement.retirer(cle)
+            attendu.pop(cle, None)
+        else:
+            cle_tri = (float(rng.randrange(20)), rng.choice([0.0, 1.0]))
+            attendu[cle] = cle_tri
+            classement.mettre_a_jour(cle, cle_tri, valeur=f"v{cle}")
+        if etape % 250 == 0:
+            k = rng.randrange(1, 40)
+            assert classement.top_cles(k) == _reference(attendu, k), etape
+    assert len(classement) == len(attendu) and len(classement._tas) <= 2 * len(attendu) + 65
+    assert classement.top(3) == [f"v{c}" for c in _reference(attendu, 3)]
+    assert ClassementPools().top(5) == [] and classement.top(0) == []
+    construit = ClassementPools.construire((i, (s,), i) for i, s in enumerate([1.0, 3.0, 3.0, -1.0]))
+    assert construit.top(10) == [1, 2, 0, 3]
+    construit.mettre_a_jour(3, (5.0,), 3)
+    assert construit.top(2) == [3, 1]
+
+    print("=== TOP-K EN COLONNES ===")
+    for _ in range(200):
+        n = rng.randrange(1, 60)
+        valeurs = np.array([rng.choice([1.0, 2.0, 2.0, float("-inf"), float("nan"), rng.random()]) for _ in range(n)])
+        k = rng.randrange(0, n + 3)
+        assert indices_top_k(valeurs, k).tolist() == np.argsort(-valeurs, kind="stable")[:k].tolist()
+
+    print("=== STRATEGY ENGINE ===")
+    moteur = StrategyEngine(config_path="strategy_config.json", dry_run=True)
+    moteur.cfg["allocations"]["max_concurrent"] = 10
+    pools = [
+        PoolCandidate(f"p{i}", "dex", "Polygon", "A-B", tvl=rng.choice([0.0, rng.uniform(1e4, 1e9)]), apr=round(rng.uniform(0, 50)))
+        for i in range(NB_POOLS)
+    ]
+    neutre = StrategyContext("2030-01-01T00:00:00Z", "neutre", 0.5, 0.8, "", {}, 3)
+
+    def reference(contexte):
+        if any(p.score is not None for p in pools):
+            cle = lambda p: (p.score if p.score is not None else float("-inf"), p.apr, p.tvl)
+        else:
+            cle = lambda p: moteur._compute_effective_score(p, contexte)
+        return sorted(pools, key=cle, reverse=True)[:10]
+
+    assert moteur.select_candidates(pools, neutre) == reference(neutre)
+    index = moteur._classement
+
+    appels = []
+    calcul = moteur._compute_effective_score
+    moteur._compute_effective_score = lambda p, c: appels.append(p.pool_id) or calcul(p, c)
+    for i in (5, 77, 4_000):
+        pools[i].apr += 500 + i
+    selection = moteur.select_candidates(pools, neutre)
+    assert moteur._classement is index, "index mis à jour sur place, pas reconstruit"
+    assert sorted(appels) == ["p4000", "p5", "p77"], "seuls les pools modifiés sont re-scorés"
+    moteur._compute_effective_score = calcul
+    assert selection == reference(neutre) and selection[0] is pools[4_000]
+    print(f"pools re-scorés après mise à jour : {len(appels)} / {NB_POOLS}")
+
+    favorable = StrategyContext("2030-01-01T00:00:00Z", "favorable", 0.5, 0.8, "", {}, 3)
+    assert moteur.select_candidates(pools, favorable) == reference(favorable), "changement de contexte"
+    for i in range(0, NB_POOLS, 7):
+        pools[i].score = float(i % 11)
+    assert moteur.select_candidates(pools, favorable) == reference(favorable), "scores explicites"
+    del pools[50:]
+    assert moteur.select_candidates(pools, favorable) == reference(favorable), "liste raccourcie"
+    pools.append(PoolCandidate("nouveau", "dex", "Polygon", "C-D", tvl=1.0, apr=1.0, score=99.0))
+    assert moteur.select_candidates(pools, favorable)[0].pool_id == "nouveau"
+
+    print("=== TOP 3 DU SCORING ===")
+    profil = charger_profil_utilisateur()
+    dicts = [{"plateforme": "dex", "nom": f"P{i}", "apr": float(i % 9), "tvl_usd": 1e6 * (i % 5)} for i in range(500)]
+    resultats, gain = calculer_scores_et_gains(dicts, profil, 1000, {})
+    tries = sorted(dicts, key=lambda p: p["score"], reverse=True)[:3]
+    assert [nom for nom, _, _ in resultats] == [f"dex | {p['nom']}" for p in tries]
+
+    print("✅ Index de classement OK")
+
+
+if __name__ == "__main__":
+    main()
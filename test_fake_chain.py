@@ -0,0 +1,129 @@
+import os
+import tempfile
+
+from eth_account import Account
+from web3 import Web3
+
+from core.execution.batch_executor import MINICHEF_DEPOSIT_ABI
+from core.execution.fake_chain import FakeChain
+from core.swap_reel import SUSHISWAP_V2_ROUTER
+
+CLE_PRIVEE = "0x" + "11" * 32
+COMPTE = Account.from_key(CLE_PRIVEE).address
+E6, E18 = 10**6, 10**18
+
+
+def preparer_chaine() -> dict:
+    chaine = FakeChain()
+    usdc = chaine.deployer_token("USDC", 6)
+    weth = chaine.deployer_token("WETH", 18)
+    wmatic = chaine.deployer_token("WMATIC", 18, adresse="0x0d500B1d8E8eF31E21C99d1Db9A6444d3ADf1270")
+    sushi = chaine.deployer_token("SUSHI", 18)
+    chaine.deployer_router(SUSHISWAP_V2_ROUTER)
+    paire = chaine.creer_paire(usdc, weth, 2_000_000 * E6, 1_000 * E18)
+    chaine.creer_paire(usdc, wmatic, 1_000_000 * E6, 2_000_000 * E18)
+    chaine.creer_paire(wmatic, weth, 2_000_000 * E18, 500 * E18)
+    chef = chaine.deployer_minichef(sushi)
+    pid = chaine.ajouter_pool_minichef(chef, paire, recompense_par_bloc=10**17)
+    chaine.crediter(usdc, COMPTE, 10_000 * E6)
+    chaine.crediter_natif(COMPTE, 100 * E18)
+    return {"chaine": chaine, "usdc": usdc, "weth": weth, "paire": paire, "chef": chef, "pid": pid, "sushi": sushi}
+
+
+def main() -> None:
+    env = preparer_chaine()
+    chaine = env["chaine"]
+    url = chaine.demarrer_serveur_http()
+    variables = {"POLYGON_RPC_URL": url, "WALLET_ACTIVE_NAME": "ENV", "WALLET_ADDRESS": COMPTE, "PRIVATE_KEY": CLE_PRIVEE}
+    sauvegarde = {cle: os.environ.get(cle) for cle in variables}
+    ancien = os.getcwd()
+    # Les journaux (farming, swaps) sont écrits dans un répertoire temporaire.
+    with tempfile.TemporaryDirectory() as dossier:
+        os.chdir(dossier)
+        os.environ.update(variables)
+        try:
+            executer(env, url)
+        finally:
+            os.chdir(ancien)
+            for cle, valeur in sauvegarde.items():
+                if valeur is None:
+                    os.environ.pop(cle, None)
+                else:
+                    os.environ[cle] = valeur
+            chaine.arreter_serveur_http()
+
+
+def executer(env: dict, url: str) -> None:
+    chaine = env["chaine"]
+
+    print("=== SWAP REEL (core.swap_reel inchangé) ===")
+    from core.swap_reel import effectuer_swap_reel
+
+    res = effectuer_swap_reel("sushiswap_v2", env["usdc"], env["weth"], 1_000 * E6, confirm=True)
+    weth_recu = chaine.solde(env["weth"], COMPTE)
+    print(res["status"], len(res["path"]), "saut(s)", weth_recu / E18, "WETH")
+    assert res["status"] == "confirmed" and weth_recu > 0
+
+    print("=== AJOUT DE LIQUIDITE (liquidity_real_tx inchangé) ===")
+    from core.execution.liquidity_real_tx import ajouter_liquidite_reelle
+
+    pool = {
+        "platform": "sushiswap",
+        "chain": "polygon",
+        "router_address": SUSHISWAP_V2_ROUTER,
+        "tokenA_symbol": "USDC",
+        "tokenB_symbol": "WETH",
+        "tokenA_address": env["usdc"],
+        "tokenB_address": env["weth"],
+    }
+    for token in (env["usdc"], env["weth"]):
+        w3 = Web3(Web3.HTTPProvider(url))
+        erc20 = w3.eth.contract(address=Web3.to_checksum_address(token), abi=[
+            {"name": "approve", "type": "function", "stateMutability": "nonpayable",
+             "inputs": [{"name": "s", "type": "address"}, {"name": "v", "type": "uint256"}],
+             "outputs": [{"name": "", "type": "bool"}]},
+        ])
+        tx = erc20.functions.approve(Web3.to_checksum_address(SUSHISWAP_V2_ROUTER), 2**256 - 1).build_transaction(
+            {"from": COMPTE, "nonce": w3.eth.get_transaction_count(COMPTE)}
+        )
+        w3.eth.send_raw_transaction(Account.sign_transaction(tx, CLE_PRIVEE).rawTransaction)
+    r0, r1 = chaine.reserves(env["paire"])
+    r_usdc, r_weth = (r0, r1) if env["usdc"] < env["weth"] else (r1, r0)
+    montant_b = 200 * E6 * r_weth / r_usdc / E18 * 1.001  # au prix courant de la paire
+    res = ajouter_liquidite_reelle(pool=pool, amountA=200.0, amountB=montant_b)
+    lp = chaine.solde(env["paire"], COMPTE)
+    print(res["success"], res["lp_tokens"], lp, res.get("error"))
+    assert res["success"] and lp > 0
+
+    print("=== STAKE + HARVEST + UNSTAKE (farming_cli inchangé) ===")
+    w3 = Web3(Web3.HTTPProvider(url))
+    lp_token = w3.eth.contract(address=Web3.to_checksum_address(env["paire"]), abi=[
+        {"name": "approve", "type": "function", "stateMutability": "nonpayable",
+         "inputs": [{"name": "s", "type": "address"}, {"name": "v", "type": "uint256"}],
+         "outputs": [{"name": "", "type": "bool"}]},
+    ])
+    chef = Web3.to_checksum_address(env["chef"])
+    for fonction in (
+        lp_token.functions.approve(chef, lp),
+        w3.eth.contract(address=chef, abi=MINICHEF_DEPOSIT_ABI).functions.deposit(env["pid"], lp, COMPTE),
+    ):
+        tx = fonction.build_transaction({"from": COMPTE, "nonce": w3.eth.get_transaction_count(COMPTE)})
+        w3.eth.send_raw_transaction(Account.sign_transaction(tx, CLE_PRIVEE).rawTransaction)
+    chaine.miner(5)
+
+    from cli.farming_cli import main as farming_main
+
+    options = ["--rpc-url", url, "--minichef", chef, "--chain-id", "137"]
+    assert farming_main(options + ["harvest", "--pid", str(env["pid"]), "--confirm"]) == 0
+    sushi = chaine.solde(env["sushi"], COMPTE)
+    print("SUSHI récoltés :", sushi / E18)
+    assert sushi > 0
+    assert farming_main(options + ["unstake", "--pid", str(env["pid"]), "--amount", str(lp / E18), "--confirm"]) == 0
+    assert chaine.solde(env["paire"], COMPTE) == lp
+
+    print("=== APPELS RPC ===")
+    print(dict(chaine.appels))
+
+
+if __name__ == "__main__":
+    main()
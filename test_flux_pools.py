@@ -0,0 +1,178 @@
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+
+from core.defi_sources import defillama
+from core.defi_sources.flux_pools import (
+    IngestionPools,
+    comparer_tables,
+    est_source_yields,
+    iterer_pools,
+    lire_table_pools,
+)
+from core.market_signals import MarketParams, detect_market_context
+from core.pool_table import PoolTable
+from core.scoring import calculer_scores, charger_profil_utilisateur
+
+NB_POOLS = 15_000
+HISTORIQUE = {"aucune | pool": {"count": 0, "total_gain": 0.0}}
+
+
+def _pool(i: int, rng: random.Random) -> dict:
+    return {
+        "chain": rng.choice(["Ethereum", "Arbitrum", "Base"]),
+        "project": f"proj{i % 300}",
+        "symbol": f"TOK{i}-USDC",
+        "tvlUsd": rng.uniform(1e4, 1e8),
+        "apyBase": rng.uniform(0, 10),
+        "apyReward": None if i % 3 else rng.uniform(0, 5),
+        "apy": rng.uniform(0.1, 40),
+        "volumeUsd1d": rng.uniform(0, 1e6),
+        "pool": f"id-{i:05d}",
+        "predictions": {"predictedClass": "Stable/Up", "binnedConfidence": 2},
+        "underlyingTokens": ["0x" + "ab" * 20, "0x" + "cd" * 20],
+        "il7d": None,
+    }
+
+
+class _Silencieux(SimpleHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+
+def _ecrire(chemin: str, pools: list) -> None:
+    with open(chemin, "w", encoding="utf-8") as f:
+        json.dump({"status": "success", "data": pools}, f)
+
+
+def main() -> None:
+    dossier = tempfile.mkdtemp()
+    rng = random.Random(7)
+    pools = [_pool(i, rng) for i in range(NB_POOLS)]
+    snapshot = os.path.join(dossier, "yields.json")
+    _ecrire(snapshot, pools)
+    print(f"payload : {os.path.getsize(snapshot) / 1e6:.1f} Mo")
+
+    print("=== PARSEUR EN FLUX ===")
+    petits = list(iterer_pools(io.BytesIO(b' {"status": "ok", "data": [{"pool": "a"} , {"pool": "b\\u00e9]"}]}'), taille_bloc=4))
+    assert [p["pool"] for p in petits] == ["a", "bé]"], "objets à cheval sur plusieurs blocs"
+    assert [p["pool"] for p in iterer_pools(io.BytesIO(b'  [{"pool": "x"}]'), taille_bloc=3)] == ["x"]
+    try:
+        list(iterer_pools(io.BytesIO(b'{"data": [{"pool": "a"}, {"pool": '), taille_bloc=8))
+        raise AssertionError("payload tronqué non détecté")
+    except ValueError:
+        pass
+
+    t0 = time.perf_counter()
+    table = lire_table_pools(snapshot, utiliser_ijson=False)
+    print(f"{len(table)} pools en {time.perf_counter() - t0:.2f}s")
+    assert len(table) == NB_POOLS and table.nombres["apr"].shape == (NB_POOLS,)
+
+    tracemalloc.start()
+    with open(snapshot, encoding="utf-8") as f:
+        json.load(f)
+    pic_complet = tracemalloc.get_traced_memory()[1]
+    tracemalloc.reset_peak()
+    lire_table_pools(snapshot, utiliser_ijson=False)
+    pic_flux = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"pic mémoire : flux {pic_flux / 1e6:.1f} Mo, json.load {pic_complet / 1e6:.1f} Mo")
+    assert pic_flux < pic_complet / 2, "pas de chargement du document entier"
+    ligne = table.ligne(table.index["id-00003"])
+    assert ligne["plateforme"] == "proj3" and ligne["nom"] == "TOK3-USDC" and ligne["lp"]
+    assert ligne["apr"] == pools[3]["apy"] and ligne["farming_apr"] == pools[3]["apyReward"]
+    assert table.ligne(1)["apr_reward"] == 0.0, "valeur absente → 0"
+
+    print("=== SOURCE HTTP ===")
+    serveur = HTTPServer(("127.0.0.1", 0), partial(_Silencieux, directory=dossier))
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{serveur.server_port}/yields.json"
+        distants = defillama.recuperer_pools(url)
+        assert len(distants) == NB_POOLS and distants[0]["id"] == "id-00000"
+        assert est_source_yields(url) and est_source_yields(snapshot)
+        assert defillama.recuperer_pools(url, en_table=True).textes["pool_id"] == [p["id"] for p in distants]
+        assert not defillama.ingerer_source(url).diff, "snapshot de l'appel précédent conservé"
+    finally:
+        serveur.shutdown()
+    assert len(defillama.recuperer_pools()) == 3, "pools simulées sans source"
+    assert len(defillama.recuperer_pools(en_table=True)) == 3
+
+    print("=== DIFF ===")
+    ingestion = IngestionPools(
+        chemin_snapshot=os.path.join(dossier, "pools.npz"),
+        profil=charger_profil_utilisateur(),
+        historique_pools=HISTORIQUE,
+    )
+    premier = ingestion.ingerer(snapshot)
+    assert len(premier.diff.ajoutes) == NB_POOLS and not premier.diff.modifies
+    reference = calculer_scores(table.lignes(), charger_profil_utilisateur()["ponderations"], HISTORIQUE, charger_profil_utilisateur())
+    assert all(ingestion.scores[p["id"]] == p["score"] for p in reference)
+
+    modifies = {f"id-{i:05d}" for i in range(0, NB_POOLS, 500)}
+    for pool in pools:
+        if pool["pool"] in modifies:
+            pool["apy"] *= 1.5
+    del pools[10:15]
+    pools.append(dict(_pool(NB_POOLS, rng)))
+    pools[20]["tvlUsd"] *= 1 + 1e-9  # sous la tolérance
+    _ecrire(snapshot, pools)
+
+    relance = IngestionPools(
+        chemin_snapshot=os.path.join(dossier, "pools.npz"),
+        profil=charger_profil_utilisateur(),
+        historique_pools=HISTORIQUE,
+    )
+    t0 = time.perf_counter()
+    second = relance.ingerer(snapshot)
+    print(second.diff.resume(), f"en {time.perf_counter() - t0:.2f}s")
+    assert second.diff.ajoutes == [f"id-{NB_POOLS:05d}"]
+    assert second.diff.retires == [f"id-{i:05d}" for i in range(10, 15)]
+    assert set(second.diff.modifies) == modifies and len(second.pools_traitees) == len(modifies) + 1
+    assert all(pool["id"] in modifies or pool["id"] == f"id-{NB_POOLS:05d}" for pool in second.pools_traitees)
+    assert "id-00010" not in relance.scores and f"id-{NB_POOLS:05d}" in relance.scores
+
+    print("=== AGRÉGATS DE SIGNAUX INCRÉMENTAUX ===")
+    complet = detect_market_context(second.table.lignes(), MarketParams()).metrics
+    for cle in ("apr_mean", "tvl_sum", "volume_sum", "volatility_cv"):
+        assert abs(second.metriques[cle] - complet[cle]) <= 1e-9 * max(1.0, abs(complet[cle])), cle
+    assert not comparer_tables(second.table, lire_table_pools(snapshot))
+
+    print("=== DAEMON : SOURCE RELUE À CHAQUE ITÉRATION ===")
+    from journal_daemon import SourcePools
+
+    interne = os.path.join(dossier, "pools_interne.json")
+    with open(interne, "w", encoding="utf-8") as f:
+        json.dump({"pools": [{"apr": 0.1, "tvl": 1e6}]}, f)
+    assert not est_source_yields(interne)
+    fichier = SourcePools(interne, chemin_snapshot=None)
+    lue = fichier.charger()
+    assert fichier.ingestion is None and isinstance(lue, PoolTable) and lue.en_dicts() == [{"apr": 0.1, "tvl_usd": 1e6}]
+    assert fichier.charger() is fichier.pools, "fichier inchangé : pas de relecture"
+
+    source = SourcePools(snapshot, chemin_snapshot=os.path.join(dossier, "daemon.npz"))
+    initiales = source.charger()
+    assert isinstance(initiales, PoolTable) and len(initiales) == len(pools) and len(source.diff.ajoutes) == len(pools)
+    assert initiales.colonne("apr") is source.ingestion.table.nombres["apr"], "colonnes reprises sans copie"
+    assert source.charger() is initiales and not source.diff, "diff vide : liste réutilisée"
+    pools[0]["apy"] += 1.0
+    _ecrire(snapshot, pools)
+    apres = source.charger()
+    assert source.diff.modifies == [pools[0]["pool"]] and apres[0]["apr"] == pools[0]["apy"]
+    relance = SourcePools(snapshot, chemin_snapshot=os.path.join(dossier, "daemon.npz"))
+    assert len(relance.charger()) == len(pools) and not relance.diff, "snapshot relu au démarrage"
+    os.remove(snapshot)
+    assert source.charger() is apres, "source illisible : pools précédentes conservées"
+
+    print("✅ Ingestion en flux des pools OK")
+
+
+if __name__ == "__main__":
+    main()
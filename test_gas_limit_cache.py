@@ -0,0 +1,52 @@
+import tempfile
+from pathlib import Path
+
+from core.gas_limit_cache import GasLimitCache, cle_gas
+
+ROUTER = "0x1b02dA8Cb0d097eB8D57A175b88c7D8b47997506"
+
+
+def main() -> None:
+    cache = GasLimitCache(fenetre=10, percentile=90, marge=1.2, min_observations=3)
+    cle = cle_gas(ROUTER, "0x38ed1739" + "00" * 32, longueur_path=2)
+    appels_rpc = []
+
+    def estimation_rpc() -> int:
+        appels_rpc.append(1)
+        return 140_000
+
+    print("=== CACHE FROID ===")
+    for gas_used in (120_000, 125_000, 130_000):
+        limite = cache.estimer(cle, estimation_rpc, lambda g: int(g * 1.15))
+        print("limite", limite)
+        cache.observer(cle, gas_used, limite)
+    assert len(appels_rpc) == 3
+
+    print("=== CACHE CHAUD ===")
+    limite = cache.estimer(cle, estimation_rpc, lambda g: int(g * 1.15))
+    print("limite", limite)
+    assert limite == 156_000 and len(appels_rpc) == 3
+
+    print("=== LIMITE TROP BASSE ===")
+    cache.observer(cle, limite, limite, status=0)
+    assert cache.limite(cle) is None
+    print(cache.stats())
+    assert cache.stats()["trop_bas"] == 1
+    assert cle_gas(ROUTER, "0x38ed1739", 3) != cle
+
+    print("=== PERSISTANCE ENTRE EXÉCUTIONS ===")
+    chemin = Path(tempfile.mkdtemp()) / "gas_limits.json"
+    premier = GasLimitCache(fenetre=10, percentile=90, min_observations=3, chemin=chemin)
+    for gas_used in (120_000, 125_000, 130_000):
+        premier.observer(cle, gas_used)
+    relance = GasLimitCache(fenetre=10, percentile=90, min_observations=3, chemin=chemin)
+    appels_rpc.clear()
+    assert relance.estimer(cle, estimation_rpc, lambda g: int(g * 1.15)) == 156_000 and not appels_rpc
+    relance.observer(cle, 156_000, 156_000, status=0)
+    assert GasLimitCache(chemin=chemin).limite(cle) is None, "réinitialisation persistée"
+    chemin.write_text("{corrompu", encoding="utf-8")
+    assert GasLimitCache(chemin=chemin).stats()["cles"] == 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import time
+
+from core import gas_estimator
+from core.gas_oracle import GasOracle, obtenir_oracle
+
+GWEI = 10**9
+
+
+class _FakeEth:
+    def __init__(self, eip1559: bool = True) -> None:
+        self.eip1559 = eip1559
+        self.appels = 0
+
+    def fee_history(self, block_count, newest, percentiles):
+        self.appels += 1
+        if not self.eip1559:
+            raise ValueError("method not found")
+        return {
+            "oldestBlock": 100,
+            "baseFeePerGas": [80 * GWEI] * block_count + [100 * GWEI],
+            "reward": [[30 * GWEI, 35 * GWEI, 60 * GWEI] for _ in range(block_count)],
+            "gasUsedRatio": [0.5] * block_count,
+        }
+
+    @property
+    def gas_price(self):
+        self.appels += 1
+        return 42 * GWEI
+
+
+class _FakeProvider:
+    endpoint_uri = "http://rpc.test"
+
+
+class _FakeW3:
+    def __init__(self, eip1559: bool = True) -> None:
+        self.eth = _FakeEth(eip1559)
+        self.provider = _FakeProvider()
+
+
+def main() -> None:
+    w3 = _FakeW3()
+    oracle = GasOracle(w3, ttl_s=60)
+
+    print("=== MODES EIP-1559 ===")
+    for mode in ("slow", "normal", "urgent"):
+        frais = oracle.frais_eip1559(mode)
+        print(mode, {k: v / GWEI for k, v in frais.items()})
+    assert oracle.frais_eip1559("normal") == {"maxFeePerGas": 235 * GWEI, "maxPriorityFeePerGas": 35 * GWEI}
+    assert w3.eth.appels == 1, "le cache doit éviter les appels RPC répétés"
+
+    print("=== REPLI LEGACY ===")
+    legacy = GasOracle(_FakeW3(eip1559=False))
+    print(legacy.frais_transaction("urgent"))
+    assert legacy.frais_transaction("urgent") == {"gasPrice": 42 * GWEI}
+
+    print("=== ESTIMATION USD ===")
+    statique = gas_estimator.estimer_cout_gas("swap", "polygon")
+    gas_estimator.enregistrer_oracle("polygon", oracle, prix_natif_usd=0.5)
+    live = gas_estimator.estimer_cout_gas("swap", "polygon")
+    print(f"statique={statique} $  live={live:.4f} $")
+    assert abs(live - 150_000 * 135 * GWEI / 1e18 * 0.5) < 1e-12
+    assert w3.eth.appels == 1
+
+    print("=== ACTIVATION À LA CRÉATION DU WEB3 ===")
+    w3_reel = _FakeW3()
+    partage = gas_estimator.activer_oracle_reseau(w3_reel, "ethereum", prix_natif_usd=lambda: 2000.0)
+    try:
+        assert partage is obtenir_oracle(_FakeW3()), "un oracle par endpoint"
+        limite = time.monotonic() + 5
+        while partage.snapshot_en_cache() is None and time.monotonic() < limite:
+            time.sleep(0.01)
+        assert partage.snapshot_en_cache() is not None, "échantillonnage en tâche de fond"
+        live = gas_estimator.estimer_cout_gas("add_liquidity", "ethereum")
+        assert abs(live - 200_000 * 135 * GWEI / 1e18 * 2000.0) < 1e-9
+        obtenir_oracle(w3_reel, ttl_s=3, nb_blocs=5)
+        assert partage.ttl_s == 3 and partage.nb_blocs == 5, "options appliquées à l'oracle existant"
+        try:
+            obtenir_oracle(w3_reel, inconnue=1)
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("option inconnue acceptée")
+    finally:
+        partage.arreter()
+
+    print("=== SOURCE DE PRIX NATIF ===")
+    source = gas_estimator.source_prix_natif(_FakeW3(), "polygon")
+    assert source() == gas_estimator.prix_natif_config("polygon"), "repli config sans cotation routeur"
+    try:
+        gas_estimator.source_prix_natif(_FakeW3(), "inconnu")()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("réseau sans prix")
+
+
+if __name__ == "__main__":
+    main()
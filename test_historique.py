@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import tempfile
+
+from core import historique
+from core.historique import HistoriqueCompact, calculer_bonus, maj_historique
+from core.scoring import calculer_scores
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+
+
+def main() -> None:
+    dossier = tempfile.mkdtemp()
+    os.makedirs(os.path.join(dossier, "data"))
+    shutil.copy(os.path.join(RACINE, "data", "historique_pools.json"), os.path.join(dossier, "data"))
+    ancien = os.getcwd()
+    os.chdir(dossier)
+    try:
+        print("=== MIGRATION DEPUIS LE JSON ===")
+        with open(historique.HISTORIQUE_PATH, encoding="utf-8") as f:
+            legacy = json.load(f)
+        compact = historique.charger_historique()
+        assert isinstance(compact, HistoriqueCompact) and set(compact) == set(legacy)
+        for nom in legacy:
+            assert calculer_bonus(compact, nom) == calculer_bonus(legacy, nom)
+            assert compact[nom]["count"] == legacy[nom]["count"]
+
+        print("=== MISE À JOUR INCRÉMENTALE ===")
+        for gain in (100.0, 200.0, 20000.0):
+            maj_historique(compact, "uniswap | NEW", gain)
+            maj_historique(legacy, "uniswap | NEW", gain)
+        vecteur = compact.vecteur_bonus(0.2, -0.1)
+        assert compact.vecteur_bonus(0.2, -0.1) is vecteur, "vecteur réutilisé tant que rien ne change"
+        i = compact.indice("uniswap | NEW")
+        assert vecteur[i] == calculer_bonus(legacy, "uniswap | NEW", 0.2, -0.1)
+        print("ewma", compact["uniswap | NEW"]["ewma_gain"])
+        assert round(compact["uniswap | NEW"]["ewma_gain"], 6) == round(100 + 0.2 * 100 + 0.2 * (20000 - 120), 6)
+        maj_historique(compact, "uniswap | NEW", -1e6)
+        assert compact.vecteur_bonus(0.2, -0.1) is not vecteur
+        assert calculer_bonus(compact, "inconnue") == 0.0
+
+        print("=== SCORING : MÊMES SCORES QU'AVEC LE DICT ===")
+        maj_historique(legacy, "uniswap | NEW", -1e6)
+        profil = {"historique_max_bonus": 0.15, "historique_max_malus": -0.10}
+        pools = [{"plateforme": nom.split(" | ")[0], "nom": nom.split(" | ")[1], "apr": 12.0, "tvl_usd": 1e5}
+                 for nom in list(legacy) + ["x | absente"]]
+        scores_compact = [p["score"] for p in calculer_scores([dict(p) for p in pools], {"apr": 0.3, "tvl": 0.7}, compact, profil)]
+        scores_dict = [p["score"] for p in calculer_scores([dict(p) for p in pools], {"apr": 0.3, "tvl": 0.7}, legacy, profil)]
+        print(scores_compact)
+        assert scores_compact == scores_dict
+
+        print("=== BONUS SUR LA MOYENNE, EWMA EN AGRÉGAT ===")
+        for nom, gains in (("a | hausse", [0.0] * 5 + [3000.0] * 5), ("a | baisse", [3000.0] * 5 + [0.0] * 5)):
+            for gain in gains:
+                maj_historique(compact, nom, gain)
+                maj_historique(legacy, nom, gain)
+        assert compact["a | hausse"]["total_gain"] == compact["a | baisse"]["total_gain"]
+        assert calculer_bonus(compact, "a | hausse") == calculer_bonus(compact, "a | baisse")
+        assert compact["a | hausse"]["ewma_gain"] > compact["a | baisse"]["ewma_gain"]
+        assert calculer_bonus(legacy, "a | hausse") == calculer_bonus(compact, "a | hausse")
+
+        print("=== DAEMON : HISTORIQUE COMPACT TRANSMIS ===")
+        from journal_daemon import _calculer_scoring_pools
+
+        lectures = []
+        vecteur_bonus = HistoriqueCompact.vecteur_bonus
+        HistoriqueCompact.vecteur_bonus = lambda self, *a: lectures.append(1) or vecteur_bonus(self, *a)
+        try:
+            info = _calculer_scoring_pools([dict(p) for p in pools], "modere", 1000.0, compact)
+        finally:
+            HistoriqueCompact.vecteur_bonus = vecteur_bonus
+        assert lectures and info["resultats_top3"], "vecteur de bonus lu par le scoring du daemon"
+
+        print("=== SÉRIALISATION BINAIRE ===")
+        historique.sauvegarder_historique(compact)
+        taille_bin = os.path.getsize(historique.HISTORIQUE_BIN_PATH)
+        relu = historique.charger_historique()
+        assert list(relu) == list(compact)
+        assert list(relu.counts) == list(compact.counts) and list(relu.ewma) == list(compact.ewma)
+        print("octets", taille_bin, "vs JSON", os.path.getsize(historique.HISTORIQUE_PATH))
+
+        print("=== CACHE ENTRE ITÉRATIONS ===")
+        lectures = []
+        depuis_octets = HistoriqueCompact.depuis_octets
+        HistoriqueCompact.depuis_octets = classmethod(lambda cls, o: lectures.append(1) or depuis_octets(o))
+        try:
+            premier = historique.charger_historique_en_cache()
+            assert historique.charger_historique_en_cache() is premier and len(lectures) == 1
+            historique.sauvegarder_historique(HistoriqueCompact())
+            assert len(historique.charger_historique_en_cache()) == 0 and len(lectures) == 2
+        finally:
+            HistoriqueCompact.depuis_octets = depuis_octets
+        assert len(historique.charger_historique()) == 0
+    finally:
+        os.chdir(ancien)
+        shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
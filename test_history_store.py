@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+
+from core import historique
+from core import history_store
+from core.history_store import HistoryStore, historique_pools_depuis_store, historique_pools_en_cache
+from core.scoring import calculer_scores
+
+RACINE = os.path.dirname(os.path.abspath(__file__))
+
+
+def main() -> None:
+    dossier = tempfile.mkdtemp()
+    for nom in ("historique_rendements.csv", "journal_top3_enrichi.csv", "historique_cycles.csv", "journal_rendement.csv"):
+        shutil.copy(os.path.join(RACINE, nom), dossier)
+    ancien = os.getcwd()
+    os.chdir(dossier)
+    try:
+        print("=== IMPORT INITIAL ===")
+        store = HistoryStore("data/historique.sqlite")
+        nb = store.synchroniser()
+        print(nb, store.stats())
+        assert nb > 0 and store.stats()["soldes"] > 0
+        assert store.synchroniser() == 0, "un second import ne doit rien réinsérer"
+
+        print("=== IMPORT INCRÉMENTAL ===")
+        with open("historique_rendements.csv", "a", encoding="utf-8") as f:
+            f.write("2030-01-01 10:00:00,modere,uniswap,TEST-POOL,1000.0,12.0,50.0,20000\n")
+        assert store.synchroniser() == 1
+        obs = store.observations(pool="uniswap | TEST-POOL")
+        assert len(obs) == 1 and obs[0]["apr"] == 12.0 and obs[0]["profil"] == "modere"
+
+        print("=== REQUÊTES ===")
+        assert store.observations(debut="2030-01-01", fin="2030-01-02") == obs
+        jours = store.gains_par_jour(debut="2025-06-17", fin="2025-06-18")
+        print(jours)
+        assert list(jours) == ["2025-06-17"]
+        agregats = store.agregats_pools()
+        assert agregats["uniswap | TEST-POOL"]["count"] == 1
+        assert agregats["uniswap | TEST-POOL"]["total_gain"] == 20000
+        assert historique.calculer_bonus(agregats, "uniswap | TEST-POOL") == 0.15
+
+        print("=== CLÉS ET SOURCE DE GAIN ===")
+        assert not store.observations(pool="STUSD"), "pool_nom nu rattaché à sa plateforme"
+        top3 = store.observations(pool="spectra-v2 | STUSD", source="journal_top3_enrichi.csv")
+        assert top3 and all(o["plateforme"] == "spectra-v2" for o in top3)
+        cycles = store.observations(pool="spectra-v2 | STUSD", source="historique_cycles.csv")
+        stusd = store.agregats_pools()["spectra-v2 | STUSD"]
+        attendus = [o["gain"] for o in cycles if o["gain"] is not None]
+        assert stusd["count"] == len(attendus) and stusd["total_gain"] == sum(attendus), "une seule source de gain"
+        assert stusd["nb_observations"] == len(store.observations(pool="spectra-v2 | STUSD"))
+
+        print("=== BONUS DU SCORING ===")
+        pools = [{"plateforme": "uniswap", "nom": "TEST-POOL", "apr": 10.0, "tvl_usd": 100.0}]
+        profil = {"historique_max_bonus": 0.15, "historique_max_malus": -0.10}
+        score = calculer_scores(pools, {"apr": 0.5, "tvl": 0.5}, None, profil)[0]["score"]
+        print("score", score)
+        assert score == round(55.0 * 1.15, 2)
+        sans_historique = calculer_scores([dict(p) for p in pools], {"apr": 0.5, "tvl": 0.5}, {}, profil)[0]["score"]
+        assert sans_historique == 55.0, "un {} explicite reste « aucun historique »"
+        synchronisations = []
+        synchroniser = HistoryStore.synchroniser
+        HistoryStore.synchroniser = lambda self, *a: synchronisations.append(1) or synchroniser(self, *a)
+        try:
+            for _ in range(5):
+                calculer_scores([dict(p) for p in pools], {"apr": 0.5, "tvl": 0.5}, None, profil)
+            assert len(synchronisations) == 0, "historique mis en cache pour la passe de scoring"
+            history_store.invalider_historique_en_cache()
+            historique_pools_en_cache()
+            assert len(synchronisations) == 1
+        finally:
+            HistoryStore.synchroniser = synchroniser
+        assert historique_pools_depuis_store("absente.sqlite") == {}
+        assert not os.path.exists("absente.sqlite")
+
+        print("=== FICHIER REMPLACÉ ===")
+        os.remove("journal_rendement.csv")
+        with open("journal_rendement.csv", "w", encoding="utf-8") as f:
+            f.write("date,gain_simule,solde_avant,solde_apres\n2031-01-01 00:00:00,5,100,105\n")
+        store.synchroniser()
+        assert [s["gain"] for s in store.soldes(source="journal_rendement.csv")] == [5.0]
+        store.fermer()
+    finally:
+        os.chdir(ancien)
+        shutil.rmtree(dossier, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import tempfile
+from datetime import date
+
+import simulateur_csv
+from core import simulation
+from core.journal_index import index_journal, vider_index
+from core.utils import ligne_deja_presente
+
+
+def main() -> None:
+    dossier = tempfile.mkdtemp()
+    ancien = os.getcwd()
+    os.chdir(dossier)
+    try:
+        vider_index()
+        print("=== simulateur_csv ===")
+        pool = {"id": "pool-1", "symbol": "USDC-WETH", "dex": "sushiswap"}
+        assert not simulateur_csv.deja_journalise_aujourdhui("pool-1")
+        simulateur_csv.journaliser_resultats(pool, 1.234)
+        assert simulateur_csv.deja_journalise_aujourdhui("pool-1")
+        assert not simulateur_csv.deja_journalise_aujourdhui("pool-2")
+        simulateur_csv.journaliser_resultats({**pool, "id": "pool-2"}, 2.0)
+        assert simulateur_csv.deja_journalise_aujourdhui("pool-2")
+        with open(simulateur_csv.FICHIER_CSV, encoding="utf-8") as f:
+            lignes = f.read().splitlines()
+        print(lignes)
+        assert lignes[0] == "date,pool_id,nom,plateforme,gain_usdc" and len(lignes) == 3
+
+        print("=== core.simulation.swap_lp_existe ===")
+        aujourd_hui = date.today()
+        assert not simulation.swap_lp_existe(aujourd_hui, "USDC-WETH")
+        simulation.enregistrer_swap_lp(aujourd_hui, "USDC-WETH", 10.0, 0.01)
+        assert simulation.swap_lp_existe(aujourd_hui, "USDC-WETH")
+        assert not simulation.swap_lp_existe(aujourd_hui, "USDC-DAI")
+        assert simulation.lire_swaps_lp(aujourd_hui) == [("USDC-WETH", 10.0, 0.01)]
+
+        print("=== core.utils.ligne_deja_presente (lecture incrémentale) ===")
+        chemin = "journal.csv"
+        with open(chemin, "w", encoding="utf-8") as f:
+            f.write("2024-01-01,a\n2024-01-02,b\n")
+        assert ligne_deja_presente(chemin, "2024-01-02")
+        with open(chemin, "a", encoding="utf-8") as f:
+            f.write("2024-01-03,c\n2024-01-04")  # dernière ligne incomplète
+        assert ligne_deja_presente(chemin, "2024-01-03")
+        assert not ligne_deja_presente(chemin, "2024-01-04")
+        with open(chemin, "a", encoding="utf-8") as f:
+            f.write(",d\n")
+        assert ligne_deja_presente(chemin, "2024-01-04")
+
+        print("=== fichier réécrit → reconstruction ===")
+        with open(chemin, "w", encoding="utf-8") as f:
+            f.write("2025-01-01,z\n")
+        assert not ligne_deja_presente(chemin, "2024-01-01")
+        assert ligne_deja_presente(chemin, "2025-01-01")
+        os.remove(chemin)
+        assert not ligne_deja_presente(chemin, "2025-01-01")
+
+        print("=== coût : seules les queues sont relues ===")
+        index = index_journal("gros.csv", lambda ligne: ligne[0])
+        with open("gros.csv", "w", encoding="utf-8") as f:
+            f.writelines(f"{i},x\n" for i in range(20_000))
+        assert index.contient("19999")
+        for i in range(20_000, 20_100):
+            with open("gros.csv", "a", encoding="utf-8") as f:
+                f.write(f"{i},x\n")
+            assert index.contient(str(i))
+        print("clés", len(index), "reconstructions", index.nb_reconstructions)
+        assert len(index) == 20_100 and index.nb_reconstructions == 1
+    finally:
+        os.chdir(ancien)
+        vider_index()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import archive_logs
+from core.journal_rotation import (
+    GestionnaireRotation,
+    dossier_archives,
+    lire_derniers,
+    lire_intervalle,
+    lire_manifeste,
+)
+from core.sync_guard import safe_read_jsonl
+
+DEPART = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def _iso(minutes: int) -> str:
+    return (DEPART + timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z")
+
+
+def _ajouter(chemin: Path, debut: int, fin: int) -> None:
+    with chemin.open("a", encoding="utf-8") as f:
+        for i in range(debut, fin):
+            f.write(json.dumps({"timestamp": _iso(i), "n": i, "pad": "x" * 200}) + "\n")
+
+
+def main() -> None:
+    dossier = Path(tempfile.mkdtemp())
+    journal = dossier / "journal_signaux.jsonl"
+
+    print("=== ROTATION PAR TAILLE ===")
+    gestionnaire = GestionnaireRotation(taille_max_mo=0.04, par_jour=False, compression="gzip", retention_jours=None)
+    for bloc in range(5):
+        _ajouter(journal, bloc * 200, (bloc + 1) * 200)
+        assert gestionnaire.faire_tourner(journal) is not None, "≈52 Ko ajoutés à chaque bloc"
+    _ajouter(journal, 1000, 1050)
+    assert gestionnaire.faire_tourner(journal) is None
+    segments = lire_manifeste(journal)
+    print([(s.fichier, s.nb) for s in segments])
+    assert [s.nb for s in segments] == [200] * 5
+    assert all(s.fichier.endswith(".jsonl.gz") for s in segments)
+    assert segments[0].debut == DEPART.timestamp() and segments[-1].fin == (DEPART + timedelta(minutes=999)).timestamp()
+    assert sum(s.taille for s in segments) < 5 * 200 * 200 / 5, "segments compressés"
+
+    print("=== DERNIERS N À TRAVERS LES SEGMENTS ===")
+    assert [o["n"] for o in lire_derniers(journal, 10)] == list(range(1040, 1050))
+    assert [o["n"] for o in lire_derniers(journal, 300)] == list(range(750, 1050))
+    assert [o["n"] for o in safe_read_jsonl(journal, max_lines=120)] == list(range(930, 1050)), "lecteurs existants"
+    assert len(lire_derniers(journal, 5000)) == 1050
+
+    print("=== INTERVALLE ===")
+    entre = [o["n"] for o in lire_intervalle(journal, _iso(390), _iso(410))]
+    assert entre == list(range(390, 411))
+    assert [o["n"] for o in lire_intervalle(journal, _iso(1045))] == list(range(1045, 1050))
+    assert [o["n"] for o in lire_intervalle(journal, DEPART.timestamp() + 60, DEPART.timestamp() + 120)] == [1, 2]
+
+    t0 = time.perf_counter()
+    for _ in range(200):
+        lire_derniers(journal, 20)
+    print(f"lire_derniers(20) : {(time.perf_counter() - t0) / 200 * 1e6:.0f} µs")
+
+    print("=== ROTATION PAR JOUR ===")
+    quotidien = dossier / "journal_control.jsonl"
+    _ajouter(quotidien, 0, 3)
+    par_jour = GestionnaireRotation(taille_max_mo=100, compression="aucune", retention_jours=None)
+    assert not par_jour.doit_tourner(quotidien, maintenant=DEPART.timestamp() + 3600)
+    segment = par_jour.faire_tourner(quotidien, maintenant=(DEPART + timedelta(days=1)).timestamp())
+    assert segment is not None and segment.nb == 3 and not quotidien.exists()
+    _ajouter(quotidien, 3, 4)
+    assert [o["n"] for o in lire_derniers(quotidien, 10)] == [0, 1, 2, 3]
+
+    print("=== RÉTENTION ===")
+    retention = GestionnaireRotation(
+        taille_max_mo=0.04, par_jour=False, compression="gzip", retention_jours=30, max_segments=3
+    )
+    _ajouter(journal, 1050, 1250)
+    retention.faire_tourner(journal, maintenant=(DEPART + timedelta(days=10)).timestamp())
+    restants = lire_manifeste(journal)
+    assert len(restants) == 3 and restants[-1].nb == 250
+    fichiers = sorted(p.name for p in dossier_archives(journal).iterdir() if p.name != "manifest.json")
+    assert fichiers == sorted(s.fichier for s in restants), "segments purgés supprimés du disque"
+    assert retention.faire_tourner(journal, forcer=True) is None, "fichier actif vide"
+    assert retention.appliquer_retention(journal, maintenant=(DEPART + timedelta(days=90)).timestamp()) == 3
+    assert lire_manifeste(journal) == [], "rien de plus récent que 30 jours"
+
+    print("=== CONFIGURATION ===")
+    cfg = {"logs": {"rotation": {"taille_max_mo": 5, "compression": "gzip", "max_segments": 10}}}
+    depuis_cfg = GestionnaireRotation.depuis_config(cfg)
+    assert depuis_cfg.taille_max == 5 * 1024 * 1024 and depuis_cfg.max_segments == 10
+    assert GestionnaireRotation.depuis_config(None).compression in ("zstd", "gzip")
+
+    print("=== ARCHIVE ZIP (archive_logs) ===")
+    ancien = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        _ajouter(Path("journal_control.jsonl"), 0, 10)
+        Path("historique_cycles.csv").write_text("date,gain\n", encoding="utf-8")
+        archive_logs.main()
+        with zipfile.ZipFile(archive_logs.nom_archive) as zf:
+            noms = zf.namelist()
+            segment = next(n for n in noms if n.startswith("archives_journaux/journal_control/") and n.endswith((".zst", ".gz")))
+            assert zf.getinfo(segment).compress_type == zipfile.ZIP_STORED, "segment déjà compressé"
+        assert "archives_journaux/journal_control/manifest.json" in noms and "historique_cycles.csv" in noms
+    finally:
+        os.chdir(ancien)
+
+    print("✅ Rotation des journaux OK")
+
+
+if __name__ == "__main__":
+    main()
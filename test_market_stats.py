@@ -0,0 +1,50 @@
+import math
+
+from core.market_signals import MarketParams, MarketStats, compute_market_stats, detect_market_context
+from core.pool_table import PoolTable
+from tools.bench_market_signals import bench_detect_market_context, pools_synthetiques, statistiques_multi_passes
+
+NB_POOLS = 100_000
+
+
+def _proches(a: dict, b: dict) -> bool:
+    return a.keys() == b.keys() and all(math.isclose(a[k], b[k], rel_tol=1e-12, abs_tol=1e-15) for k in a)
+
+
+def main() -> None:
+    print("=== CAS LIMITES ===")
+    assert compute_market_stats([]) == MarketStats()
+    vide = detect_market_context([], MarketParams())
+    assert vide.metrics == {"apr_mean": 0.0, "volume_sum": 0, "tvl_sum": 0, "volatility_cv": 0.0, "apr_trend_avg": 0.0}
+    seul = compute_market_stats([{"apr": 0.1, "apr_24h": 2, "apr_7d": 0}, {"apr": "0.3", "tvl": -5, "volume_24h": None}])
+    assert seul.apr_count == 1 and seul.apr_stdev == 0.0 and seul.trend_count == 0 and seul.tvl_sum == 0
+    # grandes valeurs proches : la formule naïve Σx² − n·m² perd toute précision
+    decales = [{"apr": 1e9 + x} for x in (4.0, 7.0, 13.0, 16.0)]
+    assert math.isclose(compute_market_stats(decales).apr_stdev, math.sqrt(30.0), rel_tol=1e-9)
+
+    print("=== ÉQUIVALENCE AVEC L'ANCIEN CALCUL ===")
+    pools = pools_synthetiques(NB_POOLS)
+    reference = statistiques_multi_passes(pools)
+    params = MarketParams(volatility_weight=0.2, apr_trend_weight=0.1)
+    decision = detect_market_context(pools, params)
+    for cle in ("apr_mean", "volume_sum", "tvl_sum", "apr_trend_avg"):
+        assert decision.metrics[cle] == reference[cle], f"{cle} : même ordre de sommation"
+    assert _proches(decision.metrics, reference)
+
+    table = PoolTable.depuis_dicts(pools)
+    par_table = detect_market_context(table, params)
+    assert par_table.context == decision.context and math.isclose(par_table.score, decision.score, rel_tol=1e-12)
+    assert _proches(par_table.metrics, decision.metrics)
+
+    print(f"=== BENCHMARK ({NB_POOLS} pools) ===")
+    resultats = bench_detect_market_context(NB_POOLS, repetitions=3)
+    for nom, duree in resultats.items():
+        print(f"{nom:<16} {duree * 1e3:8.1f} ms")
+    assert resultats["une_passe_s"] < resultats["multi_passes_s"]
+    assert resultats["pool_table_s"] * 5 < resultats["une_passe_s"]
+
+    print("✅ Noyau statistique de marché OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from core import state_manager
+from core.market_signals import (
+    MARKET_CONTEXT_STATE_KEY,
+    MarketContextTracker,
+    MarketDecision,
+    MarketParams,
+    detect_market_context,
+)
+
+POOLS_FORTES = [
+    {"apr": 0.18, "volume_24h": 2_500_000, "tvl": 25_000_000, "tvl_usd": 25_000_000, "plateforme": "a", "nom": "X"},
+    {"apr": 0.12, "volume_24h": 1_200_000, "tvl": 12_000_000, "tvl_usd": 12_000_000, "plateforme": "b", "nom": "Y"},
+]
+POOLS_FAIBLES = [{"apr": 0.01, "volume_24h": 50_000, "tvl": 800_000, "tvl_usd": 800_000, "plateforme": "c", "nom": "Z"}]
+
+
+def _brute(score: float) -> MarketDecision:
+    return MarketDecision(context="?", score=score, metrics={"apr_mean": score})
+
+
+def main() -> None:
+    print("=== EWMA ===")
+    tracker = MarketContextTracker(MarketParams(smoothing_factor=0.3, context_hysteresis=0.0))
+    assert tracker.observe(_brute(0.5)).score == 0.5, "première observation reprise telle quelle"
+    assert tracker.observe(_brute(0.5)).context == "neutre"
+    pic = tracker.observe(_brute(0.9))
+    assert abs(pic.score - 0.62) < 1e-12 and pic.context == "neutre", "un pic isolé ne bascule pas le contexte"
+    assert abs(pic.metrics["apr_mean"] - 0.62) < 1e-12 and pic.last_context == "neutre"
+    assert tracker.raw_score == 0.9 and tracker.updates == 3
+
+    print("=== HYSTÉRÉSIS ===")
+    sans_lissage = MarketContextTracker(MarketParams(smoothing_factor=1.0, context_hysteresis=0.02))
+    contextes = [sans_lissage.observe(_brute(s)).context for s in (0.66, 0.64, 0.631, 0.62, 0.64, 0.65, 0.34, 0.36, 0.38)]
+    assert contextes == [
+        "favorable", "favorable", "favorable", "neutre", "neutre", "favorable", "defavorable", "defavorable", "neutre",
+    ], contextes
+
+    print("=== SNAPSHOTS DE POOLS ===")
+    params = MarketParams()
+    suivi = MarketContextTracker(params)
+    premiere = suivi.update(POOLS_FORTES)
+    assert premiere == detect_market_context(POOLS_FORTES, params)
+    for _ in range(2):
+        decision = suivi.update(POOLS_FAIBLES)
+    assert decision.context == "defavorable" and decision.last_context == "neutre"
+    assert 0.0 < decision.metrics["tvl_sum"] < premiere.metrics["tvl_sum"]
+
+    print("=== PERSISTANCE (core.state_manager) ===")
+    dossier = Path(tempfile.mkdtemp())
+    chemin = dossier / "defipilot.state"
+    state_manager.load_state(chemin)
+    suivi.save(chemin)
+    state_manager.save_state(chemin)
+    state_manager.load_state(chemin)
+    relu = MarketContextTracker.load(params, chemin)
+    assert relu.to_dict() == suivi.to_dict() and relu.context == "defavorable"
+    assert json.loads(chemin.read_text())[MARKET_CONTEXT_STATE_KEY]["updates"] == 3
+    assert MarketContextTracker(params, {"score": "x", "context": "inconnu", "metrics": [1]}).to_dict()["score"] is None
+
+    print("=== DAEMON ===")
+    import journal_daemon
+
+    ancien = os.getcwd()
+    os.chdir(dossier)
+    try:
+        etat = {"balances": {}, "metadata": {}}
+        for pools in (POOLS_FORTES, POOLS_FAIBLES):
+            assert journal_daemon.executer_iteration(etat, pools, {}, signaux_consolides=[]) is not None
+        persiste = etat[MARKET_CONTEXT_STATE_KEY]
+        assert persiste["updates"] == 2 and persiste["context"] == "neutre"
+        assert persiste == MarketContextTracker(params, persiste).to_dict()
+        journal = [json.loads(l) for l in Path("journal_signaux.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert [e["context"] for e in journal] == ["favorable", "neutre"]
+        assert journal[-1]["last_context"] == "favorable"
+    finally:
+        os.chdir(ancien)
+
+    print("✅ Suivi du contexte de marché OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from control.risk_signals import calculer_signaux_risque
+from core.history_store import HistoryStore
+import journal_daemon
+from core.monte_carlo import (
+    SEUILS_DEFAUT,
+    TAILLE_LOT,
+    HistoriqueMarche,
+    allocation_par_pool,
+    charger_historique_marche,
+    evaluer_risque_portefeuille,
+    facteurs_quotidiens,
+    seuils_monte_carlo,
+    simuler_risque,
+    tirer_scenarios,
+)
+from core.risk_analysis import analyser_risque_v5_5
+from core.simulateur_vectoriel import simuler_portefeuilles, simuler_trajectoires
+
+
+class _Decision:
+    mode_v5_5 = "NORMAL"
+
+
+class _Horloge:
+    """Horloge simulée : avance de ``pas_s`` à chaque lecture."""
+
+    def __init__(self, pas_s: float) -> None:
+        self.pas_s = pas_s
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        self.t += self.pas_s
+        return self.t
+
+
+def _historique(jours: int = 120, seed: int = 3) -> HistoriqueMarche:
+    rng = np.random.default_rng(seed)
+    apr = np.column_stack([
+        rng.uniform(4, 6, jours),  # stable
+        rng.uniform(20, 60, jours),  # volatile
+    ])
+    rendements = np.column_stack([rng.normal(0, 0.001, jours), rng.normal(-0.002, 0.05, jours)])
+    tvl = 1_000_000 * np.exp(np.cumsum(rendements, axis=0))
+    return HistoriqueMarche(pools=["stable", "volatile"], jours=[f"j{i}" for i in range(jours)], apr=apr, tvl=tvl)
+
+
+def main() -> None:
+    print("=== CHARGEMENT DEPUIS LE STORE ===")
+    dossier = tempfile.mkdtemp()
+    csv = os.path.join(dossier, "historique_rendements.csv")
+    with open(csv, "w", encoding="utf-8") as f:
+        f.write("date,profil,plateforme,nom_pool,tvl_usd,apr,score,gain_simule\n")
+        for jour in range(1, 11):
+            f.write(f"2030-01-{jour:02d} 10:00:00,modere,uniswap,A,{1000 * jour},10.0,1.0,0\n")
+            if jour % 2:
+                f.write(f"2030-01-{jour:02d} 10:00:00,modere,curve,B,5000,{3.0 + jour},1.0,0\n")
+    store = HistoryStore(os.path.join(dossier, "historique.sqlite"))
+    store.importer_csv(csv)
+    hist = charger_historique_marche(store)
+    print(hist.pools, len(hist.jours))
+    assert hist.pools == ["curve | B", "uniswap | A"] and len(hist.jours) == 10
+    assert hist.apr[1, 0] == hist.apr[0, 0] == 4.0, "jour manquant complété par la veille"
+    assert hist.tvl[-1, 1] == 10_000
+
+    print("=== SIMULATEUR VECTORIEL : COHÉRENCE ===")
+    apr = np.array([[10.0, 30.0]] * 20)
+    facteurs = facteurs_quotidiens({"apr": apr[None], "tvl": np.zeros((1, 20, 2)), "prix": None})
+    trajectoire = simuler_trajectoires(facteurs, [0.25, 0.75], 1000)
+    reference = simuler_portefeuilles(apr, [[0.25, 0.75]], 20, 1000)
+    assert np.allclose(trajectoire[0], reference.valeurs[0])
+
+    print("=== SCÉNARIOS ===")
+    hist = _historique()
+    rng = np.random.default_rng(0)
+    for methode in ("bootstrap", "gbm"):
+        scen = tirer_scenarios(hist, 50, 30, rng, methode=methode)
+        assert scen["apr"].shape == scen["tvl"].shape == (50, 30, 2)
+        assert (scen["apr"] > 0).all()
+
+    print("=== REPRODUCTIBILITÉ ET RISQUE RELATIF ===")
+    options = dict(horizon_jours=30, nb_trajectoires=4000, seed=42, taille_lot=500, budget_s=None)
+    prudent = simuler_risque(hist, {"stable": 10_000}, max_workers=0, **options)
+    risque = simuler_risque(hist, {"volatile": 8_000, "stable": 2_000}, max_workers=0, **options)
+    print({k: round(v, 3) for k, v in risque.items() if k.startswith(("var", "cvar", "drawdown"))})
+    assert prudent["nb_trajectoires"] == 4000 and not prudent["budget_atteint"]
+    assert risque["var_95_pct"] > prudent["var_95_pct"]
+    assert risque["cvar_95_pct"] >= risque["var_95_pct"]
+    assert risque["cvar_99_pct"] >= risque["var_99_pct"] >= risque["var_95_pct"]
+    assert risque["drawdown_p99_pct"] >= risque["drawdown_p95_pct"] >= risque["drawdown_p50_pct"] >= 0
+    relance = simuler_risque(hist, {"volatile": 8_000, "stable": 2_000}, max_workers=0, **options)
+    assert relance["var_99_pct"] == risque["var_99_pct"] and relance["drawdown_p95_pct"] == risque["drawdown_p95_pct"]
+
+    print("=== POOL DE PROCESSUS : MÊMES RÉSULTATS ===")
+    parallele = simuler_risque(
+        hist, {"volatile": 8_000, "stable": 2_000}, max_workers=2, seuil_parallele=0, **options
+    )
+    assert parallele["workers"] == 2
+    assert parallele["var_99_pct"] == risque["var_99_pct"] and parallele["cvar_95_pct"] == risque["cvar_95_pct"]
+
+    print("=== BUDGET DE TEMPS ===")
+    horloge = _Horloge(pas_s=0.1)
+    borne = simuler_risque(
+        hist, {"volatile": 10_000}, horizon_jours=30, nb_trajectoires=2_000_000, seed=1, budget_s=0.3, max_workers=0,
+        horloge=horloge,
+    )
+    print(borne["nb_trajectoires"], f"{borne['duree_s']:.2f}s (horloge simulée)")
+    # Échéance à 0,4 s, départ à 0,2 s : le budget est atteint au 2e lot.
+    assert borne["budget_atteint"] and borne["nb_trajectoires"] == 2 * TAILLE_LOT
+    assert abs(borne["duree_s"] - 0.3) < 1e-9
+
+    print("=== SANS BUDGET ===")
+    rapide = simuler_risque(hist, {"volatile": 5_000, "stable": 5_000}, nb_trajectoires=10_000, seed=5,
+                            budget_s=None, max_workers=0)
+    print(f"10000 trajectoires × 30 jours en {rapide['duree_s']:.3f}s")
+    assert rapide["nb_trajectoires"] == 10_000 and not rapide["budget_atteint"]
+
+    print("=== POOL SANS HISTORIQUE ===")
+    cash = simuler_risque(hist, {"inconnue": 1000}, nb_trajectoires=100, seed=0, max_workers=0)
+    assert cash["pools_sans_historique"] == ["inconnue"] and abs(cash["var_99_pct"]) < 1e-9
+
+    print("=== COUCHE DE RISQUE ===")
+    signaux = calculer_signaux_risque({"nb_evenements": 3, "monte_carlo": risque})
+    print(signaux[0]["niveau"], signaux[0]["motifs"])
+    assert "monte_carlo" in signaux[0]["details"]
+    assert calculer_signaux_risque({"nb_evenements": 3, "monte_carlo": prudent})[0]["niveau"] == "OK"
+    eleve = {"var_95_pct": 12.0, "cvar_99_pct": 30.0, "drawdown_p95_pct": 10.0}
+    assert calculer_signaux_risque({"nb_evenements": 3, "monte_carlo": eleve})[0]["motifs"] == ["VAR_ELEVEE", "CVAR_EXTREME"]
+
+    base = analyser_risque_v5_5(_Decision(), None)
+    assert "monte_carlo" not in base and base["risk_level"] == "LOW"
+    durci = analyser_risque_v5_5(_Decision(), None, monte_carlo=eleve)
+    assert durci["risk_level"] == "MEDIUM" and not durci["allow_new_positions"] and durci["allow_exit"]
+    tolerant = analyser_risque_v5_5(
+        _Decision(), {"safety": {"monte_carlo": {"var_max_pct": 50, "cvar_max_pct": 50}}}, monte_carlo=eleve
+    )
+    assert tolerant["risk_level"] == "LOW" and tolerant["allow_new_positions"]
+    assert seuils_monte_carlo(None) == SEUILS_DEFAUT
+    cfg_strict = {"safety": {"monte_carlo": {"drawdown_max_pct": 5}}}
+    assert seuils_monte_carlo(cfg_strict)["drawdown_max_pct"] == 5.0
+    assert calculer_signaux_risque({"nb_evenements": 3, "monte_carlo": eleve}, cfg_strict)[0]["motifs"] == [
+        "VAR_ELEVEE", "CVAR_EXTREME", "DRAWDOWN_SEVERE"
+    ], "mêmes seuils de config pour les signaux et l'analyse"
+    assert analyser_risque_v5_5(_Decision(), {"safety": {"monte_carlo": {"var_max_pct": 50, "cvar_max_pct": 50,
+                                                                          "drawdown_max_pct": 5}}},
+                                monte_carlo=eleve)["risk_level"] == "MEDIUM"
+
+    print("=== PASSE DE RISQUE DU DAEMON ===")
+    positions = [
+        {"plateforme": "uniswap", "nom": "A", "montant_investi_usd": 600},
+        {"pool": "curve | B", "montant_investi_usd": "400"},
+        {"nom": "sans-montant"},
+    ]
+    allocation = allocation_par_pool(positions)
+    assert allocation == {"uniswap | A": 600.0, "curve | B": 400.0}
+    cfg = {"safety": {"monte_carlo": {"nb_trajectoires": 500, "horizon_jours": 5, "seed": 1, "budget_s": 1.0}}}
+    rapport = evaluer_risque_portefeuille(allocation, cfg, store=store, maintenant=1000.0)
+    assert rapport["nb_trajectoires"] == 500 and rapport["seuils"] == SEUILS_DEFAUT and not rapport["budget_atteint"]
+    assert evaluer_risque_portefeuille(allocation, cfg, precedent=rapport, store=store, maintenant=2000.0) == rapport
+    recalcule = evaluer_risque_portefeuille(allocation, cfg, precedent=rapport, store=store, maintenant=5000.0)
+    assert recalcule["calcule_le"] == 5000.0, "recalcul une fois l'intervalle écoulé"
+    assert evaluer_risque_portefeuille({}, cfg, store=store) is None
+    assert evaluer_risque_portefeuille(allocation, {"safety": {"monte_carlo": {"actif": False}}}, store=store) is None
+
+    etat = {"positions": positions, "monte_carlo": dict(rapport, calcule_le=time.time())}
+    analyse = journal_daemon._passe_risque(etat, _Decision(), cfg)
+    assert etat["analyse_risque"] is analyse and analyse["monte_carlo"]["nb_trajectoires"] == 500
+    assert journal_daemon._passe_risque({"positions": []}, _Decision(), cfg)["risk_level"] == "LOW"
+
+    print("✅ Monte Carlo OK")
+
+
+if __name__ == "__main__":
+    main()
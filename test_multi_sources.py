@@ -0,0 +1,194 @@
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from core.defi_sources.multi_sources import (
+    CollecteurPools,
+    Disjoncteur,
+    SourceGraphQL,
+    SourcePools,
+    SourceReserves,
+    SourceRest,
+)
+from core.execution.fake_chain import FakeChain
+from core.strategy_engine import StrategyEngine
+
+LATENCE = 0.3
+ETAG = '"v1"'
+LLAMA = {
+    "status": "success",
+    "data": [
+        {"pool": "llama-1", "project": "uniswap-v2", "chain": "Polygon", "symbol": "WETH-USDC", "tvlUsd": 2e6, "apy": 12.0},
+        {"pool": "llama-2", "project": "curve", "chain": "Polygon", "symbol": "DAI-USDC-USDT", "tvlUsd": 9e6, "apy": 3.5},
+    ],
+}
+SUBGRAPH = {
+    "data": {
+        "pools": [
+            # même pool que llama-1 (symboles inversés) : fusionnée
+            {"id": "0xsub1", "token0": {"symbol": "USDC"}, "token1": {"symbol": "WETH"},
+             "totalValueLockedUSD": "2100000", "volumeUSD": "1000000", "feeTier": "3000"},
+            {"id": "0xsub2", "token0": {"symbol": "WMATIC"}, "token1": {"symbol": "USDC"},
+             "totalValueLockedUSD": "500000", "feesUSD": "100"},
+        ]
+    }
+}
+
+
+class _Serveur(BaseHTTPRequestHandler):
+    compteurs = {"corps": 0, "304": 0, "lent": 0}
+
+    def _repondre(self, corps: dict, entetes: dict | None = None) -> None:
+        donnees = json.dumps(corps).encode()
+        self.send_response(200)
+        for cle, valeur in (entetes or {}).items():
+            self.send_header(cle, valeur)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(donnees)))
+        self.end_headers()
+        self.wfile.write(donnees)
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/lent":
+            self.compteurs["lent"] += 1
+            time.sleep(2.0)
+            try:
+                return self._repondre(LLAMA)
+            except (BrokenPipeError, ConnectionResetError):  # client parti après son timeout
+                return None
+        time.sleep(LATENCE)
+        if self.headers.get("If-None-Match") == ETAG:
+            self.compteurs["304"] += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.compteurs["corps"] += 1
+        self._repondre(LLAMA, {"ETag": ETAG, "Last-Modified": "Tue, 01 Jan 2030 00:00:00 GMT"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        requete = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert "pools" in requete["query"]
+        time.sleep(LATENCE)
+        self._repondre(SUBGRAPH)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _SourceBloquee(SourcePools):
+    """Appel qui ne rend pas la main avant ``liberer`` (timeout dépassé)."""
+
+    def __init__(self) -> None:
+        super().__init__("bloquee", timeout_s=0.1, disjoncteur=Disjoncteur(10, 60))
+        self.liberer = threading.Event()
+        self.nb_debuts = 0
+
+    def _recuperer(self, etat):
+        self.nb_debuts += 1
+        self.liberer.wait(10)
+        return [], None, None
+
+
+def main() -> None:
+    serveur = ThreadingHTTPServer(("127.0.0.1", 0), _Serveur)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{serveur.server_port}"
+
+    chaine = FakeChain(latence_rpc_s=LATENCE)
+    weth, usdc = chaine.deployer_token("WETH"), chaine.deployer_token("USDC", 6)
+    paire = chaine.creer_paire(weth, usdc, 500 * 10**18, 1_000_000 * 10**6)
+    t0_adresse, _ = sorted((weth.lower(), usdc.lower()))
+    rpc = chaine.demarrer_serveur_http()
+    weth_d_abord = t0_adresse == weth.lower()
+    paires = [{
+        "adresse": paire, "plateforme": "quickswap", "chaine": "Polygon", "symboles": "WETH-USDC",
+        "decimales0": 18 if weth_d_abord else 6, "decimales1": 6 if weth_d_abord else 18,
+        "prix0_usd": 2000.0 if weth_d_abord else 1.0, "prix1_usd": 1.0 if weth_d_abord else 2000.0, "apr": 20.0,
+    }]
+
+    try:
+        rest = SourceRest("defillama", f"{base}/yields", ttl_s=0.2)
+        graphql = SourceGraphQL(
+            "subgraph", f"{base}/graphql", "{ pools { id token0 { symbol } token1 { symbol } } }",
+            plateforme="uniswap-v2", chaine="Polygon",
+        )
+        reserves = SourceReserves("onchain", rpc, paires)
+        collecteur = CollecteurPools([rest, graphql, reserves])
+
+        print("=== COLLECTE CONCURRENTE ===")
+        t0 = time.perf_counter()
+        candidats = collecteur.list_pools()
+        duree = time.perf_counter() - t0
+        print(f"{len(candidats)} candidats en {duree:.2f}s", collecteur.rapport())
+        assert duree < 2 * LATENCE, "durée ≈ source la plus lente, pas la somme"
+        par_id = {c.pool_id: c for c in candidats}
+        assert set(par_id) == {"llama-1", "llama-2", "0xsub2", paire.lower()}
+        fusion = par_id["llama-1"]
+        assert fusion.metadata["sources"] == ["defillama", "subgraph"] and fusion.apr == 12.0
+        assert abs(par_id["0xsub2"].apr - 100 * 365 / 500_000 * 100) < 1e-9
+        onchain = par_id[paire.lower()]
+        assert onchain.platform == "quickswap" and abs(onchain.tvl - 2_000_000) < 1e-6
+
+        print("=== CACHE TTL ET REQUÊTES CONDITIONNELLES ===")
+        appels = [source.nb_appels for source in (rest, graphql, reserves)]
+        collecteur.list_pools()
+        assert [source.nb_appels for source in (rest, graphql, reserves)] == appels, "servi par le cache, sans appel"
+        assert rest.etat.dernier_statut == "cache" and _Serveur.compteurs == {"corps": 1, "304": 0, "lent": 0}
+        time.sleep(0.25)
+        assert len(collecteur.list_pools()) == 4
+        assert rest.etat.dernier_statut == "inchange" and _Serveur.compteurs == {"corps": 1, "304": 1, "lent": 0}
+
+        print("=== TIMEOUT ET DISJONCTEUR ===")
+        lent = SourceRest("lente", f"{base}/lent", timeout_s=0.2, disjoncteur=Disjoncteur(2, 60))
+        avec_lente = CollecteurPools([lent, reserves])
+        assert [c.pool_id for c in asyncio.run(avec_lente.collecter(forcer=True))] == [paire.lower()]
+        assert lent.etat.dernier_statut == "timeout"
+        asyncio.run(avec_lente.collecter(forcer=True))
+        assert lent.disjoncteur.etat == "ouvert"
+        asyncio.run(avec_lente.collecter(forcer=True))
+        assert lent.etat.dernier_statut == "disjoncte" and lent.nb_appels == 2
+        lent.disjoncteur.delai_reouverture_s = 0
+        assert lent.disjoncteur.etat == "semi-ouvert" and lent.disjoncteur.autorise()
+
+        print("=== APPEL BLOQUÉ : WORKER DÉDIÉ ===")
+        bloquee = _SourceBloquee()
+        avec_bloquee = CollecteurPools([bloquee, reserves])
+        for statut in ("timeout", "en_cours", "en_cours"):
+            assert [c.pool_id for c in asyncio.run(avec_bloquee.collecter(forcer=True))] == [paire.lower()]
+            assert bloquee.etat.dernier_statut == statut
+        workers = [t for t in threading.enumerate() if t.name.startswith("pool-source-bloquee")]
+        assert len(workers) == 1 and bloquee.nb_debuts == 1, "pas de second appel empilé derrière l'appel bloqué"
+        bloquee.liberer.set()
+        bloquee._en_cours.result(timeout=5)
+        asyncio.run(avec_bloquee.collecter(forcer=True))
+        assert bloquee.etat.dernier_statut == "ok" and bloquee.nb_debuts == 2
+        avec_bloquee.fermer()
+
+        print("=== STRATEGYENGINE ===")
+        cfg = Path(tempfile.mkdtemp()) / "strategy.json"
+        cfg.write_text(json.dumps({
+            "profile_default": "prudent",
+            "pool_sources": [
+                {"type": "rest", "nom": "defillama", "url": f"{base}/yields"},
+                {"type": "reserves", "rpc_url": rpc, "paires": paires, "seuil_echecs": 1},
+            ],
+        }))
+        moteur = StrategyEngine(cfg)
+        assert isinstance(moteur.pool_source, CollecteurPools)
+        assert len(moteur.pool_source.list_pools()) == 3
+        collecteur.fermer()
+        avec_lente.fermer()
+        moteur.pool_source.fermer()
+    finally:
+        serveur.shutdown()
+        chaine.arreter_serveur_http()
+
+    print("✅ Collecte multi-sources OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import csv
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from core.backtest import Backtest, charger_snapshots
+from core.param_sweep import DatasetPartage, aleatoire, appliquer_params, balayer, charger_dataset, ecrire_tableau, grille
+from tests.donnees_backtest import CFG, donnees_synthetiques
+
+
+def main() -> None:
+    print("=== ESPACES ===")
+    espace = {
+        "market_params.favorable_threshold": [0.6, 0.7],
+        "rebalancing.max_shift_ratio": [0.1, 0.3],
+        "exposure_table.modere.neutre": [0.5, 1.0],
+        "backtest.frais_bps": [0, 20],
+    }
+    essais = grille(espace)
+    assert len(essais) == 16
+    tirages = aleatoire({"rebalancing.min_rebal_usd": {"min": 10, "max": 100}, "backtest.profil": ["prudent", "risque"]}, 5, seed=1)
+    assert tirages == aleatoire({"rebalancing.min_rebal_usd": {"min": 10, "max": 100}, "backtest.profil": ["prudent", "risque"]}, 5, seed=1)
+    cfg, options = appliquer_params(CFG, essais[-1])
+    assert cfg["market_params"]["favorable_threshold"] == 0.7 and cfg["market_params"]["apr_normalizer"] == 30.0
+    assert cfg["rebalancing"] == {"max_shift_ratio": 0.3} and options == {"frais_bps": 20}
+    assert cfg["exposure_table"] == {"modere": {"neutre": 1.0}}
+    assert "rebalancing" not in CFG, "la config de base ne doit pas être modifiée"
+
+    with tempfile.TemporaryDirectory() as dossier:
+        bruts, signaux = donnees_synthetiques(jours=20)
+        chemin = os.path.join(dossier, "s.jsonl")
+        with open(chemin, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(s) + "\n" for s in bruts)
+        snapshots = charger_snapshots(chemin)
+        signaux[0]["extra"] = {"imbrique": [1, None]}
+
+        print("=== DATASET PROJETÉ EN MÉMOIRE ===")
+        with DatasetPartage(snapshots, signaux, dossier=dossier) as dataset:
+            vues = charger_dataset(dataset.chemin)
+            assert len(vues["snapshots"]) == len(snapshots) and len(vues["signaux"]) == len(signaux)
+            assert all(isinstance(a, np.memmap) for a in (vues["snapshots"]._ts, vues["snapshots"]._bornes))
+            assert list(vues["snapshots"]) == snapshots and vues["snapshots"][-1] == snapshots[-1]
+            assert list(vues["signaux"]) == signaux and vues["signaux"][0]["extra"] == {"imbrique": [1, None]}
+            chemin_dataset = dataset.chemin
+        assert not os.path.exists(chemin_dataset), "répertoire temporaire supprimé"
+
+        print("=== BALAYAGE PARALLÈLE ===")
+        del signaux[0]["extra"]
+        bilan = balayer(snapshots, signaux, essais, CFG, max_workers=2)
+        resultats = bilan["resultats"]
+        print(f"{len(resultats)} essais, {bilan['essais_par_s']:.2f}/s")
+        assert len(resultats) == 16 and all(r["erreur"] is None for r in resultats)
+        assert resultats[0]["pnl_usd"] >= resultats[-1]["pnl_usd"]
+        assert len({r["exposition_moyenne"] for r in resultats}) > 1, "table d'exposition balayée"
+
+        print("=== MÊMES RÉSULTATS QU'UN BACKTEST DIRECT ===")
+        ref = resultats[3]
+        cfg, options = appliquer_params(CFG, {k: ref[k] for k in espace})
+        direct = Backtest(snapshots, signaux, cfg, **options).executer()
+        assert abs(direct["pnl_usd"] - ref["pnl_usd"]) < 1e-9
+        sequentiel = balayer(snapshots, signaux, essais, CFG, max_workers=0)["resultats"]
+        assert [r["pnl_usd"] for r in sequentiel] == [r["pnl_usd"] for r in resultats]
+
+        print("=== ESSAI INVALIDE + TABLEAU ===")
+        bilan = balayer(snapshots, signaux, [{"backtest.inconnu": 1}], CFG, max_workers=0)
+        assert bilan["resultats"][0]["erreur"].startswith("TypeError")
+        sortie = os.path.join(dossier, "resultats.csv")
+        ecrire_tableau(resultats, sortie)
+        with open(sortie, encoding="utf-8") as f:
+            lignes = list(csv.DictReader(f))
+        assert len(lignes) == 16 and "exposure_table.modere.neutre" in lignes[0] and "pnl_usd" in lignes[0]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+
+from core import policy_tables
+from core.engine import strategy_adapter
+from core.market_signals import MarketParams, get_allocation_policy_for_context
+from core.market_signals_adapter import _policy_from_cfg, calculer_contexte_et_policy
+from core.policy_tables import compiler_config, empreinte_config, invalider_cache, tables_pour_config
+from core.scoring import PROFILS, charger_ponderations
+
+CONTEXTES = ("favorable", "neutre", "defavorable")
+POOLS = [
+    {"apr": 0.18, "volume_24h": 2_500_000, "tvl": 25_000_000},
+    {"apr": 0.12, "volume_24h": 1_200_000, "tvl": 12_000_000},
+]
+
+
+def main() -> None:
+    invalider_cache()
+
+    print("=== COMPILATION ===")
+    defaut = compiler_config({})
+    assert defaut.params == MarketParams() and not defaut.policies_config
+    for contexte in CONTEXTES:
+        assert defaut.policy(contexte) == get_allocation_policy_for_context(contexte)
+    try:
+        defaut.policy("inconnu")
+        raise AssertionError("contexte inconnu accepté")
+    except ValueError:
+        pass
+    assert defaut.ponderations_profil("agressif") == PROFILS["agressif"]
+    assert defaut.ponderations_profil("inexistant") == charger_ponderations("inexistant")
+
+    cfg = {
+        "market_params": {"favorable_threshold": 0.7, "champ_inconnu": 1},
+        "ALLOCATION_POLICIES": {
+            "bull": {"risque": 3, "modéré": 1, "prudent": 1, "autre": 9},
+            "neutre": {"risque": 0.5, "modéré": 0.5, "prudent": 0.0},
+            "flat": {"risque": 1.0},
+            "bear": {"risque": 0, "modéré": 0, "prudent": 0},
+        },
+        "PROFILS": {"modere": {"apr": 0.4}, "custom": {"tvl": 0.9}},
+        "autre": "ignoré",
+    }
+    tables = compiler_config(cfg)
+    assert tables.params == MarketParams(favorable_threshold=0.7)
+    assert tables.policy("favorable") == {"risque": 0.6, "modéré": 0.2, "prudent": 0.2}, "alias + normalisation"
+    assert tables.policy("neutre") == {"risque": 0.5, "modéré": 0.5, "prudent": 0.0}, "clé contexte prioritaire"
+    assert tables.policy("defavorable") == get_allocation_policy_for_context("defavorable"), "policy nulle ignorée"
+    assert tables.policies_config == {"favorable", "neutre"}
+    assert _policy_from_cfg("favorable", cfg) == tables.policy("favorable") and _policy_from_cfg("defavorable", cfg) is None
+    assert tables.ponderations_profil("modere")["apr"] == 0.4 and tables.ponderations_profil("modere")["tvl"] == 0.7
+    assert tables.ponderations_profil("custom")["tvl"] == 0.9 and PROFILS["modere"]["apr"] == 0.3
+
+    print("=== TABLES FIGÉES ===")
+    copie = tables.policy("favorable")
+    copie["risque"] = 1.0
+    assert tables.policy("favorable")["risque"] == 0.6
+    for cible in (tables.policies, tables.policies["favorable"], tables.ponderations["modere"]):
+        try:
+            cible["x"] = 1  # type: ignore[index]
+            raise AssertionError("table modifiable")
+        except TypeError:
+            pass
+
+    print("=== CACHE ET INVALIDATION ===")
+    assert tables_pour_config(cfg) is tables_pour_config(dict(cfg)), "même version, mêmes tables"
+    premier = tables_pour_config(cfg)
+    cfg["autre"] = "modifié"
+    assert tables_pour_config(cfg) is premier, "section non compilée : pas d'invalidation"
+    cfg["market_params"]["favorable_threshold"] = 0.8
+    recompile = tables_pour_config(cfg)
+    assert recompile is not premier and recompile.params.favorable_threshold == 0.8
+    assert empreinte_config(cfg) == recompile.version != premier.version
+    for i in range(policy_tables.TAILLE_CACHE + 2):
+        tables_pour_config({"market_params": {"smoothing_factor": i / 100}})
+    assert len(policy_tables._CACHE) == policy_tables.TAILLE_CACHE
+    invalider_cache()
+    assert tables_pour_config(cfg) is not recompile and tables_pour_config(cfg) == recompile
+
+    print("=== ADAPTATEURS ===")
+    ancien = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        decision, policy = calculer_contexte_et_policy(POOLS, cfg)
+        assert decision.context == "favorable" and policy == tables.policy("favorable")
+        resultat = strategy_adapter.calculer_contexte_et_policy(POOLS, {"strategy": cfg})
+        assert resultat["context"] == "favorable" and resultat["policy"] == tables.policy("favorable")
+
+        compilations = []
+        compiler = policy_tables.compiler_config
+        policy_tables.compiler_config = lambda *a, **k: compilations.append(1) or compiler(*a, **k)
+        try:
+            for _ in range(1_000):
+                tables_pour_config(cfg).policy("neutre")
+            calculer_contexte_et_policy(POOLS, cfg)
+            strategy_adapter.calculer_contexte_et_policy(POOLS, {"strategy": cfg})
+            print(f"compilations après 1000 appels : {len(compilations)}")
+            assert compilations == [], "tables servies par le cache, sans recompilation par tick"
+            tables_pour_config({**cfg, "market_params": {**cfg["market_params"], "favorable_threshold": 0.7}})
+            assert len(compilations) == 1
+        finally:
+            policy_tables.compiler_config = compiler
+    finally:
+        os.chdir(ancien)
+
+    print("✅ Tables de politique OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import json
+import math
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from core.historique import HistoriqueCompact
+from core.market_signals import MarketParams, detect_market_context
+from core.pool_table import PoolTable
+from core.rebalancing_intra import generer_actions_pools_depuis_plan
+from core.scoring import calculer_scores, calculer_scores_et_gains, charger_profil_utilisateur
+from core.strategy_context import StrategyContext
+from core.strategy_engine import PoolCandidate, StrategyEngine
+from journal_daemon import _calculer_scoring_pools, charger_pools_stats
+
+NB_POOLS = 20_000
+CATEGORIES = ["stable", "blue_chip", "degen"]
+
+
+def _pool(i: int, rng: random.Random) -> dict:
+    """Pool canonique ; les alias sont appliqués par ``_brut``."""
+    pool = {
+        "pool_id": f"p{i}",
+        "plateforme": f"dex{i % 40}",
+        "nom": f"TOK{i % 900}-USDC",
+        "categorie": CATEGORIES[i % 3],
+        "apr": rng.uniform(0.1, 40),
+        "tvl_usd": rng.uniform(1e4, 1e8),
+        "volume_24h": rng.uniform(0, 1e6),
+        "score": rng.uniform(-1, 10),
+        "montant_usd": rng.uniform(0, 500),
+    }
+    if i % 4:
+        pool["apr_24h"] = rng.uniform(0, 40)
+        pool["apr_7d"] = rng.uniform(0, 40) if i % 7 else 0.0
+    return pool
+
+
+def _brut(pool: dict, i: int) -> dict:
+    """Même pool avec les clés hétérogènes rencontrées dans le code."""
+    brut = dict(pool)
+    if i % 3 == 0:
+        brut["apy"] = brut.pop("apr")
+    if i % 3 == 1:
+        brut["tvlUsd"] = brut.pop("tvl_usd")
+    elif i % 3 == 2:
+        brut["tvl"] = brut.pop("tvl_usd")
+    if i % 2:
+        brut["symbol"] = brut.pop("nom")
+    return brut
+
+
+def main() -> None:
+    rng = random.Random(3)
+    pools = [_pool(i, rng) for i in range(NB_POOLS)]
+
+    print("=== NORMALISATION ===")
+    table = PoolTable.depuis_dicts(_brut(p, i) for i, p in enumerate(pools))
+    assert len(table) == NB_POOLS
+    ligne = table[1]
+    assert ligne.tvl_usd == pools[1]["tvl_usd"] and ligne["tvl"] == ligne["tvlUsd"] == pools[1]["tvl_usd"]
+    assert ligne.nom == pools[1]["nom"] and ligne.get("symbol") == pools[1]["nom"]
+    assert table[0].apr == pools[0]["apr"] and "apr_24h" not in table[0] and table[0].get("apr_24h", 0) == 0
+    assert table[-1].pool_id == f"p{NB_POOLS - 1}" and not hasattr(ligne, "__dict__")
+    assert table.en_dicts()[5] == pools[5]
+    mixte = PoolTable.depuis_dicts([{"apr": "12.5", "tvl": None, "tvl_usd": 3}, {"apr": True}])
+    assert mixte.colonne("apr")[0] == 12.5 and mixte[0]["tvl"] == 3 and mixte[1].get("apr") is None
+
+    print("=== MÉMOIRE PAR POOL ===")
+    tracemalloc.start()
+    dicts = [_pool(i, rng) for i in range(NB_POOLS)]
+    taille_dicts = tracemalloc.get_traced_memory()[0]
+    del dicts
+    tracemalloc.stop()
+    tracemalloc.start()
+    colonnes = PoolTable.depuis_dicts(_pool(i, rng) for i in range(NB_POOLS))
+    taille_table = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"dicts {taille_dicts / NB_POOLS:.0f} o/pool, PoolTable {taille_table / NB_POOLS:.0f} o/pool")
+    assert taille_table < taille_dicts / 2 and len(colonnes) == NB_POOLS
+
+    print("=== SIGNAUX DE MARCHÉ ===")
+    reference = [dict(p, tvl=p["tvl_usd"]) for p in pools]
+    params = MarketParams(volatility_weight=0.2, apr_trend_weight=0.1)
+    t0 = time.perf_counter()
+    par_dict = detect_market_context(reference, params)
+    t1 = time.perf_counter()
+    par_table = detect_market_context(table, params)
+    t2 = time.perf_counter()
+    print(f"dicts {(t1 - t0) * 1e3:.1f} ms, table {(t2 - t1) * 1e3:.1f} ms")
+    assert par_table.context == par_dict.context and par_dict.metrics["apr_trend_avg"] != 0
+    assert all(math.isclose(par_table.metrics[k], v, rel_tol=1e-12) for k, v in par_dict.metrics.items()), "réductions NumPy"
+
+    print("=== SCORING ===")
+    profil = charger_profil_utilisateur()
+    historique_dict = {f"dex{i} | TOK{i}-USDC": {"count": 2, "total_gain": (i - 10) * 2000.0} for i in range(30)}
+    for historique in (historique_dict, HistoriqueCompact.depuis_dict(historique_dict)):
+        copies = [dict(p) for p in pools]
+        t0 = time.perf_counter()
+        calculer_scores(copies, profil["ponderations"], historique, profil)
+        t1 = time.perf_counter()
+        calculer_scores(table, profil["ponderations"], historique, profil)
+        t2 = time.perf_counter()
+        print(f"{type(historique).__name__} : dicts {(t1 - t0) * 1e3:.1f} ms, table {(t2 - t1) * 1e3:.1f} ms")
+        assert table.colonne("score").tolist() == [p["score"] for p in copies]
+        assert calculer_scores_et_gains(table, profil, 1000, historique) == calculer_scores_et_gains(copies, profil, 1000, historique)
+
+    print("=== DAEMON : CHARGEMENT ET SCORING EN COLONNES ===")
+    with tempfile.TemporaryDirectory() as dossier:
+        fichier = Path(dossier) / "pools.json"
+        fichier.write_text(json.dumps({"pools": [_brut(p, i) for i, p in enumerate(pools[:500])]}), encoding="utf-8")
+        chargee = charger_pools_stats(fichier)
+    assert isinstance(chargee, PoolTable) and chargee.en_dicts() == pools[:500]
+    scoring_table = _calculer_scoring_pools(chargee, "modere", 1000, historique_dict)
+    copies = [dict(p) for p in pools[:500]]
+    scoring_dicts = _calculer_scoring_pools(copies, "modere", 1000, historique_dict)
+    assert scoring_table == scoring_dicts and chargee.colonne("score").tolist() == [p["score"] for p in copies]
+
+    print("=== RÉÉQUILIBRAGE INTRA-CATÉGORIE ===")
+    plan = {"actions": [
+        {"action": "augmenter", "categorie": "stable", "montant_usd": 1000},
+        {"action": "reduire", "categorie": "degen", "montant_usd": 50_000},
+        {"action": "reduire", "categorie": "blue_chip", "montant_usd": 10},
+    ]}
+    nuls = PoolTable.depuis_dicts([dict(p, score=0.0) for p in pools[:6]])
+    assert generer_actions_pools_depuis_plan(table, plan) == generer_actions_pools_depuis_plan(table.en_dicts(), plan)
+    assert generer_actions_pools_depuis_plan(nuls, plan) == generer_actions_pools_depuis_plan(nuls.en_dicts(), plan)
+
+    print("=== SÉLECTION DES CANDIDATS ===")
+    moteur = StrategyEngine(config_path="strategy_config.json", dry_run=True)
+    moteur.cfg["allocations"]["max_concurrent"] = 5
+    candidats = [
+        PoolCandidate(p["pool_id"], p["plateforme"], "Polygon", p["nom"], tvl=p["tvl_usd"] if i % 50 else 0.0, apr=round(p["apr"]))
+        for i, p in enumerate(pools)
+    ]
+    sans_score = PoolTable.depuis_candidats(candidats)
+    contextes = [
+        StrategyContext("2030-01-01T00:00:00Z", label, 0.5, 0.8, "", {}, 3)
+        for label in ("favorable", "neutre", "defavorable")
+    ]
+    for contexte in (None, *contextes):
+        assert moteur.select_candidates(sans_score, contexte) == moteur.select_candidates(candidats, contexte)
+    for i, candidat in enumerate(candidats[:500]):
+        candidat.score = float(i % 7) if i % 3 else None
+    avec_score = PoolTable.depuis_candidats(candidats)
+    assert moteur.select_candidates(avec_score) == moteur.select_candidates(candidats)
+    assert moteur.select_candidates(PoolTable()) == []
+
+    print("✅ Table de pools OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+from time import monotonic
+
+from web3 import Web3
+
+import core.swap_reel as swap_reel
+from core.execution.liquidity_dryrun import ajouter_liquidite_dryrun
+from core.gas_oracle import FeeSnapshot, obtenir_oracle
+from core.quote_service import USDC_POLYGON, WMATIC_POLYGON, QuoteService, chemins_candidats
+from core.swap_reel import SUSHISWAP_V2_ROUTER
+
+WETH = Web3.to_checksum_address("0x7ceb23fd6bc0add59e62ac25578270cff1b9f619")
+DAI = Web3.to_checksum_address("0x8f3cf7ad23cd3cadbd9735aff958023239c6a063")
+
+
+class _ServiceHorsLigne(QuoteService):
+    """Remplace l'aller-retour Multicall3 par une table de sorties fixes."""
+
+    def __init__(self, w3, sorties):
+        super().__init__(w3, SUSHISWAP_V2_ROUTER)
+        self.sorties = sorties
+        self.lots = []
+
+    def _appel_groupe(self, requetes):
+        self.lots.append(list(requetes))
+        return [self.sorties.get(tuple(a.lower() for a in path)) for _, path in requetes], 1000
+
+
+def main() -> None:
+    print("=== ROUTES CANDIDATES ===")
+    chemins = chemins_candidats(DAI, WETH, (WMATIC_POLYGON, USDC_POLYGON))
+    print(len(chemins), "routes")
+    assert len(chemins) == 3
+
+    w3 = Web3()
+    oracle = obtenir_oracle(w3, ttl_s=3600)
+    oracle._snapshot = FeeSnapshot(
+        base_fee_wei=100 * 10**9,
+        priority_fees_wei={10.0: 30 * 10**9, 50.0: 30 * 10**9, 90.0: 30 * 10**9},
+        gas_price_wei=130 * 10**9,
+        horodatage=monotonic(),
+    )
+    cle = lambda *p: tuple(a.lower() for a in p)  # noqa: E731
+    service = _ServiceHorsLigne(
+        w3,
+        {
+            cle(DAI, WETH): 400_000 * 10**9,
+            cle(DAI, WMATIC_POLYGON, WETH): 400_300 * 10**9,  # meilleure sortie brute
+            cle(DAI, USDC_POLYGON, WETH): 399_000 * 10**9,
+            cle(WMATIC_POLYGON, WETH): 3 * 10**14,  # 1 WMATIC = 0.0003 WETH
+        },
+    )
+
+    print("=== MEILLEURE ROUTE NETTE DE GAS ===")
+    quote = service.coter(DAI, WETH, 10**18)
+    for c in quote.candidates:
+        print(len(c.path), c.amount_out, c.cout_gas_out, c.amount_out_net)
+    # La route via WMATIC rapporte plus en brut mais coûte un saut de gas de plus
+    assert len(quote.meilleure.path) == 2
+    assert len(service.lots) == 1 and len(service.lots[0]) == 4, "un seul aller-retour attendu"
+
+    print("=== CACHE ===")
+    service.coter(DAI, WETH, 10**18)
+    assert len(service.lots) == 1, "cotation identique servie par le cache"
+
+    print("=== DRY-RUN LIQUIDITE ===")
+    pool = {
+        "platform": "sushiswap",
+        "chain": "polygon",
+        "tokenA_symbol": "DAI",
+        "tokenB_symbol": "WETH",
+        "tokenA_address": DAI,
+        "tokenB_address": WETH,
+        "decimalsA": 18,
+        "decimalsB": 18,
+    }
+    res = ajouter_liquidite_dryrun(pool, 100.0, 1.0, quote_service=service)
+    print(res["prix_cote_B_par_A"], res["ratio_contraint"], res["amountB_effectif"])
+    assert res["ratio_contraint"] == "A" and abs(res["prix_cote_B_par_A"] - 0.0004) < 1e-12
+
+    print("=== DEUX SWAPS, DEUX MODES DE GAS, UN ENDPOINT ===")
+    w3_swap = Web3()
+    obtenir_oracle(w3_swap, ttl_s=3600)._snapshot = FeeSnapshot(
+        base_fee_wei=10 * 10**9,
+        priority_fees_wei={10.0: 1 * 10**9, 50.0: 10 * 10**9, 90.0: 100 * 10**9},
+        gas_price_wei=20 * 10**9,
+        horodatage=monotonic(),
+    )
+    lots = []
+
+    def _appel_groupe(self, requetes):
+        lots.append(list(requetes))
+        return [service.sorties.get(tuple(a.lower() for a in path)) for _, path in requetes], 1000
+
+    patchs = {
+        "_get_web3": lambda: w3_swap,
+        "get_wallet_address": lambda: "0x" + "12" * 20,
+        "get_private_key": lambda: "0x" + "11" * 32,
+        "log_swap_event": lambda *a, **k: None,
+    }
+    origines = {nom: getattr(swap_reel, nom) for nom in patchs}
+    appel_origine = QuoteService._appel_groupe
+    for nom, valeur in patchs.items():
+        setattr(swap_reel, nom, valeur)
+    QuoteService._appel_groupe = _appel_groupe
+    try:
+        # 11 gwei : le saut via WMATIC (+300 gwei de WETH brut) couvre son gas ; 110 gwei : non
+        lent = swap_reel.effectuer_swap_reel("sushiswap_v2", DAI, WETH, 10**18, gas_mode="slow", dry_run=True)
+        urgent = swap_reel.effectuer_swap_reel("sushiswap_v2", DAI, WETH, 10**18, gas_mode="urgent", dry_run=True)
+    finally:
+        for nom, valeur in origines.items():
+            setattr(swap_reel, nom, valeur)
+        QuoteService._appel_groupe = appel_origine
+    print(len(lent["path"]), len(urgent["path"]))
+    assert len(lent["path"]) == 3 and len(urgent["path"]) == 2, "route classée avec le gas du mode de chaque swap"
+    assert len(lots) == 1, "service et cache de sorties brutes partagés entre les modes"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import logging
+import random
+
+import numpy as np
+
+from core.scoring_adjuster import (
+    LOGGER,
+    ScoreDetails,
+    ajuster_score_pool,
+    ajuster_scores_batch,
+    calculer_coefficients,
+)
+
+NB_POOLS = 20_000
+SIGNAUX = [
+    {"timestamp": "2030-01-01T00:00:00Z", "ai_score": 0.8, "metrics": {"APR": 12.0, "tvl": 5_000, "volatility": 0.3}},
+    {"timestamp": "2030-01-01T00:01:00Z", "ai_score": 0.5, "metrics": {"apr_pct": 2000, "liquidity": 2e8}},
+    {"timestamp": "2030-01-01T00:02:00Z", "context_label": "neutre"},
+]
+
+
+class _Compteur(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.nb = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.nb += 1
+
+
+def main() -> None:
+    rng = random.Random(8)
+    scores = [rng.uniform(-2, 50) for _ in range(NB_POOLS)]
+    pools = [{"id": f"p{i}"} for i in range(NB_POOLS)]
+
+    print("=== COEFFICIENTS ===")
+    coefficients = calculer_coefficients(SIGNAUX, "Favorable ")
+    assert coefficients.coeff_contexte == 1.08 and coefficients.coeff_ai == 1.04
+    assert abs(coefficients.ai_score_moyen - 0.65) < 1e-12
+    assert coefficients.drapeaux_risque == ("tvl_faible", "apr_eleve")
+    assert calculer_coefficients([], "inconnu").coeff_ai == 1.0
+
+    print("=== ÉQUIVALENCE AVEC L'AJUSTEMENT PAR POOL ===")
+    par_pool = [ajuster_score_pool(p, s, SIGNAUX, "bear") for p, s in zip(pools, scores)]
+    lot = ajuster_scores_batch(scores, SIGNAUX, "bear")
+    assert isinstance(lot, np.ndarray) and lot.tolist() == par_pool
+    assert min(par_pool) == 0.0, "scores négatifs ramenés à 0"
+    assert ajuster_scores_batch([], SIGNAUX, "bear").size == 0
+    assert np.isnan(ajuster_scores_batch([float("nan")], SIGNAUX, "bear")[0])
+
+    finaux, details = ajuster_scores_batch(scores[:3], coefficients=coefficients, retourner_details=True)
+    for pool, initial, final, detail in zip(pools, scores, finaux.tolist(), details):
+        assert isinstance(detail, ScoreDetails)
+        assert ajuster_score_pool(pool, initial, SIGNAUX, "Favorable ", retourner_details=True) == (final, detail)
+    details[0].drapeaux_risque.append("x")
+    assert details[1].drapeaux_risque == ["tvl_faible", "apr_eleve"]
+
+    print("=== JOURNALISATION ===")
+    compteur = _Compteur()
+    LOGGER.addHandler(compteur)
+    niveau = LOGGER.level
+    LOGGER.setLevel(logging.DEBUG)
+    try:
+        ajuster_scores_batch(scores[:500], SIGNAUX, "neutre")
+        assert compteur.nb == 3, "logs de coefficients une fois par tick, pas par pool"
+    finally:
+        LOGGER.removeHandler(compteur)
+        LOGGER.setLevel(niveau)
+
+    print("✅ Ajustement des scores par lot OK")
+
+
+if __name__ == "__main__":
+    main()
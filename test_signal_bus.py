@@ -0,0 +1,138 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from core import exchange_format
+from core.exchange_format import build_payload, read_last_exchange, validate_exchange_payload, write_exchange_payload
+from core.signal_bus import (
+    ClientBus,
+    JsonlSink,
+    ServeurBus,
+    SignalBus,
+    activer_bus,
+    ajouter_jsonl,
+    bus_actif,
+    desactiver_bus,
+    dernier_jsonl,
+)
+from core.supervisor import SUJET_SIGNAUX, SuiveurJsonl
+
+CLIENT = """
+import sys
+from core.signal_bus import ClientBus
+client = ClientBus(sys.argv[1])
+client.publier("ordres", {"de": "client", "n": 7})
+print(client.dernier("prix")["usd"])
+client.fermer()
+"""
+
+
+def _lignes(chemin: Path) -> list:
+    if not chemin.exists():
+        return []
+    return [json.loads(l) for l in chemin.read_text(encoding="utf-8").splitlines() if l.strip()]
+
+
+def _attendre(condition, timeout: float = 2.0) -> bool:
+    fin = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > fin:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def main() -> None:
+    dossier = Path(tempfile.mkdtemp())
+
+    print("=== TAMPON CIRCULAIRE ===")
+    bus = SignalBus(capacite=10)
+    for n in range(25):
+        bus.publier("prix", {"n": n})
+    assert [m["n"] for m in bus.derniers("prix")] == list(range(15, 25))
+    assert [m["n"] for m in bus.derniers("prix", 3)] == [22, 23, 24]
+    assert bus.sequence("prix") == 25 and bus.derniers("inconnu") == []
+
+    print("=== ÉCRITURE SANS BUS ACTIF ===")
+    assert bus_actif() is None
+    journal = dossier / "logs" / "journal.jsonl"
+    ajouter_jsonl(journal, {"n": 1})
+    assert _lignes(journal) == [{"n": 1}] and dernier_jsonl(journal) is None
+
+    print("=== ÉCRITURE VIA LE BUS ACTIF ===")
+    sink = JsonlSink()
+    bus = SignalBus(sink, journaux={"exchange": dossier / "exchange_bus.jsonl"})
+    assert activer_bus(bus) is None
+    try:
+        ajouter_jsonl(journal, {"n": 2})
+        assert dernier_jsonl(journal) == {"n": 2}, "lisible en mémoire avant l'écriture disque"
+
+        payload = build_payload(source="test", version="V6.1.0", context="favorable")
+        write_exchange_payload(dossier / "exchange_bus.jsonl", payload)
+        assert bus.dernier("exchange") is not None
+        assert read_last_exchange(dossier / "exchange_bus.jsonl")["context"] == "favorable"
+
+        lectures_disque = []
+        lire_fichier = exchange_format.safe_read_jsonl
+        exchange_format.safe_read_jsonl = lambda *a, **k: lectures_disque.append(1) or lire_fichier(*a, **k)
+        try:
+            for _ in range(1_000):
+                read_last_exchange(dossier / "exchange_bus.jsonl")
+        finally:
+            exchange_format.safe_read_jsonl = lire_fichier
+        assert lectures_disque == [], "read_last_exchange servi par le bus, sans lecture du fichier"
+
+        sink.vider()
+        assert _lignes(journal) == [{"n": 1}, {"n": 2}]
+        ecrit = _lignes(dossier / "exchange_bus.jsonl")
+        assert len(ecrit) == 1 and validate_exchange_payload(ecrit[0])[0]
+
+        print("=== SUIVEUR : LIGNES DU PROCESSUS IGNORÉES ===")
+        suiveur = SuiveurJsonl(journal, ignorer=lambda ligne: sink.consommer_ecrit(journal, ligne))
+        with journal.open("a", encoding="utf-8") as f:
+            f.write(json.dumps({"n": 3}) + "\n")
+        assert suiveur.lire_nouveaux() == [{"n": 1}, {"n": 3}]
+    finally:
+        desactiver_bus(bus)
+        sink.fermer()
+    assert bus_actif() is None
+    assert read_last_exchange(dossier / "exchange_bus.jsonl")["context"] == "favorable", "relu depuis le fichier"
+
+    print("=== TRANSPORT SOCKET UNIX ===")
+    bus = SignalBus()
+    chemin_socket = os.path.join(tempfile.mkdtemp(), "bus.sock")
+    serveur = ServeurBus(bus, chemin_socket).demarrer()
+    try:
+        client = ClientBus(chemin_socket)
+        recus = []
+        client.abonner(SUJET_SIGNAUX, lambda sujet, msg: recus.append(msg))
+        assert client.derniers(SUJET_SIGNAUX) == []  # aller-retour : l'abonnement est enregistré
+        t0 = time.perf_counter()
+        bus.publier(SUJET_SIGNAUX, {"context": "neutre"})
+        assert _attendre(lambda: recus)
+        print(f"publication → abonné distant en {(time.perf_counter() - t0) * 1000:.2f} ms")
+        assert recus == [{"context": "neutre"}]
+
+        bus.publier("prix", {"usd": 1850.5})
+        sortie = subprocess.run(
+            [sys.executable, "-c", CLIENT, chemin_socket],
+            capture_output=True, text=True, timeout=30, cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        assert sortie.returncode == 0, sortie.stderr
+        assert sortie.stdout.strip() == "1850.5"
+        assert _attendre(lambda: bus.dernier("ordres") is not None)
+        assert bus.dernier("ordres") == {"de": "client", "n": 7}
+        client.fermer()
+    finally:
+        serveur.arreter()
+    assert not os.path.exists(chemin_socket)
+
+    print("✅ Bus de signaux OK")
+
+
+if __name__ == "__main__":
+    main()
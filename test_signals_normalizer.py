@@ -0,0 +1,141 @@
+import math
+import os
+import random
+import tempfile
+from pathlib import Path
+
+from control.control_pilot import SignalConsolide, consolider_signaux, consolider_signaux_indexes
+from core.signals_normalizer import NormaliseurSignaux, normaliser_signaux, signal_en_dict
+from core.supervisor import SUJET_SIGNAUX_CONSOLIDES, Superviseur
+
+NB_SIGNAUX = 5_000
+POOLS = [{"id": "p1", "plateforme": "curve", "nom": "3POOL", "apr": 4.0, "tvl_usd": 9_000_000, "categorie": "Prudent"}]
+
+LABELS = {
+    "favorable": {"favorable", "bull", "bullish", "positif"},
+    "neutre": {"neutre", "neutral", "flat"},
+    "defavorable": {"defavorable", "défavorable", "unfavorable", "bear", "bearish", "negatif", "négatif"},
+}
+PRIORITAIRES = ("APR", "apr", "APY", "apy", "TVL", "tvl", "tvl_usd", "volatilite", "volatility", "volume", "fees", "liquidity", "utilization")
+
+
+def _reference(signal):
+    """Normalisation V5.1.0 d'un signal (une suite d'appels d'aide par champ)."""
+    if not isinstance(signal, dict):
+        return None
+
+    def _float(v):
+        if v is None or isinstance(v, bool):
+            return None
+        try:
+            r = float(v) if isinstance(v, (int, float)) else float(str(v).strip().lower())
+        except ValueError:
+            return None
+        return r if math.isfinite(r) else None
+
+    timestamp = next((str(signal[c]).strip() for c in ("timestamp", "ts") if signal.get(c) is not None and str(signal[c]).strip()), None)
+    label = None
+    for c in ("AI_context", "context", "contexte"):
+        texte = str(signal[c]).strip().lower() if signal.get(c) is not None else ""
+        label = next((k for k, v in LABELS.items() if texte in v), None)
+        if label:
+            break
+    score = next((s for s in (_float(signal.get(c)) for c in ("AI_confidence", "context_score")) if s is not None), None)
+    metrics = {c: signal[c] for c in PRIORITAIRES if c in signal and signal[c] is not None}
+    for c, v in signal.items():
+        if c not in metrics and not isinstance(v, bool) and (isinstance(v, int) or (isinstance(v, float) and math.isfinite(v))):
+            metrics[c] = v
+    if timestamp is None and label is None and not metrics and score is None:
+        return None
+    norm = {}
+    if timestamp:
+        norm["timestamp"] = timestamp
+    if label:
+        norm["context_label"] = label
+    if score is not None:
+        norm["ai_score"] = score
+    if metrics:
+        norm["metrics"] = metrics
+    return norm
+
+
+def _brut(i: int, rng: random.Random):
+    forme = i % 5
+    if forme == 0:
+        return SignalConsolide(timestamp=f"2030-01-01T00:00:{i % 60:02d}Z", context=rng.choice(["bull", "Neutre ", "x"]),
+                               apr_mean=rng.random(), AI_confidence=rng.choice([None, 0.7]))
+    if forme == 1:
+        return {"ts": rng.choice([" ", 1_700_000_000 + i, None]), "AI_context": rng.choice(["BEARISH", None]),
+                "contexte": "favorable", "context_score": rng.choice(["0.4", "nan", True]), "apy": None, "tvl": 1e6}
+    if forme == 2:
+        return {"volume": "12", "fees": rng.random(), "extra": float("inf"), "n": i, "flag": False}
+    if forme == 3:
+        return {"message": "vide"} if i % 2 else {}
+    return ["pas", "un", "dict"]
+
+
+def main() -> None:
+    rng = random.Random(5)
+    bruts = [_brut(i, rng) for i in range(NB_SIGNAUX)]
+    dicts = [signal_en_dict(b) for b in bruts]
+
+    print("=== ÉQUIVALENCE AVEC LA NORMALISATION V5.1.0 ===")
+    reference = [n for n in map(_reference, dicts) if n is not None]
+    assert normaliser_signaux([d for d in dicts if d is not None]) == reference
+    assert normaliser_signaux([None, 3, {}, {"ts": "  "}]) == []
+    assert signal_en_dict(bruts[0]) == bruts[0].to_dict() and signal_en_dict(bruts[4]) is None
+
+    print("=== NORMALISATION INCRÉMENTALE ===")
+    normaliseur = NormaliseurSignaux(capacite=NB_SIGNAUX)
+    fenetre = list(enumerate(bruts[:50]))
+    assert normaliseur.normaliser(fenetre) == [n for n in map(_reference, dicts[:50]) if n is not None]
+    assert normaliseur.nb_normalises == 50
+    suivante = fenetre[10:] + list(enumerate(bruts[50:60], start=50))
+    assert normaliseur.normaliser(reversed(suivante)) == [n for n in map(_reference, reversed(dicts[10:60])) if n is not None]
+    assert normaliseur.nb_normalises == 60, "seuls les 10 nouveaux offsets sont normalisés"
+    petit = NormaliseurSignaux(capacite=20)
+    petit.normaliser(fenetre)
+    assert len(petit) == 20
+    petit.normaliser(fenetre[-20:])
+    assert petit.nb_normalises == 50, "les offsets récents restent en cache"
+
+    print("=== CONSOLIDATION INDEXÉE ===")
+    evenements = [{"timestamp": f"2030-01-01T00:00:{s:02d}Z", "context": "neutre"} for s in (5, 1, 5, 9)]
+    indexes = consolider_signaux_indexes(zip("abcd", evenements), limit=3)
+    assert [cle for cle, _ in indexes] == ["d", "a", "c"]
+    assert [s for _, s in indexes] == consolider_signaux(evenements, limit=3)
+
+    print(f"=== BOUCLE DE 50 SIGNAUX ({NB_SIGNAUX} arrivées) ===")
+    flux = list(enumerate(bruts))
+    incremental = NormaliseurSignaux(capacite=250)
+    nb_fenetres = 0
+    for fin in range(50, NB_SIGNAUX, 10):
+        fenetre = flux[fin - 50:fin]
+        assert incremental.normaliser(fenetre) == normaliser_signaux([signal_en_dict(s) for _, s in fenetre])
+        nb_fenetres += 1
+    print(f"complète {nb_fenetres * 50} normalisations, incrémentale {incremental.nb_normalises}")
+    assert incremental.nb_normalises == NB_SIGNAUX - 10, "chaque signal n'est normalisé qu'une fois"
+
+    print("=== SUPERVISEUR ===")
+    ancien = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        superviseur = Superviseur(POOLS, journaux_consolides=(Path("absent.jsonl"),), etat={})
+        for i in range(60):
+            superviseur.bus.publier(SUJET_SIGNAUX_CONSOLIDES, {"timestamp": f"2030-01-01T00:{i:02d}:00Z", "context": "neutre"})
+        assert superviseur.iteration_daemon() is not None
+        assert superviseur.normaliseur.nb_normalises == 50
+        for i in range(60, 65):
+            superviseur.bus.publier(SUJET_SIGNAUX_CONSOLIDES, {"timestamp": f"2030-01-01T01:{i - 60:02d}:00Z", "context": "bull"})
+        snapshot = superviseur.iteration_daemon()
+        assert snapshot is not None and snapshot["nb_signaux"] == 50
+        assert superviseur.normaliseur.nb_normalises == 55, "seuls les 5 signaux nouveaux sont normalisés"
+        superviseur.sink.fermer()
+    finally:
+        os.chdir(ancien)
+
+    print("✅ Normalisation des signaux OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import simulation
+from core import simulateur_wallet
+from core.simulateur_logique import simuler_farming_lp_jours, simuler_gain_farming_lp
+from core.simulateur_vectoriel import poids_par_profil, simuler_portefeuilles, simuler_solde
+
+
+def _boucle_reference(apr, poids, jours, capital, reequilibrages=(), frais_bps=0.0):
+    """Simulation jour par jour, pool par pool (comportement historique)."""
+    positions = [capital * w for w in poids]
+    for jour in range(jours):
+        if jour in reequilibrages and jour > 0:
+            total = sum(positions)
+            deplace = sum(abs(total * w - p) for w, p in zip(poids, positions)) / 2
+            total -= deplace * frais_bps / 10_000
+            positions = [total * w for w in poids]
+        positions = [p * (1 + apr[jour][i] / 100 / 365) for i, p in enumerate(positions)]
+    return sum(positions)
+
+
+def main() -> None:
+    rng = np.random.default_rng(7)
+
+    print("=== ÉQUIVALENCE AVEC LA BOUCLE JOUR PAR JOUR ===")
+    jours, pools = 60, 8
+    apr = rng.uniform(1, 80, size=(jours, pools))
+    poids = rng.dirichlet(np.ones(pools), size=3)
+    res = simuler_portefeuilles(apr, poids, jours, [1000, 5000, 250], reequilibrages=[15, 30, 45], frais_bps=25)
+    for k, capital in enumerate([1000, 5000, 250]):
+        attendu = _boucle_reference(apr.tolist(), poids[k].tolist(), jours, capital, {15, 30, 45}, 25)
+        assert abs(res.valeur_finale[k] - attendu) < 1e-6, (res.valeur_finale[k], attendu)
+    assert res.nb_reequilibrages == 3 and (res.frais > 0).all()
+
+    print("=== INTÉRÊTS SIMPLES / FARMING LP ===")
+    simple = simuler_portefeuilles([36.5], [[1.0]], 10, 1000, composer=False)
+    assert abs(simple.gains[0] - 10.0) < 1e-9
+    farming = simuler_portefeuilles([0.0], [[1.0]], 1, 100, farming_apr=[36.5], slippage_lp=0.02, composer=False)
+    assert abs(farming.gains[0] - simuler_gain_farming_lp(100, 36.5)) < 1e-4
+
+    print("=== POIDS PAR PROFIL ===")
+    poids_profils = poids_par_profil([10, 50, 5, 30], [1e6, 1e3, 5e6, 2e6], top_n=2)
+    assert set(poids_profils) == {"prudent", "modere", "equilibre", "dynamique", "agressif"}
+    assert all(abs(p.sum() - 1) < 1e-12 and (p > 0).sum() == 2 for p in poids_profils.values())
+
+    print("=== 365 JOURS × 1000 POOLS × 5 PROFILS ===")
+    apr = rng.lognormal(2.5, 0.8, size=(365, 1000))
+    tvl = rng.lognormal(2.5, 1.0, size=1000)
+    cibles = poids_par_profil(apr.mean(axis=0), tvl, top_n=20)
+    t0 = time.perf_counter()
+    res = simuler_portefeuilles(apr, cibles, 365, 10_000, reequilibrages=range(0, 365, 7), frais_bps=10)
+    duree = time.perf_counter() - t0
+    print(f"{duree * 1000:.1f} ms", {p: round(v["rendement_pct"], 2) for p, v in res.resume().items()})
+    assert res.valeurs.shape == (5, 365) and duree < 2.0
+
+    print("=== DÉLÉGATION DES SIMULATEURS HISTORIQUES ===")
+    pools_jour = [{"apr": 36.5}, {"apr": 7.3}]
+    attendu = sum(500.0 * (1 + p["apr"] / 100 / 365) ** 30 for p in pools_jour)
+    assert abs(simuler_solde(1000.0, pools_jour, 30) - attendu) < 1e-9
+    assert simuler_solde(1000.0, [], 30) == 1000.0
+    assert abs(simuler_farming_lp_jours(100, 36.5, 30) - 30 * simuler_gain_farming_lp(100, 36.5)) < 1e-3
+    repertoire = os.getcwd()
+    with tempfile.TemporaryDirectory() as dossier:
+        os.chdir(dossier)
+        try:
+            for classe in (simulateur_wallet.WalletSimule, simulation.WalletSimule):
+                wallet = classe(1000.0)
+                ecritures = []
+                sauvegarder = wallet._sauvegarder
+                wallet._sauvegarder = lambda: (ecritures.append(1), sauvegarder())
+                avant, gain, apres = wallet.simuler_jours(pools_jour, 30)
+                assert avant == 1000.0 and abs(apres - attendu) < 1e-9 and abs(gain - (attendu - 1000.0)) < 1e-9
+                assert len(ecritures) == 1, "une seule sauvegarde pour 30 jours"
+        finally:
+            os.chdir(repertoire)
+
+    print("=== ÉCRITURE UNIQUE EN FIN DE SIMULATION ===")
+    dossier = tempfile.mkdtemp()
+    chemin = os.path.join(dossier, "simulation.json")
+    res.sauvegarder(chemin, trajectoires=True)
+    with open(chemin, encoding="utf-8") as f:
+        bilan = json.load(f)
+    assert bilan["nb_jours"] == 365 and set(bilan["profils"]) == set(cibles)
+    assert np.load(os.path.splitext(chemin)[0] + ".npz")["valeurs"].shape == (5, 365)
+
+
+if __name__ == "__main__":
+    main()
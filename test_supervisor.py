@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import core.supervisor
+import run_defipilot
+import start_defipilot
+from core.exchange_format import compute_signature
+from core.signal_bus import JsonlSink, SignalBus
+from core.supervisor import SUJET_CONTROL, SUJET_EXCHANGE, SUJET_STRATEGIE, SourceBus, Superviseur
+
+POOLS = [
+    {"id": "p1", "plateforme": "uniswap", "nom": "ETH-USDC", "apr": 12.0, "tvl_usd": 2_000_000, "categorie": "Modere"},
+    {"id": "p2", "plateforme": "curve", "nom": "3POOL", "apr": 4.0, "tvl_usd": 9_000_000, "categorie": "Prudent"},
+]
+
+
+def _signal(i: int, context: str = "neutre") -> dict:
+    return {
+        "timestamp": f"2030-01-01T00:{i:02d}:00Z",
+        "context": context,
+        "metrics_locales": {"apr_mean": 0.1 + i / 1000, "tvl_sum": 1_000_000 + i},
+    }
+
+
+def _ajouter(chemin: Path, evenements) -> None:
+    with chemin.open("a", encoding="utf-8") as f:
+        for ev in evenements:
+            f.write(json.dumps(ev) + "\n")
+
+
+def _lignes(chemin: Path) -> list:
+    if not chemin.exists():
+        return []
+    return [json.loads(l) for l in chemin.read_text(encoding="utf-8").splitlines() if l.strip()]
+
+
+def main() -> None:
+    print("=== BUS EN MÉMOIRE ET PUITS ASYNCHRONE ===")
+    dossier = Path(tempfile.mkdtemp())
+    sink = JsonlSink()
+    bus = SignalBus(sink, journaux={"a": dossier / "a.jsonl"})
+    recus = []
+    desabonner = bus.abonner("a", lambda sujet, msg: recus.append(msg["n"]))
+    for n in range(500):
+        bus.publier("a", {"n": n})
+    bus.publier("b", {"n": -1})
+    assert bus.dernier("a") == {"n": 499} and bus.sequence("a") == 500
+    assert recus == list(range(500))
+    desabonner()
+    bus.publier("a", {"n": 500})
+    assert len(recus) == 500
+    assert bus.attendre("a", apres=501, timeout=0.05) is None
+    sink.vider()
+    assert [m["n"] for m in _lignes(dossier / "a.jsonl")] == list(range(501)), "ordre et exhaustivité du puits"
+    assert not (dossier / "b.jsonl").exists()
+    sink.fermer()
+
+    print("=== SUPERVISEUR SANS GUI ===")
+    ancien = os.getcwd()
+    os.chdir(dossier)
+    try:
+        Path("data/logs").mkdir(parents=True)
+        journal = Path("journal_signaux.jsonl")
+        _ajouter(journal, [_signal(i) for i in range(5)])
+        _ajouter(Path("data/logs/journal_signaux.jsonl"), [_signal(i, "favorable") for i in range(3)])
+
+        superviseur = Superviseur(
+            POOLS,
+            journal_signaux=journal,
+            interval_daemon=0.05,
+            interval_control=60,
+            interval_lecture=0.02,
+            max_loops=3,
+            etat={},
+        )
+        source = SourceBus(superviseur)
+        superviseur.demarrer()
+        assert len(source.lire_signaux()) == 5
+
+        while superviseur.nb_resumes == 0 and superviseur.actif:
+            time.sleep(0.005)  # résumé des signaux déjà présents au démarrage
+
+        t0 = time.perf_counter()
+        vus = superviseur.nb_resumes
+        _ajouter(journal, [_signal(30, "defavorable")])
+        while superviseur.nb_resumes == vus and time.perf_counter() - t0 < 2.0:
+            time.sleep(0.005)
+        delai = time.perf_counter() - t0
+        print(f"nouveau signal → résumé ControlPilot en {delai * 1000:.1f} ms")
+        assert superviseur.nb_resumes > vus and delai < 1.0
+        assert superviseur.bus.dernier(SUJET_CONTROL)["message"] == "Analyse globale sur 6 événements."
+        # le daemon publie ensuite ses propres décisions de contexte (issues des pools)
+        echange_signal = superviseur.bus.dernier(SUJET_EXCHANGE)
+        assert echange_signal["context"] == "defavorable"
+
+        assert superviseur.attendre(timeout=10), "max_loops doit arrêter le superviseur"
+        superviseur.arreter()
+        assert superviseur.nb_iterations == 3
+        snapshot = source.lire_snapshot_strategie()
+        print(snapshot and {k: snapshot.get(k) for k in ("context", "profil", "nb_signaux")})
+        assert snapshot is not None and snapshot["nb_signaux"] == 3
+        assert source.lire_evenements_control()
+
+        print("=== JOURNAUX ÉCRITS PAR LE PUITS ===")
+        control = _lignes(Path("journal_control.jsonl"))
+        echanges = _lignes(Path("exchange_bus.jsonl"))
+        strategie = _lignes(Path("data/logs/journal_strategie.jsonl"))
+        print(len(control), len(echanges), len(strategie))
+        assert control and control[-1] == superviseur.bus.dernier(SUJET_CONTROL)
+        assert len(echanges) == len(control)
+        signe = dict(echanges[-1])
+        assert signe.pop("integrity")["signature"] == compute_signature(signe)
+        assert echange_signal in echanges
+        assert len(strategie) == 3 and strategie[-1] == superviseur.bus.dernier(SUJET_STRATEGIE)
+    finally:
+        os.chdir(ancien)
+
+    print("=== LANCEURS : RÉPERTOIRE DU PROJET ===")
+    racine = Path(start_defipilot.__file__).resolve().parent
+    vus = []
+
+    class _SuperviseurFactice:
+        def __init__(self, *args, **kwargs):
+            vus.append(Path.cwd())
+            self.bus = SignalBus()
+
+        def executer(self, gui=True):
+            return 0
+
+    classe = core.supervisor.Superviseur
+    core.supervisor.Superviseur = _SuperviseurFactice
+    ancien = os.getcwd()
+    os.chdir(tempfile.mkdtemp())
+    try:
+        assert start_defipilot.lancer_superviseur(gui=False) == 0
+        os.chdir(tempfile.mkdtemp())
+        assert run_defipilot.main(["--pools", "data/pools_sample.json", "--max-loops", "1"]) == 0
+    finally:
+        core.supervisor.Superviseur = classe
+        os.chdir(ancien)
+    assert vus == [racine, racine], "chemins relatifs ancrés sur le projet comme avec cwd=base_dir"
+
+    print("✅ Superviseur OK")
+
+
+if __name__ == "__main__":
+    main()
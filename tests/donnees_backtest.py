@@ -0,0 +1,30 @@
+# tests/donnees_backtest.py – V6.1.0
+"""Historique synthétique partagé par test_backtest.py et test_param_sweep.py."""
+
+import math
+from datetime import datetime, timedelta, timezone
+
+CATEGORIES = {"Prudent": 4.0, "Modere": 12.0, "Risque": 30.0}
+CFG = {"market_params": {"apr_normalizer": 30.0, "tvl_normalizer": 1e8, "volume_normalizer": 1e7}}
+
+
+def donnees_synthetiques(jours: int, pas_h: int = 1):
+    """Snapshots bruts ``{"timestamp", "pools"}`` et signaux sur ``jours`` jours."""
+    debut = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    snapshots, signaux = [], []
+    for i in range(jours * 24 // pas_h):
+        t = debut + timedelta(hours=i * pas_h)
+        vague = math.sin(i / 200)
+        pools = [
+            {
+                "plateforme": "dex", "nom": f"{cat}-{k}", "categorie": cat,
+                "apr": apr * (1 + 0.5 * vague) + k, "tvl": 2e6 * (1.5 + vague), "tvl_usd": 2e6,
+                "volume_24h": 4e5 * (1.2 + vague),
+            }
+            for cat, apr in CATEGORIES.items() for k in range(3)
+        ]
+        snapshots.append({"timestamp": t.isoformat().replace("+00:00", "Z"), "pools": pools})
+        if i % 6 == 0:
+            signaux.append({"timestamp": t.isoformat().replace("+00:00", "Z"), "AI_confidence": 0.5 + 0.45 * vague,
+                            "AI_context": "favorable" if vague > 0 else "defavorable"})
+    return snapshots, signaux
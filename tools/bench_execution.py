@@ -0,0 +1,211 @@
+# tools/bench_execution.py – V6.1.0
+"""
+Benchmarks de la couche d'exécution sur la chaîne simulée (aucun réseau).
+
+Mesures :
+- débit brut : transactions signées/diffusées par seconde (provider en processus),
+- appels RPC par opération : swap, ajout de liquidité et harvest, à froid puis
+  à chaud (oracle de gas, cache de gas limit, cache de cotations),
+- latence de bout en bout d'un rééquilibrage par mode d'exécuteur
+  (``sequentiel`` / ``dag``) avec minage par intervalle.
+
+Usage : python -m tools.bench_execution [--txs 500] [--pools 4] [--block-time 0.25]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from eth_account import Account
+from web3 import Web3
+
+from core.execution.batch_executor import MINICHEF_DEPOSIT_ABI, BatchRebalanceExecutor, Web3Backend
+from core.execution.fake_chain import FakeChain
+from core.swap_reel import ERC20_ABI, SUSHISWAP_V2_ROUTER
+
+CLE_PRIVEE = "0x" + "22" * 32
+COMPTE = Account.from_key(CLE_PRIVEE).address
+E6, E18 = 10**6, 10**18
+ROUTER = Web3.to_checksum_address(SUSHISWAP_V2_ROUTER)
+
+
+def _chaine(nb_pools: int, **options: Any) -> Dict[str, Any]:
+    chaine = FakeChain(**options)
+    usdc = chaine.deployer_token("USDC", 6)
+    sushi = chaine.deployer_token("SUSHI", 18)
+    chaine.deployer_router(SUSHISWAP_V2_ROUTER)
+    chef = chaine.deployer_minichef(sushi)
+    pools = []
+    for i in range(nb_pools):
+        token = chaine.deployer_token(f"TK{i}", 18)
+        paire = chaine.creer_paire(usdc, token, 1_000_000 * E6, 500_000 * E18)
+        pools.append({"token": token, "paire": paire, "pid": chaine.ajouter_pool_minichef(chef, paire)})
+    chaine.crediter(usdc, COMPTE, 10_000_000 * E6)
+    chaine.crediter_natif(COMPTE, 10_000 * E18)
+    return {"chaine": chaine, "usdc": usdc, "sushi": sushi, "chef": chef, "pools": pools}
+
+
+def _envoyer(w3: Web3, fonction: Any) -> Any:
+    tx = fonction.build_transaction({"from": COMPTE, "nonce": w3.eth.get_transaction_count(COMPTE, "pending")})
+    return w3.eth.send_raw_transaction(Account.sign_transaction(tx, CLE_PRIVEE).rawTransaction)
+
+
+def bench_debit(nb_txs: int) -> Dict[str, float]:
+    env = _chaine(1)
+    w3 = Web3(env["chaine"].provider())
+    usdc = w3.eth.contract(address=Web3.to_checksum_address(env["usdc"]), abi=ERC20_ABI)
+    data = usdc.encodeABI(fn_name="approve", args=[ROUTER, 1])
+    nonce = w3.eth.get_transaction_count(COMPTE)
+    signees = [
+        Account.sign_transaction(
+            {
+                "to": usdc.address,
+                "data": data,
+                "nonce": nonce + i,
+                "gas": 60_000,
+                "maxFeePerGas": 100 * 10**9,
+                "maxPriorityFeePerGas": 30 * 10**9,
+                "chainId": 137,
+            },
+            CLE_PRIVEE,
+        ).rawTransaction
+        for i in range(nb_txs)
+    ]
+    t0 = time.perf_counter()
+    for brute in signees:
+        w3.eth.send_raw_transaction(brute)
+    duree = time.perf_counter() - t0
+    return {"txs": nb_txs, "duree_s": duree, "tx_par_s": nb_txs / duree if duree else math.inf}
+
+
+def bench_rpc_par_operation() -> Dict[str, Dict[str, int]]:
+    env = _chaine(1)
+    chaine = env["chaine"]
+    pool = env["pools"][0]
+    url = chaine.demarrer_serveur_http()
+    os.environ.update(
+        {"POLYGON_RPC_URL": url, "WALLET_ACTIVE_NAME": "ENV", "WALLET_ADDRESS": COMPTE, "PRIVATE_KEY": CLE_PRIVEE}
+    )
+    from cli.farming_cli import main as farming_main
+    from core.execution.liquidity_real_tx import ajouter_liquidite_reelle
+    from core.swap_reel import effectuer_swap_reel
+
+    w3 = Web3(Web3.HTTPProvider(url))
+    for token in (env["usdc"], pool["token"]):
+        _envoyer(w3, w3.eth.contract(address=Web3.to_checksum_address(token), abi=ERC20_ABI).functions.approve(ROUTER, 2**255))
+
+    def mesurer(operation) -> Dict[str, int]:
+        avant = Counter(chaine.appels)
+        operation()
+        delta = Counter(chaine.appels)
+        delta.subtract(avant)
+        return {m: n for m, n in delta.items() if n}
+
+    pool_lp = {
+        "platform": "sushiswap",
+        "chain": "polygon",
+        "router_address": SUSHISWAP_V2_ROUTER,
+        "tokenA_symbol": "USDC",
+        "tokenB_symbol": "TK0",
+        "tokenA_address": env["usdc"],
+        "tokenB_address": pool["token"],
+    }
+
+    def ajout() -> None:
+        r0, r1 = chaine.reserves(pool["paire"])
+        r_usdc, r_tk = (r0, r1) if env["usdc"] < pool["token"] else (r1, r0)
+        ajouter_liquidite_reelle(pool=pool_lp, amountA=100.0, amountB=100 * E6 * r_tk / r_usdc / E18 * 1.001)
+
+    resultats: Dict[str, Dict[str, int]] = {}
+    for passe in ("froid", "chaud1", "chaud2", "chaud3"):
+        resultats[f"swap ({passe})"] = mesurer(
+            lambda: effectuer_swap_reel("sushiswap_v2", env["usdc"], pool["token"], 100 * E6, confirm=True)
+        )
+    for passe in ("froid", "chaud1", "chaud2", "chaud3"):
+        resultats[f"add_liquidity ({passe})"] = mesurer(ajout)
+
+    chef = Web3.to_checksum_address(env["chef"])
+    lp = chaine.solde(pool["paire"], COMPTE)
+    _envoyer(w3, w3.eth.contract(address=Web3.to_checksum_address(pool["paire"]), abi=ERC20_ABI).functions.approve(chef, lp))
+    _envoyer(w3, w3.eth.contract(address=chef, abi=MINICHEF_DEPOSIT_ABI).functions.deposit(pool["pid"], lp, COMPTE))
+    options = ["--rpc-url", url, "--minichef", chef]
+    for passe in ("froid", "chaud1", "chaud2", "chaud3"):
+        chaine.miner(2)
+        resultats[f"harvest ({passe})"] = mesurer(
+            lambda: farming_main(options + ["harvest", "--pid", str(pool["pid"]), "--confirm"])
+        )
+    chaine.arreter_serveur_http()
+    return resultats
+
+
+def _plan(env: Dict[str, Any], w3: Web3) -> List[Dict[str, Any]]:
+    chaine = env["chaine"]
+    actions: List[Dict[str, Any]] = []
+    for pool in env["pools"]:
+        r0, r1 = chaine.reserves(pool["paire"])
+        r_usdc, r_tk = (r0, r1) if env["usdc"] < pool["token"] else (r1, r0)
+        montant = 1_000 * E6
+        sortie = montant * 997 * r_tk // (r_usdc * 1000 + montant * 997)
+        offre = r_tk  # ordre de grandeur suffisant pour un dépôt conservateur
+        lp_prevu = min(montant * math.isqrt(r0 * r1) // (r_usdc + montant), sortie * math.isqrt(r0 * r1) // offre)
+        groupe = {"pool_id": pool["paire"]}
+        actions += [
+            {"kind": "swap", "params": {**groupe, "router": ROUTER, "token_in": env["usdc"], "amount_in_wei": montant,
+                                         "amount_out_min_wei": 0, "path": [env["usdc"], pool["token"]]}},
+            {"kind": "add_liquidity", "params": {**groupe, "router": ROUTER, "tokenA_address": env["usdc"],
+                                                  "tokenB_address": pool["token"], "amountA_wei": montant,
+                                                  "amountB_wei": sortie}},
+            {"kind": "stake", "params": {**groupe, "minichef": env["chef"], "lp_token": pool["paire"],
+                                          "pid": pool["pid"], "amount_lp_wei": lp_prevu * 9 // 10}},
+        ]
+    return actions
+
+
+def bench_latence_reequilibrage(nb_pools: int, block_time_s: float) -> Dict[str, Dict[str, Any]]:
+    resultats: Dict[str, Dict[str, Any]] = {}
+    for mode in ("sequentiel", "dag"):
+        env = _chaine(nb_pools, block_time_s=block_time_s)
+        w3 = Web3(env["chaine"].provider())
+        backend = Web3Backend(w3, CLE_PRIVEE)
+        rapport = BatchRebalanceExecutor(backend, mode=mode, max_workers=16).execute(_plan(env, w3))
+        resultats[mode] = {
+            "status": rapport["status"],
+            "etapes": rapport["nb_etapes"] + rapport["nb_approbations"],
+            "confirmees": rapport["nb_confirmees"],
+            "latence_s": rapport["latence_totale_s"],
+            "blocs": env["chaine"].numero_bloc,
+        }
+    return resultats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks exécution (chaîne simulée)")
+    parser.add_argument("--txs", type=int, default=500)
+    parser.add_argument("--pools", type=int, default=4)
+    parser.add_argument("--block-time", type=float, default=0.25, dest="block_time")
+    args = parser.parse_args()
+
+    debit = bench_debit(args.txs)
+    print("=== DEBIT (provider en processus) ===")
+    print(f"{debit['txs']} txs en {debit['duree_s']:.3f}s → {debit['tx_par_s']:.0f} tx/s")
+
+    print("=== APPELS RPC PAR OPERATION (HTTP local) ===")
+    for operation, appels in bench_rpc_par_operation().items():
+        detail = ", ".join(f"{m}={n}" for m, n in sorted(appels.items()))
+        print(f"{operation:<24} total={sum(appels.values()):>3}  {detail}")
+
+    print(f"=== LATENCE REEQUILIBRAGE ({args.pools} pools, bloc {args.block_time}s) ===")
+    for mode, res in bench_latence_reequilibrage(args.pools, args.block_time).items():
+        print(
+            f"{mode:<10} status={res['status']} confirmees={res['confirmees']}/{res['etapes']} "
+            f"latence={res['latence_s']:.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# tools/bench_market_signals.py – V6.1.0
+"""
+Benchmark de ``core.market_signals.detect_market_context`` (aucun réseau).
+
+Compare, sur un univers synthétique de pools :
+- l'ancien calcul multi-passes (extraction APR/volume/TVL, moyenne recalculée
+  dans l'écart-type, passe séparée pour la tendance),
+- le noyau fusionné en une passe (Welford) sur une liste de dicts,
+- le chemin NumPy sur une ``PoolTable``.
+
+Usage : python -m tools.bench_market_signals [--pools 100000] [--repetitions 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+from core.market_signals import MarketParams, detect_market_context
+from core.pool_table import PoolTable
+
+
+def pools_synthetiques(nb_pools: int, graine: int = 11) -> List[Dict[str, Any]]:
+    rng = random.Random(graine)
+    pools: List[Dict[str, Any]] = []
+    for i in range(nb_pools):
+        pool: Dict[str, Any] = {
+            "apr": rng.uniform(0.0, 0.4) if i % 10 else 0.0,
+            "volume_24h": rng.uniform(0, 2e6),
+            "tvl": rng.uniform(1e4, 5e7),
+        }
+        if i % 3:
+            pool["apr_24h"] = rng.uniform(0.0, 0.4)
+            pool["apr_7d"] = rng.uniform(0.0, 0.4)
+        pools.append(pool)
+    return pools
+
+
+def statistiques_multi_passes(pools: Sequence[Mapping[str, Any]]) -> Dict[str, float]:
+    """Ancienne implémentation (V4.2) : une passe par métrique, deux moyennes pour l'écart-type."""
+
+    def positifs(cle: str) -> List[float]:
+        return [float(p[cle]) for p in pools if isinstance(p.get(cle), (int, float)) and p[cle] > 0]
+
+    def moyenne(valeurs: Sequence[float]) -> float:
+        return sum(valeurs) / len(valeurs) if valeurs else 0.0
+
+    apr = positifs("apr")
+    m = moyenne(apr)
+    ecart = math.sqrt(sum((x - m) ** 2 for x in apr) / (len(apr) - 1)) if len(apr) >= 2 else 0.0
+    tendances = [
+        (float(p["apr_24h"]) - float(p["apr_7d"])) / max(1e-12, abs(float(p["apr_7d"])))
+        for p in pools
+        if isinstance(p.get("apr_24h"), (int, float)) and isinstance(p.get("apr_7d"), (int, float)) and p["apr_7d"] != 0
+    ]
+    return {
+        "apr_mean": moyenne(apr),
+        "volume_sum": sum(positifs("volume_24h")),
+        "tvl_sum": sum(positifs("tvl")),
+        "volatility_cv": ecart / m if m > 0 else 0.0,
+        "apr_trend_avg": moyenne(tendances),
+    }
+
+
+def _chronometrer(fonction: Callable[[], Any], repetitions: int) -> float:
+    meilleur = math.inf
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - t0)
+    return meilleur
+
+
+def bench_detect_market_context(nb_pools: int, repetitions: int = 5) -> Dict[str, float]:
+    pools = pools_synthetiques(nb_pools)
+    table = PoolTable.depuis_dicts(pools)
+    params = MarketParams(volatility_weight=0.2, apr_trend_weight=0.1)
+    return {
+        "multi_passes_s": _chronometrer(lambda: statistiques_multi_passes(pools), repetitions),
+        "une_passe_s": _chronometrer(lambda: detect_market_context(pools, params), repetitions),
+        "pool_table_s": _chronometrer(lambda: detect_market_context(table, params), repetitions),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark detect_market_context")
+    parser.add_argument("--pools", type=int, default=100_000)
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    resultats = bench_detect_market_context(args.pools, args.repetitions)
+    print(f"=== DETECT_MARKET_CONTEXT ({args.pools} pools, meilleur de {args.repetitions}) ===")
+    reference = resultats["multi_passes_s"]
+    for nom, duree in resultats.items():
+        print(f"{nom:<16} {duree * 1e3:8.1f} ms  (x{reference / duree:.1f})")
+
+
+if __name__ == "__main__":
+    main()
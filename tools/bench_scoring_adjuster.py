@@ -0,0 +1,69 @@
+# tools/bench_scoring_adjuster.py – V6.1.0
+"""
+Benchmark de ``core.scoring_adjuster`` (aucun réseau).
+
+Compare, sur des scores synthétiques :
+- l'ajustement pool par pool (``ajuster_score_pool``, coefficients recalculés
+  à chaque appel),
+- l'ajustement par lot (``ajuster_scores_batch``, coefficients calculés une
+  fois par tick puis appliqués en NumPy).
+
+Usage : python -m tools.bench_scoring_adjuster [--pools 20000] [--repetitions 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import random
+import time
+from typing import Any, Callable, Dict
+
+from core.scoring_adjuster import ajuster_score_pool, ajuster_scores_batch
+
+SIGNAUX = [
+    {"timestamp": "2030-01-01T00:00:00Z", "ai_score": 0.8, "metrics": {"APR": 12.0, "tvl": 5_000, "volatility": 0.3}},
+    {"timestamp": "2030-01-01T00:01:00Z", "ai_score": 0.5, "metrics": {"apr_pct": 2000, "liquidity": 2e8}},
+    {"timestamp": "2030-01-01T00:02:00Z", "context_label": "neutre"},
+]
+
+
+def _chronometrer(fonction: Callable[[], Any], repetitions: int) -> float:
+    meilleur = math.inf
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - t0)
+    return meilleur
+
+
+def bench_ajustement(nb_pools: int, repetitions: int = 5, graine: int = 8) -> Dict[str, float]:
+    rng = random.Random(graine)
+    scores = [rng.uniform(-2, 50) for _ in range(nb_pools)]
+    pools = [{"id": f"p{i}"} for i in range(nb_pools)]
+
+    def par_pool() -> None:
+        for pool, score in zip(pools, scores):
+            ajuster_score_pool(pool, score, SIGNAUX, "neutre")
+
+    return {
+        "par_pool_s": _chronometrer(par_pool, repetitions),
+        "lot_s": _chronometrer(lambda: ajuster_scores_batch(scores, SIGNAUX, "neutre"), repetitions),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de l'ajustement des scores")
+    parser.add_argument("--pools", type=int, default=20_000)
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    resultats = bench_ajustement(args.pools, args.repetitions)
+    print(f"=== AJUSTEMENT DES SCORES ({args.pools} pools, meilleur de {args.repetitions}) ===")
+    reference = resultats["par_pool_s"]
+    for nom, duree in resultats.items():
+        print(f"{nom:<12} {duree * 1e3:8.1f} ms  (x{reference / duree:.1f})")
+
+
+if __name__ == "__main__":
+    main()
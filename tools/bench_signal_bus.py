@@ -0,0 +1,76 @@
+# tools/bench_signal_bus.py – V6.1.0
+"""
+Benchmark de la lecture du dernier payload d'échange (aucun réseau).
+
+Compare ``core.exchange_format.read_last_exchange`` :
+- sans bus actif (relecture de la dernière ligne du fichier JSONL),
+- avec un ``SignalBus`` actif (dernier payload servi depuis la mémoire).
+
+Usage : python -m tools.bench_signal_bus [--lectures 10000] [--repetitions 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from core.exchange_format import build_payload, read_last_exchange, write_exchange_payload
+from core.signal_bus import JsonlSink, SignalBus, activer_bus, desactiver_bus
+
+
+def _chronometrer(fonction: Callable[[], Any], repetitions: int) -> float:
+    meilleur = math.inf
+    for _ in range(repetitions):
+        t0 = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - t0)
+    return meilleur
+
+
+def bench_lecture_exchange(nb_lectures: int, repetitions: int = 5) -> Dict[str, float]:
+    """Durée moyenne d'une lecture (s), fichier seul puis bus actif."""
+    dossier = Path(tempfile.mkdtemp())
+    chemin = dossier / "exchange_bus.jsonl"
+
+    def lire() -> None:
+        for _ in range(nb_lectures):
+            read_last_exchange(chemin)
+
+    try:
+        write_exchange_payload(chemin, build_payload(source="bench", version="V6.1.0", context="neutre"))
+        resultats = {"fichier_s": _chronometrer(lire, repetitions) / nb_lectures}
+
+        sink = JsonlSink()
+        bus = SignalBus(sink, journaux={"exchange": chemin})
+        activer_bus(bus)
+        try:
+            write_exchange_payload(chemin, build_payload(source="bench", version="V6.1.0", context="favorable"))
+            resultats["bus_s"] = _chronometrer(lire, repetitions) / nb_lectures
+        finally:
+            desactiver_bus(bus)
+            sink.fermer()
+        return resultats
+    finally:
+        shutil.rmtree(dossier, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de read_last_exchange")
+    parser.add_argument("--lectures", type=int, default=10_000)
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    resultats = bench_lecture_exchange(args.lectures, args.repetitions)
+    print(f"=== READ_LAST_EXCHANGE ({args.lectures} lectures, meilleur de {args.repetitions}) ===")
+    reference = resultats["fichier_s"]
+    for nom, duree in resultats.items():
+        print(f"{nom:<10} {duree * 1e6:8.1f} µs  (x{reference / duree:.1f})")
+
+
+if __name__ == "__main__":
+    main()